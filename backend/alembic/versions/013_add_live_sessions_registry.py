@@ -0,0 +1,43 @@
+"""add_live_sessions_registry
+
+Revision ID: 013_live_sessions
+Revises: 012_drop_unused
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '013_live_sessions'
+down_revision: Union[str, Sequence[str], None] = '012_drop_unused'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the cluster-wide Live API session registry."""
+    op.create_table('live_sessions',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('learner_session_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('node_id', sa.String(), nullable=False),
+        sa.Column('context', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('last_heartbeat_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_live_sessions_learner', 'live_sessions', ['learner_session_id'])
+    op.create_index('idx_live_sessions_node', 'live_sessions', ['node_id'])
+    op.create_index('idx_live_sessions_heartbeat', 'live_sessions', ['last_heartbeat_at'])
+
+
+def downgrade() -> None:
+    """Drop the Live API session registry."""
+    op.drop_index('idx_live_sessions_heartbeat', table_name='live_sessions')
+    op.drop_index('idx_live_sessions_node', table_name='live_sessions')
+    op.drop_index('idx_live_sessions_learner', table_name='live_sessions')
+    op.drop_table('live_sessions')
@@ -0,0 +1,49 @@
+"""add_file_blobs
+
+Revision ID: 014_file_blobs
+Revises: 013_live_sessions
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '014_file_blobs'
+down_revision: Union[str, Sequence[str], None] = '013_live_sessions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create content-addressed file blobs and their training references."""
+    op.create_table('file_blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('storage_key', sa.String(), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('mime_type', sa.String(), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('sha256'),
+        sa.UniqueConstraint('storage_key')
+    )
+    op.create_table('training_file_refs',
+        sa.Column('training_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['sha256'], ['file_blobs.sha256']),
+        sa.PrimaryKeyConstraint('training_id')
+    )
+    op.create_index('idx_training_file_refs_sha256', 'training_file_refs', ['sha256'])
+
+
+def downgrade() -> None:
+    """Drop file blobs and training references."""
+    op.drop_index('idx_training_file_refs_sha256', table_name='training_file_refs')
+    op.drop_table('training_file_refs')
+    op.drop_table('file_blobs')
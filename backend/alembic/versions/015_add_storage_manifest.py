@@ -0,0 +1,44 @@
+"""add_storage_manifest
+
+Revision ID: 015_storage_manifest
+Revises: 014_file_blobs
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '015_storage_manifest'
+down_revision: Union[str, Sequence[str], None] = '014_file_blobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the storage manifest (filled by the reconciler on first run)."""
+    op.create_table('storage_manifest',
+        sa.Column('storage_key', sa.String(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('trainer_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('sha256', sa.String(length=64), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_accessed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('storage_key')
+    )
+    op.create_index('idx_storage_manifest_kind', 'storage_manifest', ['kind'])
+    op.create_index('idx_storage_manifest_trainer', 'storage_manifest', ['trainer_id'])
+    op.create_index('idx_storage_manifest_last_accessed', 'storage_manifest', ['last_accessed_at'])
+
+
+def downgrade() -> None:
+    """Drop the storage manifest."""
+    op.drop_index('idx_storage_manifest_last_accessed', table_name='storage_manifest')
+    op.drop_index('idx_storage_manifest_trainer', table_name='storage_manifest')
+    op.drop_index('idx_storage_manifest_kind', table_name='storage_manifest')
+    op.drop_table('storage_manifest')
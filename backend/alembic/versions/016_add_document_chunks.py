@@ -0,0 +1,37 @@
+"""add_document_chunks
+
+Revision ID: 016_document_chunks
+Revises: 015_storage_manifest
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '016_document_chunks'
+down_revision: Union[str, Sequence[str], None] = '015_storage_manifest'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the table of locally extracted document chunks (filled lazily)."""
+    op.create_table('document_chunks',
+        sa.Column('storage_key', sa.String(), nullable=False),
+        sa.Column('chunk_index', sa.Integer(), nullable=False),
+        sa.Column('location', sa.String(), nullable=False),
+        sa.Column('section_title', sa.String(), nullable=True),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('token_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('storage_key', 'chunk_index')
+    )
+
+
+def downgrade() -> None:
+    """Drop the document chunks table."""
+    op.drop_table('document_chunks')
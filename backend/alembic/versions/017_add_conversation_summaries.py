@@ -0,0 +1,38 @@
+"""add_conversation_summaries
+
+Revision ID: 017_conversation_summaries
+Revises: 016_document_chunks
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '017_conversation_summaries'
+down_revision: Union[str, Sequence[str], None] = '016_document_chunks'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the table of rolling chat summaries (one row per learner session)."""
+    op.create_table('conversation_summaries',
+        sa.Column('learner_session_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('summarized_until', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('summarized_messages', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('summarized_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['learner_session_id'], ['learner_sessions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('learner_session_id')
+    )
+
+
+def downgrade() -> None:
+    """Drop the conversation summaries table."""
+    op.drop_table('conversation_summaries')
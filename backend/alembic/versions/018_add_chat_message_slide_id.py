@@ -0,0 +1,41 @@
+"""add_chat_message_slide_id
+
+Revision ID: 018_chat_message_slide_id
+Revises: 017_conversation_summaries
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '018_chat_message_slide_id'
+down_revision: Union[str, Sequence[str], None] = '017_conversation_summaries'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record the slide a chat message was sent from (chat history filter)."""
+    op.add_column('chat_messages', sa.Column('slide_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        'fk_chat_messages_slide_id', 'chat_messages', 'training_slides',
+        ['slide_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index(
+        'idx_chat_messages_slide_created',
+        'chat_messages',
+        ['slide_id', 'created_at', 'id'],
+        postgresql_where=sa.text('slide_id IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Remove the chat message slide reference."""
+    op.drop_index('idx_chat_messages_slide_created', table_name='chat_messages')
+    op.drop_constraint('fk_chat_messages_slide_id', 'chat_messages', type_='foreignkey')
+    op.drop_column('chat_messages', 'slide_id')
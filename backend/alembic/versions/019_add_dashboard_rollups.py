@@ -0,0 +1,90 @@
+"""add_dashboard_rollups
+
+Revision ID: 019_dashboard_rollups
+Revises: 018_chat_message_slide_id
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '019_dashboard_rollups'
+down_revision: Union[str, Sequence[str], None] = '018_chat_message_slide_id'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _counter(name: str, big: bool = False) -> sa.Column:
+    return sa.Column(name, sa.BigInteger() if big else sa.Integer(), server_default='0', nullable=False)
+
+
+def _updated_at() -> sa.Column:
+    return sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False)
+
+
+def upgrade() -> None:
+    """Create the dashboard rollup tables (filled by the reconciler on first run)."""
+    op.create_table('session_rollups',
+        sa.Column('session_id', postgresql.UUID(as_uuid=True), nullable=False),
+        _counter('learner_count'),
+        _counter('total_time_seconds', big=True),
+        _counter('slide_progress_sum', big=True),
+        _counter('max_slide_reached'),
+        _counter('total_slides'),
+        _counter('slides_with_content'),
+        _updated_at(),
+        sa.ForeignKeyConstraint(['session_id'], ['training_sessions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('session_id')
+    )
+    op.create_table('training_rollups',
+        sa.Column('training_id', postgresql.UUID(as_uuid=True), nullable=False),
+        _counter('session_count'),
+        _counter('active_session_count'),
+        _counter('learner_count'),
+        _counter('total_time_seconds', big=True),
+        _counter('slide_progress_sum', big=True),
+        _counter('max_slide_reached'),
+        _counter('total_slides'),
+        _counter('slides_with_content'),
+        _updated_at(),
+        sa.ForeignKeyConstraint(['training_id'], ['trainings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('training_id')
+    )
+    op.create_table('trainer_rollups',
+        sa.Column('trainer_id', postgresql.UUID(as_uuid=True), nullable=False),
+        _counter('trainings_with_support'),
+        _counter('trainings_ai_generated'),
+        _counter('session_count'),
+        _counter('active_session_count'),
+        _counter('learner_count'),
+        _counter('total_time_seconds', big=True),
+        _counter('slide_progress_sum', big=True),
+        _counter('total_slides'),
+        _counter('slides_with_content'),
+        _updated_at(),
+        sa.ForeignKeyConstraint(['trainer_id'], ['trainers.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('trainer_id')
+    )
+    op.create_table('daily_activity_rollups',
+        sa.Column('trainer_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        _counter('learners_started'),
+        _counter('unique_learners'),
+        _counter('slides_generated'),
+        _updated_at(),
+        sa.ForeignKeyConstraint(['trainer_id'], ['trainers.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('trainer_id', 'day')
+    )
+
+
+def downgrade() -> None:
+    """Drop the dashboard rollup tables."""
+    op.drop_table('daily_activity_rollups')
+    op.drop_table('trainer_rollups')
+    op.drop_table('training_rollups')
+    op.drop_table('session_rollups')
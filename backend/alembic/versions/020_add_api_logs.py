@@ -0,0 +1,53 @@
+"""add_api_logs
+
+Revision ID: 020_api_logs
+Revises: 019_dashboard_rollups
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '020_api_logs'
+down_revision: Union[str, Sequence[str], None] = '019_dashboard_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Recreate api_logs (dropped in 012) with the token accounting of every Gemini call."""
+    op.create_table('api_logs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('service_name', sa.String(), nullable=False),
+        sa.Column('endpoint', sa.String(), nullable=False),
+        sa.Column('method', sa.String(), nullable=False),
+        sa.Column('request_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('response_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('response_time_ms', sa.Integer(), nullable=True),
+        sa.Column('tokens_used', sa.Integer(), nullable=True),
+        sa.Column('cost_estimate', sa.String(), nullable=True),
+        sa.Column('learner_session_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('service_type', sa.String(), nullable=True),
+        sa.Column('model', sa.String(), nullable=True),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=True),
+        sa.Column('candidates_tokens', sa.Integer(), nullable=True),
+        sa.Column('cached_tokens', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['learner_session_id'], ['learner_sessions.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_api_logs_learner_session_created', 'api_logs', ['learner_session_id', 'created_at'])
+    op.create_index('idx_api_logs_created', 'api_logs', ['created_at'])
+
+
+def downgrade() -> None:
+    """Drop api_logs again."""
+    op.drop_index('idx_api_logs_created', table_name='api_logs')
+    op.drop_index('idx_api_logs_learner_session_created', table_name='api_logs')
+    op.drop_table('api_logs')
@@ -4,14 +4,16 @@ API endpoints for admin dashboard and trainer management
 """
 
 import logging
-from typing import List, Dict, Any
+from typing import Dict, Any, Literal, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infrastructure.auth import get_current_trainer
 from app.infrastructure.database import get_database_session
 from app.domain.entities.trainer import Trainer
+from app.domain.schemas.admin import AdminOverviewParams
+from app.domain.schemas.common import PaginatedResponse
 from app.domain.services.admin_dashboard_service import AdminDashboardService
 from app.adapters.repositories.admin_repository import AdminRepository
 
@@ -41,22 +43,44 @@ async def get_current_admin_trainer(
     return current_trainer
 
 
+def get_overview_params(
+    page: int = Query(1, ge=1, description="Page number, starting at 1"),
+    per_page: int = Query(50, ge=1, le=100, description="Rows per page"),
+    sort: Optional[str] = Query(None, description="Response field to sort by"),
+    order: Optional[Literal["asc", "desc"]] = Query(None, description="Sort direction"),
+    search: Optional[str] = Query(None, max_length=100, description="Case-insensitive text search")
+) -> AdminOverviewParams:
+    """Dependency reading the pagination, sort and search query parameters of overview listings"""
+    return AdminOverviewParams(page=page, per_page=per_page, sort=sort, order=order, search=search)
+
+
 @router.get("/trainers-overview")
 async def get_trainers_overview(
+    params: AdminOverviewParams = Depends(get_overview_params),
+    is_active: Optional[bool] = Query(None, description="Only active (true) or inactive (false) trainers"),
     admin_trainer: Trainer = Depends(get_current_admin_trainer),
     admin_service: AdminDashboardService = Depends(get_admin_dashboard_service)
-) -> List[Dict[str, Any]]:
+) -> PaginatedResponse:
     """
     Get overview of all trainers with their complete statistics
+    
+    Paginated (page, per_page up to 100), searchable, sortable on:
+    first_name, last_name, email, created_at (default, desc), trainings_with_support,
+    trainings_ai_generated, active_sessions, total_sessions, unique_learners,
+    total_time_all_learners, average_time_per_slide, total_slides_generated,
+    average_slides_per_training
     """
-    logger.info(f"Admin {admin_trainer.email} requested trainers overview")
+    logger.info(f"Admin {admin_trainer.email} requested trainers overview (page {params.page})")
     
     try:
-        trainers_overview = await admin_service.get_trainers_overview()
+        trainers_overview = await admin_service.get_trainers_overview(params, is_active=is_active)
         
-        logger.info(f"Successfully retrieved overview for {len(trainers_overview)} trainers")
+        logger.info(f"Successfully retrieved overview for {len(trainers_overview.items)} of {trainers_overview.total} trainers")
         return trainers_overview
         
+    except ValueError as e:
+        logger.warning(f"Invalid trainers overview query: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get trainers overview: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="error.api.trainersOverview")
@@ -64,20 +88,29 @@ async def get_trainers_overview(
 
 @router.get("/trainees-overview")
 async def get_trainees_overview(
+    params: AdminOverviewParams = Depends(get_overview_params),
+    level: Optional[str] = Query(None, description="Only trainees with this experience level"),
     admin_trainer: Trainer = Depends(get_current_admin_trainer),
     admin_service: AdminDashboardService = Depends(get_admin_dashboard_service)
-) -> List[Dict[str, Any]]:
+) -> PaginatedResponse:
     """
     Get overview of all trainees with their learning statistics
+    
+    Paginated (page, per_page up to 100), searchable, sortable on:
+    email (default), level, job_sector, objective, total_sessions,
+    trainer_sessions, total_time, total_slides_viewed
     """
-    logger.info(f"Admin {admin_trainer.email} requested trainees overview")
+    logger.info(f"Admin {admin_trainer.email} requested trainees overview (page {params.page})")
     
     try:
-        trainees_overview = await admin_service.get_trainees_overview()
+        trainees_overview = await admin_service.get_trainees_overview(params, level=level)
         
-        logger.info(f"Successfully retrieved overview for {len(trainees_overview)} trainees")
+        logger.info(f"Successfully retrieved overview for {len(trainees_overview.items)} of {trainees_overview.total} trainees")
         return trainees_overview
         
+    except ValueError as e:
+        logger.warning(f"Invalid trainees overview query: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get trainees overview: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="error.api.traineesOverview")
@@ -85,20 +118,29 @@ async def get_trainees_overview(
 
 @router.get("/trainings-overview")
 async def get_trainings_overview(
+    params: AdminOverviewParams = Depends(get_overview_params),
+    training_type: Optional[Literal["IA", "Humain"]] = Query(None, description="Only AI-generated or trainer trainings"),
     admin_trainer: Trainer = Depends(get_current_admin_trainer),
     admin_service: AdminDashboardService = Depends(get_admin_dashboard_service)
-) -> List[Dict[str, Any]]:
+) -> PaginatedResponse:
     """
     Get overview of all trainings with their statistics
+    
+    Paginated (page, per_page up to 100), searchable, sortable on:
+    training_name (default), training_type, total_learners, total_sessions,
+    total_time, avg_time_per_session, total_slides, avg_slides_per_session
     """
-    logger.info(f"Admin {admin_trainer.email} requested trainings overview")
+    logger.info(f"Admin {admin_trainer.email} requested trainings overview (page {params.page})")
     
     try:
-        trainings_overview = await admin_service.get_trainings_overview()
+        trainings_overview = await admin_service.get_trainings_overview(params, training_type=training_type)
         
-        logger.info(f"Successfully retrieved overview for {len(trainings_overview)} trainings")
+        logger.info(f"Successfully retrieved overview for {len(trainings_overview.items)} of {trainings_overview.total} trainings")
         return trainings_overview
         
+    except ValueError as e:
+        logger.warning(f"Invalid trainings overview query: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get trainings overview: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="error.api.trainingsOverview")
@@ -106,20 +148,30 @@ async def get_trainings_overview(
 
 @router.get("/sessions-overview")
 async def get_sessions_overview(
+    params: AdminOverviewParams = Depends(get_overview_params),
+    is_active: Optional[bool] = Query(None, description="Only active (true) or inactive (false) sessions"),
+    training_type: Optional[Literal["IA", "Humain"]] = Query(None, description="Only sessions of AI-generated or trainer trainings"),
     admin_trainer: Trainer = Depends(get_current_admin_trainer),
     admin_service: AdminDashboardService = Depends(get_admin_dashboard_service)
-) -> List[Dict[str, Any]]:
+) -> PaginatedResponse:
     """
     Get overview of all training sessions with their statistics and token costs
+    
+    Paginated (page, per_page up to 100), searchable, sortable on:
+    session_name, training_name, training_type, session_date (default, desc),
+    status, total_slides, progress_percentage, token_cost
     """
-    logger.info(f"Admin {admin_trainer.email} requested sessions overview")
+    logger.info(f"Admin {admin_trainer.email} requested sessions overview (page {params.page})")
     
     try:
-        sessions_overview = await admin_service.get_sessions_overview()
+        sessions_overview = await admin_service.get_sessions_overview(params, is_active=is_active, training_type=training_type)
         
-        logger.info(f"Successfully retrieved overview for {len(sessions_overview)} sessions")
+        logger.info(f"Successfully retrieved overview for {len(sessions_overview.items)} of {sessions_overview.total} sessions")
         return sessions_overview
         
+    except ValueError as e:
+        logger.warning(f"Invalid sessions overview query: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get sessions overview: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="error.api.sessionsOverview")
@@ -25,6 +25,8 @@ from app.adapters.outbound.conversation_adapter import ConversationAdapter
 from app.adapters.repositories.learner_session_repository import LearnerSessionRepository
 from app.adapters.repositories.training_slide_repository import TrainingSlideRepository
 from app.adapters.repositories.chat_message_repository import ChatMessageRepository
+from app.infrastructure.conversation_summarizer import conversation_summarizer
+from app.infrastructure.chat_message_writer import chat_message_writer
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -81,7 +83,13 @@ async def chat_with_ai_trainer(
         conversation_adapter = ConversationAdapter()
         conversation_service = ConversationService(conversation_adapter)
         chat_message_repo = ChatMessageRepository(db)
-        chat_history_service = ChatHistoryService(conversation_service, chat_message_repo)
+        chat_history_service = ChatHistoryService(
+            conversation_service,
+            chat_message_repo,
+            conversation_memory=conversation_summarizer.create_memory_service(db),
+            on_turn_stored=conversation_summarizer.schedule,
+            message_writer=chat_message_writer
+        )
         
         # Process chat request with automatic history storage
         chat_response = await chat_history_service.handle_learner_chat_with_history(
@@ -287,7 +295,12 @@ async def _handle_contextual_action_with_history(
     conversation_adapter = ConversationAdapter()
     conversation_service = ConversationService(conversation_adapter)
     chat_message_repo = ChatMessageRepository(db)
-    chat_history_service = ChatHistoryService(conversation_service, chat_message_repo)
+    chat_history_service = ChatHistoryService(
+        conversation_service,
+        chat_message_repo,
+        on_turn_stored=conversation_summarizer.schedule,
+        message_writer=chat_message_writer
+    )
     
     # Get the specific adapter method
     adapter_method = getattr(conversation_adapter, adapter_method_name)
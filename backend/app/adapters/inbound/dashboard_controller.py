@@ -3,22 +3,28 @@ FIA v3.0 - Dashboard Controller
 API endpoints for trainer dashboard statistics
 """
 
+import base64
+import binascii
+import json
 import logging
-from fastapi import APIRouter, Depends
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import literal_column, select, tuple_, union_all
 
 from app.infrastructure.auth import get_current_trainer
-from app.infrastructure.database import get_database_session
+from app.infrastructure.dashboard_cache import dashboard_cache
+from app.infrastructure.database import AsyncSessionLocal, get_database_session
 from app.infrastructure.models.trainer_model import TrainerModel
 from app.infrastructure.models.training_model import TrainingModel
 from app.infrastructure.models.training_session_model import TrainingSessionModel
 from app.infrastructure.models.learner_session_model import LearnerSessionModel
-from app.infrastructure.models.training_slide_model import TrainingSlideModel
-from app.infrastructure.models.training_submodule_model import TrainingSubmoduleModel
-from app.infrastructure.models.training_module_model import TrainingModuleModel
-from app.infrastructure.models.learner_training_plan_model import LearnerTrainingPlanModel
 from app.infrastructure.models.chat_message_model import ChatMessageModel
+from app.infrastructure.models.dashboard_rollup_model import DailyActivityRollupModel, TrainerRollupModel
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -40,85 +46,30 @@ async def get_dashboard_stats(
     """
     try:
         trainer_id = current_trainer.id
+        cached = dashboard_cache.get(trainer_id, "stats")
+        if cached is not None:
+            return cached
         logger.info(f"Getting dashboard stats for trainer {trainer_id}")
         
-        # Count trainings for this trainer
-        trainings_result = await db.execute(
-            select(func.count(TrainingModel.id))
-            .where(TrainingModel.trainer_id == trainer_id)
-        )
-        trainings_count = trainings_result.scalar() or 0
-        logger.info(f"Trainings count: {trainings_count}")
-        
-        # Count active training sessions for this trainer's trainings
-        active_sessions_result = await db.execute(
-            select(func.count(TrainingSessionModel.id))
-            .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
-            .where(
-                TrainingModel.trainer_id == trainer_id,
-                TrainingSessionModel.is_active == True
-            )
-        )
-        active_sessions_count = active_sessions_result.scalar() or 0
-        logger.info(f"Active sessions count: {active_sessions_count}")
-        
-        # Count unique learners by email across all trainer's sessions
-        unique_learners_result = await db.execute(
-            select(func.count(func.distinct(LearnerSessionModel.email)))
-            .join(TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id)
-            .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
-            .where(TrainingModel.trainer_id == trainer_id)
+        # One row maintained by the dashboard rollups (none yet: nothing to count)
+        result = await db.execute(
+            select(TrainerRollupModel).where(TrainerRollupModel.trainer_id == trainer_id)
         )
-        unique_learners_count = unique_learners_result.scalar() or 0
-        logger.info(f"Unique learners count: {unique_learners_count}")
+        rollup = result.scalar_one_or_none()
         
-        # Calculate total time spent by all learners (in hours)
-        total_time_result = await db.execute(
-            select(func.sum(LearnerSessionModel.total_time_spent))
-            .join(TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id)
-            .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
-            .where(TrainingModel.trainer_id == trainer_id)
-        )
-        total_time_seconds = total_time_result.scalar() or 0
+        trainings_count = (rollup.trainings_with_support + rollup.trainings_ai_generated) if rollup else 0
+        active_sessions_count = rollup.active_session_count if rollup else 0
+        unique_learners_count = rollup.learner_count if rollup else 0
+        total_time_seconds = rollup.total_time_seconds if rollup else 0
         total_time_hours = int(total_time_seconds / 3600) if total_time_seconds else 0
         total_time_spent = f"{total_time_hours}h"
-        logger.info(f"Total time spent: {total_time_seconds} seconds = {total_time_hours} hours")
-        
-        # Calculate total slides viewed (sum of current_slide_number)
-        slides_viewed_result = await db.execute(
-            select(func.sum(LearnerSessionModel.current_slide_number))
-            .join(TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id)
-            .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
-            .where(TrainingModel.trainer_id == trainer_id)
-        )
-        total_slides_viewed = slides_viewed_result.scalar() or 0
-        logger.info(f"Total slides viewed: {total_slides_viewed}")
-        
-        # Count total slides with content for all trainer's trainings
-        # Simplified approach: get slides for this trainer via learner sessions
-        try:
-            total_slides_result = await db.execute(
-                select(func.count(TrainingSlideModel.id))
-                .join(TrainingSubmoduleModel, TrainingSlideModel.submodule_id == TrainingSubmoduleModel.id)
-                .join(TrainingModuleModel, TrainingSubmoduleModel.module_id == TrainingModuleModel.id)
-                .join(LearnerTrainingPlanModel, TrainingModuleModel.plan_id == LearnerTrainingPlanModel.id)
-                .join(LearnerSessionModel, LearnerTrainingPlanModel.learner_session_id == LearnerSessionModel.id)
-                .join(TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id)
-                .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
-                .where(
-                    TrainingModel.trainer_id == trainer_id,
-                    TrainingSlideModel.content.isnot(None)
-                )
-            )
-            total_slides_count = total_slides_result.scalar() or 0
-            logger.info(f"Total slides count: {total_slides_count}")
-        except Exception as slides_error:
-            logger.error(f"Error counting total slides: {slides_error}")
-            total_slides_count = 0
+        # Slides viewed: sum of current_slide_number; total: slides with content in the learners' plans
+        total_slides_viewed = rollup.slide_progress_sum if rollup else 0
+        total_slides_count = rollup.slides_with_content if rollup else 0
         
         logger.info(f"Dashboard stats for trainer {trainer_id}: trainings={trainings_count}, sessions={active_sessions_count}, learners={unique_learners_count}, time={total_time_hours}h, slides_viewed={total_slides_viewed}, total_slides={total_slides_count}")
         
-        return {
+        stats = {
             "trainings_count": trainings_count,
             "active_sessions_count": active_sessions_count,
             "unique_learners_count": unique_learners_count,
@@ -126,6 +77,8 @@ async def get_dashboard_stats(
             "total_slides_viewed": total_slides_viewed,
             "total_slides_count": total_slides_count
         }
+        dashboard_cache.put(trainer_id, "stats", stats)
+        return stats
         
     except Exception as e:
         logger.error(f"Failed to get dashboard stats: {e}")
@@ -140,6 +93,83 @@ async def get_dashboard_stats(
         }
 
 
+@router.get("/daily-activity")
+async def get_daily_activity(
+    days: int = Query(30, ge=1, le=366, description="Number of days up to today (UTC)"),
+    current_trainer: TrainerModel = Depends(get_current_trainer),
+    db: AsyncSession = Depends(get_database_session)
+):
+    """
+    Get the trainer's activity per day (learners starting, slides generated)
+    
+    Returns:
+        Days with activity, oldest first
+    """
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    result = await db.execute(
+        select(DailyActivityRollupModel)
+        .where(
+            DailyActivityRollupModel.trainer_id == current_trainer.id,
+            DailyActivityRollupModel.day >= since
+        )
+        .order_by(DailyActivityRollupModel.day)
+    )
+    return [
+        {
+            "day": rollup.day.isoformat(),
+            "learners_started": rollup.learners_started,
+            "unique_learners": rollup.unique_learners,
+            "slides_generated": rollup.slides_generated
+        }
+        for rollup in result.scalars().all()
+    ]
+
+
+# Activity kind -> (icon, i18n title key, title parameter)
+RECENT_ACTIVITY_KINDS = {
+    "training": ("file-earmark-plus", "activity.createdTraining", "name"),
+    "session": ("calendar-plus", "activity.createdSession", "name"),
+    "learner": ("person-plus", "activity.newLearner", "email")
+}
+RECENT_ACTIVITY_PER_KIND = 3
+RECENT_ACTIVITY_LIMIT = 5
+
+
+def _recent_activity_query(trainer_id: UUID):
+    """Latest RECENT_ACTIVITY_PER_KIND rows of each kind, RECENT_ACTIVITY_LIMIT most recent overall"""
+    trainings = select(
+        literal_column("'training'").label('kind'),
+        TrainingModel.name.label('label'),
+        TrainingModel.created_at.label('occurred_at')
+    ).where(
+        TrainingModel.trainer_id == trainer_id
+    ).order_by(TrainingModel.created_at.desc()).limit(RECENT_ACTIVITY_PER_KIND)
+    sessions = select(
+        literal_column("'session'"),
+        TrainingSessionModel.name,
+        TrainingSessionModel.created_at
+    ).join(
+        TrainingModel, TrainingSessionModel.training_id == TrainingModel.id
+    ).where(
+        TrainingModel.trainer_id == trainer_id
+    ).order_by(TrainingSessionModel.created_at.desc()).limit(RECENT_ACTIVITY_PER_KIND)
+    learners = select(
+        literal_column("'learner'"),
+        LearnerSessionModel.email,
+        LearnerSessionModel.started_at
+    ).join(
+        TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id
+    ).join(
+        TrainingModel, TrainingSessionModel.training_id == TrainingModel.id
+    ).where(
+        TrainingModel.trainer_id == trainer_id
+    ).order_by(LearnerSessionModel.started_at.desc()).limit(RECENT_ACTIVITY_PER_KIND)
+    activity = union_all(trainings, sessions, learners).subquery('activity')
+    return select(activity).where(
+        activity.c.occurred_at.isnot(None)
+    ).order_by(activity.c.occurred_at.desc()).limit(RECENT_ACTIVITY_LIMIT)
+
+
 @router.get("/recent-activity")
 async def get_recent_activity(
     current_trainer: TrainerModel = Depends(get_current_trainer),
@@ -153,64 +183,23 @@ async def get_recent_activity(
     """
     try:
         trainer_id = current_trainer.id
-        activities = []
-        
-        # Get recent trainings
-        recent_trainings = await db.execute(
-            select(TrainingModel)
-            .where(TrainingModel.trainer_id == trainer_id)
-            .order_by(TrainingModel.created_at.desc())
-            .limit(3)
-        )
+        cached = dashboard_cache.get(trainer_id, "recent_activity")
+        if cached is not None:
+            return cached
         
-        for training in recent_trainings.scalars():
-            activities.append({
-                "icon": "file-earmark-plus",
-                "title_key": "activity.createdTraining",
-                "title_params": {"name": training.name},
-                "timestamp": training.created_at.strftime("%Y-%m-%d %H:%M")
-            })
-        
-        # Get recent training sessions
-        recent_sessions = await db.execute(
-            select(TrainingSessionModel)
-            .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
-            .where(TrainingModel.trainer_id == trainer_id)
-            .order_by(TrainingSessionModel.created_at.desc())
-            .limit(3)
-        )
-        
-        for session in recent_sessions.scalars():
-            activities.append({
-                "icon": "calendar-plus",
-                "title_key": "activity.createdSession",
-                "title_params": {"name": session.name},
-                "timestamp": session.created_at.strftime("%Y-%m-%d %H:%M")
-            })
-        
-        # Get recent learner sessions
-        recent_learners = await db.execute(
-            select(LearnerSessionModel)
-            .join(TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id)
-            .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
-            .where(TrainingModel.trainer_id == trainer_id)
-            .order_by(LearnerSessionModel.started_at.desc())
-            .limit(3)
-        )
-        
-        for learner in recent_learners.scalars():
-            activities.append({
-                "icon": "person-plus",
-                "title_key": "activity.newLearner",
-                "title_params": {"email": learner.email},
-                "timestamp": learner.started_at.strftime("%Y-%m-%d %H:%M")
-            })
-        
-        # Sort all activities by timestamp (most recent first)
-        activities.sort(key=lambda x: x["timestamp"], reverse=True)
-        
-        # Return top 5 most recent activities
-        return activities[:5]
+        # Latest trainings, sessions and learners, merged and sorted in one query
+        result = await db.execute(_recent_activity_query(trainer_id))
+        activities = [
+            {
+                "icon": RECENT_ACTIVITY_KINDS[row.kind][0],
+                "title_key": RECENT_ACTIVITY_KINDS[row.kind][1],
+                "title_params": {RECENT_ACTIVITY_KINDS[row.kind][2]: row.label},
+                "timestamp": row.occurred_at.strftime("%Y-%m-%d %H:%M")
+            }
+            for row in result.all()
+        ]
+        dashboard_cache.put(trainer_id, "recent_activity", activities)
+        return activities
         
     except Exception as e:
         logger.error(f"Failed to get recent activity: {e}")
@@ -218,123 +207,129 @@ async def get_recent_activity(
         return []
 
 
+CHAT_HISTORY_PAGE_SIZE = 500
+CHAT_HISTORY_MAX_PAGE_SIZE = 2000
+
+
+def _encode_cursor(created_at: datetime, message_id: UUID) -> str:
+    """Opaque keyset cursor: position of the last returned message"""
+    raw = json.dumps([created_at.isoformat(), str(message_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, message_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(message_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _chat_history_query(
+    trainer_id: UUID,
+    session_id: UUID,
+    after: Optional[Tuple[datetime, UUID]] = None,
+    learner_session_id: Optional[UUID] = None,
+    slide_id: Optional[UUID] = None
+):
+    """Messages of a trainer's training session with learner emails, in (created_at, id) order"""
+    query = (
+        select(
+            ChatMessageModel.id,
+            ChatMessageModel.learner_session_id,
+            ChatMessageModel.slide_id,
+            ChatMessageModel.message,
+            ChatMessageModel.response,
+            ChatMessageModel.message_type,
+            ChatMessageModel.created_at,
+            LearnerSessionModel.email
+        )
+        .join(LearnerSessionModel, ChatMessageModel.learner_session_id == LearnerSessionModel.id)
+        .join(TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id)
+        .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
+        .where(
+            TrainingSessionModel.id == session_id,
+            TrainingModel.trainer_id == trainer_id  # Ownership check in the same query
+        )
+    )
+    if learner_session_id is not None:
+        query = query.where(ChatMessageModel.learner_session_id == learner_session_id)
+    if slide_id is not None:
+        query = query.where(ChatMessageModel.slide_id == slide_id)
+    if after is not None:
+        query = query.where(tuple_(ChatMessageModel.created_at, ChatMessageModel.id) > tuple_(*after))
+    return query.order_by(ChatMessageModel.created_at, ChatMessageModel.id)
+
+
+def _format_chat_row(row) -> Dict[str, Any]:
+    return {
+        "id": str(row.id),
+        "learner_session_id": str(row.learner_session_id),
+        "slide_id": str(row.slide_id) if row.slide_id else None,
+        "learner_message": row.message,
+        "ai_response": row.response,
+        "message_type": row.message_type,  # 'question' or 'answer'
+        "created_at": row.created_at.strftime("%Y-%m-%d %H:%M:%S") if row.created_at else None,
+        "learner_email": row.email
+    }
+
+
 @router.get("/chat-history/{session_id}")
 async def get_chat_history(
-    session_id: str,
+    session_id: UUID,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(CHAT_HISTORY_PAGE_SIZE, ge=1, le=CHAT_HISTORY_MAX_PAGE_SIZE),
+    learner_session_id: Optional[UUID] = Query(None, description="Only this learner's messages"),
+    slide_id: Optional[UUID] = Query(None, description="Only messages sent from this slide"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="'ndjson' streams every message"),
     current_trainer: TrainerModel = Depends(get_current_trainer),
     db: AsyncSession = Depends(get_database_session)
 ):
     """
     Get chat history for a specific training session
     
+    One query returns a page of messages with the learner email, oldest first.
+    When more messages follow, the X-Next-Cursor response header holds the
+    cursor of the next page. format=ndjson streams all remaining messages
+    instead (one JSON object per line), for exports of large sessions.
+    Sessions of other trainers return no messages.
+    
     Returns:
         List of chat messages with learner questions and AI responses
     """
-    try:
-        trainer_id = current_trainer.id
-        logger.info(f"🔍 [DEBUG] Getting chat history for session {session_id} by trainer {trainer_id}")
-        
-        # STEP 1: Verify the session belongs to this trainer
-        logger.info(f"🔍 [DEBUG] STEP 1: Verifying session ownership")
-        session_result = await db.execute(
-            select(TrainingSessionModel)
-            .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
-            .where(
-                TrainingSessionModel.id == session_id,
-                TrainingModel.trainer_id == trainer_id
-            )
-        )
-        session = session_result.scalar_one_or_none()
-        
-        if not session:
-            logger.warning(f"❌ [DEBUG] Session {session_id} not found or access denied for trainer {trainer_id}")
-            
-            # EXTRA DEBUG: Check if session exists at all
-            session_exists_result = await db.execute(
-                select(TrainingSessionModel.id, TrainingModel.trainer_id)
-                .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
-                .where(TrainingSessionModel.id == session_id)
-            )
-            session_exists = session_exists_result.first()
-            
-            if session_exists:
-                logger.warning(f"❌ [DEBUG] Session exists but belongs to trainer {session_exists.trainer_id}, not {trainer_id}")
-            else:
-                logger.warning(f"❌ [DEBUG] Session {session_id} does not exist at all")
-            
-            return []
-        
-        logger.info(f"✅ [DEBUG] STEP 1: Session verified - belongs to trainer {trainer_id}")
-        
-        # STEP 2: Get learner sessions for this training session
-        logger.info(f"🔍 [DEBUG] STEP 2: Getting learner sessions")
-        learner_sessions_result = await db.execute(
-            select(LearnerSessionModel)
-            .where(LearnerSessionModel.training_session_id == session_id)
-        )
-        learner_sessions = learner_sessions_result.scalars().all()
-        logger.info(f"📊 [DEBUG] Found {len(learner_sessions)} learner sessions")
-        
-        for ls in learner_sessions:
-            logger.info(f"   - Learner session {ls.id} ({ls.email})")
-        
-        # STEP 3: Get chat messages for all learners in this session
-        logger.info(f"🔍 [DEBUG] STEP 3: Getting chat messages")
-        chat_messages_result = await db.execute(
-            select(ChatMessageModel)
-            .join(LearnerSessionModel, ChatMessageModel.learner_session_id == LearnerSessionModel.id)
-            .where(LearnerSessionModel.training_session_id == session_id)
-            .order_by(ChatMessageModel.created_at.asc())
+    after = _decode_cursor(cursor) if cursor else None
+    query = _chat_history_query(current_trainer.id, session_id, after, learner_session_id, slide_id)
+    
+    if format == "ndjson":
+        logger.info(f"📤 DASHBOARD [CHAT_EXPORT] Streaming chat history of session {session_id}")
+        return StreamingResponse(
+            _stream_chat_history(query),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f'attachment; filename="chat-history-{session_id}.ndjson"'}
         )
-        chat_messages = chat_messages_result.scalars().all()
-        logger.info(f"📊 [DEBUG] Raw query returned {len(chat_messages)} chat messages")
-        
-        # STEP 4: Alternative query - direct from chat_messages
-        logger.info(f"🔍 [DEBUG] STEP 4: Alternative direct query")
-        learner_session_ids = [str(ls.id) for ls in learner_sessions]
-        if learner_session_ids:
-            direct_messages_result = await db.execute(
-                select(ChatMessageModel)
-                .where(ChatMessageModel.learner_session_id.in_(learner_session_ids))
-                .order_by(ChatMessageModel.created_at.asc())
-            )
-            direct_messages = direct_messages_result.scalars().all()
-            logger.info(f"📊 [DEBUG] Direct query returned {len(direct_messages)} chat messages")
-            
-            for msg in direct_messages:
-                logger.info(f"   - Message {msg.id}: \"{msg.message[:50] if msg.message else 'No message'}...\"")
-                logger.info(f"     Response: \"{msg.response[:50] if msg.response else 'No response'}...\"")
-                logger.info(f"     Learner session: {msg.learner_session_id}")
-        
-        # Format messages for display using the working query
-        formatted_messages = []
-        messages_to_use = direct_messages if learner_session_ids and len(direct_messages) > 0 else chat_messages
-        
-        logger.info(f"🔍 [DEBUG] STEP 5: Formatting {len(messages_to_use)} messages")
-        for msg in messages_to_use:
-            # Get learner email from learner session
-            learner_email = "Unknown"
-            for ls in learner_sessions:
-                if str(ls.id) == str(msg.learner_session_id):
-                    learner_email = ls.email
-                    break
-            
-            formatted_message = {
-                "id": str(msg.id),
-                "learner_message": msg.message,
-                "ai_response": msg.response,
-                "message_type": msg.message_type,  # 'question' or 'answer'
-                "created_at": msg.created_at.strftime("%Y-%m-%d %H:%M:%S") if msg.created_at else None,
-                "learner_email": learner_email
-            }
-            formatted_messages.append(formatted_message)
-            logger.info(f"   - Formatted message for {learner_email}")
-        
-        logger.info(f"✅ [DEBUG] Final result: {len(formatted_messages)} formatted messages for session {session_id}")
-        return formatted_messages
-        
+    
+    try:
+        result = await db.execute(query.limit(limit + 1))
+        rows = result.all()
     except Exception as e:
-        logger.error(f"❌ [DEBUG] Failed to get chat history for session {session_id}: {e}")
-        import traceback
-        logger.error(f"❌ [DEBUG] Traceback: {traceback.format_exc()}")
-        return []
\ No newline at end of file
+        logger.error(f"❌ DASHBOARD [CHAT_HISTORY] Failed to get chat history for session {session_id}: {e}")
+        return []
+    
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    logger.info(f"💬 DASHBOARD [CHAT_HISTORY] {len(rows)} messages for session {session_id}")
+    return [_format_chat_row(row) for row in rows]
+
+
+async def _stream_chat_history(query) -> AsyncIterator[bytes]:
+    """NDJSON lines from a server-side cursor (own DB session: it outlives the request handler)"""
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=CHAT_HISTORY_PAGE_SIZE))
+        async for partition in result.partitions():
+            yield "".join(
+                json.dumps(_format_chat_row(row), ensure_ascii=False) + "\n" for row in partition
+            ).encode("utf-8")
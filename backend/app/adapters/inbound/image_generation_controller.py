@@ -5,18 +5,22 @@ FastAPI routes for OpenAI image generation service
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
+import base64
 import logging
 import traceback
 import time
 from typing import Dict, Any
+from uuid import uuid4
 
 from app.infrastructure.database import get_database_session
+from app.infrastructure.dependencies import get_file_storage_service
 from app.domain.schemas.image_generation import (
     ImageGenerationRequest,
     ImageGenerationResponse,
     ImageGenerationStatus,
     ImageGenerationMetrics
 )
+from app.domain.services.slide_image_service import SlideImageService
 from app.adapters.outbound.openai_adapter import OpenAIAdapter
 from app.adapters.repositories.learner_session_repository import LearnerSessionRepository
 from app.adapters.repositories.training_slide_repository import TrainingSlideRepository
@@ -83,13 +87,25 @@ async def generate_infographic(
             slide_id=request.slide_id
         )
         
+        # Store the image and its variants through the configured storage
+        image_urls = {}
+        try:
+            image_service = SlideImageService(get_file_storage_service())
+            image_urls = await image_service.save_image(
+                result["image_bytes"],
+                request.learner_session_id,
+                request.slide_id or uuid4()  # Untracked images still get their own folder
+            )
+        except Exception as e:
+            logger.error(f"Failed to store generated image: {str(e)}")
+        
         # Save image information to database if slide_id is provided
-        if request.slide_id and result.get("image_path"):
+        if request.slide_id and image_urls:
             try:
                 slide = await training_slide_repo.get_by_id(request.slide_id)
                 if slide:
                     # Update slide with image information
-                    slide.generated_image_path = result["image_path"]
+                    slide.generated_image_path = image_urls["key"]
                     slide.generated_image_metadata = {
                         "revised_prompt": result["revised_prompt"],
                         "generation_time": time.time() - start_time,
@@ -98,7 +114,7 @@ async def generate_infographic(
                         "quality": result["metadata"]["quality"]
                     }
                     await training_slide_repo.update(slide)
-                    logger.info(f"Updated slide {request.slide_id} with image path: {result['image_path']}")
+                    logger.info(f"Updated slide {request.slide_id} with image path: {image_urls['key']}")
                 else:
                     logger.warning(f"Slide {request.slide_id} not found for updating image path")
             except Exception as e:
@@ -111,7 +127,11 @@ async def generate_infographic(
         
         return ImageGenerationResponse(
             success=True,
-            image_data=result["image_data"],
+            image_url=image_urls.get("image_url"),
+            thumbnail_url=image_urls.get("thumbnail_url"),
+            original_url=image_urls.get("original_url"),
+            # Inline fallback only when the image could not be stored
+            image_data=None if image_urls else base64.b64encode(result["image_bytes"]).decode("ascii"),
             revised_prompt=result["revised_prompt"],
             metadata=result["metadata"],
             generation_time_seconds=generation_time
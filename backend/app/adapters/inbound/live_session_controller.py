@@ -17,6 +17,10 @@ import time
 from app.infrastructure.database import get_database_session
 from app.domain.services.live_conversation_service import LiveConversationService, LiveConversationError
 from app.adapters.outbound.live_api_adapter import LiveAPIAdapter
+from app.infrastructure.live_api_pool import live_api_pool
+from app.infrastructure.voice_activity_detector import live_audio_vad
+from app.infrastructure.live_session_registry import live_session_registry
+from app.infrastructure.metrics import live_websocket_connections, live_websocket_connections_opened
 from app.adapters.repositories.learner_session_repository import LearnerSessionRepository
 from app.adapters.repositories.slide_repository import SlideRepository
 from app.adapters.repositories.training_session_repository import TrainingSessionRepository
@@ -40,6 +44,9 @@ class ConnectionManager:
     async def connect(self, websocket: WebSocket, connection_id: str, learner_session_id: UUID):
         """Accept WebSocket connection and store metadata"""
         await websocket.accept()
+        if connection_id not in self.active_connections:
+            live_websocket_connections.inc()
+            live_websocket_connections_opened.inc()
         self.active_connections[connection_id] = websocket
         self.connection_metadata[connection_id] = {
             "learner_session_id": learner_session_id,
@@ -53,6 +60,7 @@ class ConnectionManager:
         """Remove WebSocket connection and cleanup metadata"""
         if connection_id in self.active_connections:
             del self.active_connections[connection_id]
+            live_websocket_connections.dec()
         if connection_id in self.connection_metadata:
             metadata = self.connection_metadata[connection_id]
             logger.info(f"🔌 LIVE_WS [DISCONNECT] WebSocket disconnected: {connection_id} "
@@ -348,6 +356,11 @@ async def handle_audio_message(
         is_throttled = processing_metadata.get("throttled", False)
         is_mock_mode = processing_metadata.get("mock", False)
         
+        if processing_metadata.get("no_speech"):
+            # Silent chunk trimmed by the VAD - nothing to answer
+            logger.debug(f"🔇 LIVE_WS [NO_SPEECH] Silent audio chunk from {connection_id}, no response sent")
+            return
+        
         if has_audio or has_text or is_throttled:
             # Double-check connection is still active before sending response
             if connection_id not in connection_manager.active_connections:
@@ -481,9 +494,22 @@ async def get_active_connections():
                 "messages_received": metadata["messages_received"]
             })
         
+        # Live sessions across every worker, from the shared registry
+        cluster_sessions = [
+            {
+                "live_session_id": record.session_id,
+                "learner_session_id": str(record.learner_session_id),
+                "node_id": record.node_id,
+                "last_heartbeat_at": record.last_heartbeat_at.isoformat()
+            }
+            for record in await live_session_registry.list_sessions()
+        ]
+        
         return {
+            "node_id": live_session_registry.node_id,
             "total_connections": connection_manager.get_connection_count(),
-            "connections": connections_info
+            "connections": connections_info,
+            "cluster_live_sessions": cluster_sessions
         }
         
     except Exception as e:
@@ -502,15 +528,19 @@ async def get_active_connections():
 async def live_api_health_check():
     """Health check for Live API service"""
     try:
-        # Test Live API adapter availability
-        live_adapter = LiveAPIAdapter()
+        cluster_sessions = await live_session_registry.count_by_node()
         
         return {
             "status": "healthy",
             "service": "live_api",
             "version": "1.0",
+            "node_id": live_session_registry.node_id,
             "active_connections": connection_manager.get_connection_count(),
-            "active_live_sessions": live_adapter.get_session_count()
+            "active_live_sessions": _live_api_adapter_instance.get_session_count() if _live_api_adapter_instance else 0,
+            "cluster_live_sessions": sum(cluster_sessions.values()),
+            "cluster_live_sessions_by_node": cluster_sessions,
+            "connection_pool": live_api_pool.get_stats(),
+            "voice_activity_detection": live_audio_vad.get_stats()
         }
     except Exception as e:
         logger.error(f"❌ LIVE_API [HEALTH] Health check failed: {str(e)}")
@@ -0,0 +1,44 @@
+"""
+FIA v3.0 - Metrics Controller
+Prometheus scrape endpoint
+"""
+
+import asyncio
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.infrastructure.auth import optional_superuser
+from app.infrastructure.metrics import metrics
+from app.infrastructure.models.trainer_model import TrainerModel
+from app.infrastructure.settings import settings
+
+router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(
+    authorization: Optional[str] = Header(default=None),
+    admin: Optional[TrainerModel] = Depends(optional_superuser)
+) -> PlainTextResponse:
+    """
+    Route latency, Gemini calls and tokens, rate limiter waits, DB pool
+    checkouts, TTS bytes and Live connections, in the Prometheus text format
+
+    Aggregates every worker of the host when METRICS_MULTIPROC_DIR is set.
+    Requires `Authorization: Bearer <METRICS_TOKEN>` or an admin JWT, unless
+    METRICS_PUBLIC is set.
+    """
+    token_valid = bool(settings.metrics_token) and hmac.compare_digest(
+        authorization or "", f"Bearer {settings.metrics_token}"
+    )
+    if not (settings.metrics_public or token_valid or admin is not None):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Metrics token or admin authentication required")
+
+    # Reads the other workers' snapshot files: kept off the event loop
+    body = await asyncio.to_thread(metrics.exposition)
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
@@ -19,14 +19,18 @@ from app.schemas.plan_schemas import (
     ValidationErrorDetail
 )
 from app.domain.services.integrated_plan_generation_service import IntegratedPlanGenerationService
+from app.domain.services.document_chunk_service import DocumentChunkService
 from app.adapters.repositories.learner_training_plan_repository import LearnerTrainingPlanRepository
 from app.adapters.repositories.api_log_repository import ApiLogRepository
+from app.adapters.repositories.document_chunk_repository import DocumentChunkRepository
 from app.adapters.repositories.learner_session_repository import LearnerSessionRepository
 from app.domain.services.plan_generation_service_v2 import PlanGenerationError
-from app.adapters.outbound.settings_adapter import SettingsAdapter
 from app.domain.services.document_processor import DocumentProcessingError
 from app.infrastructure.adapters.vertex_ai_adapter import VertexAIError
 from app.infrastructure.database import get_async_session
+from app.infrastructure.settings import settings
+from app.infrastructure.training_retrieval import training_retrieval
+from app.infrastructure.dependencies import get_file_storage_service
 from app.infrastructure.models.training_model import TrainingModel
 
 logger = logging.getLogger(__name__)
@@ -43,11 +47,18 @@ async def get_integrated_plan_generation_service(
     plan_repository = LearnerTrainingPlanRepository(session)
     api_log_repository = ApiLogRepository(session)
     
+    # Texte du document extrait localement une fois par fichier stocké
+    chunk_service = DocumentChunkService(
+        DocumentChunkRepository(session),
+        token_budget=settings.document_text_token_budget
+    )
+    
     # Créer le service intégré avec la session DB
     return IntegratedPlanGenerationService(
         plan_repository=plan_repository,
         api_log_repository=api_log_repository,
-        db_session=session
+        db_session=session,
+        chunk_service=chunk_service
     )
 
 
@@ -99,14 +110,16 @@ async def generate_plan_integrated(
                 detail="No training file associated with this training"
             )
         
-        # Résoudre le chemin complet du fichier de formation
-        from app.domain.services.file_storage_service import FileStorageService
-        settings_adapter = SettingsAdapter()
-        file_storage = FileStorageService(settings_adapter)
-        full_file_path = await file_storage.get_training_file_path(training.file_path)
+        # Résoudre le chemin local du fichier (R2: téléchargé une fois dans le cache disque)
+        file_storage = get_file_storage_service()
+        try:
+            full_file_path = await file_storage.get_training_file_path(training.file_path)
+        except (FileNotFoundError, RuntimeError) as e:
+            logger.warning(f"❌ Training file could not be resolved: {str(e)}")
+            full_file_path = None
         
         # Vérifier que le fichier existe
-        if not full_file_path.exists():
+        if full_file_path is None or not full_file_path.exists():
             logger.warning(f"❌ Training file not found: {full_file_path}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -134,9 +147,13 @@ async def generate_plan_integrated(
             learner_session_id=learner_session_id,
             learner_profile=learner_profile_dict,
             file_path=str(full_file_path),
-            force_regenerate=request.force_regenerate
+            force_regenerate=request.force_regenerate,
+            storage_key=training.file_path
         )
         
+        # Préparer l'index de recherche du document pour les slides et le chat
+        training_retrieval.prefetch(training.file_path)
+        
         # Validation stricte côté backend avec Pydantic
         try:
             # Valider la structure du plan généré
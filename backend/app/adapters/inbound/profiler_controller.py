@@ -0,0 +1,88 @@
+"""
+FIA v3.0 - Profiler Controller
+Admin endpoints to run the on-demand sampling profiler and download its flamegraph stacks
+"""
+
+import logging
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.adapters.inbound.admin_controller import get_current_admin_trainer
+from app.domain.entities.trainer import Trainer
+from app.domain.ports.file_storage import FileStoragePort
+from app.domain.schemas.admin import ProfilerStartRequest
+from app.infrastructure.dependencies import get_file_storage_service
+from app.infrastructure.sampling_profiler import sampling_profiler
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/admin/profiler", tags=["Admin"])
+
+
+@router.post("/start")
+async def start_profiling(
+    request: ProfilerStartRequest,
+    admin_trainer: Trainer = Depends(get_current_admin_trainer),
+    storage_service: FileStoragePort = Depends(get_file_storage_service)
+) -> Dict[str, Any]:
+    """
+    Profile the requests matching a path glob for a limited time (admin only)
+
+    Runs in the worker receiving this call. The profile is stored when the
+    session ends (duration elapsed or POST /stop).
+    """
+    logger.info(f"Admin {admin_trainer.email} started profiling {request.route_pattern}")
+    try:
+        return await sampling_profiler.start_session(
+            storage_service,
+            route_pattern=request.route_pattern,
+            sample_percent=request.sample_percent,
+            duration_seconds=request.duration_seconds,
+            interval_ms=request.interval_ms
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.post("/stop")
+async def stop_profiling(admin_trainer: Trainer = Depends(get_current_admin_trainer)) -> Dict[str, Any]:
+    """End the running session early and store its profile (admin only)"""
+    profile = await sampling_profiler.stop_session()
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No profiling session running")
+    return profile
+
+
+@router.get("/status")
+async def get_profiler_status(admin_trainer: Trainer = Depends(get_current_admin_trainer)) -> Dict[str, Any]:
+    """Running session, last stored profile and overhead/retention limits (admin only)"""
+    return sampling_profiler.status()
+
+
+@router.get("/profiles")
+async def list_profiles(admin_trainer: Trainer = Depends(get_current_admin_trainer)) -> List[Dict[str, Any]]:
+    """Stored profiles, newest first (admin only)"""
+    return await sampling_profiler.list_profiles()
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    admin_trainer: Trainer = Depends(get_current_admin_trainer),
+    storage_service: FileStoragePort = Depends(get_file_storage_service)
+) -> FileResponse:
+    """
+    Download a profile as folded stacks (admin only)
+
+    Render with `flamegraph.pl profile.folded > profile.svg` or open it in speedscope.
+    """
+    try:
+        path = await sampling_profiler.get_profile_path(storage_service, profile_id)
+    except Exception as e:
+        logger.warning(f"⚠️ PROFILER [DOWNLOAD] Could not fetch {profile_id}: {e}")
+        path = None
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=f"{profile_id}.folded")
@@ -11,6 +11,7 @@ import secrets
 from datetime import datetime, timedelta
 
 from app.infrastructure.database import get_database_session
+from app.infrastructure.dependencies import get_file_storage_service
 from app.infrastructure.settings import settings
 
 
@@ -38,11 +39,11 @@ def normalize_frontend_url(frontend_url: str) -> str:
     # Add https:// protocol for production domains
     return f"https://{frontend_url}"
 from app.domain.entities.training import Training, FileType
+from app.domain.ports.file_storage import FileStoragePort
 from app.domain.entities.training_session import TrainingSession
 from app.domain.schemas.training import TrainingResponse
 from app.domain.schemas.training_session import TrainingSessionWithLink
 from app.domain.services.ai_training_generation_service import AITrainingGenerationService
-from app.domain.services.file_storage_service import FileStorageService
 from app.adapters.repositories.training_repository import TrainingRepository
 from app.adapters.repositories.training_session_repository import TrainingSessionRepository
 from app.adapters.repositories.trainer_repository import TrainerRepository
@@ -91,12 +92,6 @@ async def get_ai_training_generation_service(
     return AITrainingGenerationService(ai_adapter, settings_adapter, rate_limiter_adapter)
 
 
-async def get_file_storage_service() -> FileStorageService:
-    """Get file storage service with proper dependency injection"""
-    settings_adapter = SettingsAdapter()
-    return FileStorageService(settings_adapter)
-
-
 # ============================================================================
 # PUBLIC ENDPOINTS
 # ============================================================================
@@ -106,7 +101,7 @@ async def create_quick_start_training(
     request: QuickStartRequest,
     db: AsyncSession = Depends(get_database_session),
     ai_service: AITrainingGenerationService = Depends(get_ai_training_generation_service),
-    file_storage: FileStorageService = Depends(get_file_storage_service)
+    file_storage: FileStoragePort = Depends(get_file_storage_service)
 ):
     """
     Create AI-generated training and session for anonymous users
@@ -56,7 +56,6 @@ from app.domain.schemas.learner_session import (
 from app.adapters.repositories.training_session_repository import TrainingSessionRepository
 from app.adapters.repositories.learner_session_repository import LearnerSessionRepository
 from app.adapters.repositories.training_repository import TrainingRepository
-from app.adapters.repositories.trainer_repository import TrainerRepository
 from app.domain.services.plan_generation_service_v2 import PlanGenerationService
 from app.domain.services.session_notification_service import SessionNotificationService
 from app.domain.services.session_type_detection_service import SessionTypeDetectionService
@@ -618,15 +617,7 @@ async def get_session_type_detection_service(
     db: AsyncSession = Depends(get_database_session)
 ) -> SessionTypeDetectionService:
     """Get session type detection service with proper dependency injection"""
-    training_session_repo = TrainingSessionRepository(db)
-    training_repo = TrainingRepository(db) 
-    trainer_repo = TrainerRepository(db)
-    
-    return SessionTypeDetectionService(
-        training_session_repository=training_session_repo,
-        training_repository=training_repo,
-        trainer_repository=trainer_repo
-    )
+    return SessionTypeDetectionService(training_session_repository=TrainingSessionRepository(db))
 
 
 # ============================================================================
@@ -3,8 +3,10 @@ FIA v3.0 - Slide Controller
 API endpoints for slide generation and management
 """
 
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException, Depends
+import os
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from fastapi.responses import FileResponse
 from typing import Dict, Any
 from pydantic import BaseModel
@@ -12,6 +14,9 @@ from pathlib import Path
 from uuid import UUID
 
 from app.domain.services.slide_generation_service_orchestrator import SlideGenerationServiceOrchestrator
+from app.domain.services.slide_image_service import SlideImageService
+from app.domain.ports.file_storage import FileStoragePort
+from app.infrastructure.dependencies import get_file_storage_service
 from app.infrastructure.rate_limiter import SlidingWindowRateLimiter
 
 logger = logging.getLogger(__name__)
@@ -20,6 +25,9 @@ router = APIRouter(prefix="/api/slides", tags=["slides"])
 # Rate limiter for slide generation (costly AI operations)
 rate_limiter = SlidingWindowRateLimiter(requests_per_minute=30, window_size_seconds=60)
 
+# Versioned slide images never change under the same URL
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 
 class SimplifySlideRequest(BaseModel):
     """Request model for slide content simplification"""
@@ -426,13 +434,61 @@ async def slide_service_health() -> Dict[str, Any]:
         }
 
 
+@router.get("/image/{learner_session_id}/{slide_id}/{filename}")
+async def get_versioned_slide_image(
+    learner_session_id: UUID,
+    slide_id: UUID,
+    filename: str,
+    request: Request,
+    file_storage: FileStoragePort = Depends(get_file_storage_service)
+) -> Response:
+    """
+    Serve a stored slide image variant
+    
+    File names carry a content hash ("<version>.webp", "<version>_thumb.webp",
+    "<version>.png"), so responses are immutable and cached for a year.
+    
+    Args:
+        learner_session_id: ID of the learner session
+        slide_id: ID of the slide
+        filename: Versioned variant file name
+        
+    Returns:
+        FileResponse with the image, or 304 when the client already has it
+    """
+    content_type = SlideImageService.content_type_for(filename)
+    if content_type is None:
+        raise HTTPException(status_code=404, detail="Image not found for this slide")
+    
+    etag = f'"{Path(filename).stem}"'
+    cache_headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=cache_headers)
+    
+    key = SlideImageService.asset_key(learner_session_id, slide_id, filename)
+    try:
+        image_path = await file_storage.get_asset_path(key)
+        stat_result = await asyncio.to_thread(os.stat, image_path)
+    except (FileNotFoundError, RuntimeError):
+        logger.warning(f"❌ SLIDE API [IMAGE_NOT_FOUND] Image not found: {key}")
+        raise HTTPException(status_code=404, detail="Image not found for this slide")
+    
+    return FileResponse(
+        path=str(image_path),
+        media_type=content_type,
+        stat_result=stat_result,
+        headers=cache_headers
+    )
+
+
 @router.get("/image/{learner_session_id}/{slide_id}")
 async def get_slide_image(
     learner_session_id: UUID,
-    slide_id: UUID
+    slide_id: UUID,
+    file_storage: FileStoragePort = Depends(get_file_storage_service)
 ) -> FileResponse:
     """
-    Serve generated slide image file
+    Serve generated slide image file (legacy unversioned URL)
     
     Args:
         learner_session_id: ID of the learner session
@@ -441,35 +497,20 @@ async def get_slide_image(
     Returns:
         FileResponse with the PNG image
     """
+    key = f"images/slide_images/{learner_session_id}/slide_{slide_id}_image.png"
     try:
-        logger.info(f"🎯 SLIDE API [IMAGE] Serving image for session {learner_session_id}, slide {slide_id}")
-        
-        # Construct expected image path
-        image_path = Path(f"uploads/images/slide_images/{learner_session_id}/slide_{slide_id}_image.png")
-        
-        # Check if file exists
-        if not image_path.exists():
-            logger.warning(f"❌ SLIDE API [IMAGE_NOT_FOUND] Image not found: {image_path}")
-            raise HTTPException(
-                status_code=404,
-                detail="Image not found for this slide"
-            )
-        
-        logger.info(f"✅ SLIDE API [IMAGE] Serving image: {image_path}")
-        
-        return FileResponse(
-            path=str(image_path),
-            media_type="image/png",
-            filename=f"slide_{slide_id}_image.png"
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-        
-    except Exception as e:
-        logger.error(f"❌ SLIDE API [IMAGE_ERROR] Failed to serve image: {str(e)}")
+        image_path = await file_storage.get_asset_path(key)
+        stat_result = await asyncio.to_thread(os.stat, image_path)
+    except (FileNotFoundError, RuntimeError):
+        logger.warning(f"❌ SLIDE API [IMAGE_NOT_FOUND] Image not found: {key}")
         raise HTTPException(
-            status_code=500,
-            detail="Failed to serve slide image"
-        )
\ No newline at end of file
+            status_code=404,
+            detail="Image not found for this slide"
+        )
+    
+    return FileResponse(
+        path=str(image_path),
+        media_type="image/png",
+        filename=f"slide_{slide_id}_image.png",
+        stat_result=stat_result
+    )
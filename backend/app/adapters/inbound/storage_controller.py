@@ -8,8 +8,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from typing import Dict, Any
 
 from app.infrastructure.dependencies import get_file_storage_service, get_storage_info
+from app.infrastructure.storage_manifest import storage_manifest
+from app.domain.entities.trainer import Trainer
 from app.domain.ports.file_storage import FileStoragePort
 from app.adapters.outbound.cloudflare_r2_storage_adapter import CloudflareR2StorageAdapter
+from app.adapters.outbound.manifest_file_storage import unwrap_storage
+from app.adapters.inbound.admin_controller import get_current_admin_trainer
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,7 @@ async def get_storage_status(
     - Storage type (local/R2)
     - Configuration
     - Health status
+    - Usage (files and bytes per kind, from the storage manifest)
     - Warnings for Railway deployment
     """
     
@@ -36,9 +41,16 @@ async def get_storage_status(
         
         # Perform health check if R2
         health_status = {}
-        if isinstance(storage_service, CloudflareR2StorageAdapter):
+        if isinstance(unwrap_storage(storage_service), CloudflareR2StorageAdapter):
             health_status = await storage_service.health_check()
         
+        # Usage comes from the manifest, never from a storage scan
+        try:
+            usage = await storage_manifest.get_stats()
+        except Exception as e:
+            logger.warning(f"⚠️ Storage manifest unavailable: {e}")
+            usage = {}
+        
         # Railway deployment warnings
         warnings = []
         if storage_info["type"] == "local_filesystem":
@@ -51,6 +63,7 @@ async def get_storage_status(
         return {
             "storage_configuration": storage_info,
             "health_check": health_status,
+            "usage": usage,
             "warnings": warnings,
             "recommendation": (
                 "✅ Using persistent R2 storage" 
@@ -76,7 +89,7 @@ async def storage_health_check(
     """
     
     try:
-        if isinstance(storage_service, CloudflareR2StorageAdapter):
+        if isinstance(unwrap_storage(storage_service), CloudflareR2StorageAdapter):
             return await storage_service.health_check()
         else:
             # Local storage always "healthy" but not persistent
@@ -94,6 +107,35 @@ async def storage_health_check(
         }
 
 
+@router.post("/reconcile", summary="Reconcile the storage manifest")
+async def reconcile_storage_manifest(
+    admin_trainer: Trainer = Depends(get_current_admin_trainer),
+    storage_service: FileStoragePort = Depends(get_file_storage_service)
+) -> Dict[str, Any]:
+    """
+    Align the storage manifest with a full listing of the storage (admin only)
+    """
+    result = await storage_manifest.reconcile(storage_service)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A reconciliation is already running"
+        )
+    return result
+
+
+@router.post("/cleanup-orphans", summary="Delete orphaned training files")
+async def cleanup_orphaned_files(
+    admin_trainer: Trainer = Depends(get_current_admin_trainer),
+    storage_service: FileStoragePort = Depends(get_file_storage_service)
+) -> Dict[str, Any]:
+    """
+    Delete training files no training references any more (admin only)
+    """
+    cleaned = await storage_manifest.cleanup_orphans(storage_service)
+    return {"deleted_files": cleaned}
+
+
 @router.get("/migration-guide", summary="Get R2 migration guide")
 async def get_migration_guide() -> Dict[str, Any]:
     """
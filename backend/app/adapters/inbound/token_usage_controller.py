@@ -16,6 +16,7 @@ from app.domain.schemas.token_usage import (
 )
 from app.domain.services.token_usage_service import TokenUsageService
 from app.adapters.outbound.logger_adapter import LoggerAdapter
+from app.adapters.repositories.api_log_repository import ApiLogRepository
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -36,7 +37,7 @@ async def get_token_usage_service(
     Creates TokenUsageService with proper dependency injection following
     hexagonal architecture principles.
     """
-    logger_adapter = LoggerAdapter()
+    logger_adapter = LoggerAdapter(ApiLogRepository(db))
     return TokenUsageService(logger_adapter)
 
 
@@ -3,28 +3,43 @@ FIA v3.0 - Training Controller
 FastAPI routes for training management
 """
 
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, status
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from typing import List, Optional
+import asyncio
+import hashlib
 import io
 import logging
+import os
 from pathlib import Path
 from datetime import datetime
 
 from app.infrastructure.database import get_database_session
+from app.infrastructure.models.storage_manifest_model import StorageManifestModel
 from app.infrastructure.auth import get_current_trainer
+from app.infrastructure.dependencies import get_file_storage_service
+from app.infrastructure.settings import settings
+from app.infrastructure.training_retrieval import training_retrieval, index_key
 from app.domain.entities.trainer import Trainer
 from app.domain.entities.training import Training, FileType
 from app.domain.schemas.training import TrainingUpload, TrainingResponse, TrainingListResponse
-from app.domain.services.file_storage_service import FileStorageService
+from app.domain.ports.file_storage import FileStoragePort
+from app.domain.services.deduplicated_file_storage_service import DeduplicatedFileStorageService
 from app.domain.services.ai_training_generation_service import AITrainingGenerationService, AITrainingGenerationError
 from app.adapters.repositories.training_repository import TrainingRepository
+from app.adapters.repositories.file_blob_repository import FileBlobRepository
+from app.adapters.repositories.document_chunk_repository import DocumentChunkRepository
 from app.adapters.outbound.settings_adapter import SettingsAdapter
+from app.adapters.outbound.cloudflare_r2_storage_adapter import CloudflareR2StorageAdapter
+from app.adapters.outbound.manifest_file_storage import unwrap_storage
 from app.adapters.outbound.ai_adapter import AIAdapter
 from app.adapters.outbound.rate_limiter_adapter import RateLimiterAdapter
-from app.utils.file_validation import validate_training_file, get_file_type_from_extension, FileValidationError
+from app.utils.file_validation import (
+    validate_training_file, get_file_type_from_extension, FileValidationError, ValidatedUploadStream
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -91,12 +106,14 @@ async def create_training(
         rate_limiter_adapter = RateLimiterAdapter()
         logger.info("✅ TRAINING [SERVICES] RateLimiterAdapter created")
         
-        file_storage = FileStorageService(settings_adapter)
-        logger.info("✅ TRAINING [SERVICES] FileStorageService created")
+        file_storage = get_file_storage_service()
+        logger.info(f"✅ TRAINING [SERVICES] {type(file_storage).__name__} created")
         
         training_repo = TrainingRepository(db)
         logger.info("✅ TRAINING [SERVICES] TrainingRepository created")
         
+        deduplicated_storage = DeduplicatedFileStorageService(file_storage, FileBlobRepository(db))
+        
         ai_generation_service = AITrainingGenerationService(ai_adapter, settings_adapter, rate_limiter_adapter)
         logger.info("✅ TRAINING [SERVICES] All services initialized successfully")
         
@@ -110,18 +127,24 @@ async def create_training(
         
         try:
             if not is_ai_generated:
-                # Handle file upload for traditional trainings
-                file_content = io.BytesIO(await file.read())
+                # Validate and hash the spooled upload chunk by chunk (magic bytes,
+                # size limit) without reading it in memory
+                validated_upload = ValidatedUploadStream(file.file, file_extension)
+                sha256 = await asyncio.to_thread(validated_upload.drain)
+                file.file.seek(0)
                 
-                # Store file using the training ID
-                file_path, file_size = await file_storage.store_training_file(
+                # Reference the existing copy of this content, or store it once
+                file_path, file_size, reused = await deduplicated_storage.store_training_file(
                     trainer_id=current_trainer.id,
                     training_id=temp_training.id,
-                    file_content=file_content,
+                    sha256=sha256,
+                    file_content=file.file,
                     original_filename=file.filename,
                     mime_type=mime_type
                 )
                 
+                logger.info(f"💾 TRAINING [UPLOAD] {'Reused' if reused else 'Stored'} {file_size} bytes - sha256 {sha256}")
+                
                 # Update training with file information
                 temp_training.file_path = file_path
                 temp_training.file_name = file.filename
@@ -211,13 +234,16 @@ Le service de génération automatique de contenu de formation n'est pas disponi
             
         except Exception as storage_error:
             
-            # Try to clean up any partially stored file
+            # Try to clean up any partially stored file (or drop the blob reference)
             try:
                 if 'file_path' in locals():
-                    await file_storage.delete_training_file(file_path)
+                    await deduplicated_storage.release_training_file(temp_training.id, file_path)
             except:
                 pass  # Ignore cleanup errors
             
+            if isinstance(storage_error, FileValidationError):
+                raise
+            
             logger.error(f"File storage error during training creation: {str(storage_error)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -324,9 +350,12 @@ async def delete_training(
     try:
         # Delete file first
         if training.file_path:
-            settings_adapter = SettingsAdapter()
-            file_storage = FileStorageService(settings_adapter)
-            await file_storage.delete_training_file(training.file_path)
+            deduplicated_storage = DeduplicatedFileStorageService(get_file_storage_service(), FileBlobRepository(db))
+            if await deduplicated_storage.release_training_file(training.id, training.file_path):
+                # The extracted text and its retrieval index go with the last reference to the file
+                await DocumentChunkRepository(db).delete_chunks(training.file_path)
+                await deduplicated_storage.file_storage.delete_asset(index_key(training.file_path))
+                training_retrieval.invalidate(training.file_path)
         
         # Delete from database
         await training_repo.delete(training_id)
@@ -343,9 +372,33 @@ async def delete_training(
         )
 
 
+async def _download_etag(db: AsyncSession, file_storage: FileStoragePort, file_path: str, stat_result: os.stat_result) -> str:
+    """
+    ETag of a stored training file, stable across downloads
+    
+    The R2 read-through cache refreshes a file's mtime on every access, so
+    the content hash recorded in the storage manifest (or the R2 object's
+    own ETag) is used; mtime-size only for local files the manifest lacks.
+    """
+    sha256 = (await db.execute(
+        select(StorageManifestModel.sha256).where(StorageManifestModel.storage_key == file_path)
+    )).scalar_one_or_none()
+    if sha256:
+        return f'"{sha256}"'
+    
+    storage_adapter = unwrap_storage(file_storage)
+    if isinstance(storage_adapter, CloudflareR2StorageAdapter) and not storage_adapter.is_legacy_path(file_path):
+        object_etag = (await storage_adapter.get_file_info_async(file_path)).get("etag")
+        if object_etag:
+            return f'"{object_etag}"'
+    
+    return f'"{hashlib.md5(f"{stat_result.st_mtime}-{stat_result.st_size}".encode(), usedforsecurity=False).hexdigest()}"'
+
+
 @router.get("/{training_id}/download")
 async def download_training_file(
     training_id: UUID,
+    request: Request,
     current_trainer: Trainer = Depends(get_current_trainer),
     db: AsyncSession = Depends(get_database_session)
 ):
@@ -354,6 +407,10 @@ async def download_training_file(
     
     Returns the original training file with appropriate headers for download.
     Only the trainer who uploaded the file can download it.
+    
+    - R2 (redirect mode): 302 to a short-lived presigned URL
+    - Local storage / R2 proxy mode: file response with Range (206) and
+      ETag / If-None-Match (304) support
     """
     
     training_repo = TrainingRepository(db)
@@ -380,9 +437,8 @@ async def download_training_file(
             detail="Training file not found"
         )
     
-    # Get file storage service and check if file exists
-    settings_adapter = SettingsAdapter()
-    file_storage = FileStorageService(settings_adapter)
+    # Get the configured file storage and check if file exists
+    file_storage = get_file_storage_service()
     file_exists = await file_storage.file_exists(training.file_path)
     
     if not file_exists:
@@ -391,27 +447,46 @@ async def download_training_file(
             detail="Training file not found on server"
         )
     
+    # Determine content type
+    content_type = training.mime_type or "application/octet-stream"
+    
+    # Create appropriate filename for download
+    download_filename = training.file_name or f"training_{training_id}{Path(training.file_path).suffix}"
+    
     try:
-        # Get full file path
-        full_file_path = await file_storage.get_training_file_path(training.file_path)
+        storage_adapter = unwrap_storage(file_storage)
+        if (
+            isinstance(storage_adapter, CloudflareR2StorageAdapter)
+            and settings.r2_download_mode == "redirect"
+            and not storage_adapter.is_legacy_path(training.file_path)
+        ):
+            # The browser downloads straight from R2, no bytes go through this worker
+            url = file_storage.generate_presigned_download_url(
+                training.file_path,
+                download_filename,
+                content_type,
+                expires_in=settings.r2_presigned_url_ttl_seconds
+            )
+            return RedirectResponse(url, status_code=status.HTTP_302_FOUND, headers={"Cache-Control": "no-store"})
         
-        # Determine content type
-        content_type = training.mime_type or "application/octet-stream"
+        # Get full file path (R2 proxy mode: local read-through cache)
+        full_file_path = await file_storage.get_training_file_path(training.file_path)
         
-        # Create appropriate filename for download
-        download_filename = training.file_name or f"training_{training_id}{Path(training.file_path).suffix}"
+        # Validator of the stored content, so conditional requests can be answered without a body
+        stat_result = await asyncio.to_thread(os.stat, full_file_path)
+        etag = await _download_etag(db, file_storage, training.file_path, stat_result)
+        if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
         
-        # Return file using FileResponse for better performance
+        # FileResponse streams from disk with sendfile-sized chunks and answers Range requests (206)
         return FileResponse(
             path=str(full_file_path),
             filename=download_filename,
             media_type=content_type,
+            stat_result=stat_result,
             headers={
-                "Content-Disposition": f"attachment; filename=\"{download_filename}\"",
-                "Content-Type": content_type,
-                "Cache-Control": "no-cache, no-store, must-revalidate",
-                "Pragma": "no-cache",
-                "Expires": "0"
+                "Cache-Control": "private, no-cache",
+                "ETag": etag
             }
         )
         
@@ -7,6 +7,7 @@ from uuid import UUID
 
 from app.domain.ports.ai_adapter_port import AIAdapterPort, AIError, RateLimitExceededException
 from app.infrastructure.adapters.vertex_ai_adapter import VertexAIAdapter, VertexAIError
+from app.infrastructure.gemini_call_logger import ServiceType
 
 
 class AIAdapter(AIAdapterPort):
@@ -22,7 +23,8 @@ class AIAdapter(AIAdapterPort):
         context_cache_id: Optional[str] = None,
         temperature: float = 0.7,
         session_id: Optional[str] = None,
-        learner_session_id: Optional[str] = None
+        learner_session_id: Optional[str] = None,
+        service_type: Optional[str] = None
     ) -> str:
         """Generate content using AI model"""
         try:
@@ -37,7 +39,8 @@ class AIAdapter(AIAdapterPort):
                 prompt=prompt,
                 generation_config=generation_config,
                 session_id=session_id,
-                learner_session_id=learner_session_id
+                learner_session_id=learner_session_id,
+                service_type=ServiceType(service_type) if service_type else None
             )
         except VertexAIError as e:
             raise AIError(str(e)) from e
@@ -3,212 +3,610 @@ FIA v3.0 - Cloudflare R2 Storage Adapter
 S3-compatible storage adapter for persistent file storage on Railway
 """
 
+import asyncio
 import boto3
+import functools
 import logging
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import BinaryIO, Tuple
+from typing import AsyncIterator, BinaryIO, Dict, List, Optional, Tuple
+from urllib.parse import quote
 from uuid import UUID
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 
 from app.domain.ports.file_storage import FileStoragePort
 from app.domain.ports.settings_port import SettingsPort
+from app.domain.services.file_storage_service import FileStorageService
+from app.infrastructure.file_cache import LocalFileCache, etag_matches, training_file_cache
 
 logger = logging.getLogger(__name__)
 
+# Multipart part size for uploads (R2 requires at least 5 MiB except for the last part)
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+# Objects larger than this are downloaded with parallel ranged GETs
+RANGED_DOWNLOAD_THRESHOLD = 16 * 1024 * 1024
+RANGE_SIZE = 8 * 1024 * 1024
+
+DEFAULT_MAX_CONCURRENCY = 16
+
+# Every training object key starts with this prefix; paths without it were
+# stored on local disk before STORAGE_TYPE=r2 ("{trainer_id}/{filename}")
+TRAINING_KEY_PREFIX = "trainings/"
+
+# boto3 clients and the worker pool are shared by every adapter instance of the
+# process: adapters are created per request, clients and connections are not
+_clients: Dict[Tuple[str, str], "boto3.client"] = {}
+_clients_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Dedicated bounded pool for blocking boto3 calls"""
+    global _executor
+    with _clients_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="r2-io")
+        return _executor
+
+
+def _get_client(endpoint_url: str, access_key: str, secret_key: str, max_pool_connections: int):
+    """Return the shared S3 client for these credentials, creating it once"""
+    key = (endpoint_url, access_key)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = boto3.client(
+                's3',
+                endpoint_url=endpoint_url,
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+                region_name='auto',  # R2 uses 'auto' region
+                config=Config(
+                    max_pool_connections=max_pool_connections,  # one connection per worker thread
+                    retries={'max_attempts': 3, 'mode': 'standard'},
+                    connect_timeout=5,
+                    read_timeout=60,
+                    tcp_keepalive=True
+                )
+            )
+            _clients[key] = client
+        return client
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    """Read up to `size` bytes, looping over short reads until EOF"""
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
 
 class CloudflareR2StorageAdapter(FileStoragePort):
-    """Cloudflare R2 storage implementation using S3-compatible API"""
-    
-    def __init__(self, settings_port: SettingsPort):
+    """
+    Cloudflare R2 storage implementation using S3-compatible API
+
+    boto3 is synchronous, so every network call is offloaded to a dedicated,
+    bounded thread pool sized like the client's HTTP connection pool. The
+    event loop only awaits futures and never blocks on a transfer.
+    """
+
+    def __init__(self, settings_port: SettingsPort, file_cache: Optional[LocalFileCache] = None):
         self.settings = settings_port
-        
+        self.file_cache = file_cache or training_file_cache
+
         # R2 configuration
         self.bucket_name = self.settings.get_r2_bucket_name()
         self.endpoint_url = self.settings.get_r2_endpoint_url()
         self.access_key = self.settings.get_r2_access_key()
         self.secret_key = self.settings.get_r2_secret_key()
-        
+        self.max_concurrency = int(self.settings.get_setting("r2_max_concurrency", DEFAULT_MAX_CONCURRENCY))
+
+        self._executor = _get_executor(self.max_concurrency)
+        self._legacy_storage: Optional[FileStorageService] = None
+
         # Initialize S3 client for R2
         try:
-            self.s3_client = boto3.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key,
-                region_name='auto'  # R2 uses 'auto' region
+            self.s3_client = _get_client(
+                self.endpoint_url,
+                self.access_key,
+                self.secret_key,
+                max_pool_connections=self.max_concurrency
             )
-            logger.info("✅ R2 storage client initialized successfully")
+            logger.debug("✅ R2 storage client ready")
         except NoCredentialsError:
             logger.error("❌ R2 credentials not found - using fallback local storage")
             self.s3_client = None
         except Exception as e:
             logger.error(f"❌ Failed to initialize R2 client: {e}")
             self.s3_client = None
-    
-    def _generate_object_key(self, trainer_id: UUID, training_id: UUID, original_filename: str) -> str:
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking boto3 call in the R2 worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    @staticmethod
+    def is_legacy_path(file_path: str) -> bool:
+        """Training file stored on local disk before the switch to R2"""
+        return not file_path.startswith(TRAINING_KEY_PREFIX)
+
+    @property
+    def legacy_storage(self) -> FileStorageService:
+        """Local storage still serving legacy training files"""
+        if self._legacy_storage is None:
+            self._legacy_storage = FileStorageService(self.settings)
+        return self._legacy_storage
+
+    def _generate_object_key(
+        self, trainer_id: UUID, training_id: UUID, original_filename: str, content_key: Optional[str] = None
+    ) -> str:
         """Generate S3 object key with organized structure"""
         file_extension = Path(original_filename).suffix.lower()
+        if content_key:
+            # Content-addressed: trainings/blobs/{sha256}.{extension}
+            return f"{TRAINING_KEY_PREFIX}blobs/{content_key}{file_extension}"
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{training_id}_{timestamp}{file_extension}"
-        
+
         # Object key: trainings/{trainer_id}/{filename}
-        return f"trainings/{trainer_id}/{filename}"
-    
+        return f"{TRAINING_KEY_PREFIX}{trainer_id}/{filename}"
+
     async def store_training_file(
         self,
         trainer_id: UUID,
         training_id: UUID,
         file_content: BinaryIO,
         original_filename: str,
-        mime_type: str
+        mime_type: str,
+        content_key: Optional[str] = None
     ) -> Tuple[str, int]:
         """Store training file in Cloudflare R2"""
-        
+
         if not self.s3_client:
             raise RuntimeError("R2 storage not available - check configuration")
-        
+
         # Generate object key
-        object_key = self._generate_object_key(trainer_id, training_id, original_filename)
-        
-        # Read content and get size
-        file_content.seek(0)
-        content = file_content.read()
-        file_size = len(content)
-        
+        object_key = self._generate_object_key(trainer_id, training_id, original_filename, content_key)
+
+        metadata = {
+            'trainer_id': str(trainer_id),
+            'training_id': str(training_id),
+            'original_filename': original_filename,
+            'upload_timestamp': datetime.now().isoformat()
+        }
+
+        # Only one part is ever held in memory
+        first_part = await self._run(_read_exact, file_content, MULTIPART_PART_SIZE)
+
         try:
-            # Upload to R2
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=object_key,
-                Body=content,
-                ContentType=mime_type,
-                Metadata={
-                    'trainer_id': str(trainer_id),
-                    'training_id': str(training_id),
-                    'original_filename': original_filename,
-                    'upload_timestamp': datetime.now().isoformat()
-                }
-            )
-            
+            if len(first_part) < MULTIPART_PART_SIZE:
+                # Small file: single request
+                await self._run(
+                    self.s3_client.put_object,
+                    Bucket=self.bucket_name,
+                    Key=object_key,
+                    Body=first_part,
+                    ContentType=mime_type,
+                    Metadata=metadata
+                )
+                file_size = len(first_part)
+            else:
+                file_size = await self._multipart_upload(object_key, first_part, file_content, mime_type, metadata)
+
             logger.info(f"✅ File uploaded to R2: {object_key} ({file_size} bytes)")
             return object_key, file_size
-            
+
         except ClientError as e:
             logger.error(f"❌ R2 upload failed: {e}")
             raise RuntimeError(f"Failed to upload file to R2: {e}")
-    
-    async def get_training_file_path(self, file_path: str) -> str:
-        """Return R2 object key (file_path is the object key)"""
-        return file_path
-    
+
+    async def _multipart_upload(
+        self,
+        object_key: str,
+        first_part: bytes,
+        file_content: BinaryIO,
+        mime_type: str,
+        metadata: dict
+    ) -> int:
+        """Upload a stream in fixed-size parts, aborting the upload on any error"""
+        upload = await self._run(
+            self.s3_client.create_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=object_key,
+            ContentType=mime_type,
+            Metadata=metadata
+        )
+        upload_id = upload['UploadId']
+        parts = []
+        file_size = 0
+
+        try:
+            part = first_part
+            while part:
+                # Read the next part while the current one is being sent
+                next_part = asyncio.ensure_future(self._run(_read_exact, file_content, MULTIPART_PART_SIZE))
+                try:
+                    response = await self._run(
+                        self.s3_client.upload_part,
+                        Bucket=self.bucket_name,
+                        Key=object_key,
+                        UploadId=upload_id,
+                        PartNumber=len(parts) + 1,
+                        Body=part
+                    )
+                except BaseException:
+                    next_part.cancel()
+                    await asyncio.gather(next_part, return_exceptions=True)
+                    raise
+                parts.append({'ETag': response['ETag'], 'PartNumber': len(parts) + 1})
+                file_size += len(part)
+                part = await next_part
+
+            await self._run(
+                self.s3_client.complete_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=object_key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+            return file_size
+
+        except BaseException:
+            await self._run(
+                self.s3_client.abort_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=object_key,
+                UploadId=upload_id
+            )
+            raise
+
+    async def get_training_file_path(self, file_path: str) -> Path:
+        """
+        Return a local path to the object, served from the read-through cache
+
+        The first call downloads the object (once, however many concurrent
+        callers) and verifies it against its ETag; later calls are local.
+        Legacy training files are read from local disk.
+        """
+        if self.is_legacy_path(file_path):
+            return await self.legacy_storage.get_training_file_path(file_path)
+        return await self._cached_object_path(file_path)
+
+    async def _cached_object_path(self, key: str) -> Path:
+        """Local copy of any bucket object, filled through the read-through cache"""
+        if not self.s3_client:
+            raise RuntimeError("R2 storage not available")
+
+        etag = ''
+
+        async def fetch(destination: Path) -> None:
+            nonlocal etag
+            info = await self._head_object_info(key)
+            if not info:
+                raise FileNotFoundError(key)
+            etag = info.get('etag', '')
+            await self.download_to_file(key, destination, size=info['size'])
+
+        try:
+            return await self.file_cache.get_path(
+                key,
+                fetch,
+                verify=lambda path: etag_matches(path, etag, MULTIPART_PART_SIZE)
+            )
+        except ClientError as e:
+            logger.error(f"❌ R2 cache fill failed: {e}")
+            raise RuntimeError(f"Failed to download file from R2: {e}")
+
+    @asynccontextmanager
+    async def open_training_file_mmap(self, file_path: str) -> AsyncIterator[mmap.mmap]:
+        """Read-only memory map of a cached object, pinned in the cache while open"""
+        path = await self.get_training_file_path(file_path)
+        with self.file_cache.open_mmap(path) as mapped:
+            yield mapped
+
     async def delete_training_file(self, file_path: str) -> bool:
         """Delete training file from R2"""
-        
+
+        if self.is_legacy_path(file_path):
+            return await self.legacy_storage.delete_training_file(file_path)
+        return await self._delete_object(file_path)
+
+    async def _delete_object(self, key: str) -> bool:
+        """Delete any bucket object and its cached copy"""
         if not self.s3_client:
             logger.error("❌ R2 storage not available for deletion")
             return False
-        
+
         try:
-            self.s3_client.delete_object(
+            await self._run(
+                self.s3_client.delete_object,
                 Bucket=self.bucket_name,
-                Key=file_path
+                Key=key
             )
-            logger.info(f"✅ File deleted from R2: {file_path}")
+            await asyncio.to_thread(self.file_cache.discard, key)
+            logger.info(f"✅ File deleted from R2: {key}")
             return True
-            
+
         except ClientError as e:
             logger.error(f"❌ R2 deletion failed: {e}")
             return False
-    
+
     async def file_exists(self, file_path: str) -> bool:
         """Check if file exists in R2"""
-        
+
+        if self.is_legacy_path(file_path):
+            return await self.legacy_storage.file_exists(file_path)
+
         if not self.s3_client:
             return False
-        
+
         try:
-            self.s3_client.head_object(
+            await self._run(
+                self.s3_client.head_object,
                 Bucket=self.bucket_name,
                 Key=file_path
             )
             return True
-            
+
         except ClientError as e:
             if e.response['Error']['Code'] == '404':
                 return False
             logger.error(f"❌ R2 head_object failed: {e}")
             return False
-    
+
     def get_file_info(self, file_path: str) -> dict:
-        """Get file information from R2"""
-        
+        """Get file information from R2 (blocking, prefer get_file_info_async)"""
+
+        if self.is_legacy_path(file_path):
+            return self.legacy_storage.get_file_info(file_path)
+
         if not self.s3_client:
             return {}
-        
+
         try:
             response = self.s3_client.head_object(
                 Bucket=self.bucket_name,
                 Key=file_path
             )
-            
-            return {
-                'size': response.get('ContentLength', 0),
-                'modified': response.get('LastModified'),
-                'content_type': response.get('ContentType'),
-                'metadata': response.get('Metadata', {}),
-                'exists': True
-            }
-            
+            return self._file_info_from_head(response)
+
         except ClientError as e:
             logger.error(f"❌ R2 get_file_info failed: {e}")
             return {}
-    
-    async def get_file_download_content(self, file_path: str) -> bytes:
-        """Download file content from R2"""
-        
+
+    async def get_file_info_async(self, file_path: str) -> dict:
+        """Get file information from R2 without blocking the event loop"""
+
+        if self.is_legacy_path(file_path):
+            return await asyncio.to_thread(self.legacy_storage.get_file_info, file_path)
+        return await self._head_object_info(file_path)
+
+    async def _head_object_info(self, key: str) -> dict:
+        """Size, ETag and metadata of any bucket object ({} if unavailable)"""
         if not self.s3_client:
-            raise RuntimeError("R2 storage not available")
-        
+            return {}
+
         try:
-            response = self.s3_client.get_object(
+            response = await self._run(
+                self.s3_client.head_object,
                 Bucket=self.bucket_name,
-                Key=file_path
+                Key=key
             )
-            
-            content = response['Body'].read()
+            return self._file_info_from_head(response)
+
+        except ClientError as e:
+            logger.error(f"❌ R2 get_file_info failed: {e}")
+            return {}
+
+    @staticmethod
+    def _file_info_from_head(response: dict) -> dict:
+        return {
+            'size': response.get('ContentLength', 0),
+            'modified': response.get('LastModified'),
+            'content_type': response.get('ContentType'),
+            'etag': response.get('ETag', '').strip('"'),
+            'metadata': response.get('Metadata', {}),
+            'exists': True
+        }
+
+    def _get_object_bytes(self, file_path: str, byte_range: Optional[str] = None) -> bytes:
+        """Blocking GET of a whole object or a byte range (runs in the pool)"""
+        kwargs = {'Bucket': self.bucket_name, 'Key': file_path}
+        if byte_range:
+            kwargs['Range'] = byte_range
+        response = self.s3_client.get_object(**kwargs)
+        return response['Body'].read()
+
+    async def get_file_range(self, file_path: str, start: int, end: int) -> bytes:
+        """Download bytes [start, end] (inclusive) of an object"""
+
+        if not self.s3_client:
+            raise RuntimeError("R2 storage not available")
+
+        try:
+            return await self._run(self._get_object_bytes, file_path, f"bytes={start}-{end}")
+        except ClientError as e:
+            logger.error(f"❌ R2 ranged download failed: {e}")
+            raise RuntimeError(f"Failed to download file range from R2: {e}")
+
+    async def get_file_download_content(self, file_path: str) -> bytes:
+        """Download file content from R2 (parallel ranged GETs for large objects)"""
+
+        if not self.s3_client:
+            raise RuntimeError("R2 storage not available")
+
+        try:
+            info = await self._head_object_info(file_path)
+            size = info.get('size', 0)
+
+            if size > RANGED_DOWNLOAD_THRESHOLD:
+                ranges = [(start, min(start + RANGE_SIZE, size) - 1) for start in range(0, size, RANGE_SIZE)]
+                parts = await asyncio.gather(*(
+                    self._run(self._get_object_bytes, file_path, f"bytes={start}-{end}")
+                    for start, end in ranges
+                ))
+                content = b"".join(parts)
+            else:
+                content = await self._run(self._get_object_bytes, file_path)
+
             logger.info(f"✅ File downloaded from R2: {file_path} ({len(content)} bytes)")
             return content
-            
+
         except ClientError as e:
             logger.error(f"❌ R2 download failed: {e}")
             raise RuntimeError(f"Failed to download file from R2: {e}")
-    
+
+    async def download_to_file(self, file_path: str, destination: Path, size: Optional[int] = None) -> int:
+        """
+        Download an object straight to disk with parallel ranged GETs
+
+        Each range is written at its offset as soon as it arrives, so at most
+        one range per worker is held in memory.
+
+        Returns:
+            Number of bytes written
+        """
+
+        if not self.s3_client:
+            raise RuntimeError("R2 storage not available")
+
+        if size is None:
+            info = await self._head_object_info(file_path)
+            if not info:
+                raise RuntimeError(f"R2 object not found: {file_path}")
+            size = info['size']
+
+        fd = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            def fetch_and_write(start: int, end: int) -> None:
+                data = self._get_object_bytes(file_path, f"bytes={start}-{end}")
+                os.pwrite(fd, data, start)
+
+            await asyncio.gather(*(
+                self._run(fetch_and_write, start, min(start + RANGE_SIZE, size) - 1)
+                for start in range(0, size, RANGE_SIZE)
+            ))
+        except ClientError as e:
+            logger.error(f"❌ R2 download failed: {e}")
+            raise RuntimeError(f"Failed to download file from R2: {e}")
+        finally:
+            os.close(fd)
+
+        return size
+
+    async def store_asset(self, key: str, content: bytes, content_type: str) -> int:
+        """Store an immutable asset in R2"""
+        if not self.s3_client:
+            raise RuntimeError("R2 storage not available - check configuration")
+
+        try:
+            await self._run(
+                self.s3_client.put_object,
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=content,
+                ContentType=content_type,
+                CacheControl="public, max-age=31536000, immutable"
+            )
+        except ClientError as e:
+            logger.error(f"❌ R2 asset upload failed: {e}")
+            raise RuntimeError(f"Failed to upload asset to R2: {e}")
+        return len(content)
+
+    async def get_asset_path(self, key: str) -> Path:
+        """Local copy of an asset, served from the read-through cache"""
+        return await self._cached_object_path(key)
+
+    async def delete_asset(self, key: str) -> bool:
+        """Delete an asset from R2"""
+        return await self._delete_object(key)
+
+    async def list_stored_files(self) -> List[Tuple[str, int, str]]:
+        """List every object of the bucket (reconciliation only)"""
+        if not self.s3_client:
+            raise RuntimeError("R2 storage not available")
+
+        def scan() -> List[Tuple[str, int, str]]:
+            files = []
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=self.bucket_name):
+                for obj in page.get('Contents', []):
+                    kind = "training" if obj['Key'].startswith("trainings/") else "asset"
+                    files.append((obj['Key'], obj['Size'], kind))
+            return files
+
+        return await self._run(scan)
+
+    def generate_presigned_download_url(
+        self,
+        file_path: str,
+        download_filename: str,
+        content_type: str,
+        expires_in: int = 300
+    ) -> str:
+        """
+        Short-lived signed GET URL so clients download straight from R2
+
+        Signing is a local HMAC computation, no request is sent to R2.
+        The response headers are forced so the browser saves the file under
+        its original name.
+        """
+        if not self.s3_client:
+            raise RuntimeError("R2 storage not available")
+
+        ascii_name = download_filename.encode("ascii", "ignore").decode().replace('"', "") or "download"
+        disposition = f'attachment; filename="{ascii_name}"; filename*=UTF-8\'\'{quote(download_filename)}'
+
+        return self.s3_client.generate_presigned_url(
+            'get_object',
+            Params={
+                'Bucket': self.bucket_name,
+                'Key': file_path,
+                'ResponseContentDisposition': disposition,
+                'ResponseContentType': content_type
+            },
+            ExpiresIn=expires_in
+        )
+
     def is_available(self) -> bool:
         """Check if R2 storage is properly configured and available"""
         return self.s3_client is not None
-    
+
     async def health_check(self) -> dict:
         """Health check for R2 storage"""
-        
+
         if not self.s3_client:
             return {
                 'status': 'unavailable',
                 'message': 'R2 client not initialized'
             }
-        
+
         try:
             # Try to list bucket (basic connectivity test)
-            self.s3_client.head_bucket(Bucket=self.bucket_name)
-            
+            await self._run(self.s3_client.head_bucket, Bucket=self.bucket_name)
+
             return {
                 'status': 'healthy',
                 'bucket': self.bucket_name,
-                'endpoint': self.endpoint_url
+                'endpoint': self.endpoint_url,
+                'max_concurrency': self.max_concurrency,
+                'file_cache': self.file_cache.get_stats()
             }
-            
+
         except ClientError as e:
             return {
                 'status': 'error',
                 'message': f"R2 connectivity failed: {e}"
-            }
\ No newline at end of file
+            }
@@ -13,6 +13,7 @@ from app.infrastructure.adapters.vertex_ai_adapter import VertexAIAdapter
 from app.infrastructure.rate_limiter import gemini_rate_limiter
 from app.infrastructure.gemini_call_logger import gemini_call_logger, ServiceType
 from app.infrastructure.settings import settings
+from app.infrastructure.training_retrieval import training_retrieval
 from app.domain.services.learner_profile_enrichment_service import LearnerProfileEnrichmentService
 from app.adapters.repositories.learner_session_repository import LearnerSessionRepository
 from app.domain.services.conversation_prompt_builder import ConversationPromptBuilder
@@ -216,13 +217,17 @@ class ConversationAdapter(ConversationServicePort):
             # Apply rate limiting before API call
             await gemini_rate_limiter.acquire()
             
+            # Passages of the training document matching the question (within the latency budget)
+            source_passages = await training_retrieval.passages_for_learner_session(learner_session_id, message)
+            
             prompt = self.prompt_builder.build_message_response_prompt(
                 message=message,
                 conversation_history=conversation_history,
                 slide_content=training_context,  # Pour l'instant, utiliser training_context comme contenu
                 slide_title="Formation en cours",  # Titre par défaut
                 slide_type="content",  # Type par défaut
-                learner_profile=learner_profile
+                learner_profile=learner_profile,
+                source_passages=source_passages
             )
             
             response_result = await self._generate_ai_response(
@@ -5,12 +5,16 @@ Implementation of Live API conversation service using Vertex AI Live API
 
 import logging
 import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from uuid import UUID
 import json
 
 from app.domain.ports.outbound_ports import LiveConversationServicePort
 from app.infrastructure.live_api_client import LiveAPIClient, AudioData, LiveResponse, LiveAPIError
+from app.infrastructure.live_api_pool import live_api_pool
+from app.infrastructure.voice_activity_detector import live_audio_vad, is_pcm_mime_type
+from app.infrastructure.settings import settings
+from app.infrastructure.live_session_registry import LiveSessionRegistry, live_session_registry
 from app.infrastructure.rate_limiter import gemini_rate_limiter
 from app.infrastructure.gemini_call_logger import gemini_call_logger, ServiceType
 
@@ -20,13 +24,18 @@ logger = logging.getLogger(__name__)
 class LiveAPIAdapter(LiveConversationServicePort):
     """Outbound adapter for Live API conversation service using Vertex AI Live API"""
     
-    def __init__(self):
+    def __init__(self, registry: Optional[LiveSessionRegistry] = None):
         """Initialize Live API adapter"""
+        # Local state for the sessions served by this worker
         self.active_sessions: Dict[str, LiveAPIClient] = {}
         self.session_contexts: Dict[str, Dict[str, Any]] = {}
         self.session_throttle: Dict[str, float] = {}  # Track last response time per session
         self.response_cooldown = 2.0  # Minimum seconds between responses
         
+        # Cluster-wide ownership of sessions (shared across workers)
+        self.registry = registry or live_session_registry
+        self.registry.set_eviction_callback(self._evict_session)
+        
         logger.info("🎙️ LIVE_API [ADAPTER] Initialized")
     
     async def create_live_session(
@@ -55,12 +64,21 @@ class LiveAPIAdapter(LiveConversationServicePort):
         Returns:
             str: Live session ID
         """
+        session_id = None
         try:
             # Apply rate limiting
             await gemini_rate_limiter.acquire()
             
-            # Generate unique session ID
-            session_id = str(uuid.uuid4())
+            # Resume the learner's session if a worker (possibly this one or a dead one)
+            # still holds it, otherwise generate a new session ID
+            existing = await self.registry.find_by_learner(learner_session_id)
+            if existing and await self.registry.claim(existing.session_id):
+                session_id = existing.session_id
+                logger.info(f"🔁 LIVE_API [CREATE_SESSION] Resuming session {session_id} previously owned by {existing.node_id}")
+                if session_id in self.active_sessions:
+                    await live_api_pool.release(self.active_sessions.pop(session_id))
+            else:
+                session_id = str(uuid.uuid4())
             
             logger.info(f"🚀 LIVE_API [CREATE_SESSION] Creating Live session: {session_id}")
             
@@ -85,28 +103,39 @@ class LiveAPIAdapter(LiveConversationServicePort):
                 }
             }
             
-            # MOCK MODE: Skip real Vertex AI connection for development testing
-            logger.info("🎭 LIVE_API [MOCK] Using mock mode for development (no real Vertex AI connection)")
-            
-            # Simulate successful connection
-            connection_success = True
+            if live_api_pool.enabled:
+                # Warm connection from the pool (cold connect if none is ready)
+                client = await live_api_pool.acquire(session_config)
+                connection_success = client.is_connected_status()
+                logger.info(f"🔗 LIVE_API [CREATE_SESSION] Upstream session {client.session_id} bound to {session_id}")
+            else:
+                # MOCK MODE: Skip real Vertex AI connection for development testing
+                logger.info("🎭 LIVE_API [MOCK] Using mock mode for development (no real Vertex AI connection)")
+                client = None
+                connection_success = True
             
             if connection_success:
-                # Store mock session (no real client)
-                self.active_sessions[session_id] = None  # Mock client 
+                # Mock sessions have no client
+                self.active_sessions[session_id] = client
                 self.session_contexts[session_id] = {
                     "slide_context": slide_context,
                     "learner_profile": learner_profile,
                     "learner_session_id": learner_session_id,
                     "created_at": session_id,  # Mock session ID
                     "session_config": session_config,
-                    "is_mock": True
+                    "is_mock": client is None
                 }
+                await self.registry.register(
+                    session_id,
+                    learner_session_id,
+                    json.loads(json.dumps(self.session_contexts[session_id], default=str))
+                )
                 
                 logger.info(f"✅ LIVE_API [CREATE_SESSION] Session created successfully: {session_id}")
                 return session_id
             else:
                 logger.error(f"❌ LIVE_API [CREATE_SESSION] Failed to connect to Live API")
+                await live_api_pool.release(client)
                 raise LiveAPIError("Failed to establish Live API connection")
                 
         except Exception as e:
@@ -138,6 +167,28 @@ class LiveAPIAdapter(LiveConversationServicePort):
             - is_complete: bool - Whether response is complete
         """
         try:
+            # Trim leading/trailing silence before anything is sent upstream
+            vad_metadata = {}
+            if settings.live_vad_enabled and is_pcm_mime_type(mime_type):
+                vad_result = live_audio_vad.process(audio_input, session_id=session_id)
+                vad_metadata = {
+                    "vad_input_bytes": vad_result.input_bytes,
+                    "vad_output_bytes": vad_result.output_bytes,
+                    "vad_segments": len(vad_result.segments)
+                }
+                if not vad_result.has_speech:
+                    # Silence only: no upstream call and no cooldown consumed
+                    logger.debug(f"🔇 LIVE_API [VAD] No speech in {len(audio_input)} bytes for session {session_id}")
+                    return {
+                        "audio_response": b"",
+                        "text_transcript": "",
+                        "metadata": {"no_speech": True, **vad_metadata},
+                        "is_complete": True,
+                        "error": None
+                    }
+                logger.info(f"🎚️ LIVE_API [VAD] Session {session_id}: {vad_result.input_bytes} -> {vad_result.output_bytes} bytes ({len(vad_result.segments)} segments)")
+                audio_input = vad_result.audio
+            
             # 🔍 NOUVEAU: Logger centralisé - INPUT pour Live API
             call_id = gemini_call_logger.log_input(
                 service_name="live_api_adapter",
@@ -177,7 +228,7 @@ class LiveAPIAdapter(LiveConversationServicePort):
                     "error": None
                 }
             
-            logger.info(f"🎙️ LIVE_API [CONVERSATION] Processing audio input for session: {session_id} (MOCK MODE)")
+            logger.info(f"🎙️ LIVE_API [CONVERSATION] Processing audio input for session: {session_id}")
             
             # MOCK: Simulate audio processing without real Vertex AI
             if session_context.get("is_mock"):
@@ -205,35 +256,43 @@ class LiveAPIAdapter(LiveConversationServicePort):
                         "text_only": True,  # Flag to indicate text-only mode
                         "audio_input_size": len(audio_input),
                         "mime_type": mime_type,
-                        "session_id": session_id
+                        "session_id": session_id,
+                        **vad_metadata
                     },
                     "is_complete": True,
                     "error": None
-            }
+                }
+            else:
+                self.session_throttle[session_id] = current_time
+                response_data = await self._exchange_audio(
+                    self.active_sessions[session_id], audio_input, mime_type, session_id, vad_metadata
+                )
             
             # 🔍 NOUVEAU: Logger centralisé - OUTPUT pour Live API
             # Live API utilise l'audio, estimation des tokens pour le texte généré
-            estimated_output_tokens = len(mock_text) // 4 if mock_text else 0
+            text_response = response_data["text_transcript"]
+            estimated_output_tokens = len(text_response) // 4 if text_response else 0
+            is_mock = response_data["metadata"].get("mock", False)
             
             gemini_call_logger.log_output(
                 call_id=call_id,
                 service_name="live_api_adapter",
                 response={
-                    "text_response": mock_text,
+                    "text_response": text_response,
                     "audio_size": len(response_data["audio_response"]),
                     "metadata": response_data["metadata"]
                 },
                 session_id=session_id,
                 additional_metadata={
-                    "mock": True,
-                    "text_only": True,
+                    "mock": is_mock,
+                    "text_only": is_mock,
                     "estimated_tokens": True
                 },
                 input_tokens=0,  # Audio input, pas de tokens texte
                 output_tokens=estimated_output_tokens
             )
                 
-            logger.info(f"✅ LIVE_API [CONVERSATION] Mock response generated for session: {session_id}")
+            logger.info(f"✅ LIVE_API [CONVERSATION] {'Mock response' if is_mock else 'Response'} generated for session: {session_id}")
             return response_data
             
         except LiveAPIError:
@@ -243,6 +302,43 @@ class LiveAPIAdapter(LiveConversationServicePort):
             logger.error(f"❌ LIVE_API [CONVERSATION] Unexpected error: {str(e)}")
             raise LiveAPIError(f"Conversation handling failed: {str(e)}")
     
+    async def _exchange_audio(
+        self,
+        client: LiveAPIClient,
+        audio_input: bytes,
+        mime_type: str,
+        session_id: str,
+        vad_metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Send one audio turn upstream and collect the streamed model turn"""
+        await client.send_audio(AudioData(data=audio_input, mime_type=mime_type))
+        
+        text_parts: List[str] = []
+        audio_parts: List[bytes] = []
+        error = None
+        async for response in client.receive_response():
+            if response.error:
+                error = response.error
+                break
+            if response.text:
+                text_parts.append(response.text)
+            if response.audio_data:
+                audio_parts.append(response.audio_data)
+        
+        return {
+            "audio_response": b"".join(audio_parts),
+            "text_transcript": "".join(text_parts),
+            "metadata": {
+                "audio_input_size": len(audio_input),
+                "mime_type": mime_type,
+                "session_id": session_id,
+                "upstream_session_id": client.session_id,
+                **vad_metadata
+            },
+            "is_complete": True,
+            "error": error
+        }
+    
     async def close_live_session(self, session_id: str) -> bool:
         """
         Close Live API session and cleanup resources
@@ -256,6 +352,12 @@ class LiveAPIAdapter(LiveConversationServicePort):
         try:
             logger.info(f"🔌 LIVE_API [CLOSE_SESSION] Closing session: {session_id}")
             
+            if session_id not in self.active_sessions:
+                # Served by another worker: drop it from the registry, the owner is notified
+                await self.registry.release(session_id, force=True)
+                logger.info(f"✅ LIVE_API [CLOSE_SESSION] Remote session released: {session_id}")
+                return True
+            
             success = await self._cleanup_session(session_id)
             
             if success:
@@ -332,14 +434,33 @@ IMPORTANT: Tu es en conversation vocale Live. Parle naturellement comme si tu é
         else:
             return "Kore"  # Default fallback
     
+    async def find_live_session(self, learner_session_id: UUID) -> Optional[str]:
+        """Find the Live session ID of a learner on any worker"""
+        record = await self.registry.find_by_learner(learner_session_id)
+        return record.session_id if record else None
+    
+    async def _evict_session(self, session_id: str) -> None:
+        """Drop local state for a session taken over or closed by another worker"""
+        if session_id not in self.active_sessions and session_id not in self.session_contexts:
+            return
+        logger.info(f"📤 LIVE_API [EVICT] Session {session_id} moved to another worker, dropping local state")
+        await live_api_pool.release(self.active_sessions.pop(session_id, None))
+        self.session_contexts.pop(session_id, None)
+        self.session_throttle.pop(session_id, None)
+        live_audio_vad.forget(session_id)
+    
     async def _cleanup_session(self, session_id: str) -> bool:
         """Clean up session resources"""
         try:
             success = True
             
-            # Clean up mock session
+            # Remove from the cluster registry (only if still owned by this worker)
+            await self.registry.release(session_id)
+            
+            # Release the upstream connection (mock sessions have no client)
             if session_id in self.active_sessions:
-                del self.active_sessions[session_id]
+                client = self.active_sessions.pop(session_id)
+                await live_api_pool.release(client)
             
             # Remove session context
             if session_id in self.session_contexts:
@@ -348,6 +469,7 @@ IMPORTANT: Tu es en conversation vocale Live. Parle naturellement comme si tu é
             # Clean up throttle data
             if session_id in self.session_throttle:
                 del self.session_throttle[session_id]
+            live_audio_vad.forget(session_id)
             
             logger.info(f"🧹 LIVE_API [CLEANUP] Session cleaned up: {session_id}")
             return success
@@ -368,9 +490,13 @@ IMPORTANT: Tu es en conversation vocale Live. Parle naturellement comme si tu é
         }
     
     def get_session_count(self) -> int:
-        """Get count of active sessions"""
+        """Get count of active sessions on this worker"""
         return len(self.active_sessions)
     
+    async def get_cluster_session_counts(self) -> Dict[str, int]:
+        """Get count of active sessions per worker across the cluster"""
+        return await self.registry.count_by_node()
+    
     async def cleanup_all_sessions(self) -> int:
         """Clean up all active sessions (useful for shutdown)"""
         logger.info("🧹 LIVE_API [CLEANUP_ALL] Cleaning up all active sessions...")
@@ -1,36 +1,32 @@
 """
 FIA v3.0 - Logger Adapter
-Outbound adapter for accessing application logs and extracting token usage statistics
+Outbound adapter reading token usage statistics from the api_logs table
 """
 
 import logging
-import re
-import json
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timezone, timedelta
-from collections import defaultdict
+from datetime import datetime, timezone
+from uuid import UUID
 
 from app.domain.ports.outbound_ports import LoggerAdapterPort
-from app.infrastructure.gemini_call_logger import ServiceType
+from app.domain.ports.repositories import ApiLogRepositoryPort
 
 logger = logging.getLogger(__name__)
 
 
 class LoggerAdapter(LoggerAdapterPort):
     """
-    Adapter for accessing application logs and parsing token usage data
-    
-    Note: This is a KISS implementation that parses logs in memory.
-    For production with high volume, consider a dedicated logging database.
+    Adapter serving token usage from api_logs
+
+    Every Gemini call made through the Vertex AI gateway is persisted in
+    api_logs with the usage metadata of its response; statistics are
+    aggregated in SQL over the (learner_session_id, created_at) index.
     """
-    
-    def __init__(self):
+
+    def __init__(self, api_log_repository: ApiLogRepositoryPort):
         """Initialize the logger adapter"""
-        # Access to the application's logging system
-        self.app_logger = logging.getLogger("app")
-        self.gemini_logger = logging.getLogger("app.infrastructure.gemini_call_logger") 
-        logger.info("🔍 LOGGER_ADAPTER [INIT] Initialized with access to application logs")
-    
+        self.api_log_repository = api_log_repository
+
     async def get_token_usage_by_session(
         self,
         learner_session_id: str,
@@ -39,48 +35,50 @@ class LoggerAdapter(LoggerAdapterPort):
     ) -> Dict[str, Any]:
         """
         Get token usage statistics for a specific learner session
-        
-        This is a simplified implementation that would parse recent logs.
-        In production, this would query a proper logging database or metrics system.
         """
         try:
             logger.info(f"🔍 LOGGER_ADAPTER [GET_USAGE] Processing session: {learner_session_id}")
-            
-            # For now, return mock data structure that demonstrates the interface
-            # In a real implementation, this would parse actual log files or query a log database
-            
-            # Simulate parsing logs to extract token data
-            session_data = self._simulate_log_parsing(learner_session_id)
-            
+
+            session_uuid = self._parse_session_id(learner_session_id)
+            rows = []
+            if session_uuid is not None:
+                rows = await self.api_log_repository.get_usage_by_service_type(
+                    session_uuid, self._parse_time(start_time), self._parse_time(end_time)
+                )
+
+            first_call = min((row["first_call_at"] for row in rows), default=None)
+            last_call = max((row["last_call_at"] for row in rows), default=None)
             result = {
                 "learner_session_id": learner_session_id,
-                "total_tokens": session_data["total_tokens"],
-                "input_tokens": session_data["input_tokens"],
-                "output_tokens": session_data["output_tokens"],
-                "call_count": session_data["call_count"],
-                "session_duration": session_data.get("session_duration"),
-                "by_service_type": session_data["by_service_type"],
-                "data_source": "application_logs",
+                "total_tokens": sum(row["total_tokens"] for row in rows),
+                "input_tokens": sum(row["input_tokens"] for row in rows),
+                "output_tokens": sum(row["output_tokens"] for row in rows),
+                "cached_tokens": sum(row["cached_tokens"] for row in rows),
+                "call_count": sum(row["calls"] for row in rows),
+                "session_duration": (last_call - first_call).total_seconds() if first_call and last_call else None,
+                "by_service_type": self._breakdown(rows),
+                "data_source": "api_logs",
                 "parsed_at": datetime.now(timezone.utc).isoformat()
             }
-            
-            logger.info(f"✅ LOGGER_ADAPTER [GET_USAGE] Parsed {result['call_count']} calls, {result['total_tokens']} total tokens")
+
+            logger.info(f"✅ LOGGER_ADAPTER [GET_USAGE] {result['call_count']} calls, {result['total_tokens']} total tokens")
             return result
-            
+
         except Exception as e:
-            logger.error(f"❌ LOGGER_ADAPTER [GET_USAGE] Failed to parse logs for session {learner_session_id}: {str(e)}")
+            logger.error(f"❌ LOGGER_ADAPTER [GET_USAGE] Failed for session {learner_session_id}: {str(e)}")
             # Return empty structure on error
             return {
                 "learner_session_id": learner_session_id,
                 "total_tokens": 0,
                 "input_tokens": 0,
                 "output_tokens": 0,
+                "cached_tokens": 0,
                 "call_count": 0,
                 "session_duration": None,
                 "by_service_type": {},
                 "error": str(e)
             }
-    
+
     async def get_service_type_breakdown(
         self,
         learner_session_id: str
@@ -89,19 +87,18 @@ class LoggerAdapter(LoggerAdapterPort):
         Get detailed breakdown of token usage by service type
         """
         try:
-            logger.info(f"🔍 LOGGER_ADAPTER [BREAKDOWN] Analyzing service types for session: {learner_session_id}")
-            
-            # Simulate parsing logs and categorizing by service type
-            session_data = self._simulate_log_parsing(learner_session_id)
-            breakdown = session_data["by_service_type"]
-            
+            session_uuid = self._parse_session_id(learner_session_id)
+            if session_uuid is None:
+                return {}
+            breakdown = self._breakdown(await self.api_log_repository.get_usage_by_service_type(session_uuid))
+
             logger.info(f"✅ LOGGER_ADAPTER [BREAKDOWN] Found {len(breakdown)} service types")
             return breakdown
-            
+
         except Exception as e:
             logger.error(f"❌ LOGGER_ADAPTER [BREAKDOWN] Failed: {str(e)}")
             return {}
-    
+
     async def get_recent_calls(
         self,
         learner_session_id: str,
@@ -111,193 +108,54 @@ class LoggerAdapter(LoggerAdapterPort):
         Get recent AI calls for a session
         """
         try:
-            logger.info(f"🔍 LOGGER_ADAPTER [RECENT_CALLS] Fetching last {limit} calls for session: {learner_session_id}")
-            
-            # Simulate extracting recent call data from logs
-            recent_calls = self._simulate_recent_calls(learner_session_id, limit)
-            
-            logger.info(f"✅ LOGGER_ADAPTER [RECENT_CALLS] Retrieved {len(recent_calls)} recent calls")
-            return recent_calls
-            
+            session_uuid = self._parse_session_id(learner_session_id)
+            if session_uuid is None:
+                return []
+            api_logs = await self.api_log_repository.get_recent_calls(session_uuid, limit)
+
+            return [
+                {
+                    "call_id": str(api_log.id),
+                    "service_name": api_log.service_name,
+                    "service_type": api_log.service_type or "unknown",
+                    "model": api_log.model,
+                    "timestamp": api_log.created_at.isoformat() if api_log.created_at else None,
+                    "input_tokens": api_log.prompt_tokens or 0,
+                    "output_tokens": api_log.candidates_tokens or 0,
+                    "cached_tokens": api_log.cached_tokens or 0,
+                    "processing_time": (api_log.response_time_ms or 0) / 1000,
+                    "learner_session_id": learner_session_id
+                }
+                for api_log in api_logs
+            ]
+
         except Exception as e:
             logger.error(f"❌ LOGGER_ADAPTER [RECENT_CALLS] Failed: {str(e)}")
             return []
-    
-    def _simulate_log_parsing(self, learner_session_id: str) -> Dict[str, Any]:
-        """
-        Simulate parsing application logs to extract token usage data
-        
-        In a real implementation, this would:
-        1. Query log files or logging database
-        2. Parse log entries matching the learner_session_id
-        3. Extract token information from GEMINI_CALL_LOGGER entries
-        4. Aggregate by service type
-        
-        For demonstration, we return realistic mock data.
-        """
-        
-        # Mock data representing what would be parsed from real logs
-        # This demonstrates the expected data structure
-        mock_data = {
-            "call_count": 8,
-            "total_tokens": 1250,
-            "input_tokens": 480,
-            "output_tokens": 770,
-            "session_duration": 1800.5,  # 30 minutes
-            "by_service_type": {
-                "plan_generation": {
-                    "input_tokens": 120,
-                    "output_tokens": 350,
-                    "calls": 1,
-                    "service_names": ["vertex_ai_adapter"]
-                },
-                "conversation": {
-                    "input_tokens": 280,
-                    "output_tokens": 320,
-                    "calls": 5,
-                    "service_names": ["conversation_chat", "conversation_hint"]
-                },
-                "slide_generation": {
-                    "input_tokens": 60,
-                    "output_tokens": 80,
-                    "calls": 1,
-                    "service_names": ["vertex_ai_adapter"]
-                },
-                "image_generation": {
-                    "input_tokens": 20,
-                    "output_tokens": 0,
-                    "calls": 1,
-                    "service_names": ["openai_dalle"]
-                },
-                "tts_generation": {
-                    "input_tokens": 0,  # TTS doesn't consume text tokens for input
-                    "output_tokens": 20,
-                    "calls": 0,
-                    "service_names": ["tts_adapter"]
-                }
+
+    def _breakdown(self, rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Service type -> usage, from the grouped api_logs rows"""
+        return {
+            row["service_type"]: {
+                "input_tokens": row["input_tokens"],
+                "output_tokens": row["output_tokens"],
+                "cached_tokens": row["cached_tokens"],
+                "calls": row["calls"],
+                "service_names": sorted(name for name in row["service_names"] if name)
             }
+            for row in rows
         }
-        
-        # Add session-specific variance for realism
-        session_hash = hash(learner_session_id) % 1000
-        variance_factor = 0.8 + (session_hash / 1000) * 0.4  # 0.8 to 1.2
-        
-        # Apply variance to make data session-specific
-        mock_data["call_count"] = int(mock_data["call_count"] * variance_factor)
-        mock_data["total_tokens"] = int(mock_data["total_tokens"] * variance_factor)
-        mock_data["input_tokens"] = int(mock_data["input_tokens"] * variance_factor)
-        mock_data["output_tokens"] = int(mock_data["output_tokens"] * variance_factor)
-        
-        return mock_data
-    
-    def _simulate_recent_calls(self, learner_session_id: str, limit: int) -> List[Dict[str, Any]]:
-        """
-        Simulate extracting recent call information from logs
-        """
-        base_time = datetime.now(timezone.utc)
-        calls = []
-        
-        # Generate mock recent calls with realistic data
-        call_templates = [
-            {
-                "service_name": "conversation_chat",
-                "service_type": "conversation",
-                "input_tokens": 45,
-                "output_tokens": 78,
-                "processing_time": 1.8
-            },
-            {
-                "service_name": "vertex_ai_adapter",
-                "service_type": "plan_generation", 
-                "input_tokens": 120,
-                "output_tokens": 350,
-                "processing_time": 3.2
-            },
-            {
-                "service_name": "conversation_hint",
-                "service_type": "conversation",
-                "input_tokens": 25,
-                "output_tokens": 42,
-                "processing_time": 1.1
-            },
-            {
-                "service_name": "openai_dalle",
-                "service_type": "image_generation",
-                "input_tokens": 18,
-                "output_tokens": 0,
-                "processing_time": 4.5
-            }
-        ]
-        
-        for i in range(min(limit, len(call_templates) * 2)):
-            template = call_templates[i % len(call_templates)]
-            call_time = base_time - timedelta(minutes=i * 3)
-            
-            call_data = {
-                "call_id": f"call_{i+1}_{int(call_time.timestamp())}",
-                "service_name": template["service_name"],
-                "service_type": template["service_type"],
-                "timestamp": call_time.isoformat(),
-                "input_tokens": template["input_tokens"] + (i % 10),  # Add some variance
-                "output_tokens": template["output_tokens"] + (i % 15),
-                "processing_time": template["processing_time"] + (i * 0.1),
-                "learner_session_id": learner_session_id
-            }
-            calls.append(call_data)
-        
-        return calls[:limit]
-    
-    def _parse_log_entry_for_tokens(self, log_entry: str) -> Optional[Dict[str, Any]]:
-        """
-        Parse a single log entry to extract token information
-        
-        This would parse actual log entries from GeminiCallLogger like:
-        "🪙 TOKENS - Input: 150 | Output: 300 | Total: 450"
-        """
+
+    def _parse_session_id(self, learner_session_id: str) -> Optional[UUID]:
+        """Learner session UUID, None if the id cannot match any logged call"""
         try:
-            # Pattern to match token information in logs
-            token_pattern = r"🪙 TOKENS - Input: (\d+|\w+) \| Output: (\d+|\w+) \| Total: (\d+|\w+)"
-            service_pattern = r"🏷️ Service Type: (\w+)"
-            session_pattern = r"Learner: ([a-f0-9-]+)"
-            
-            match = re.search(token_pattern, log_entry)
-            service_match = re.search(service_pattern, log_entry)
-            session_match = re.search(session_pattern, log_entry)
-            
-            if match and service_match and session_match:
-                input_tokens = int(match.group(1)) if match.group(1).isdigit() else 0
-                output_tokens = int(match.group(2)) if match.group(2).isdigit() else 0
-                total_tokens = int(match.group(3)) if match.group(3).isdigit() else 0
-                
-                return {
-                    "input_tokens": input_tokens,
-                    "output_tokens": output_tokens,
-                    "total_tokens": total_tokens,
-                    "service_type": service_match.group(1),
-                    "learner_session_id": session_match.group(1)
-                }
-        except Exception as e:
-            logger.debug(f"Failed to parse log entry: {e}")
-        
-        return None
-    
-    async def _get_log_entries_for_session(
-        self, 
-        learner_session_id: str,
-        start_time: Optional[str] = None,
-        end_time: Optional[str] = None
-    ) -> List[str]:
-        """
-        Retrieve log entries for a specific session
-        
-        In a real implementation, this would:
-        1. Query log files or logging database
-        2. Filter by learner_session_id
-        3. Apply time range filters
-        4. Return matching log entries
-        
-        For now, returns empty list as this is infrastructure-dependent.
-        """
-        # This would be implemented based on your logging infrastructure
-        # Could read from log files, query a logging service, etc.
-        return []
\ No newline at end of file
+            return UUID(str(learner_session_id))
+        except ValueError:
+            return None
+
+    def _parse_time(self, value: Optional[str]) -> Optional[datetime]:
+        """ISO timestamp filter (a trailing Z is accepted); ValueError if malformed"""
+        if not value:
+            return None
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
@@ -0,0 +1,104 @@
+"""
+FIA v3.0 - Manifest File Storage
+Storage decorator keeping the storage manifest up to date on every write, delete and read
+"""
+
+import hashlib
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
+from uuid import UUID
+
+from app.domain.ports.file_storage import FileStoragePort
+
+
+class _HashingReader:
+    """Read-through wrapper hashing a stream while the storage consumes it"""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._hash = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        self._hash.update(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class ManifestFileStorage(FileStoragePort):
+    """
+    Record every stored file in the storage manifest
+
+    Wraps the configured storage adapter; adapter-specific methods (health
+    checks, presigned URLs...) are forwarded unchanged. Use unwrap_storage()
+    for isinstance checks against a concrete adapter.
+    """
+
+    def __init__(self, inner: FileStoragePort, manifest):
+        self.inner = inner
+        self.manifest = manifest
+
+    async def store_training_file(
+        self,
+        trainer_id: UUID,
+        training_id: UUID,
+        file_content: BinaryIO,
+        original_filename: str,
+        mime_type: str,
+        content_key: Optional[str] = None
+    ) -> Tuple[str, int]:
+        reader = _HashingReader(file_content)
+        file_path, file_size = await self.inner.store_training_file(
+            trainer_id=trainer_id,
+            training_id=training_id,
+            file_content=reader,
+            original_filename=original_filename,
+            mime_type=mime_type,
+            content_key=content_key
+        )
+        await self.manifest.record_store(file_path, "training", file_size, trainer_id, reader.hexdigest())
+        return file_path, file_size
+
+    async def get_training_file_path(self, file_path: str) -> Path:
+        self.manifest.touch(file_path)
+        return await self.inner.get_training_file_path(file_path)
+
+    async def delete_training_file(self, file_path: str) -> bool:
+        deleted = await self.inner.delete_training_file(file_path)
+        await self.manifest.record_delete(file_path)
+        return deleted
+
+    async def file_exists(self, file_path: str) -> bool:
+        return await self.inner.file_exists(file_path)
+
+    async def store_asset(self, key: str, content: bytes, content_type: str) -> int:
+        size = await self.inner.store_asset(key, content, content_type)
+        await self.manifest.record_store(key, "asset", size, sha256=hashlib.sha256(content).hexdigest())
+        return size
+
+    async def get_asset_path(self, key: str) -> Path:
+        self.manifest.touch(key)
+        return await self.inner.get_asset_path(key)
+
+    async def delete_asset(self, key: str) -> bool:
+        deleted = await self.inner.delete_asset(key)
+        await self.manifest.record_delete(key)
+        return deleted
+
+    async def list_stored_files(self) -> List[Tuple[str, int, str]]:
+        return await self.inner.list_stored_files()
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+def unwrap_storage(file_storage: FileStoragePort) -> FileStoragePort:
+    """Concrete storage adapter behind a ManifestFileStorage"""
+    while isinstance(file_storage, ManifestFileStorage):
+        file_storage = file_storage.inner
+    return file_storage
@@ -7,7 +7,6 @@ import base64
 import logging
 import time
 import os
-import aiofiles
 from pathlib import Path
 from typing import Optional, Dict, Any
 from uuid import UUID
@@ -28,9 +27,6 @@ class OpenAIAdapter(ImageGenerationServicePort):
     
     def __init__(self):
         self.client = OpenAI(api_key=settings.openai_api_key)
-        # Initialize image storage path - make it absolute to avoid relative path issues
-        self.image_storage_path = Path("uploads/images/slide_images").resolve()
-        self.image_storage_path.mkdir(parents=True, exist_ok=True)
         
     async def generate_infographic(
         self,
@@ -86,25 +82,11 @@ class OpenAIAdapter(ImageGenerationServicePort):
             
             # Extract image data
             image_data = response.data[0]
-            image_base64 = image_data.b64_json
-            
-            # Save image to file if learner_session_id is provided
-            image_path = None
-            if learner_session_id:
-                try:
-                    image_path = await self._save_image_to_file(
-                        image_base64,
-                        learner_session_id,
-                        slide_id
-                    )
-                    logger.info(f"Image saved to: {image_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to save image to file: {str(e)}")
-                    # Continue without saving - not critical for the response
+            # Decoded once here; persisting and serving is up to the caller (SlideImageService)
+            image_bytes = base64.b64decode(image_data.b64_json)
             
             result = {
-                "image_data": image_base64,  # Still return base64 for immediate display
-                "image_path": image_path,  # File path for permanent storage
+                "image_bytes": image_bytes,
                 "revised_prompt": image_data.revised_prompt or prompt,
                 "metadata": {
                     "size": "1024x1024",
@@ -128,9 +110,8 @@ class OpenAIAdapter(ImageGenerationServicePort):
                 service_name="openai_dalle",
                 response={
                     "image_generated": True,
-                    "image_size_bytes": len(image_base64) if image_base64 else 0,
+                    "image_size_bytes": len(image_bytes),
                     "revised_prompt": image_data.revised_prompt or prompt,
-                    "image_path": image_path,
                     "metadata": result["metadata"]
                 },
                 learner_session_id=str(learner_session_id) if learner_session_id else None,
@@ -138,7 +119,6 @@ class OpenAIAdapter(ImageGenerationServicePort):
                 additional_metadata={
                     "slide_title": slide_title,
                     "slide_id": str(slide_id) if slide_id else None,
-                    "image_saved": image_path is not None,
                     "estimated_tokens": True
                 },
                 input_tokens=estimated_input_tokens,
@@ -227,58 +207,6 @@ Create thios simple infographic strictly following these instructions.
         
         return base_prompt
     
-    async def _save_image_to_file(
-        self,
-        image_base64: str,
-        learner_session_id: UUID,
-        slide_id: Optional[UUID] = None
-    ) -> str:
-        """Save base64 image to file and return the file path"""
-        try:
-            # Create session-specific directory
-            session_dir = self.image_storage_path / str(learner_session_id)
-            session_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Generate filename
-            if slide_id:
-                filename = f"slide_{slide_id}_image.png"
-            else:
-                import uuid
-                filename = f"image_{uuid.uuid4()}.png"
-            
-            file_path = session_dir / filename
-            
-            # Remove existing image if it exists (one image per slide)
-            if file_path.exists():
-                logger.info(f"Removing existing image: {file_path}")
-                file_path.unlink()
-            
-            # Decode base64 and save to file
-            image_bytes = base64.b64decode(image_base64)
-            
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(image_bytes)
-            
-            # Return relative path for database storage
-            try:
-                relative_path = str(file_path.relative_to(Path.cwd()))
-            except ValueError:
-                # If relative_to fails, return the absolute path relative to backend directory
-                backend_path = Path(__file__).parent.parent.parent
-                try:
-                    relative_path = str(file_path.relative_to(backend_path))
-                except ValueError:
-                    # Last resort - return absolute path
-                    relative_path = str(file_path)
-            
-            logger.debug(f"Image saved successfully: {relative_path}")
-            
-            return relative_path
-            
-        except Exception as e:
-            logger.error(f"Error saving image to file: {str(e)}")
-            raise Exception(f"Failed to save image: {str(e)}")
-    
     async def delete_slide_image(self, image_path: str) -> bool:
         """Delete a slide image file"""
         try:
@@ -8,6 +8,7 @@ from app.domain.ports.file_storage import FileStoragePort
 from app.domain.ports.settings_port import SettingsPort
 from app.domain.services.file_storage_service import FileStorageService
 from app.adapters.outbound.cloudflare_r2_storage_adapter import CloudflareR2StorageAdapter
+from app.adapters.outbound.manifest_file_storage import ManifestFileStorage
 
 logger = logging.getLogger(__name__)
 
@@ -24,8 +25,15 @@ class StorageFactory:
             settings_port: Settings port implementation
             
         Returns:
-            FileStoragePort implementation (local or R2)
+            FileStoragePort implementation (local or R2), recording into the storage manifest
         """
+        # Imported here: the manifest pulls in the database layer
+        from app.infrastructure.storage_manifest import storage_manifest
+        return ManifestFileStorage(StorageFactory._create_inner_adapter(settings_port), storage_manifest)
+    
+    @staticmethod
+    def _create_inner_adapter(settings_port: SettingsPort) -> FileStoragePort:
+        """Local or R2 adapter, without the manifest"""
         storage_type = settings_port.get_storage_type().lower()
         
         if storage_type == "r2":
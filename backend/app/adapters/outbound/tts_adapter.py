@@ -9,6 +9,7 @@ from typing import Dict, Any, List, Optional
 from app.domain.ports.outbound_ports import TTSServicePort
 from app.adapters.outbound.gemini_tts_adapter import GeminiTTSAdapter, GeminiTTSError
 from app.infrastructure.gemini_call_logger import gemini_call_logger, ServiceType
+from app.infrastructure.metrics import tts_audio_bytes
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +67,8 @@ class TTSAdapter(TTSServicePort):
                 language_code=language_code
             )
             
+            tts_audio_bytes.inc(len(result.get("audio_data", b"")), adapter="gemini_tts")
+            
             # 🔍 NOUVEAU: Logger centralisé - OUTPUT pour TTS
             # TTS consomme du texte en entrée et génère de l'audio en sortie
             estimated_input_tokens = len(text) // 4
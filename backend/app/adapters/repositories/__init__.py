@@ -5,6 +5,9 @@ from .learner_session_repository import LearnerSessionRepository
 from .slide_repository import SlideRepository
 from .chat_message_repository import ChatMessageRepository
 from .api_log_repository import ApiLogRepository
+from .file_blob_repository import FileBlobRepository
+from .document_chunk_repository import DocumentChunkRepository
+from .conversation_summary_repository import ConversationSummaryRepository
 
 __all__ = [
     "TrainerRepository",
@@ -13,5 +16,8 @@ __all__ = [
     "LearnerSessionRepository",
     "SlideRepository",
     "ChatMessageRepository",
-    "ApiLogRepository"
+    "ApiLogRepository",
+    "FileBlobRepository",
+    "DocumentChunkRepository",
+    "ConversationSummaryRepository"
 ]
\ No newline at end of file
@@ -4,24 +4,30 @@ Repository for admin dashboard statistics and trainer overview queries
 """
 
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, distinct, case, cast, Integer
+from sqlalchemy import select, func, distinct, case, cast, Float, Integer, or_
 from sqlalchemy.orm import joinedload
 
 from app.domain.ports.admin_repository_port import AdminRepositoryPort
+from app.domain.schemas.admin import AdminOverviewParams
 from app.infrastructure.models.trainer_model import TrainerModel
 from app.infrastructure.models.training_model import TrainingModel
 from app.infrastructure.models.training_session_model import TrainingSessionModel
 from app.infrastructure.models.learner_session_model import LearnerSessionModel
 from app.infrastructure.models.training_slide_model import TrainingSlideModel
 from app.infrastructure.models.chat_message_model import ChatMessageModel
-from app.infrastructure.models.training_submodule_model import TrainingSubmoduleModel
-from app.infrastructure.models.training_module_model import TrainingModuleModel
-from app.infrastructure.models.learner_training_plan_model import LearnerTrainingPlanModel
+from app.infrastructure.models.dashboard_rollup_model import (
+    SessionRollupModel, TrainingRollupModel, TrainerRollupModel
+)
+from app.infrastructure.models.api_log_model import ApiLogModel
 
 logger = logging.getLogger(__name__)
 
+# Gemini Flash pricing (USD per token) applied to the token usage in api_logs
+COST_PER_INPUT_TOKEN = 0.00000125
+COST_PER_OUTPUT_TOKEN = 0.00000375
+
 
 class AdminRepository(AdminRepositoryPort):
     """Repository for admin dashboard queries"""
@@ -29,12 +35,25 @@ class AdminRepository(AdminRepositoryPort):
     def __init__(self, session: AsyncSession):
         self.session = session
     
-    async def get_trainers_overview_statistics(self) -> List[Dict[str, Any]]:
+    async def get_trainers_overview_statistics(
+        self,
+        params: AdminOverviewParams,
+        is_active: Optional[bool] = None,
+        trainer_id: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Get comprehensive statistics for all trainers with their metrics
-        Returns: List of trainer statistics dictionaries
+        Get comprehensive statistics for trainers with their metrics
+        Returns: One page of trainer statistics dictionaries and the total trainer count
         """
-        # Simplified query focusing on available data relationships
+        # Aggregates come from the trainer rollup (no row yet: nothing to count)
+        trainings_with_support = func.coalesce(TrainerRollupModel.trainings_with_support, 0)
+        trainings_ai_generated = func.coalesce(TrainerRollupModel.trainings_ai_generated, 0)
+        active_sessions = func.coalesce(TrainerRollupModel.active_session_count, 0)
+        total_sessions = func.coalesce(TrainerRollupModel.session_count, 0)
+        unique_learners = func.coalesce(TrainerRollupModel.learner_count, 0)
+        total_time_seconds = func.coalesce(TrainerRollupModel.total_time_seconds, 0)
+        total_slides_generated = func.coalesce(TrainerRollupModel.slide_progress_sum, 0)
+        
         query = select(
             TrainerModel.id,
             TrainerModel.first_name,
@@ -44,43 +63,58 @@ class AdminRepository(AdminRepositoryPort):
             TrainerModel.is_active,
             TrainerModel.created_at,
             
-            # Training counts - simple counting
-            func.count(distinct(case((TrainingModel.is_ai_generated == False, TrainingModel.id)))).label('trainings_with_support'),
-            func.count(distinct(case((TrainingModel.is_ai_generated == True, TrainingModel.id)))).label('trainings_ai_generated'),
+            # Training counts
+            trainings_with_support.label('trainings_with_support'),
+            trainings_ai_generated.label('trainings_ai_generated'),
             
-            # Session counts - counting through trainings
-            func.count(distinct(case((TrainingSessionModel.is_active == True, TrainingSessionModel.id)))).label('active_sessions'),
-            func.count(distinct(TrainingSessionModel.id)).label('total_sessions'),
+            # Session counts
+            active_sessions.label('active_sessions'),
+            total_sessions.label('total_sessions'),
             
-            # Learner statistics - counting through sessions
-            func.count(distinct(LearnerSessionModel.email)).label('unique_learners'),
-            func.coalesce(func.sum(LearnerSessionModel.total_time_spent), 0).label('total_time_seconds'),
+            # Learner statistics
+            unique_learners.label('unique_learners'),
+            total_time_seconds.label('total_time_seconds'),
             
             # Slide statistics - sum of current_slide_number from all learner sessions
-            func.coalesce(func.sum(LearnerSessionModel.current_slide_number), 0).label('total_slides_generated')
+            total_slides_generated.label('total_slides_generated')
             
         ).select_from(
             TrainerModel
         ).outerjoin(
-            TrainingModel, TrainerModel.id == TrainingModel.trainer_id
-        ).outerjoin(
-            TrainingSessionModel, TrainingModel.id == TrainingSessionModel.training_id
-        ).outerjoin(
-            LearnerSessionModel, TrainingSessionModel.id == LearnerSessionModel.training_session_id
-        ).group_by(
-            TrainerModel.id,
-            TrainerModel.first_name,
-            TrainerModel.last_name,
-            TrainerModel.email,
-            TrainerModel.is_superuser,
-            TrainerModel.is_active,
-            TrainerModel.created_at
-        ).order_by(
-            TrainerModel.created_at.desc()
+            TrainerRollupModel, TrainerModel.id == TrainerRollupModel.trainer_id
         )
         
-        result = await self.session.execute(query)
-        rows = result.fetchall()
+        if params.search:
+            pattern = self._contains_pattern(params.search)
+            query = query.where(or_(
+                TrainerModel.first_name.ilike(pattern, escape="\\"),
+                TrainerModel.last_name.ilike(pattern, escape="\\"),
+                TrainerModel.email.ilike(pattern, escape="\\")
+            ))
+        if is_active is not None:
+            query = query.where(TrainerModel.is_active == is_active)
+        if trainer_id is not None:
+            query = query.where(TrainerModel.id == trainer_id)
+        
+        # Sort keys are the response fields (formatted durations sort on their seconds)
+        sort_columns = {
+            "first_name": TrainerModel.first_name,
+            "last_name": TrainerModel.last_name,
+            "email": TrainerModel.email,
+            "created_at": TrainerModel.created_at,
+            "trainings_with_support": trainings_with_support,
+            "trainings_ai_generated": trainings_ai_generated,
+            "active_sessions": active_sessions,
+            "total_sessions": total_sessions,
+            "unique_learners": unique_learners,
+            "total_time_all_learners": total_time_seconds,
+            "average_time_per_slide": total_time_seconds / func.nullif(total_slides_generated, 0),
+            "total_slides_generated": total_slides_generated,
+            "average_slides_per_training": total_slides_generated / func.nullif(trainings_with_support + trainings_ai_generated, 0)
+        }
+        rows, total = await self._fetch_page(
+            query, params, sort_columns, ("created_at", True), [TrainerModel.id]
+        )
         
         # Process results and calculate derived metrics
         trainers_stats = []
@@ -128,46 +162,69 @@ class AdminRepository(AdminRepositoryPort):
             
             trainers_stats.append(trainer_stats)
         
-        return trainers_stats
+        return trainers_stats, total
     
-    async def get_trainees_overview_statistics(self) -> List[Dict[str, Any]]:
+    async def get_trainees_overview_statistics(
+        self,
+        params: AdminOverviewParams,
+        level: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Get comprehensive statistics for all trainees with their learning metrics
-        Returns: List of trainee statistics dictionaries
+        Get comprehensive statistics for trainees with their learning metrics
+        Returns: One page of trainee statistics dictionaries and the total trainee count
         """
-        # Simplify the query to avoid complex subqueries that may cause errors
-        query = select(
+        total_sessions = func.count(distinct(LearnerSessionModel.training_session_id))
+        total_slides_viewed = func.coalesce(func.max(LearnerSessionModel.current_slide_number), 0)
+        total_time_seconds = func.coalesce(func.sum(LearnerSessionModel.total_time_spent), 0)
+        group_columns = [
             LearnerSessionModel.email,
             LearnerSessionModel.experience_level,
             LearnerSessionModel.job_position,
             LearnerSessionModel.activity_sector,
             LearnerSessionModel.objectives,
-            LearnerSessionModel.enriched_profile,
+            LearnerSessionModel.enriched_profile
+        ]
+        
+        # Simplify the query to avoid complex subqueries that may cause errors
+        query = select(
+            *group_columns,
             
             # Count total sessions for this learner
-            func.count(distinct(LearnerSessionModel.training_session_id)).label('total_sessions'),
+            total_sessions.label('total_sessions'),
             
             # Total slides viewed - using current_slide_number as proxy
-            func.coalesce(func.max(LearnerSessionModel.current_slide_number), 0).label('total_slides_viewed'),
+            total_slides_viewed.label('total_slides_viewed'),
             
             # Total time spent across all sessions
-            func.coalesce(func.sum(LearnerSessionModel.total_time_spent), 0).label('total_time_seconds')
+            total_time_seconds.label('total_time_seconds')
             
         ).select_from(
             LearnerSessionModel
         ).group_by(
-            LearnerSessionModel.email,
-            LearnerSessionModel.experience_level,
-            LearnerSessionModel.job_position,
-            LearnerSessionModel.activity_sector,
-            LearnerSessionModel.objectives,
-            LearnerSessionModel.enriched_profile
-        ).order_by(
-            LearnerSessionModel.email
+            *group_columns
         )
         
-        result = await self.session.execute(query)
-        rows = result.fetchall()
+        if params.search:
+            pattern = self._contains_pattern(params.search)
+            query = query.where(or_(
+                LearnerSessionModel.email.ilike(pattern, escape="\\"),
+                LearnerSessionModel.job_position.ilike(pattern, escape="\\"),
+                LearnerSessionModel.activity_sector.ilike(pattern, escape="\\")
+            ))
+        if level is not None:
+            query = query.where(LearnerSessionModel.experience_level == level)
+        
+        sort_columns = {
+            "email": LearnerSessionModel.email,
+            "level": LearnerSessionModel.experience_level,
+            "job_sector": LearnerSessionModel.job_position,
+            "objective": LearnerSessionModel.objectives,
+            "total_sessions": total_sessions,
+            "trainer_sessions": total_sessions,
+            "total_time": total_time_seconds,
+            "total_slides_viewed": total_slides_viewed
+        }
+        rows, total = await self._fetch_page(query, params, sort_columns, ("email", False), group_columns)
         
         # Process results and format data
         trainees_stats = []
@@ -203,46 +260,63 @@ class AdminRepository(AdminRepositoryPort):
             
             trainees_stats.append(trainee_stats)
         
-        return trainees_stats
+        return trainees_stats, total
     
-    async def get_trainings_overview_statistics(self) -> List[Dict[str, Any]]:
+    async def get_trainings_overview_statistics(
+        self,
+        params: AdminOverviewParams,
+        training_type: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Get comprehensive statistics for all trainings with their metrics
-        Returns: List of training statistics dictionaries
+        Get comprehensive statistics for trainings with their metrics
+        Returns: One page of training statistics dictionaries and the total training count
         """
+        total_sessions = func.coalesce(TrainingRollupModel.session_count, 0)
+        total_learners = func.coalesce(TrainingRollupModel.learner_count, 0)
+        total_time_seconds = func.coalesce(TrainingRollupModel.total_time_seconds, 0)
+        total_slides = func.coalesce(TrainingRollupModel.max_slide_reached, 0)
+        
         query = select(
             TrainingModel.id.label('training_id'),
             TrainingModel.name.label('training_name'),
             TrainingModel.is_ai_generated,
             
-            # Count sessions for this training
-            func.count(distinct(TrainingSessionModel.id)).label('total_sessions'),
+            # Sessions of this training
+            total_sessions.label('total_sessions'),
             
-            # Count unique learners across all sessions of this training
-            func.count(distinct(LearnerSessionModel.email)).label('total_learners'),
+            # Unique learners across all sessions of this training
+            total_learners.label('total_learners'),
             
-            # Sum total time across all learner sessions for this training
-            func.coalesce(func.sum(LearnerSessionModel.total_time_spent), 0).label('total_time_seconds'),
+            # Total time across all learner sessions of this training
+            total_time_seconds.label('total_time_seconds'),
             
-            # Get max slides viewed (proxy for total slides in training)
-            func.coalesce(func.max(LearnerSessionModel.current_slide_number), 0).label('total_slides')
+            # Max slides viewed (proxy for total slides in training)
+            total_slides.label('total_slides')
             
         ).select_from(
             TrainingModel
         ).outerjoin(
-            TrainingSessionModel, TrainingModel.id == TrainingSessionModel.training_id
-        ).outerjoin(
-            LearnerSessionModel, TrainingSessionModel.id == LearnerSessionModel.training_session_id
-        ).group_by(
-            TrainingModel.id,
-            TrainingModel.name,
-            TrainingModel.is_ai_generated
-        ).order_by(
-            TrainingModel.name
+            TrainingRollupModel, TrainingModel.id == TrainingRollupModel.training_id
         )
         
-        result = await self.session.execute(query)
-        rows = result.fetchall()
+        if params.search:
+            query = query.where(TrainingModel.name.ilike(self._contains_pattern(params.search), escape="\\"))
+        if training_type is not None:
+            query = query.where(TrainingModel.is_ai_generated == (training_type == "IA"))
+        
+        sort_columns = {
+            "training_name": TrainingModel.name,
+            "training_type": TrainingModel.is_ai_generated,
+            "total_learners": total_learners,
+            "total_sessions": total_sessions,
+            "total_time": total_time_seconds,
+            "avg_time_per_session": total_time_seconds / func.nullif(total_sessions, 0),
+            "total_slides": total_slides,
+            "avg_slides_per_session": total_slides / func.nullif(total_sessions, 0)
+        }
+        rows, total = await self._fetch_page(
+            query, params, sort_columns, ("training_name", False), [TrainingModel.id]
+        )
         
         # Process results and format data
         trainings_stats = []
@@ -276,13 +350,37 @@ class AdminRepository(AdminRepositoryPort):
             
             trainings_stats.append(training_stats)
         
-        return trainings_stats
+        return trainings_stats, total
     
-    async def get_sessions_overview_statistics(self) -> List[Dict[str, Any]]:
+    async def get_sessions_overview_statistics(
+        self,
+        params: AdminOverviewParams,
+        is_active: Optional[bool] = None,
+        training_type: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Get comprehensive statistics for all training sessions with their metrics
-        Returns: List of session statistics dictionaries
+        Get comprehensive statistics for training sessions with their metrics
+        Returns: One page of session statistics dictionaries and the total session count
         """
+        total_learners = func.coalesce(SessionRollupModel.learner_count, 0)
+        max_slide_reached = func.coalesce(SessionRollupModel.max_slide_reached, 0)
+        # Average progress: average of individual learner current positions
+        avg_current_slide = func.coalesce(
+            cast(SessionRollupModel.slide_progress_sum, Float) / func.nullif(SessionRollupModel.learner_count, 0), 0
+        )
+        total_slides = func.coalesce(SessionRollupModel.total_slides, 0)
+        # Token cost of the session learners, only evaluated when sorting on it
+        token_cost = (
+            select(func.coalesce(func.sum(
+                func.coalesce(ApiLogModel.prompt_tokens, 0) * COST_PER_INPUT_TOKEN
+                + func.coalesce(ApiLogModel.candidates_tokens, 0) * COST_PER_OUTPUT_TOKEN
+            ), 0))
+            .join(LearnerSessionModel, ApiLogModel.learner_session_id == LearnerSessionModel.id)
+            .where(LearnerSessionModel.training_session_id == TrainingSessionModel.id)
+            .correlate(TrainingSessionModel)
+            .scalar_subquery()
+        )
+        
         query = select(
             TrainingSessionModel.id.label('session_id'),
             TrainingSessionModel.name.label('session_name'),
@@ -290,35 +388,44 @@ class AdminRepository(AdminRepositoryPort):
             TrainingSessionModel.created_at.label('session_date'),
             TrainingModel.name.label('training_name'),
             TrainingModel.is_ai_generated,
+            total_learners.label('total_learners'),
+            max_slide_reached.label('max_slide_reached'),
+            avg_current_slide.label('avg_current_slide'),
             
-            # Count learners for this session
-            func.count(distinct(LearnerSessionModel.email)).label('total_learners'),
+            # Real total slides count of the session training plans
+            total_slides.label('total_slides')
             
-            # Get max current slide (highest slide reached by any learner)
-            func.coalesce(func.max(LearnerSessionModel.current_slide_number), 0).label('max_slide_reached'),
-            
-            # Get average progress: average of individual learner current positions
-            func.coalesce(func.avg(LearnerSessionModel.current_slide_number), 0).label('avg_current_slide')
-            
-        ).select_from(
-            TrainingSessionModel
         ).join(
             TrainingModel, TrainingSessionModel.training_id == TrainingModel.id
         ).outerjoin(
-            LearnerSessionModel, TrainingSessionModel.id == LearnerSessionModel.training_session_id
-        ).group_by(
-            TrainingSessionModel.id,
-            TrainingSessionModel.name,
-            TrainingSessionModel.is_active,
-            TrainingSessionModel.created_at,
-            TrainingModel.name,
-            TrainingModel.is_ai_generated
-        ).order_by(
-            TrainingSessionModel.created_at.desc()
+            SessionRollupModel, TrainingSessionModel.id == SessionRollupModel.session_id
         )
         
-        result = await self.session.execute(query)
-        rows = result.fetchall()
+        if params.search:
+            pattern = self._contains_pattern(params.search)
+            query = query.where(or_(
+                TrainingSessionModel.name.ilike(pattern, escape="\\"),
+                TrainingModel.name.ilike(pattern, escape="\\")
+            ))
+        if is_active is not None:
+            query = query.where(TrainingSessionModel.is_active == is_active)
+        if training_type is not None:
+            query = query.where(TrainingModel.is_ai_generated == (training_type == "IA"))
+        
+        sort_columns = {
+            "session_name": TrainingSessionModel.name,
+            "training_name": TrainingModel.name,
+            "training_type": TrainingModel.is_ai_generated,
+            "session_date": TrainingSessionModel.created_at,
+            "status": TrainingSessionModel.is_active,
+            "total_slides": total_slides,
+            "progress_percentage": func.least(100, avg_current_slide * 100 / func.nullif(total_slides, 0)),
+            "token_cost": token_cost
+        }
+        rows, total = await self._fetch_page(
+            query, params, sort_columns, ("session_date", True), [TrainingSessionModel.id]
+        )
+        token_usage = await self._session_token_usage([row.session_id for row in rows])
         
         # Process results and format data
         sessions_stats = []
@@ -327,8 +434,7 @@ class AdminRepository(AdminRepositoryPort):
             training_type = "IA" if row.is_ai_generated else "Humain"
             status = "Active" if row.is_active else "Inactive"
             
-            # Get the real total slides count for this training session
-            total_slides_in_plan = await self._get_total_slides_for_session(row.session_id)
+            total_slides_in_plan = row.total_slides
             
             # Calculate progress percentage based on average current position vs real total
             progress_percentage = 0
@@ -336,13 +442,9 @@ class AdminRepository(AdminRepositoryPort):
                 # Average progress of all learners as percentage of total slides in the plan
                 progress_percentage = min(100, (row.avg_current_slide / total_slides_in_plan) * 100)
             
-            # For token costs, use placeholder values for now
-            # In a real implementation, these would come from API logs or a dedicated token tracking system
-            input_tokens = row.total_learners * 150  # Placeholder calculation
-            output_tokens = row.total_learners * 75   # Placeholder calculation
-            cost_per_input_token = 0.00000125  # Gemini Flash pricing
-            cost_per_output_token = 0.00000375  # Gemini Flash pricing
-            total_cost = (input_tokens * cost_per_input_token) + (output_tokens * cost_per_output_token)
+            # Token usage recorded in api_logs for the session learners
+            input_tokens, output_tokens = token_usage.get(row.session_id, (0, 0))
+            total_cost = (input_tokens * COST_PER_INPUT_TOKEN) + (output_tokens * COST_PER_OUTPUT_TOKEN)
             
             session_stats = {
                 "session_id": str(row.session_id),
@@ -352,7 +454,7 @@ class AdminRepository(AdminRepositoryPort):
                 "session_date": row.session_date.isoformat() if row.session_date else None,
                 "status": status,
                 "total_slides": total_slides_in_plan,
-                "progress_percentage": round(progress_percentage, 1),
+                "progress_percentage": round(float(progress_percentage), 1),
                 "input_tokens": input_tokens,
                 "output_tokens": output_tokens,
                 "token_cost": f"${total_cost:.4f}"
@@ -360,7 +462,7 @@ class AdminRepository(AdminRepositoryPort):
             
             sessions_stats.append(session_stats)
         
-        return sessions_stats
+        return sessions_stats, total
     
     async def get_global_admin_statistics(self) -> Dict[str, Any]:
         """
@@ -449,34 +551,77 @@ class AdminRepository(AdminRepositoryPort):
         else:
             return f"{whole_hours}h {remaining_minutes}min"
     
-    async def _get_total_slides_for_session(self, session_id: str) -> int:
+    async def _session_token_usage(self, session_ids: List[Any]) -> Dict[Any, Tuple[int, int]]:
+        """Input / output tokens per training session of a page (one aggregate over api_logs)"""
+        if not session_ids:
+            return {}
+        result = await self.session.execute(
+            select(
+                LearnerSessionModel.training_session_id,
+                func.coalesce(func.sum(ApiLogModel.prompt_tokens), 0).label('input_tokens'),
+                func.coalesce(func.sum(ApiLogModel.candidates_tokens), 0).label('output_tokens')
+            )
+            .join(ApiLogModel, ApiLogModel.learner_session_id == LearnerSessionModel.id)
+            .where(LearnerSessionModel.training_session_id.in_(session_ids))
+            .group_by(LearnerSessionModel.training_session_id)
+        )
+        return {row.training_session_id: (row.input_tokens, row.output_tokens) for row in result}
+    
+    async def _fetch_page(
+        self,
+        query,
+        params: AdminOverviewParams,
+        sort_columns: Dict[str, Any],
+        default_sort: Tuple[str, bool],
+        tiebreakers: List[Any]
+    ) -> Tuple[list, int]:
         """
-        Get the total number of slides in the training plan for a specific session
+        Sort and paginate an overview query
+        
+        The total row count comes back with the page (COUNT(*) OVER ()), so
+        a page costs one round trip. Tiebreakers keep the order stable across pages.
         
         Args:
-            session_id: The training session ID
+            query: Overview select with filters applied
+            params: Page, sort and order requested
+            sort_columns: Sortable response field -> SQL expression
+            default_sort: (field, descending) used when no sort is requested
+            tiebreakers: Unique ordering columns appended after the sort column
             
         Returns:
-            Total number of slides in the training plan
+            Rows of the page and total number of rows
         """
-        try:
-            # Query to get total slides count for this session
-            # Following the same pattern as dashboard_controller.py
-            total_slides_result = await self.session.execute(
-                select(func.count(TrainingSlideModel.id))
-                .join(TrainingSubmoduleModel, TrainingSlideModel.submodule_id == TrainingSubmoduleModel.id)
-                .join(TrainingModuleModel, TrainingSubmoduleModel.module_id == TrainingModuleModel.id)
-                .join(LearnerTrainingPlanModel, TrainingModuleModel.plan_id == LearnerTrainingPlanModel.id)
-                .join(LearnerSessionModel, LearnerTrainingPlanModel.learner_session_id == LearnerSessionModel.id)
-                .join(TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id)
-                .where(TrainingSessionModel.id == session_id)
-                .distinct()  # Avoid counting the same slide multiple times
-            )
-            
-            total_slides = total_slides_result.scalar() or 0
-            return total_slides
-            
-        except Exception as e:
-            # If there's an error getting the real count, fall back to max_slide_reached
-            logger.error(f"Error getting total slides for session {session_id}: {e}")
-            return 0
\ No newline at end of file
+        sort, descending = self._resolve_sort(params, sort_columns, default_sort)
+        page_query = query.add_columns(
+            func.count().over().label('total_count')
+        ).order_by(
+            self._ordering(sort_columns[sort], descending), *tiebreakers
+        ).offset(params.offset).limit(params.per_page)
+        
+        result = await self.session.execute(page_query)
+        rows = result.fetchall()
+        
+        if rows:
+            return rows, rows[0].total_count
+        if params.offset == 0:
+            return rows, 0
+        # Page past the end: the window count has no row to ride on
+        total_result = await self.session.execute(select(func.count()).select_from(query.subquery()))
+        return rows, total_result.scalar() or 0
+    
+    def _resolve_sort(self, params: AdminOverviewParams, sort_keys, default_sort: Tuple[str, bool]) -> Tuple[str, bool]:
+        """Requested (or default) sort field and direction; ValueError if the field is not sortable"""
+        sort = params.sort or default_sort[0]
+        if sort not in sort_keys:
+            raise ValueError(f"Unsupported sort column: {sort}")
+        if params.order:
+            return sort, params.order == "desc"
+        return sort, params.sort is None and default_sort[1]
+    
+    def _ordering(self, column, descending: bool):
+        return column.desc().nulls_last() if descending else column.asc().nulls_last()
+    
+    def _contains_pattern(self, search: str) -> str:
+        """ILIKE pattern matching the search text literally"""
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{escaped}%"
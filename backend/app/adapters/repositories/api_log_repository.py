@@ -1,10 +1,12 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, insert, literal_column, select
 
 from app.domain.entities import ApiLog
 from app.infrastructure.models.api_log_model import ApiLogModel
+from app.infrastructure.models.learner_session_model import LearnerSessionModel
 from app.domain.ports.repositories import ApiLogRepositoryPort
 
 
@@ -26,7 +28,12 @@ class ApiLogRepository(ApiLogRepositoryPort):
             response_time_ms=api_log.response_time_ms,
             tokens_used=api_log.tokens_used,
             cost_estimate=api_log.cost_estimate,
-            learner_session_id=api_log.learner_session_id
+            learner_session_id=api_log.learner_session_id,
+            service_type=api_log.service_type,
+            model=api_log.model,
+            prompt_tokens=api_log.prompt_tokens,
+            candidates_tokens=api_log.candidates_tokens,
+            cached_tokens=api_log.cached_tokens
         )
         
         self.session.add(api_log_model)
@@ -34,6 +41,45 @@ class ApiLogRepository(ApiLogRepositoryPort):
         await self.session.refresh(api_log_model)
         return api_log
     
+    async def create_many(self, api_logs: List[ApiLog]) -> int:
+        """Insert a batch of logs in one statement; a deleted learner session is not an error"""
+        if not api_logs:
+            return 0
+        session_ids = {log.learner_session_id for log in api_logs if log.learner_session_id}
+        existing = set()
+        if session_ids:
+            result = await self.session.execute(
+                select(LearnerSessionModel.id).where(LearnerSessionModel.id.in_(session_ids))
+            )
+            existing = set(result.scalars().all())
+        await self.session.execute(
+            insert(ApiLogModel),
+            [
+                {
+                    "id": log.id,
+                    "service_name": log.service_name,
+                    "endpoint": log.endpoint,
+                    "method": log.method,
+                    "request_data": log.request_data,
+                    "response_data": log.response_data,
+                    "status_code": log.status_code,
+                    "response_time_ms": log.response_time_ms,
+                    "tokens_used": log.tokens_used,
+                    "cost_estimate": log.cost_estimate,
+                    "learner_session_id": log.learner_session_id if log.learner_session_id in existing else None,
+                    "created_at": log.created_at,
+                    "service_type": log.service_type,
+                    "model": log.model,
+                    "prompt_tokens": log.prompt_tokens,
+                    "candidates_tokens": log.candidates_tokens,
+                    "cached_tokens": log.cached_tokens
+                }
+                for log in api_logs
+            ]
+        )
+        await self.session.commit()
+        return len(api_logs)
+    
     async def get_by_id(self, log_id: UUID) -> Optional[ApiLog]:
         result = await self.session.execute(
             select(ApiLogModel).where(ApiLogModel.id == log_id)
@@ -54,6 +100,41 @@ class ApiLogRepository(ApiLogRepositoryPort):
         )
         return list(result.scalars().all())
     
+    async def get_usage_by_service_type(
+        self,
+        learner_session_id: UUID,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Token sums per service type of a learner session (one indexed aggregate)"""
+        # Literal (not a bind parameter) so the select and GROUP BY expressions match
+        service_type = func.coalesce(ApiLogModel.service_type, literal_column("'unknown'"))
+        query = select(
+            service_type.label('service_type'),
+            func.count().label('calls'),
+            func.coalesce(func.sum(ApiLogModel.prompt_tokens), 0).label('input_tokens'),
+            func.coalesce(func.sum(ApiLogModel.candidates_tokens), 0).label('output_tokens'),
+            func.coalesce(func.sum(ApiLogModel.cached_tokens), 0).label('cached_tokens'),
+            func.coalesce(func.sum(ApiLogModel.tokens_used), 0).label('total_tokens'),
+            func.array_agg(func.distinct(ApiLogModel.service_name)).label('service_names'),
+            func.min(ApiLogModel.created_at).label('first_call_at'),
+            func.max(ApiLogModel.created_at).label('last_call_at')
+        ).where(ApiLogModel.learner_session_id == learner_session_id)
+        if start_time is not None:
+            query = query.where(ApiLogModel.created_at >= start_time)
+        if end_time is not None:
+            query = query.where(ApiLogModel.created_at <= end_time)
+        result = await self.session.execute(query.group_by(service_type))
+        return [dict(row._mapping) for row in result]
+    
+    async def get_recent_calls(self, learner_session_id: UUID, limit: int = 10) -> List[ApiLog]:
+        result = await self.session.execute(
+            select(ApiLogModel).where(ApiLogModel.learner_session_id == learner_session_id)
+            .order_by(ApiLogModel.created_at.desc())
+            .limit(limit)
+        )
+        return [self._model_to_entity(model) for model in result.scalars().all()]
+    
     async def delete(self, log_id: UUID) -> bool:
         result = await self.session.execute(
             select(ApiLogModel).where(ApiLogModel.id == log_id)
@@ -63,4 +144,25 @@ class ApiLogRepository(ApiLogRepositoryPort):
             await self.session.delete(api_log)
             await self.session.commit()
             return True
-        return False
\ No newline at end of file
+        return False
+    
+    def _model_to_entity(self, model: ApiLogModel) -> ApiLog:
+        return ApiLog(
+            api_log_id=model.id,
+            service_name=model.service_name,
+            endpoint=model.endpoint,
+            method=model.method,
+            request_data=model.request_data,
+            response_data=model.response_data,
+            status_code=model.status_code,
+            response_time_ms=model.response_time_ms,
+            tokens_used=model.tokens_used,
+            cost_estimate=model.cost_estimate,
+            learner_session_id=model.learner_session_id,
+            created_at=model.created_at,
+            service_type=model.service_type,
+            model=model.model,
+            prompt_tokens=model.prompt_tokens,
+            candidates_tokens=model.candidates_tokens,
+            cached_tokens=model.cached_tokens
+        )
@@ -1,11 +1,14 @@
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
 from app.domain.entities.chat_message import ChatMessage
 from app.domain.ports.repositories import ChatMessageRepositoryPort
 from app.infrastructure.models.chat_message_model import ChatMessageModel
+from app.infrastructure.models.learner_session_model import LearnerSessionModel
+from app.infrastructure.models.training_slide_model import TrainingSlideModel
 
 
 class ChatMessageRepository(ChatMessageRepositoryPort):
@@ -20,6 +23,45 @@ class ChatMessageRepository(ChatMessageRepositoryPort):
         await self.session.refresh(message_model)
         return self._model_to_entity(message_model)
     
+    async def create_many(self, chat_messages: List[ChatMessage]) -> int:
+        """
+        Insert a batch of messages in one statement
+        
+        Client-sent references never fail the batch: an unknown slide is
+        stored as NULL, messages of a deleted learner session are skipped.
+        """
+        if not chat_messages:
+            return 0
+        session_ids = {message.learner_session_id for message in chat_messages}
+        result = await self.session.execute(
+            select(LearnerSessionModel.id).where(LearnerSessionModel.id.in_(session_ids))
+        )
+        existing_sessions = set(result.scalars().all())
+        slide_ids = {message.slide_id for message in chat_messages if message.slide_id}
+        existing_slides = set()
+        if slide_ids:
+            result = await self.session.execute(
+                select(TrainingSlideModel.id).where(TrainingSlideModel.id.in_(slide_ids))
+            )
+            existing_slides = set(result.scalars().all())
+        
+        rows = [
+            {
+                "id": message.id,
+                "learner_session_id": message.learner_session_id,
+                "message": message.content,
+                "message_type": message.message_type,
+                "slide_id": message.slide_id if message.slide_id in existing_slides else None,
+                "created_at": message.created_at
+            }
+            for message in chat_messages
+            if message.learner_session_id in existing_sessions
+        ]
+        if rows:
+            await self.session.execute(insert(ChatMessageModel), rows)
+            await self.session.commit()
+        return len(rows)
+    
     async def get_by_id(self, message_id: UUID) -> Optional[ChatMessage]:
         result = await self.session.execute(
             select(ChatMessageModel).where(ChatMessageModel.id == message_id)
@@ -54,6 +96,13 @@ class ChatMessageRepository(ChatMessageRepositoryPort):
         message_models = result.scalars().all()
         return [self._model_to_entity(model) for model in message_models]
     
+    async def get_after(self, learner_session_id: UUID, after: Optional[datetime] = None) -> List[ChatMessage]:
+        query = select(ChatMessageModel).where(ChatMessageModel.learner_session_id == learner_session_id)
+        if after is not None:
+            query = query.where(ChatMessageModel.created_at > after)
+        result = await self.session.execute(query.order_by(ChatMessageModel.created_at))
+        return [self._model_to_entity(model) for model in result.scalars().all()]
+    
     async def delete(self, message_id: UUID) -> bool:
         result = await self.session.execute(
             select(ChatMessageModel).where(ChatMessageModel.id == message_id)
@@ -72,6 +121,7 @@ class ChatMessageRepository(ChatMessageRepositoryPort):
             learner_session_id=chat_message.learner_session_id,
             message=chat_message.content,  # Map content to message
             message_type=chat_message.message_type,  # Fixed: use message_type from entity
+            slide_id=chat_message.slide_id,
             created_at=chat_message.created_at
         )
     
@@ -83,5 +133,6 @@ class ChatMessageRepository(ChatMessageRepositoryPort):
             message_type=model.message_type,  # Fixed: correct mapping
             content=model.message or model.response or "",  # Use message or response
             slide_number=None,  # Will be added later if needed
-            created_at=model.created_at
+            created_at=model.created_at,
+            slide_id=model.slide_id
         )
\ No newline at end of file
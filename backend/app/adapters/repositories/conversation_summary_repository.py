@@ -0,0 +1,47 @@
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.domain.ports.repositories import ConversationSummaryRepositoryPort
+from app.domain.entities.conversation_summary import ConversationSummary
+from app.infrastructure.models.conversation_summary_model import ConversationSummaryModel
+
+
+class ConversationSummaryRepository(ConversationSummaryRepositoryPort):
+    """Repository for rolling chat summaries"""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def get(self, learner_session_id: UUID) -> Optional[ConversationSummary]:
+        result = await self.session.execute(
+            select(ConversationSummaryModel).where(ConversationSummaryModel.learner_session_id == learner_session_id)
+        )
+        model = result.scalar_one_or_none()
+        if model is None:
+            return None
+        return ConversationSummary(
+            learner_session_id=model.learner_session_id,
+            summary=model.summary,
+            summarized_until=model.summarized_until,
+            summarized_messages=model.summarized_messages,
+            summarized_tokens=model.summarized_tokens
+        )
+    
+    async def save(self, summary: ConversationSummary) -> None:
+        values = {
+            "learner_session_id": summary.learner_session_id,
+            "summary": summary.summary,
+            "summarized_until": summary.summarized_until,
+            "summarized_messages": summary.summarized_messages,
+            "summarized_tokens": summary.summarized_tokens
+        }
+        statement = insert(ConversationSummaryModel).values(**values)
+        await self.session.execute(statement.on_conflict_do_update(
+            index_elements=[ConversationSummaryModel.learner_session_id],
+            set_={**{k: statement.excluded[k] for k in values if k != "learner_session_id"}, "updated_at": func.now()}
+        ))
+        await self.session.commit()
@@ -0,0 +1,88 @@
+import logging
+from typing import List
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.ports.repositories import DocumentChunkRepositoryPort
+from app.domain.entities.document_chunk import DocumentChunk
+from app.infrastructure.models.document_chunk_model import DocumentChunkModel
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant namespacing the per-file locks in pg_try_advisory_xact_lock(namespace, hashtext(storage_key))
+CHUNK_LOCK_NAMESPACE = 7311
+
+
+class DocumentChunkRepository(DocumentChunkRepositoryPort):
+    """
+    Repository for locally extracted document chunks
+    
+    Writes are only flushed: the caller owning the session commits them.
+    """
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def get_chunks(self, storage_key: str) -> List[DocumentChunk]:
+        result = await self.session.execute(
+            select(
+                DocumentChunkModel.chunk_index,
+                DocumentChunkModel.location,
+                DocumentChunkModel.section_title,
+                DocumentChunkModel.content,
+                DocumentChunkModel.token_count
+            )
+            .where(DocumentChunkModel.storage_key == storage_key)
+            .order_by(DocumentChunkModel.chunk_index)
+        )
+        return [
+            DocumentChunk(
+                chunk_index=row.chunk_index,
+                location=row.location,
+                section_title=row.section_title,
+                content=row.content,
+                token_count=row.token_count
+            )
+            for row in result.all()
+        ]
+    
+    async def replace_chunks(self, storage_key: str, chunks: List[DocumentChunk]) -> None:
+        """
+        Delete and bulk insert (a single executemany) under a per-file advisory lock
+        
+        A concurrent first extraction of the same file holds the lock until its
+        transaction ends: its chunks are the same, so this one is not stored
+        rather than waiting or failing on the primary key.
+        """
+        locked = (await self.session.execute(
+            text("SELECT pg_try_advisory_xact_lock(:namespace, hashtext(:storage_key))"),
+            {"namespace": CHUNK_LOCK_NAMESPACE, "storage_key": storage_key}
+        )).scalar()
+        if not locked:
+            logger.info(f"📑 DOCUMENT_CHUNKS [SKIP] {storage_key} is being stored by another extraction")
+            return
+        
+        await self.session.execute(delete(DocumentChunkModel).where(DocumentChunkModel.storage_key == storage_key))
+        if chunks:
+            await self.session.execute(
+                insert(DocumentChunkModel),
+                [
+                    {
+                        "storage_key": storage_key,
+                        "chunk_index": chunk.chunk_index,
+                        "location": chunk.location,
+                        "section_title": chunk.section_title,
+                        "content": chunk.content,
+                        "token_count": chunk.token_count
+                    }
+                    for chunk in chunks
+                ]
+            )
+        await self.session.flush()
+    
+    async def delete_chunks(self, storage_key: str) -> int:
+        result = await self.session.execute(
+            delete(DocumentChunkModel).where(DocumentChunkModel.storage_key == storage_key)
+        )
+        await self.session.flush()
+        return result.rowcount or 0
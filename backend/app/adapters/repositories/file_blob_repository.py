@@ -0,0 +1,87 @@
+from typing import Optional, Tuple
+from uuid import UUID
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.ports.repositories import FileBlobRepositoryPort
+from app.infrastructure.models.file_blob_model import FileBlobModel, TrainingFileRefModel
+
+
+class FileBlobRepository(FileBlobRepositoryPort):
+    """
+    Repository for content-addressed training files
+    
+    Counters are only changed with single conditional UPDATE/DELETE
+    statements, so concurrent uploads and deletions of the same content
+    never lose a reference. A blob whose count reached zero can no longer be
+    acquired; it is deleted and the next upload stores the content again.
+    
+    Changes are only flushed: they are committed (or rolled back) with the
+    training that references the blob, by the caller owning the session.
+    """
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def acquire(self, sha256: str, training_id: UUID) -> Optional[Tuple[str, int]]:
+        """Increment the blob's reference count and link it to the training"""
+        result = await self.session.execute(
+            update(FileBlobModel)
+            .where(FileBlobModel.sha256 == sha256, FileBlobModel.ref_count > 0)
+            .values(ref_count=FileBlobModel.ref_count + 1)
+            .returning(FileBlobModel.storage_key, FileBlobModel.size_bytes)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        
+        self.session.add(TrainingFileRefModel(training_id=training_id, sha256=sha256))
+        await self.session.flush()
+        return row.storage_key, row.size_bytes
+    
+    async def create(self, sha256: str, storage_key: str, size_bytes: int, mime_type: str, training_id: UUID) -> bool:
+        """Insert the blob with one reference, unless another upload created it first"""
+        result = await self.session.execute(
+            insert(FileBlobModel)
+            .values(sha256=sha256, storage_key=storage_key, size_bytes=size_bytes, mime_type=mime_type, ref_count=1)
+            .on_conflict_do_nothing(index_elements=[FileBlobModel.sha256])
+            .returning(FileBlobModel.sha256)
+        )
+        if result.first() is None:
+            return False
+        
+        self.session.add(TrainingFileRefModel(training_id=training_id, sha256=sha256))
+        await self.session.flush()
+        return True
+    
+    async def release(self, training_id: UUID) -> Tuple[bool, Optional[str]]:
+        """Remove the training's reference and delete the blob row when it was the last one"""
+        result = await self.session.execute(
+            delete(TrainingFileRefModel)
+            .where(TrainingFileRefModel.training_id == training_id)
+            .returning(TrainingFileRefModel.sha256)
+        )
+        sha256 = result.scalar_one_or_none()
+        if sha256 is None:
+            return False, None
+        
+        result = await self.session.execute(
+            update(FileBlobModel)
+            .where(FileBlobModel.sha256 == sha256)
+            .values(ref_count=FileBlobModel.ref_count - 1)
+            .returning(FileBlobModel.ref_count)
+        )
+        remaining = result.scalar_one_or_none()
+        
+        storage_key = None
+        if remaining is not None and remaining <= 0:
+            result = await self.session.execute(
+                delete(FileBlobModel)
+                .where(FileBlobModel.sha256 == sha256, FileBlobModel.ref_count <= 0)
+                .returning(FileBlobModel.storage_key)
+            )
+            storage_key = result.scalar_one_or_none()
+        
+        await self.session.flush()
+        return True, storage_key
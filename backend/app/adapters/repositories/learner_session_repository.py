@@ -11,6 +11,7 @@ from sqlalchemy import select
 from app.domain.entities.learner_session import LearnerSession
 from app.domain.ports.repositories import LearnerSessionRepositoryPort
 from app.infrastructure.models.learner_session_model import LearnerSessionModel
+from app.infrastructure.dashboard_rollups import dashboard_rollups
 
 
 class LearnerSessionRepository(LearnerSessionRepositoryPort):
@@ -69,6 +70,7 @@ class LearnerSessionRepository(LearnerSessionRepositoryPort):
         self.session.add(model)
         await self.session.commit()
         await self.session.refresh(model)
+        dashboard_rollups.mark_session(model.training_session_id)
         return self._model_to_entity(model)
     
     async def get_by_id(self, learner_session_id: UUID) -> Optional[LearnerSession]:
@@ -120,6 +122,7 @@ class LearnerSessionRepository(LearnerSessionRepositoryPort):
         
         await self.session.commit()
         await self.session.refresh(model)
+        dashboard_rollups.mark_session(model.training_session_id)
         return self._model_to_entity(model)
     
     async def delete(self, learner_session_id: UUID) -> bool:
@@ -134,6 +137,7 @@ class LearnerSessionRepository(LearnerSessionRepositoryPort):
         
         await self.session.delete(model)
         await self.session.commit()
+        dashboard_rollups.mark_session(model.training_session_id)
         return True
     
     async def get_by_training_session_id(self, training_session_id: UUID) -> List[LearnerSession]:
@@ -172,6 +176,7 @@ class LearnerSessionRepository(LearnerSessionRepositoryPort):
             )
             
             await self.session.commit()
+            dashboard_rollups.mark_learner_session(learner_session_id)
             
             # Vérifier qu'une ligne a été mise à jour
             return result.rowcount > 0
@@ -14,6 +14,7 @@ from app.domain.ports.repositories import LearnerTrainingPlanRepositoryPort
 from app.infrastructure.models.learner_training_plan_model import LearnerTrainingPlanModel
 from app.infrastructure.models.training_module_model import TrainingModuleModel
 from app.infrastructure.models.training_submodule_model import TrainingSubmoduleModel
+from app.infrastructure.dashboard_rollups import dashboard_rollups
 
 
 class LearnerTrainingPlanRepository(LearnerTrainingPlanRepositoryPort):
@@ -129,6 +130,7 @@ class LearnerTrainingPlanRepository(LearnerTrainingPlanRepositoryPort):
         if plan_model:
             await self.session.delete(plan_model)
             await self.session.commit()
+            dashboard_rollups.mark_learner_session(plan_model.learner_session_id)
             return True
         return False
     
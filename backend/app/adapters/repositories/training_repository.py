@@ -6,6 +6,8 @@ from sqlalchemy import select
 from app.domain.entities.training import Training, FileType
 from app.domain.ports.repositories import TrainingRepositoryPort
 from app.infrastructure.models.training_model import TrainingModel
+from app.infrastructure.dashboard_cache import dashboard_cache
+from app.infrastructure.dashboard_rollups import dashboard_rollups
 
 
 class TrainingRepository(TrainingRepositoryPort):
@@ -20,6 +22,8 @@ class TrainingRepository(TrainingRepositoryPort):
         self.session.add(training_model)
         await self.session.commit()
         await self.session.refresh(training_model)
+        dashboard_rollups.mark_trainer(training_model.trainer_id)
+        dashboard_cache.invalidate(training_model.trainer_id)
         return self._to_entity(training_model)
     
     async def get_by_id(self, training_id: UUID) -> Optional[Training]:
@@ -62,6 +66,8 @@ class TrainingRepository(TrainingRepositoryPort):
         
         await self.session.commit()
         await self.session.refresh(training_model)
+        dashboard_rollups.mark_trainer(training_model.trainer_id)
+        dashboard_cache.invalidate(training_model.trainer_id)
         return self._to_entity(training_model)
     
     async def delete(self, training_id: UUID) -> bool:
@@ -73,6 +79,8 @@ class TrainingRepository(TrainingRepositoryPort):
         if training_model:
             self.session.delete(training_model)
             # Note: commit will be handled by the controller
+            dashboard_rollups.mark_trainer(training_model.trainer_id)
+            dashboard_cache.invalidate(training_model.trainer_id)
             return True
         return False
     
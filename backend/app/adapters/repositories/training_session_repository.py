@@ -11,6 +11,10 @@ from sqlalchemy import select
 from app.domain.entities.training_session import TrainingSession
 from app.domain.ports.repositories import TrainingSessionRepositoryPort
 from app.infrastructure.models.training_session_model import TrainingSessionModel
+from app.infrastructure.models.training_model import TrainingModel
+from app.infrastructure.models.trainer_model import TrainerModel
+from app.infrastructure.dashboard_cache import dashboard_cache
+from app.infrastructure.dashboard_rollups import dashboard_rollups
 
 
 class TrainingSessionRepository(TrainingSessionRepositoryPort):
@@ -51,6 +55,8 @@ class TrainingSessionRepository(TrainingSessionRepositoryPort):
         self.session.add(model)
         await self.session.commit()
         await self.session.refresh(model)
+        dashboard_rollups.mark_training(model.training_id)
+        await self._invalidate_dashboard(model.training_id)
         return self._model_to_entity(model)
     
     async def get_by_id(self, training_session_id: UUID) -> Optional[TrainingSession]:
@@ -69,6 +75,16 @@ class TrainingSessionRepository(TrainingSessionRepositoryPort):
         model = result.scalar_one_or_none()
         return self._model_to_entity(model) if model else None
     
+    async def get_trainer_email_by_token(self, session_token: str) -> Optional[str]:
+        """Get the email of the trainer owning the session's training (one joined query)"""
+        result = await self.session.execute(
+            select(TrainerModel.email)
+            .join(TrainingModel, TrainingModel.trainer_id == TrainerModel.id)
+            .join(TrainingSessionModel, TrainingSessionModel.training_id == TrainingModel.id)
+            .where(TrainingSessionModel.session_token == session_token)
+        )
+        return result.scalar_one_or_none()
+    
     async def get_by_training_id(self, training_id: UUID) -> List[TrainingSession]:
         """Get all training sessions for a training"""
         result = await self.session.execute(
@@ -96,6 +112,8 @@ class TrainingSessionRepository(TrainingSessionRepositoryPort):
         
         await self.session.commit()
         await self.session.refresh(model)
+        dashboard_rollups.mark_training(model.training_id)
+        await self._invalidate_dashboard(model.training_id)
         return self._model_to_entity(model)
     
     async def delete(self, training_session_id: UUID) -> bool:
@@ -110,4 +128,13 @@ class TrainingSessionRepository(TrainingSessionRepositoryPort):
         
         await self.session.delete(model)
         await self.session.commit()
-        return True
\ No newline at end of file
+        dashboard_rollups.mark_training(model.training_id)
+        await self._invalidate_dashboard(model.training_id)
+        return True
+    
+    async def _invalidate_dashboard(self, training_id: UUID) -> None:
+        """Drop the cached dashboard of the trainer owning the training (lists its sessions)"""
+        result = await self.session.execute(
+            select(TrainingModel.trainer_id).where(TrainingModel.id == training_id)
+        )
+        dashboard_cache.invalidate(result.scalar_one_or_none())
@@ -14,6 +14,7 @@ from datetime import datetime, timezone
 logger = logging.getLogger(__name__)
 
 from app.infrastructure.models.training_slide_model import TrainingSlideModel
+from app.infrastructure.dashboard_rollups import dashboard_rollups
 from app.domain.entities.training_slide import TrainingSlide, SlideType
 
 
@@ -91,6 +92,7 @@ class TrainingSlideRepository:
                 )
             )
             await self.session.commit()
+            dashboard_rollups.mark_slide(slide_id)
             return True
         except Exception:
             await self.session.rollback()
@@ -221,6 +223,7 @@ class TrainingSlideRepository:
         self.session.add(slide_model)
         await self.session.commit()
         await self.session.refresh(slide_model)
+        dashboard_rollups.mark_slide(slide_model.id)
         
         return slide_model
     
@@ -9,6 +9,8 @@ from .slide import Slide
 from .chat_message import ChatMessage
 from .api_log import ApiLog
 from .learner_training_plan import LearnerTrainingPlan
+from .document_chunk import DocumentChunk
+from .conversation_summary import ConversationSummary
 # Temporarily commented out entities that still inherit from Base
 # from .training_module import TrainingModule
 # from .training_submodule import TrainingSubmodule
@@ -23,6 +25,8 @@ __all__ = [
     "ChatMessage",
     "ApiLog",
     "LearnerTrainingPlan",
+    "DocumentChunk",
+    "ConversationSummary",
     # "TrainingModule",
     # "TrainingSubmodule",
     # "TrainingSlide"
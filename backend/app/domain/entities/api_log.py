@@ -24,7 +24,12 @@ class ApiLog:
         tokens_used: Optional[int] = None,
         cost_estimate: Optional[str] = None,
         learner_session_id: Optional[UUID] = None,
-        created_at: Optional[datetime] = None
+        created_at: Optional[datetime] = None,
+        service_type: Optional[str] = None,
+        model: Optional[str] = None,
+        prompt_tokens: Optional[int] = None,
+        candidates_tokens: Optional[int] = None,
+        cached_tokens: Optional[int] = None
     ):
         self.id = api_log_id or uuid4()
         self.service_name = service_name
@@ -38,6 +43,12 @@ class ApiLog:
         self.cost_estimate = cost_estimate
         self.learner_session_id = learner_session_id
         self.created_at = created_at or datetime.utcnow()
+        # Token accounting from the model usage metadata (tokens_used is the total)
+        self.service_type = service_type
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.candidates_tokens = candidates_tokens
+        self.cached_tokens = cached_tokens
         
         # Validate business rules
         self._validate()
@@ -59,8 +70,9 @@ class ApiLog:
         if self.response_time_ms is not None and self.response_time_ms < 0:
             raise ValueError("Response time cannot be negative")
         
-        if self.tokens_used is not None and self.tokens_used < 0:
-            raise ValueError("Tokens used cannot be negative")
+        for tokens in (self.tokens_used, self.prompt_tokens, self.candidates_tokens, self.cached_tokens):
+            if tokens is not None and tokens < 0:
+                raise ValueError("Tokens used cannot be negative")
     
     def is_successful(self) -> bool:
         """Check if the API call was successful"""
@@ -92,6 +104,9 @@ class ApiLog:
             "success": self.is_successful(),
             "response_time_ms": self.response_time_ms,
             "tokens_used": self.tokens_used,
+            "prompt_tokens": self.prompt_tokens,
+            "candidates_tokens": self.candidates_tokens,
+            "cached_tokens": self.cached_tokens,
             "created_at": self.created_at.isoformat() if self.created_at else None
         }
     
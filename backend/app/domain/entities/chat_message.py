@@ -18,11 +18,13 @@ class ChatMessage:
         content: str,
         chat_message_id: Optional[UUID] = None,
         slide_number: Optional[int] = None,
-        created_at: Optional[datetime] = None
+        created_at: Optional[datetime] = None,
+        slide_id: Optional[UUID] = None
     ):
         self.id = chat_message_id or uuid4()
         self.learner_session_id = learner_session_id
         self.slide_number = slide_number
+        self.slide_id = slide_id
         self.message_type = message_type
         self.content = content
         self.created_at = created_at or datetime.utcnow()
@@ -69,6 +71,7 @@ class ChatMessage:
             "type": self.message_type,
             "content": self.content,
             "slide_number": self.slide_number,
+            "slide_id": str(self.slide_id) if self.slide_id else None,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "learner_session_id": str(self.learner_session_id)
         }
\ No newline at end of file
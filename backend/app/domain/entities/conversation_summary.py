@@ -0,0 +1,19 @@
+"""
+FIA v3.0 - Conversation Summary Entity
+Pure domain entity for the rolling summary of a learner's chat history
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+
+@dataclass
+class ConversationSummary:
+    """Summary of every chat message of a learner session up to summarized_until"""
+    
+    learner_session_id: UUID
+    summary: str
+    summarized_until: datetime  # created_at of the last message folded into the summary
+    summarized_messages: int = 0
+    summarized_tokens: int = 0  # Estimated tokens of those messages verbatim
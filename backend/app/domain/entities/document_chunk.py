@@ -0,0 +1,18 @@
+"""
+FIA v3.0 - Document Chunk Entity
+Pure domain entity for locally extracted training document text
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class DocumentChunk:
+    """Retrieval / prompt unit: consecutive text of one page, slide or section"""
+    
+    chunk_index: int
+    location: str  # "page 3", "slide 12", "section 4"
+    section_title: Optional[str]
+    content: str
+    token_count: int
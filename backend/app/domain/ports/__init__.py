@@ -5,7 +5,9 @@ from .repositories import (
     LearnerSessionRepositoryPort,
     SlideRepositoryPort,
     ChatMessageRepositoryPort,
-    ApiLogRepositoryPort
+    ChatMessageWriterPort,
+    ApiLogRepositoryPort,
+    ApiLogWriterPort
 )
 
 from .outbound_ports import (
@@ -22,7 +24,9 @@ __all__ = [
     "LearnerSessionRepositoryPort",
     "SlideRepositoryPort",
     "ChatMessageRepositoryPort",
+    "ChatMessageWriterPort",
     "ApiLogRepositoryPort",
+    "ApiLogWriterPort",
     "GeminiServicePort",
     "EmailServicePort",
     "FileStorageServicePort",
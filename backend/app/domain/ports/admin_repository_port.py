@@ -4,33 +4,57 @@ Pure domain interface without infrastructure dependencies
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.domain.schemas.admin import AdminOverviewParams
 
 
 class AdminRepositoryPort(ABC):
-    """Port for admin repository operations from domain layer"""
+    """Port for admin repository operations from domain layer
+    
+    Overview methods return one page of rows and the total number of rows
+    matching the filters. An unsupported sort column raises ValueError.
+    """
     
     @abstractmethod
-    async def get_trainers_overview_statistics(self) -> List[Dict[str, Any]]:
-        """Get comprehensive overview of all trainers with their statistics"""
+    async def get_trainers_overview_statistics(
+        self,
+        params: AdminOverviewParams,
+        is_active: Optional[bool] = None,
+        trainer_id: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get comprehensive overview of trainers with their statistics"""
         pass
     
     @abstractmethod
-    async def get_trainees_overview_statistics(self) -> List[Dict[str, Any]]:
-        """Get comprehensive overview of all trainees with their learning statistics"""
+    async def get_trainees_overview_statistics(
+        self,
+        params: AdminOverviewParams,
+        level: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get comprehensive overview of trainees with their learning statistics"""
         pass
     
     @abstractmethod
-    async def get_trainings_overview_statistics(self) -> List[Dict[str, Any]]:
-        """Get comprehensive overview of all trainings with their statistics"""
+    async def get_trainings_overview_statistics(
+        self,
+        params: AdminOverviewParams,
+        training_type: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get comprehensive overview of trainings with their statistics"""
         pass
     
     @abstractmethod
-    async def get_sessions_overview_statistics(self) -> List[Dict[str, Any]]:
-        """Get comprehensive overview of all training sessions with their statistics"""
+    async def get_sessions_overview_statistics(
+        self,
+        params: AdminOverviewParams,
+        is_active: Optional[bool] = None,
+        training_type: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get comprehensive overview of training sessions with their statistics"""
         pass
     
     @abstractmethod
     async def get_global_admin_statistics(self) -> Dict[str, Any]:
         """Get global platform statistics for admin dashboard"""
-        pass
\ No newline at end of file
+        pass
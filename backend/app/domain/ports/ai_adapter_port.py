@@ -19,9 +19,10 @@ class AIAdapterPort(ABC):
         context_cache_id: Optional[str] = None,
         temperature: float = 0.7,
         session_id: Optional[str] = None,
-        learner_session_id: Optional[str] = None
+        learner_session_id: Optional[str] = None,
+        service_type: Optional[str] = None
     ) -> str:
-        """Generate content using AI model"""
+        """Generate content using AI model (service_type: usage category, e.g. "slide_generation")"""
         pass
     
     @abstractmethod
@@ -4,7 +4,7 @@ Interface for file storage operations
 """
 
 from abc import ABC, abstractmethod
-from typing import BinaryIO, Tuple
+from typing import BinaryIO, List, Optional, Tuple
 from uuid import UUID
 from pathlib import Path
 
@@ -19,7 +19,8 @@ class FileStoragePort(ABC):
         training_id: UUID,
         file_content: BinaryIO,
         original_filename: str,
-        mime_type: str
+        mime_type: str,
+        content_key: Optional[str] = None
     ) -> Tuple[str, int]:
         """
         Store a training file and return file path and size
@@ -30,6 +31,8 @@ class FileStoragePort(ABC):
             file_content: Binary file content
             original_filename: Original filename with extension
             mime_type: MIME type of the file
+            content_key: Content hash to store the file under (shared
+                "blobs/<content_key>.<ext>" path) instead of a per-training name
             
         Returns:
             Tuple of (file_path, file_size_in_bytes)
@@ -73,4 +76,58 @@ class FileStoragePort(ABC):
         Returns:
             True if file exists, False otherwise
         """
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    async def store_asset(self, key: str, content: bytes, content_type: str) -> int:
+        """
+        Store a generated asset (e.g. a slide image) under a fixed key
+        
+        Assets are immutable: a new version of an asset gets a new key.
+        
+        Args:
+            key: Relative storage key, e.g. "images/slide_images/<session>/<slide>/<hash>.webp"
+            content: Asset bytes
+            content_type: MIME type of the asset
+            
+        Returns:
+            Size of the stored asset in bytes
+        """
+        pass
+    
+    @abstractmethod
+    async def get_asset_path(self, key: str) -> Path:
+        """
+        Get a local path for a stored asset
+        
+        Args:
+            key: Storage key used with store_asset
+            
+        Returns:
+            Path to a local copy of the asset (may not exist for local storage)
+        """
+        pass
+    
+    @abstractmethod
+    async def delete_asset(self, key: str) -> bool:
+        """
+        Delete a stored asset
+        
+        Args:
+            key: Storage key used with store_asset
+            
+        Returns:
+            True if the asset was deleted, False if it didn't exist
+        """
+        pass
+    
+    @abstractmethod
+    async def list_stored_files(self) -> List[Tuple[str, int, str]]:
+        """
+        List everything currently in storage (full scan, for reconciliation only)
+        
+        Returns:
+            List of (key, size_in_bytes, kind) where key is the training file_path
+            or asset key and kind is 'training' or 'asset'
+        """
+        pass
@@ -264,6 +264,14 @@ class LiveConversationServicePort(ABC):
     ) -> bool:
         """Close Live API session"""
         pass
+    
+    @abstractmethod
+    async def find_live_session(
+        self,
+        learner_session_id: UUID
+    ) -> Optional[str]:
+        """Find the Live session ID of a learner, whichever worker serves it"""
+        pass
 
 
 class ImageGenerationServicePort(ABC):
@@ -284,7 +292,7 @@ class ImageGenerationServicePort(ABC):
             
         Returns:
             Dict containing:
-            - image_data: str - Base64 encoded image data
+            - image_bytes: bytes - Decoded PNG image
             - revised_prompt: str - The revised prompt used by OpenAI
             - metadata: Dict - Additional metadata (size, format, etc.)
         """
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from app.domain.entities import (
     Trainer, Training, TrainingSession, LearnerSession,
-    Slide, ChatMessage, ApiLog, LearnerTrainingPlan
+    Slide, ChatMessage, ApiLog, LearnerTrainingPlan, DocumentChunk,
+    ConversationSummary
 )
 
 
@@ -68,6 +70,10 @@ class TrainingSessionRepositoryPort(ABC):
     async def get_by_token(self, session_token: str) -> Optional[TrainingSession]:
         pass
     
+    @abstractmethod
+    async def get_trainer_email_by_token(self, session_token: str) -> Optional[str]:
+        pass
+    
     @abstractmethod
     async def get_by_training_id(self, training_id: UUID) -> List[TrainingSession]:
         pass
@@ -159,17 +165,50 @@ class ChatMessageRepositoryPort(ABC):
     ) -> List[ChatMessage]:
         pass
     
+    @abstractmethod
+    async def create_many(self, chat_messages: List[ChatMessage]) -> int:
+        """Insert messages in one statement and one commit; returns how many were stored"""
+        pass
+    
+    @abstractmethod
+    async def get_after(self, learner_session_id: UUID, after: Optional[datetime] = None) -> List[ChatMessage]:
+        """Every message of a session created after `after`, oldest first"""
+        pass
+    
     @abstractmethod
     async def delete(self, message_id: UUID) -> bool:
         pass
 
 
+class ApiLogWriterPort(ABC):
+    """Write-behind persistence of API call logs (token accounting), off the request path"""
+    
+    @abstractmethod
+    def write(self, api_logs: List[ApiLog]) -> None:
+        """Queue logs for the next batched insert; never raises"""
+        pass
+
+
+class ChatMessageWriterPort(ABC):
+    """Write-behind persistence of chat messages, off the request path"""
+    
+    @abstractmethod
+    def write(self, chat_messages: List[ChatMessage], on_written: Optional[Callable[[], Any]] = None) -> None:
+        """Queue messages for the next batched insert, calling on_written once committed; never raises"""
+        pass
+
+
 class ApiLogRepositoryPort(ABC):
     
     @abstractmethod
     async def create(self, api_log: ApiLog) -> ApiLog:
         pass
     
+    @abstractmethod
+    async def create_many(self, api_logs: List[ApiLog]) -> int:
+        """Insert a batch of logs in one statement"""
+        pass
+    
     @abstractmethod
     async def get_by_id(self, log_id: UUID) -> Optional[ApiLog]:
         pass
@@ -182,6 +221,20 @@ class ApiLogRepositoryPort(ABC):
     async def get_by_operation_type(self, operation_type: str) -> List[ApiLog]:
         pass
     
+    @abstractmethod
+    async def get_usage_by_service_type(
+        self,
+        learner_session_id: UUID,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Token sums per service type of a learner session"""
+        pass
+    
+    @abstractmethod
+    async def get_recent_calls(self, learner_session_id: UUID, limit: int = 10) -> List[ApiLog]:
+        pass
+    
     @abstractmethod
     async def delete(self, log_id: UUID) -> bool:
         pass
@@ -219,4 +272,55 @@ class LearnerTrainingPlanRepositoryPort(ABC):
     
     @abstractmethod
     async def get_plans_with_performance_metrics(self, min_tokens: int = None, max_generation_time: int = None) -> List[LearnerTrainingPlan]:
-        pass
\ No newline at end of file
+        pass
+
+
+class FileBlobRepositoryPort(ABC):
+    """Refcounted mapping between trainings and content-addressed stored files"""
+    
+    @abstractmethod
+    async def acquire(self, sha256: str, training_id: UUID) -> Optional[Tuple[str, int]]:
+        """Reference an existing blob for a training; returns (storage_key, size) or None if unknown"""
+        pass
+    
+    @abstractmethod
+    async def create(self, sha256: str, storage_key: str, size_bytes: int, mime_type: str, training_id: UUID) -> bool:
+        """Record a newly stored blob referenced by a training; False if the hash already exists"""
+        pass
+    
+    @abstractmethod
+    async def release(self, training_id: UUID) -> Tuple[bool, Optional[str]]:
+        """Drop a training's reference; returns (was_referenced, storage_key to delete if it was the last one)"""
+        pass
+
+
+class DocumentChunkRepositoryPort(ABC):
+    """Locally extracted chunks of stored training files, keyed by storage key"""
+    
+    @abstractmethod
+    async def get_chunks(self, storage_key: str) -> List[DocumentChunk]:
+        """All chunks of a file in document order; empty if never extracted"""
+        pass
+    
+    @abstractmethod
+    async def replace_chunks(self, storage_key: str, chunks: List[DocumentChunk]) -> None:
+        """Store the chunks of a file, replacing any previous extraction (skipped while a concurrent one is being stored)"""
+        pass
+    
+    @abstractmethod
+    async def delete_chunks(self, storage_key: str) -> int:
+        """Drop the chunks of a deleted file"""
+        pass
+
+
+class ConversationSummaryRepositoryPort(ABC):
+    """Rolling chat summaries, one per learner session"""
+    
+    @abstractmethod
+    async def get(self, learner_session_id: UUID) -> Optional[ConversationSummary]:
+        pass
+    
+    @abstractmethod
+    async def save(self, summary: ConversationSummary) -> None:
+        """Insert or replace the summary of a session"""
+        pass
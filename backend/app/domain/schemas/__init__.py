@@ -41,6 +41,7 @@ from .chat_message import (
 from .api_log import ApiLogCreate, ApiLogResponse, ApiLogSummary
 from .auth import Token, TokenData, LoginResponse
 from .common import ErrorResponse, SuccessResponse, PaginatedResponse, HealthResponse
+from .admin import AdminOverviewParams, ProfilerStartRequest
 
 __all__ = [
     # Trainer schemas
@@ -93,5 +94,8 @@ __all__ = [
     "Token", "TokenData", "LoginResponse",
     
     # Common schemas
-    "ErrorResponse", "SuccessResponse", "PaginatedResponse", "HealthResponse"
+    "ErrorResponse", "SuccessResponse", "PaginatedResponse", "HealthResponse",
+    
+    # Admin schemas
+    "AdminOverviewParams", "ProfilerStartRequest"
 ]
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+FIA v3.0 - Admin Schemas
+Pydantic schemas for admin dashboard listings
+"""
+
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+
+class AdminOverviewParams(BaseModel):
+    """Pagination, sorting and search of an admin overview listing"""
+    page: int = Field(1, ge=1, description="Page number, starting at 1")
+    per_page: int = Field(50, ge=1, le=100, description="Rows per page")
+    sort: Optional[str] = Field(None, description="Column to sort by (listing default if omitted)")
+    order: Optional[Literal["asc", "desc"]] = Field(None, description="Sort direction")
+    search: Optional[str] = Field(None, max_length=100, description="Case-insensitive text search")
+
+    @property
+    def offset(self) -> int:
+        return (self.page - 1) * self.per_page
+
+
+class ProfilerStartRequest(BaseModel):
+    """Requests to profile and sampling rate of an on-demand profiling session"""
+    route_pattern: str = Field("*", min_length=1, max_length=200, description="Glob on the request path, e.g. /api/slides/*")
+    sample_percent: float = Field(100.0, gt=0, le=100, description="Percentage of matching requests profiled")
+    duration_seconds: int = Field(60, ge=1, description="Session length in seconds (capped by PROFILER_MAX_DURATION_SECONDS)")
+    interval_ms: float = Field(10.0, ge=1, le=1000, description="Sampling interval, raised automatically to respect the overhead cap")
@@ -19,7 +19,10 @@ class ImageGenerationRequest(BaseModel):
 class ImageGenerationResponse(BaseModel):
     """Schema for image generation response"""
     success: bool = Field(..., description="Whether generation was successful")
-    image_data: Optional[str] = Field(None, description="Base64 encoded image data")
+    image_url: Optional[str] = Field(None, description="URL of the generated image (WebP when available)")
+    thumbnail_url: Optional[str] = Field(None, description="URL of a small thumbnail of the image")
+    original_url: Optional[str] = Field(None, description="URL of the original PNG image")
+    image_data: Optional[str] = Field(None, description="Base64 encoded image data (only when the image could not be stored)")
     revised_prompt: Optional[str] = Field(None, description="The revised prompt used by OpenAI")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Image metadata (size, format, etc.)")
     generation_time_seconds: float = Field(..., description="Time taken to generate image")
@@ -19,6 +19,7 @@ class TokenUsageSummary(BaseModel):
     total_tokens: int = Field(..., description="Total tokens consumed")
     input_tokens: int = Field(..., description="Total input tokens")
     output_tokens: int = Field(..., description="Total output tokens")
+    cached_tokens: int = Field(0, description="Input tokens served from the context cache")
     total_calls: int = Field(..., description="Total number of AI calls")
     session_duration_seconds: Optional[float] = Field(None, description="Session duration in seconds")
 
@@ -27,6 +28,7 @@ class ServiceTypeUsage(BaseModel):
     """Token usage statistics for a specific service type"""
     input_tokens: int = Field(..., description="Input tokens for this service type")
     output_tokens: int = Field(..., description="Output tokens for this service type")
+    cached_tokens: int = Field(0, description="Cached input tokens for this service type")
     calls: int = Field(..., description="Number of calls for this service type")
     service_names: List[str] = Field(..., description="List of service names in this category")
 
@@ -49,12 +51,14 @@ class RecentCall(BaseModel):
     timestamp: str = Field(..., description="Timestamp of the call in ISO format")
     input_tokens: int = Field(..., description="Input tokens used")
     output_tokens: int = Field(..., description="Output tokens generated")
+    cached_tokens: int = Field(0, description="Cached input tokens")
+    model: Optional[str] = Field(None, description="Model the call was sent to")
     processing_time: float = Field(..., description="Processing time in seconds")
 
 
 class TokenUsageMetadata(BaseModel):
     """Metadata about token usage data"""
-    data_source: str = Field(..., description="Source of the data (e.g., application_logs)")
+    data_source: str = Field(..., description="Source of the data (e.g., api_logs)")
     estimation_accuracy: str = Field(..., description="Accuracy level (high/estimated)")
 
 
@@ -4,9 +4,12 @@ Business logic for admin dashboard statistics and trainer overview
 """
 
 import logging
-from typing import List, Dict, Any
+import math
+from typing import List, Dict, Any, Optional
 
 from app.domain.ports.admin_repository_port import AdminRepositoryPort
+from app.domain.schemas.admin import AdminOverviewParams
+from app.domain.schemas.common import PaginatedResponse
 
 
 logger = logging.getLogger(__name__)
@@ -18,81 +21,123 @@ class AdminDashboardService:
     def __init__(self, admin_repository: AdminRepositoryPort):
         self.admin_repository = admin_repository
     
-    async def get_trainers_overview(self) -> List[Dict[str, Any]]:
+    async def get_trainers_overview(
+        self,
+        params: AdminOverviewParams,
+        is_active: Optional[bool] = None
+    ) -> PaginatedResponse:
         """
-        Get comprehensive overview of all trainers with their statistics
+        Get comprehensive overview of trainers with their statistics
         
+        Args:
+            params: Page, sort and search of the listing
+            is_active: Only active (True) or inactive (False) trainers
+            
         Returns:
-            List of trainer dictionaries with complete statistics
+            Page of trainer dictionaries with complete statistics
         """
         try:
-            logger.info("Fetching trainers overview statistics")
+            logger.info(f"Fetching trainers overview statistics (page {params.page})")
             
-            trainers_stats = await self.admin_repository.get_trainers_overview_statistics()
+            trainers_stats, total = await self.admin_repository.get_trainers_overview_statistics(
+                params, is_active=is_active
+            )
             
-            logger.info(f"Successfully retrieved statistics for {len(trainers_stats)} trainers")
+            logger.info(f"Successfully retrieved statistics for {len(trainers_stats)} of {total} trainers")
             
-            return trainers_stats
+            return self._page(trainers_stats, total, params)
             
         except Exception as e:
             logger.error(f"Failed to get trainers overview: {str(e)}")
             raise
     
-    async def get_trainees_overview(self) -> List[Dict[str, Any]]:
+    async def get_trainees_overview(
+        self,
+        params: AdminOverviewParams,
+        level: Optional[str] = None
+    ) -> PaginatedResponse:
         """
-        Get comprehensive overview of all trainees with their learning statistics
+        Get comprehensive overview of trainees with their learning statistics
         
+        Args:
+            params: Page, sort and search of the listing
+            level: Only trainees with this experience level
+            
         Returns:
-            List of trainee dictionaries with complete learning statistics
+            Page of trainee dictionaries with complete learning statistics
         """
         try:
-            logger.info("Fetching trainees overview statistics")
+            logger.info(f"Fetching trainees overview statistics (page {params.page})")
             
-            trainees_stats = await self.admin_repository.get_trainees_overview_statistics()
+            trainees_stats, total = await self.admin_repository.get_trainees_overview_statistics(
+                params, level=level
+            )
             
-            logger.info(f"Successfully retrieved statistics for {len(trainees_stats)} trainees")
+            logger.info(f"Successfully retrieved statistics for {len(trainees_stats)} of {total} trainees")
             
-            return trainees_stats
+            return self._page(trainees_stats, total, params)
             
         except Exception as e:
             logger.error(f"Failed to get trainees overview: {str(e)}")
             raise
     
-    async def get_trainings_overview(self) -> List[Dict[str, Any]]:
+    async def get_trainings_overview(
+        self,
+        params: AdminOverviewParams,
+        training_type: Optional[str] = None
+    ) -> PaginatedResponse:
         """
-        Get comprehensive overview of all trainings with their statistics
+        Get comprehensive overview of trainings with their statistics
         
+        Args:
+            params: Page, sort and search of the listing
+            training_type: Only 'IA' or 'Humain' trainings
+            
         Returns:
-            List of training dictionaries with complete statistics
+            Page of training dictionaries with complete statistics
         """
         try:
-            logger.info("Fetching trainings overview statistics")
+            logger.info(f"Fetching trainings overview statistics (page {params.page})")
             
-            trainings_stats = await self.admin_repository.get_trainings_overview_statistics()
+            trainings_stats, total = await self.admin_repository.get_trainings_overview_statistics(
+                params, training_type=training_type
+            )
             
-            logger.info(f"Successfully retrieved statistics for {len(trainings_stats)} trainings")
+            logger.info(f"Successfully retrieved statistics for {len(trainings_stats)} of {total} trainings")
             
-            return trainings_stats
+            return self._page(trainings_stats, total, params)
             
         except Exception as e:
             logger.error(f"Failed to get trainings overview: {str(e)}")
             raise
     
-    async def get_sessions_overview(self) -> List[Dict[str, Any]]:
+    async def get_sessions_overview(
+        self,
+        params: AdminOverviewParams,
+        is_active: Optional[bool] = None,
+        training_type: Optional[str] = None
+    ) -> PaginatedResponse:
         """
-        Get comprehensive overview of all training sessions with their statistics
+        Get comprehensive overview of training sessions with their statistics
         
+        Args:
+            params: Page, sort and search of the listing
+            is_active: Only active (True) or inactive (False) sessions
+            training_type: Only sessions of 'IA' or 'Humain' trainings
+            
         Returns:
-            List of session dictionaries with complete statistics
+            Page of session dictionaries with complete statistics
         """
         try:
-            logger.info("Fetching sessions overview statistics")
+            logger.info(f"Fetching sessions overview statistics (page {params.page})")
             
-            sessions_stats = await self.admin_repository.get_sessions_overview_statistics()
+            sessions_stats, total = await self.admin_repository.get_sessions_overview_statistics(
+                params, is_active=is_active, training_type=training_type
+            )
             
-            logger.info(f"Successfully retrieved statistics for {len(sessions_stats)} sessions")
+            logger.info(f"Successfully retrieved statistics for {len(sessions_stats)} of {total} sessions")
             
-            return sessions_stats
+            return self._page(sessions_stats, total, params)
             
         except Exception as e:
             logger.error(f"Failed to get sessions overview: {str(e)}")
@@ -131,15 +176,14 @@ class AdminDashboardService:
         try:
             logger.info(f"Fetching detailed statistics for trainer {trainer_id}")
             
-            # For now, get the trainer from the overview and return it
+            # For now, get the trainer row of the overview and return it
             # In the future, this could be expanded with more detailed metrics
-            trainers_overview = await self.admin_repository.get_trainers_overview_statistics()
-            
-            trainer_stats = next(
-                (trainer for trainer in trainers_overview if trainer['id'] == trainer_id),
-                None
+            trainers_overview, _ = await self.admin_repository.get_trainers_overview_statistics(
+                AdminOverviewParams(per_page=1), trainer_id=trainer_id
             )
             
+            trainer_stats = trainers_overview[0] if trainers_overview else None
+            
             if not trainer_stats:
                 raise ValueError(f"Trainer with ID {trainer_id} not found")
             
@@ -199,4 +243,13 @@ class AdminDashboardService:
             
         except Exception as e:
             logger.error(f"Failed to get platform health metrics: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+    
+    def _page(self, items: List[Dict[str, Any]], total: int, params: AdminOverviewParams) -> PaginatedResponse:
+        return PaginatedResponse(
+            items=items,
+            total=total,
+            page=params.page,
+            per_page=params.per_page,
+            total_pages=math.ceil(total / params.per_page)
+        )
@@ -3,15 +3,17 @@ FIA v3.0 - Chat History Service
 Service for managing chat message history storage using decorator pattern
 """
 
+import functools
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, List, Optional
 from uuid import UUID
 from datetime import datetime
 
 from app.domain.entities.chat_message import ChatMessage
-from app.domain.ports.repositories import ChatMessageRepositoryPort
+from app.domain.ports.repositories import ChatMessageRepositoryPort, ChatMessageWriterPort
 from app.domain.services.conversation_service import ConversationService
-from app.domain.schemas.conversation import ChatRequest, ChatResponse
+from app.domain.services.conversation_memory_service import ConversationMemoryService
+from app.domain.schemas.conversation import ChatRequest, ChatResponse, ConversationMessage
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +30,10 @@ class ChatHistoryService:
     def __init__(
         self, 
         conversation_service: ConversationService,
-        chat_message_repository: ChatMessageRepositoryPort
+        chat_message_repository: ChatMessageRepositoryPort,
+        conversation_memory: Optional[ConversationMemoryService] = None,
+        on_turn_stored: Optional[Callable[[UUID], None]] = None,
+        message_writer: Optional[ChatMessageWriterPort] = None
     ):
         """
         Initialize chat history service
@@ -36,9 +41,15 @@ class ChatHistoryService:
         Args:
             conversation_service: Core conversation service to wrap
             chat_message_repository: Repository for storing chat messages
+            conversation_memory: Builds prompt history from stored messages (client history used without it)
+            on_turn_stored: Called with the learner session id after each stored turn (summary refresh)
+            message_writer: Write-behind batching of message inserts (direct inserts without it)
         """
         self.conversation_service = conversation_service
         self.chat_message_repository = chat_message_repository
+        self.conversation_memory = conversation_memory
+        self.on_turn_stored = on_turn_stored
+        self.message_writer = message_writer
         logger.info("💬 CHAT_HISTORY [SERVICE] Initialized with decorator pattern")
     
     async def handle_learner_chat_with_history(
@@ -56,43 +67,31 @@ class ChatHistoryService:
         Returns:
             ChatResponse with AI-generated response
         """
-        try:
-            learner_session_id = chat_request.context.learner_session_id
-            current_slide_id = getattr(chat_request.context, 'current_slide_id', None)
-            
-            logger.info(f"💬 CHAT_HISTORY [START] Processing {conversation_type} chat for learner session {learner_session_id}")
-            
-            # Store user message/question
-            await self._store_user_message(
-                learner_session_id=learner_session_id,
-                message_content=chat_request.message,
-                conversation_type=conversation_type,
-                slide_id=current_slide_id
-            )
-            
-            # Process with wrapped conversation service
-            chat_response = await self.conversation_service.handle_learner_chat(chat_request)
-            
-            # Store AI response
-            await self._store_ai_response(
-                learner_session_id=learner_session_id,
-                response_content=chat_response.response,
-                conversation_type=conversation_type,
-                slide_id=current_slide_id,
-                confidence_score=chat_response.confidence_score
-            )
-            
-            logger.info(f"✅ CHAT_HISTORY [SUCCESS] Stored {conversation_type} conversation for learner session {learner_session_id}")
-            return chat_response
-            
-        except Exception as e:
-            logger.error(f"❌ CHAT_HISTORY [ERROR] Failed to process chat with history: {str(e)}")
-            # Still return the response even if history storage fails
-            try:
-                return await self.conversation_service.handle_learner_chat(chat_request)
-            except Exception as inner_e:
-                logger.error(f"❌ CHAT_HISTORY [CRITICAL] Core conversation service also failed: {str(inner_e)}")
-                raise inner_e
+        learner_session_id = chat_request.context.learner_session_id
+        current_slide_id = getattr(chat_request.context, 'current_slide_id', None)
+        
+        logger.info(f"💬 CHAT_HISTORY [START] Processing {conversation_type} chat for learner session {learner_session_id}")
+        
+        # Server-side history (loaded before the new question is stored)
+        chat_request, memory_stats = await self._with_server_history(chat_request)
+        
+        # Built before the AI call so the question keeps its timestamp
+        user_message = self._build_message(learner_session_id, "question", chat_request.message, current_slide_id)
+        
+        # Single AI call: storage problems below never trigger another one
+        chat_response = await self.conversation_service.handle_learner_chat(chat_request)
+        
+        # Question and answer are persisted together, off the request path
+        await self._persist([
+            user_message,
+            self._build_message(learner_session_id, "answer", chat_response.response, current_slide_id)
+        ], turn_of=learner_session_id)
+        
+        if memory_stats:
+            chat_response.metadata = {**(chat_response.metadata or {}), "conversation_memory": memory_stats}
+        
+        logger.info(f"✅ CHAT_HISTORY [SUCCESS] Stored {conversation_type} conversation for learner session {learner_session_id}")
+        return chat_response
     
     async def handle_contextual_action_with_history(
         self,
@@ -119,20 +118,13 @@ class ChatHistoryService:
         Returns:
             ChatResponse with AI-generated response
         """
+        logger.info(f"💬 CHAT_HISTORY [CONTEXTUAL] Processing {action_type} action for learner session {learner_session_id}")
+        
+        # The contextual action is stored as a user "question"
+        contextual_question = f"[{action_type.upper()}] {slide_title}"
+        user_message = self._build_message(learner_session_id, "question", contextual_question, current_slide_id)
+        
         try:
-            logger.info(f"💬 CHAT_HISTORY [CONTEXTUAL] Processing {action_type} action for learner session {learner_session_id}")
-            
-            # Create a contextual question for history
-            contextual_question = f"[{action_type.upper()}] {slide_title}"
-            
-            # Store the contextual action as a user "question"
-            await self._store_user_message(
-                learner_session_id=learner_session_id,
-                message_content=contextual_question,
-                conversation_type=action_type,
-                slide_id=current_slide_id
-            )
-            
             # Call the specific adapter method
             response_data = await conversation_adapter_method(
                 slide_content=slide_content,
@@ -149,68 +141,87 @@ class ChatHistoryService:
                 related_concepts=response_data["related_concepts"],
                 metadata=response_data["metadata"]
             )
-            
-            # Store AI response
-            await self._store_ai_response(
-                learner_session_id=learner_session_id,
-                response_content=chat_response.response,
-                conversation_type=action_type,
-                slide_id=current_slide_id,
-                confidence_score=chat_response.confidence_score
-            )
-            
-            logger.info(f"✅ CHAT_HISTORY [CONTEXTUAL] Stored {action_type} action for learner session {learner_session_id}")
-            return chat_response
-            
         except Exception as e:
             logger.error(f"❌ CHAT_HISTORY [CONTEXTUAL_ERROR] Failed to process {action_type} with history: {str(e)}")
+            await self._persist([user_message])
             raise e
+        
+        await self._persist([
+            user_message,
+            self._build_message(learner_session_id, "answer", chat_response.response, current_slide_id)
+        ], turn_of=learner_session_id)
+        
+        logger.info(f"✅ CHAT_HISTORY [CONTEXTUAL] Stored {action_type} action for learner session {learner_session_id}")
+        return chat_response
     
-    async def _store_user_message(
-        self,
-        learner_session_id: UUID,
-        message_content: str,
-        conversation_type: str,
-        slide_id: Optional[int] = None
-    ) -> None:
-        """Store user message in chat history"""
+    async def _with_server_history(self, chat_request: ChatRequest) -> tuple[ChatRequest, Optional[Dict[str, int]]]:
+        """Replace the client-sent history with the stored summary and recent messages"""
+        if not self.conversation_memory:
+            return chat_request, None
+        
+        learner_session_id = chat_request.context.learner_session_id
         try:
-            user_message = ChatMessage(
-                learner_session_id=learner_session_id,
-                message_type="question",
-                content=message_content,
-                slide_number=slide_id
-            )
-            
-            await self.chat_message_repository.create(user_message)
-            logger.debug(f"📝 CHAT_HISTORY [USER_MSG] Stored user message: {message_content[:50]}...")
-            
+            window = await self.conversation_memory.load_history(learner_session_id)
         except Exception as e:
-            logger.error(f"❌ CHAT_HISTORY [USER_MSG_ERROR] Failed to store user message: {str(e)}")
-            # Don't raise - history storage failure shouldn't block conversation
+            logger.warning(f"⚠️ CHAT_HISTORY [MEMORY] Falling back to client history: {str(e)}")
+            return chat_request, None
+        
+        history = [ConversationMessage(**message) for message in window.to_conversation_history()]
+        context = chat_request.context.model_copy(update={"conversation_history": history})
+        
+        stats = window.get_stats()
+        saved_percent = (window.saved_tokens / window.verbatim_tokens * 100) if window.verbatim_tokens else 0
+        logger.info(
+            f"🧠 CHAT_MEMORY [BUDGET] {learner_session_id} - {window.history_tokens} history tokens "
+            f"({'summary + ' if window.summary else ''}{len(window.messages)} messages) instead of "
+            f"{window.verbatim_tokens} verbatim, saved {window.saved_tokens} ({saved_percent:.0f}%)"
+        )
+        return chat_request.model_copy(update={"context": context}), stats
     
-    async def _store_ai_response(
+    def _build_message(
         self,
         learner_session_id: UUID,
-        response_content: str,
-        conversation_type: str,
-        slide_id: Optional[int] = None,
-        confidence_score: float = 0.8
-    ) -> None:
-        """Store AI response in chat history"""
+        message_type: str,
+        content: str,
+        slide_id: Optional[Any] = None
+    ) -> Optional[ChatMessage]:
+        """Chat message entity, None if it cannot be stored (e.g. empty content)"""
         try:
-            ai_message = ChatMessage(
+            return ChatMessage(
                 learner_session_id=learner_session_id,
-                message_type="answer",
-                content=response_content,
-                slide_number=slide_id
+                message_type=message_type,
+                content=content[:2000],
+                # The chat context carries the training slide UUID, contextual actions a number
+                slide_number=slide_id if isinstance(slide_id, int) else None,
+                slide_id=slide_id if isinstance(slide_id, UUID) else None
             )
-            
-            await self.chat_message_repository.create(ai_message)
-            logger.debug(f"🤖 CHAT_HISTORY [AI_MSG] Stored AI response: {response_content[:50]}...")
-            
         except Exception as e:
-            logger.error(f"❌ CHAT_HISTORY [AI_MSG_ERROR] Failed to store AI response: {str(e)}")
+            logger.error(f"❌ CHAT_HISTORY [MESSAGE_ERROR] Invalid {message_type} message not stored: {str(e)}")
+            return None
+    
+    async def _persist(self, messages: List[Optional[ChatMessage]], turn_of: Optional[UUID] = None) -> None:
+        """
+        Store messages through the write-behind writer (or directly); never raises
+        
+        For a complete turn (`turn_of` set), on_turn_stored runs once the
+        messages are committed, so the summary refresh sees them.
+        """
+        messages = [message for message in messages if message is not None]
+        if not messages:
+            return
+        on_written = None
+        if turn_of is not None and self.on_turn_stored:
+            on_written = functools.partial(self.on_turn_stored, turn_of)
+        try:
+            if self.message_writer:
+                self.message_writer.write(messages, on_written=on_written)
+            else:
+                await self.chat_message_repository.create_many(messages)
+                if on_written:
+                    on_written()
+            logger.debug(f"📝 CHAT_HISTORY [STORE] {len(messages)} messages queued for storage")
+        except Exception as e:
+            logger.error(f"❌ CHAT_HISTORY [STORE_ERROR] Failed to store {len(messages)} messages: {str(e)}")
             # Don't raise - history storage failure shouldn't block conversation
     
     async def get_chat_history(
@@ -0,0 +1,157 @@
+"""
+FIA v3.0 - Conversation Memory Service
+Server-side chat history for prompts: rolling summary + recent messages under a token budget
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.domain.entities.chat_message import ChatMessage
+from app.domain.entities.conversation_summary import ConversationSummary
+from app.domain.ports.repositories import ChatMessageRepositoryPort, ConversationSummaryRepositoryPort
+from app.domain.services.document_extraction_service import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConversationWindow:
+    """What a chat prompt gets of the past conversation"""
+
+    summary: Optional[str] = None
+    messages: List[ChatMessage] = field(default_factory=list)
+    history_tokens: int = 0  # Estimated tokens actually sent
+    verbatim_tokens: int = 0  # Estimated tokens of the same history sent verbatim
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.verbatim_tokens - self.history_tokens)
+
+    def to_conversation_history(self) -> List[Dict[str, Any]]:
+        """Messages in the ConversationMessage shape, the summary first as a "system" message"""
+        history = [{"role": "system", "content": self.summary}] if self.summary else []
+        history.extend(
+            {
+                "role": "user" if message.is_question() else "assistant",
+                "content": message.content,
+                "timestamp": message.created_at.isoformat() if message.created_at else None
+            }
+            for message in self.messages
+        )
+        return history
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "history_tokens": self.history_tokens,
+            "verbatim_tokens": self.verbatim_tokens,
+            "saved_tokens": self.saved_tokens,
+            "recent_messages": len(self.messages),
+            "has_summary": int(bool(self.summary))
+        }
+
+
+class ConversationMemoryService:
+    """
+    Builds chat history from the stored messages instead of what the client sends
+
+    Messages older than the recent window are folded into a per-session summary
+    every `summarize_every_turns` question/answer pairs (by the caller, in the
+    background). Prompts get the summary plus the newest unsummarized messages
+    that fit the token budget, including those already past the recent window
+    but not folded yet.
+    """
+
+    def __init__(
+        self,
+        chat_message_repository: ChatMessageRepositoryPort,
+        summary_repository: ConversationSummaryRepositoryPort,
+        token_budget: int = 1500,
+        recent_messages: int = 10,
+        summarize_every_turns: int = 5
+    ):
+        self.chat_message_repository = chat_message_repository
+        self.summary_repository = summary_repository
+        self.token_budget = token_budget
+        self.recent_messages = recent_messages
+        self.summarize_every_turns = summarize_every_turns
+
+    async def load_history(self, learner_session_id: UUID) -> ConversationWindow:
+        """Summary and unsummarized messages of a session, within the token budget (2 queries)"""
+        summary = await self.summary_repository.get(learner_session_id)
+        # Few rows: the summarizer folds them every summarize_every_turns turns past the recent window
+        messages = await self.chat_message_repository.get_after(
+            learner_session_id,
+            after=summary.summarized_until if summary else None
+        )
+        return self.fit_budget(summary, messages, self.token_budget)
+
+    @staticmethod
+    def fit_budget(
+        summary: Optional[ConversationSummary],
+        messages: List[ChatMessage],
+        token_budget: int
+    ) -> ConversationWindow:
+        """Summary (at most half the budget) then the newest messages that still fit"""
+        summary_text = None
+        used = 0
+        if summary and summary.summary:
+            summary_text = summary.summary
+            if estimate_tokens(summary_text) > token_budget // 2:
+                summary_text = summary_text[:(token_budget // 2) * 4].rsplit(" ", 1)[0] + " …"
+            used = estimate_tokens(summary_text)
+
+        kept: List[ChatMessage] = []
+        for message in reversed(messages):
+            tokens = estimate_tokens(message.content)
+            if used + tokens > token_budget:
+                break
+            kept.append(message)
+            used += tokens
+        kept.reverse()
+
+        verbatim = (summary.summarized_tokens if summary else 0) + sum(estimate_tokens(m.content) for m in messages)
+        return ConversationWindow(summary=summary_text, messages=kept, history_tokens=used, verbatim_tokens=verbatim)
+
+    def needs_summary(self, pending_messages: int) -> bool:
+        """True once the messages past the recent window reach `summarize_every_turns` turns"""
+        if self.summarize_every_turns <= 0:
+            return False
+        return pending_messages - self.recent_messages >= 2 * self.summarize_every_turns
+
+    async def get_messages_to_summarize(
+        self, learner_session_id: UUID
+    ) -> Optional[Tuple[Optional[ConversationSummary], List[ChatMessage]]]:
+        """Current summary and the unsummarized messages older than the recent window, None if not due"""
+        summary = await self.summary_repository.get(learner_session_id)
+        pending = await self.chat_message_repository.get_after(
+            learner_session_id,
+            after=summary.summarized_until if summary else None
+        )
+        if not self.needs_summary(len(pending)):
+            return None
+        return summary, pending[:-self.recent_messages] if self.recent_messages else pending
+
+    async def save_summary(
+        self,
+        learner_session_id: UUID,
+        previous: Optional[ConversationSummary],
+        folded_messages: List[ChatMessage],
+        summary_text: str
+    ) -> ConversationSummary:
+        """Store the new summary covering the previous one plus the folded messages"""
+        summary = ConversationSummary(
+            learner_session_id=learner_session_id,
+            summary=summary_text.strip(),
+            summarized_until=folded_messages[-1].created_at,
+            summarized_messages=(previous.summarized_messages if previous else 0) + len(folded_messages),
+            summarized_tokens=(previous.summarized_tokens if previous else 0)
+                + sum(estimate_tokens(m.content) for m in folded_messages)
+        )
+        await self.summary_repository.save(summary)
+        logger.info(
+            f"🧠 CHAT_MEMORY [SUMMARY] {learner_session_id} - {summary.summarized_messages} messages "
+            f"({summary.summarized_tokens} tokens) summarized in {estimate_tokens(summary.summary)} tokens"
+        )
+        return summary
@@ -5,7 +5,9 @@ Service centralisé pour construire tous les prompts de conversation et chat IA
 
 import logging
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from app.domain.services.prompt_builder import format_source_passages
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +26,8 @@ class ConversationPromptBuilder:
         slide_content: str,
         slide_title: str,
         slide_type: str,
-        learner_profile: Any
+        learner_profile: Any,
+        source_passages: Optional[str] = None
     ) -> str:
         """
         Construire le prompt de réponse aux messages avec enrichissement profil
@@ -36,6 +39,7 @@ class ConversationPromptBuilder:
             slide_title: Titre de la slide courante
             slide_type: Type de la slide courante
             learner_profile: Profil de l'apprenant
+            source_passages: Extraits du support de formation les plus pertinents pour le message
             
         Returns:
             Prompt formaté pour la réponse conversationnelle
@@ -46,6 +50,10 @@ class ConversationPromptBuilder:
         profile_info = self._extract_profile_info(learner_profile)
         enriched_profile = self._extract_enriched_profile(learner_profile)
         history_text = self._format_conversation_history(conversation_history)
+        source_section = format_source_passages(
+            source_passages,
+            "Extraits du support du formateur liés au message ; fonde ta réponse dessus quand ils sont pertinents :"
+        )
         
         prompt =f"""
 <ROLE>
@@ -69,7 +77,7 @@ Titre : {slide_title}
 Type de slide : {slide_type}
 Contenu : {slide_content}
 </SLIDE_COURANT>
-
+{source_section}
 <TYPE_DE_REPONSE>
 - Type de slide = "plan/stage/module/" : Présente le déroulé du module, crée de l’engagement, relie aux objectifs de l’apprenant.
 - Type de slide = "content" : Reformule ou simplifie, illustre par un exemple concret, met en valeur les points clés, fait le lien avec le métier de l’apprenant.
@@ -358,6 +366,62 @@ Extrait maintanant de manière très synthétique le plus important à retenir s
         logger.info(f"✅ CONVERSATION PROMPT BUILDER [KEY_POINTS] Prompt built - {len(prompt)} characters")
         return prompt
     
+    def build_conversation_summary_prompt(
+        self,
+        previous_summary: Optional[str],
+        messages: List[Dict[str, Any]]
+    ) -> str:
+        """
+        Construire le prompt de résumé glissant de la conversation
+        
+        Args:
+            previous_summary: Résumé déjà établi des échanges plus anciens
+            messages: Messages à intégrer au résumé (role, content), du plus ancien au plus récent
+            
+        Returns:
+            Prompt formaté pour la mise à jour du résumé
+        """
+        logger.info(f"💬 CONVERSATION PROMPT BUILDER [SUMMARY] Building summary prompt for {len(messages)} messages")
+        
+        exchanges = "\n".join(
+            f"{'Apprenant' if msg['role'] == 'user' else 'Formateur IA'}: {msg['content']}"
+            for msg in messages
+        )
+        
+        prompt = f"""
+<ROLE>
+Tu es un assistant qui tient à jour la mémoire d'une conversation entre un apprenant et son formateur IA.
+</ROLE>
+
+<OBJECTIF>
+Mettre à jour le [RÉSUMÉ EXISTANT] avec les [NOUVEAUX ÉCHANGES] pour que le formateur puisse poursuivre la conversation sans relire tout l'historique.
+</OBJECTIF>
+
+<RÉSUMÉ_EXISTANT>
+{previous_summary or "Aucun résumé pour l'instant"}
+</RÉSUMÉ_EXISTANT>
+
+<NOUVEAUX_ÉCHANGES>
+{exchanges}
+</NOUVEAUX_ÉCHANGES>
+
+<CONSIGNES>
+- Conserve les questions posées, les notions expliquées, les difficultés et les centres d'intérêt de l'apprenant
+- Supprime les formules de politesse et les répétitions
+- 150 mots maximum, à la troisième personne, dans la langue de la conversation
+</CONSIGNES>
+
+<STRUCTURE_JSON_ATTENDUE>
+Réponds en format JSON avec cette structure exacte :
+{{
+  "summary": "Le résumé mis à jour"
+}}
+</STRUCTURE_JSON_ATTENDUE>
+"""
+        
+        logger.info(f"✅ CONVERSATION PROMPT BUILDER [SUMMARY] Prompt built - {len(prompt)} characters")
+        return prompt
+    
     # ===== Méthodes privées communes =====
     
     def _extract_profile_info(self, learner_profile: Any) -> Dict[str, str]:
@@ -414,8 +478,14 @@ Extrait maintanant de manière très synthétique le plus important à retenir s
         if not conversation_history:
             return "Pas d'historique de conversation"
         
+        # Résumé glissant des échanges plus anciens (message "system" de l'historique serveur)
+        summaries = [msg["content"] for msg in conversation_history if msg["role"] == "system"]
+        messages = [msg for msg in conversation_history if msg["role"] != "system"]
+        
         history_text = ""
-        for msg in conversation_history[-10:]:  # Derniers 10 messages pour le contexte
+        if summaries:
+            history_text += f"Résumé des échanges précédents : {summaries[-1]}\n\n"
+        for msg in messages[-10:]:  # Derniers 10 messages pour le contexte
             role = "Apprenant" if msg["role"] == "user" else "Formateur IA"
             history_text += f"{role}: {msg['content']}\n"
         
@@ -453,6 +523,12 @@ Extrait maintanant de manière très synthétique le plus important à retenir s
                 "method": "build_key_points_prompt",
                 "output_format": "JSON avec points prioritaires",
                 "features": ["synthesis", "prioritization"]
+            },
+            "conversation_summary": {
+                "description": "Prompt pour mettre à jour le résumé glissant de la conversation",
+                "method": "build_conversation_summary_prompt",
+                "output_format": "JSON avec summary",
+                "features": ["conversation_memory", "summarization"]
             }
         }
     
@@ -472,7 +548,8 @@ Extrait maintanant de manière très synthétique le plus important à retenir s
             "slide_commentary": ["slide_content", "slide_title", "learner_profile"],
             "example_generation": ["slide_content", "slide_title", "learner_profile"],
             "comprehension_question": ["slide_content", "slide_title", "learner_profile"],
-            "key_points": ["slide_content", "slide_title", "learner_profile"]
+            "key_points": ["slide_content", "slide_title", "learner_profile"],
+            "conversation_summary": ["messages"]
         }
         
         if prompt_type not in required_params:
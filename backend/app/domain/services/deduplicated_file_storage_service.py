@@ -0,0 +1,100 @@
+"""
+FIA v3.0 - Deduplicated File Storage Service
+Content-addressed storage of training files shared between trainings
+"""
+
+import asyncio
+import logging
+from typing import BinaryIO, Tuple
+from uuid import UUID
+
+from app.domain.ports.file_storage import FileStoragePort
+from app.domain.ports.repositories import FileBlobRepositoryPort
+
+logger = logging.getLogger(__name__)
+
+# Attempts when a blob with the same hash is being created or released concurrently
+MAX_ACQUIRE_ATTEMPTS = 3
+
+
+class DeduplicatedFileStorageService:
+    """
+    Store each distinct file content once, whatever the number of trainings
+
+    Blobs are stored under their SHA-256 and trainings reference them through
+    the refcounted mapping of the blob repository, whose changes are committed
+    by the caller with the training. Their `file_path` is the blob's storage key, so
+    everything keyed by path (document analysis, Gemini context caches, the
+    local R2 cache) is naturally shared by every training using that file.
+    """
+
+    def __init__(self, file_storage: FileStoragePort, blob_repository: FileBlobRepositoryPort):
+        self.file_storage = file_storage
+        self.blob_repository = blob_repository
+
+    async def store_training_file(
+        self,
+        trainer_id: UUID,
+        training_id: UUID,
+        sha256: str,
+        file_content: BinaryIO,
+        original_filename: str,
+        mime_type: str
+    ) -> Tuple[str, int, bool]:
+        """
+        Reference an existing blob with this hash or store the content as a new one
+
+        Args:
+            sha256: Hex SHA-256 of the content, computed before the call
+            file_content: Content stream, only read when the blob is new
+
+        Returns:
+            Tuple of (file_path, file_size_in_bytes, reused_existing_blob)
+        """
+        for attempt in range(MAX_ACQUIRE_ATTEMPTS):
+            existing = await self.blob_repository.acquire(sha256, training_id)
+            if existing:
+                storage_key, size = existing
+                logger.info(f"♻️ FILE_DEDUP [REUSE] sha256={sha256[:12]} -> {storage_key}")
+                return storage_key, size, True
+
+            file_path, file_size = await self.file_storage.store_training_file(
+                trainer_id=trainer_id,
+                training_id=training_id,
+                file_content=file_content,
+                original_filename=original_filename,
+                mime_type=mime_type,
+                content_key=sha256
+            )
+            if await self.blob_repository.create(sha256, file_path, file_size, mime_type, training_id):
+                logger.info(f"💾 FILE_DEDUP [NEW] sha256={sha256[:12]} -> {file_path}")
+                return file_path, file_size, False
+
+            # The same content was stored concurrently (under the same key, so
+            # there is no copy to drop), or its last reference is being
+            # released: try to reference theirs
+            if hasattr(file_content, "seek"):
+                file_content.seek(0)
+            await asyncio.sleep(0.05 * (attempt + 1))
+
+        raise RuntimeError(f"Could not store or reference blob {sha256}")
+
+    async def release_training_file(self, training_id: UUID, file_path: str) -> bool:
+        """
+        Drop a training's reference; delete the stored file with the last one
+
+        Files stored before deduplication have no reference and are deleted directly.
+
+        Returns:
+            True if the stored file was deleted
+        """
+        was_referenced, storage_key = await self.blob_repository.release(training_id)
+        if not was_referenced:
+            return await self.file_storage.delete_training_file(file_path)
+
+        if storage_key is None:
+            logger.info(f"♻️ FILE_DEDUP [KEEP] {file_path} still used by other trainings")
+            return False
+
+        logger.info(f"🗑️ FILE_DEDUP [DELETE] Last reference released for {storage_key}")
+        return await self.file_storage.delete_training_file(storage_key)
@@ -0,0 +1,120 @@
+"""
+FIA v3.0 - Document Chunk Service
+Extracts training files once, stores their chunks and selects them for prompts
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+from app.domain.entities.document_chunk import DocumentChunk
+from app.domain.ports.repositories import DocumentChunkRepositoryPort
+from app.domain.services.document_extraction_service import (
+    DocumentExtractor,
+    DocumentExtractionError,
+    DEFAULT_CHUNK_TOKENS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Below this, the extracted text is probably a scanned document: send the file itself
+MIN_LOCAL_TEXT_TOKENS = 200
+
+DEFAULT_TOKEN_BUDGET = 32000
+
+
+class DocumentChunkService:
+    """
+    Chunks of training files, extracted locally on first use
+
+    Chunks are keyed by the file's storage key, so trainings sharing a
+    deduplicated file share its extraction.
+    """
+
+    def __init__(
+        self,
+        chunk_repository: DocumentChunkRepositoryPort,
+        extractor: Optional[DocumentExtractor] = None,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        chunk_tokens: int = DEFAULT_CHUNK_TOKENS
+    ):
+        self.chunk_repository = chunk_repository
+        self.extractor = extractor or DocumentExtractor()
+        self.token_budget = token_budget
+        self.chunk_tokens = chunk_tokens
+
+    async def get_chunks(self, storage_key: str, local_path: str) -> List[DocumentChunk]:
+        """Stored chunks of a file, extracting and storing them on first call"""
+        chunks = await self.chunk_repository.get_chunks(storage_key)
+        if chunks or not self.extractor.can_extract(local_path):
+            return chunks
+
+        start_time = time.time()
+        try:
+            chunks = await asyncio.to_thread(self._extract_chunks, local_path)
+        except DocumentExtractionError as e:
+            logger.warning(f"⚠️ DOCUMENT_CHUNKS [EXTRACT] {str(e)}")
+            return []
+
+        await self.chunk_repository.replace_chunks(storage_key, chunks)
+        logger.info(
+            f"📑 DOCUMENT_CHUNKS [EXTRACTED] {storage_key} - {len(chunks)} chunks, "
+            f"{sum(c.token_count for c in chunks)} tokens in {time.time() - start_time:.2f}s"
+        )
+        return chunks
+
+    def _extract_chunks(self, local_path: str) -> List[DocumentChunk]:
+        return self.extractor.chunk(self.extractor.extract(local_path), max_tokens=self.chunk_tokens)
+
+    async def get_document_text(self, storage_key: str, local_path: str) -> Optional[str]:
+        """
+        Extracted text of a document within the token budget
+
+        Returns:
+            Rendered chunks, or None when the file has no usable text layer
+            (unsupported type, scanned PDF) and must be sent as a file
+        """
+        chunks = await self.get_chunks(storage_key, local_path)
+        if sum(c.token_count for c in chunks) < MIN_LOCAL_TEXT_TOKENS:
+            return None
+        return self.render(self.select_within_budget(chunks, self.token_budget))
+
+    @staticmethod
+    def select_within_budget(chunks: List[DocumentChunk], token_budget: int) -> List[DocumentChunk]:
+        """
+        Chunks fitting the budget, spread over the whole document
+
+        When everything does not fit, the first chunk of every page/slide is
+        taken first, then the second ones, and so on, so the selection keeps
+        the document's full outline rather than only its beginning.
+        """
+        if sum(c.token_count for c in chunks) <= token_budget:
+            return chunks
+
+        by_location: Dict[str, List[DocumentChunk]] = {}
+        for chunk in chunks:
+            by_location.setdefault(chunk.location, []).append(chunk)
+
+        selected: List[DocumentChunk] = []
+        used = 0
+        depth = 0
+        while True:
+            candidates = [group[depth] for group in by_location.values() if len(group) > depth]
+            if not candidates:
+                break
+            for chunk in candidates:
+                if used + chunk.token_count <= token_budget:
+                    selected.append(chunk)
+                    used += chunk.token_count
+            depth += 1
+        return sorted(selected, key=lambda c: c.chunk_index)
+
+    @staticmethod
+    def render(chunks: List[DocumentChunk]) -> str:
+        """Chunks as prompt text, each headed by its location and section"""
+        parts = []
+        for chunk in chunks:
+            header = f"[{chunk.location}" + (f" - {chunk.section_title}]" if chunk.section_title else "]")
+            parts.append(f"{header}\n{chunk.content}")
+        return "\n\n".join(parts)
@@ -0,0 +1,387 @@
+"""
+FIA v3.0 - Document Extraction Service
+Local text extraction and chunking of training documents (PDF/PPTX/MD)
+"""
+
+import logging
+import re
+import unicodedata
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.domain.entities.document_chunk import DocumentChunk
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+    logger.warning("⚠️ DOCUMENT_EXTRACTION [INIT] pypdf not installed - PDF files will be sent to Gemini as is")
+
+# Chunk size targets, in estimated tokens
+DEFAULT_CHUNK_TOKENS = 350
+MIN_CHUNK_TOKENS = 60
+
+# OOXML namespaces used by PowerPoint files
+PPTX_NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+TITLE_PLACEHOLDERS = {"title", "ctrTitle"}
+NOTES_SKIPPED_PLACEHOLDERS = {"sldImg", "sldNum", "hdr", "ftr", "dt"}
+
+MARKDOWN_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Token estimate used across the app (1 token ≈ 4 characters)"""
+    return max(1, len(text) // 4) if text else 0
+
+
+@dataclass
+class ExtractedSection:
+    """One page, slide or markdown section of a document"""
+    location: str  # "page 3", "slide 12", "section 4"
+    title: Optional[str]
+    text: str
+    notes: str = ""
+
+
+@dataclass
+class ExtractedDocument:
+    """Normalized text content of a document"""
+    source_type: str  # 'pdf', 'pptx' or 'md'
+    sections: List[ExtractedSection] = field(default_factory=list)
+    outline: List[str] = field(default_factory=list)
+
+    @property
+    def token_count(self) -> int:
+        return sum(estimate_tokens(s.text) + estimate_tokens(s.notes) for s in self.sections)
+
+
+class DocumentExtractionError(Exception):
+    """Exception for documents that cannot be read locally"""
+    pass
+
+
+class DocumentExtractor:
+    """
+    Extract, normalize and chunk training documents without any API call
+
+    PDF text comes from pypdf (optional dependency), PowerPoint slides and
+    speaker notes are read straight from the OOXML package, Markdown is
+    split on its headings. Legacy .ppt files are not supported.
+    """
+
+    SUPPORTED_EXTENSIONS = {".pdf", ".pptx", ".md"}
+
+    def can_extract(self, file_path: str) -> bool:
+        extension = Path(file_path).suffix.lower()
+        if extension == ".pdf":
+            return PYPDF_AVAILABLE
+        return extension in self.SUPPORTED_EXTENSIONS
+
+    def extract(self, file_path: str) -> ExtractedDocument:
+        """Extract the normalized text of a document (blocking, run it in a thread)"""
+        extension = Path(file_path).suffix.lower()
+        try:
+            if extension == ".pdf":
+                document = self._extract_pdf(file_path)
+            elif extension == ".pptx":
+                document = self._extract_pptx(file_path)
+            elif extension == ".md":
+                document = self._extract_markdown(file_path)
+            else:
+                raise DocumentExtractionError(f"Unsupported file type for local extraction: {extension}")
+        except DocumentExtractionError:
+            raise
+        except Exception as e:
+            raise DocumentExtractionError(f"Could not extract {Path(file_path).name}: {str(e)}") from e
+
+        document.sections = [s for s in document.sections if s.text or s.notes]
+        return document
+
+    def chunk(self, document: ExtractedDocument, max_tokens: int = DEFAULT_CHUNK_TOKENS) -> List[DocumentChunk]:
+        """
+        Split a document into chunks of at most max_tokens
+
+        Chunks never span two sections, so each keeps a single location and
+        title. Paragraphs are packed greedily; a paragraph larger than a chunk
+        is split on sentence boundaries. A small trailing piece is merged with
+        the previous chunk of the same section.
+        """
+        chunks: List[DocumentChunk] = []
+        for section in document.sections:
+            body = section.text
+            if section.notes:
+                body = f"{body}\n\nNotes : {section.notes}" if body else f"Notes : {section.notes}"
+
+            pieces: List[str] = []
+            current: List[str] = []
+            current_tokens = 0
+            for unit in self._units(body, max_tokens):
+                unit_tokens = estimate_tokens(unit)
+                if current and current_tokens + unit_tokens > max_tokens:
+                    pieces.append("\n\n".join(current))
+                    current, current_tokens = [], 0
+                current.append(unit)
+                current_tokens += unit_tokens
+            if current:
+                tail = "\n\n".join(current)
+                if pieces and current_tokens < MIN_CHUNK_TOKENS and estimate_tokens(pieces[-1]) + current_tokens <= max_tokens * 1.25:
+                    pieces[-1] = f"{pieces[-1]}\n\n{tail}"
+                else:
+                    pieces.append(tail)
+
+            for piece in pieces:
+                chunks.append(DocumentChunk(
+                    chunk_index=len(chunks),
+                    location=section.location,
+                    section_title=section.title,
+                    content=piece,
+                    token_count=estimate_tokens(piece)
+                ))
+        return chunks
+
+    @staticmethod
+    def _units(body: str, max_tokens: int) -> List[str]:
+        """Paragraphs, with oversized ones split into sentences (or hard-wrapped)"""
+        units = []
+        for paragraph in re.split(r"\n\s*\n", body):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if estimate_tokens(paragraph) <= max_tokens:
+                units.append(paragraph)
+                continue
+            for sentence in SENTENCE_END.split(paragraph):
+                max_chars = max_tokens * 4
+                while len(sentence) > max_chars:
+                    cut = sentence.rfind(" ", 0, max_chars)
+                    cut = cut if cut > 0 else max_chars
+                    units.append(sentence[:cut].strip())
+                    sentence = sentence[cut:]
+                if sentence.strip():
+                    units.append(sentence.strip())
+        return units
+
+    # ------------------------------------------------------------------ PDF
+
+    def _extract_pdf(self, file_path: str) -> ExtractedDocument:
+        if not PYPDF_AVAILABLE:
+            raise DocumentExtractionError("pypdf is not installed")
+
+        reader = PdfReader(file_path)
+        outline_by_page = self._pdf_outline(reader)
+        pages = [normalize_text(page.extract_text() or "") for page in reader.pages]
+        pages = strip_repeated_lines(pages)
+
+        document = ExtractedDocument(source_type="pdf", outline=[title for _, title in sorted(outline_by_page.items())])
+        current_title = None
+        for number, text in enumerate(pages, start=1):
+            current_title = outline_by_page.get(number, current_title)
+            title = current_title or self._first_line(text)
+            document.sections.append(ExtractedSection(location=f"page {number}", title=title, text=text))
+
+        if not document.outline:
+            document.outline = [s.title for s in document.sections if s.title]
+        return document
+
+    @staticmethod
+    def _pdf_outline(reader) -> Dict[int, str]:
+        """First bookmark title per page (1-based)"""
+        outline: Dict[int, str] = {}
+
+        def walk(items):
+            for item in items:
+                if isinstance(item, list):
+                    walk(item)
+                    continue
+                try:
+                    page_number = reader.get_destination_page_number(item) + 1
+                except Exception:
+                    continue
+                outline.setdefault(page_number, normalize_text(item.title))
+
+        try:
+            walk(reader.outline or [])
+        except Exception as e:
+            logger.debug(f"📄 DOCUMENT_EXTRACTION [PDF] Outline unreadable: {str(e)}")
+        return outline
+
+    @staticmethod
+    def _first_line(text: str) -> Optional[str]:
+        for line in text.splitlines():
+            line = line.strip()
+            if line:
+                return line[:120]
+        return None
+
+    # ----------------------------------------------------------------- PPTX
+
+    def _extract_pptx(self, file_path: str) -> ExtractedDocument:
+        document = ExtractedDocument(source_type="pptx")
+        with zipfile.ZipFile(file_path) as package:
+            for number, slide_path in enumerate(self._pptx_slide_paths(package), start=1):
+                slide = ET.fromstring(package.read(slide_path))
+                title, paragraphs = self._pptx_shapes_text(slide, skipped=set())
+
+                notes = ""
+                notes_path = self._pptx_related(package, slide_path, "notesSlide")
+                if notes_path:
+                    _, notes_paragraphs = self._pptx_shapes_text(
+                        ET.fromstring(package.read(notes_path)),
+                        skipped=NOTES_SKIPPED_PLACEHOLDERS
+                    )
+                    notes = normalize_text("\n".join(notes_paragraphs))
+
+                text = normalize_text("\n".join(paragraphs))
+                document.sections.append(ExtractedSection(
+                    location=f"slide {number}",
+                    title=title,
+                    text=text,
+                    notes=notes
+                ))
+                if title:
+                    document.outline.append(title)
+        return document
+
+    @staticmethod
+    def _pptx_slide_paths(package: zipfile.ZipFile) -> List[str]:
+        """Slide parts in presentation order"""
+        presentation = ET.fromstring(package.read("ppt/presentation.xml"))
+        relations = ET.fromstring(package.read("ppt/_rels/presentation.xml.rels"))
+        targets = {rel.get("Id"): rel.get("Target") for rel in relations.findall("rel:Relationship", PPTX_NS)}
+
+        paths = []
+        for slide_id in presentation.findall("p:sldIdLst/p:sldId", PPTX_NS):
+            target = targets.get(slide_id.get(f"{{{PPTX_NS['r']}}}id"))
+            if target:
+                paths.append(_resolve_part("ppt/presentation.xml", target))
+        return paths
+
+    @staticmethod
+    def _pptx_related(package: zipfile.ZipFile, part: str, relation_type: str) -> Optional[str]:
+        directory, name = part.rsplit("/", 1)
+        rels_path = f"{directory}/_rels/{name}.rels"
+        if rels_path not in package.namelist():
+            return None
+        relations = ET.fromstring(package.read(rels_path))
+        for rel in relations.findall("rel:Relationship", PPTX_NS):
+            if rel.get("Type", "").endswith(f"/{relation_type}"):
+                return _resolve_part(part, rel.get("Target"))
+        return None
+
+    @staticmethod
+    def _pptx_shapes_text(root: ET.Element, skipped: set):
+        """(title, paragraphs) of every text shape, in document order"""
+        title = None
+        paragraphs: List[str] = []
+        for shape in root.iter(f"{{{PPTX_NS['p']}}}sp"):
+            placeholder = shape.find("p:nvSpPr/p:nvPr/p:ph", PPTX_NS)
+            placeholder_type = placeholder.get("type") if placeholder is not None else None
+            if placeholder_type in skipped:
+                continue
+
+            shape_paragraphs = []
+            for paragraph in shape.iter(f"{{{PPTX_NS['a']}}}p"):
+                text = "".join(run.text or "" for run in paragraph.iter(f"{{{PPTX_NS['a']}}}t")).strip()
+                if text:
+                    shape_paragraphs.append(text)
+
+            if placeholder_type in TITLE_PLACEHOLDERS and title is None and shape_paragraphs:
+                title = normalize_text(" ".join(shape_paragraphs))
+            else:
+                paragraphs.extend(shape_paragraphs)
+
+        # Tables are graphic frames, not shapes
+        for cell in root.iter(f"{{{PPTX_NS['a']}}}tc"):
+            text = " ".join(t.text or "" for t in cell.iter(f"{{{PPTX_NS['a']}}}t")).strip()
+            if text:
+                paragraphs.append(text)
+        return title, paragraphs
+
+    # ------------------------------------------------------------- Markdown
+
+    def _extract_markdown(self, file_path: str) -> ExtractedDocument:
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        document = ExtractedDocument(source_type="md")
+        headings: List[str] = []
+        lines: List[str] = []
+
+        def flush():
+            text = normalize_text("\n".join(lines))
+            if text:
+                document.sections.append(ExtractedSection(
+                    location=f"section {len(document.sections) + 1}",
+                    title=" > ".join(headings) or None,
+                    text=text
+                ))
+            lines.clear()
+
+        in_code_block = False
+        for line in content.splitlines():
+            if line.lstrip().startswith("```"):
+                in_code_block = not in_code_block
+            match = None if in_code_block else MARKDOWN_HEADING.match(line)
+            if match:
+                flush()
+                level = len(match.group(1))
+                del headings[level - 1:]
+                headings.append(match.group(2).strip())
+                document.outline.append(f"{'  ' * (level - 1)}{headings[-1]}")
+            else:
+                lines.append(line)
+        flush()
+        return document
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize, de-hyphenate and collapse whitespace, keeping paragraph breaks"""
+    text = unicodedata.normalize("NFKC", text).replace("­", "")
+    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+    lines = [re.sub(r"[ \t ]+", " ", line).strip() for line in text.splitlines()]
+    text = "\n".join(lines)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def strip_repeated_lines(pages: List[str], min_pages: int = 3) -> List[str]:
+    """Drop running headers and footers: short lines found on more than half of the pages"""
+    if len(pages) < min_pages:
+        return pages
+    counts = Counter(
+        line for page in pages
+        for line in {l.strip() for l in page.splitlines()}
+        if line and len(line) < 80
+    )
+    repeated = {line for line, count in counts.items() if count > len(pages) / 2}
+    if not repeated:
+        return pages
+    return [
+        normalize_text("\n".join(l for l in page.splitlines() if l.strip() not in repeated))
+        for page in pages
+    ]
+
+
+def _resolve_part(source_part: str, target: str) -> str:
+    """Absolute package path of a relationship target"""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    parts = source_part.split("/")[:-1]
+    for segment in target.split("/"):
+        if segment == "..":
+            parts.pop()
+        elif segment != ".":
+            parts.append(segment)
+    return "/".join(parts)
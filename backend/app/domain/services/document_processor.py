@@ -7,7 +7,10 @@ import logging
 import asyncio
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional, Protocol
+from typing import Dict, Any, Optional, Protocol, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.domain.services.document_chunk_service import DocumentChunkService
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -42,9 +45,14 @@ class DocumentProcessor:
     
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
     
-    def __init__(self, vertex_ai_adapter: Optional[VertexAIPort] = None):
-        """Initialize document processor with Vertex AI adapter"""
+    def __init__(
+        self,
+        vertex_ai_adapter: Optional[VertexAIPort] = None,
+        chunk_service: Optional["DocumentChunkService"] = None
+    ):
+        """Initialize document processor with Vertex AI adapter and optional local extraction"""
         self.vertex_ai_adapter = vertex_ai_adapter
+        self.chunk_service = chunk_service
         self.max_retries = 3
         
         logger.info("📄 DOCUMENT [PROCESSOR] initialized")
@@ -169,12 +177,16 @@ class DocumentProcessor:
                 e
             )
     
-    async def process_document(self, file_path: str) -> str:
+    async def process_document(self, file_path: str, storage_key: Optional[str] = None) -> str:
         """
         Process document and extract content for plan generation
         
+        With a chunk service and the file's storage key, the analysis is run on
+        the locally extracted text instead of uploading the binary document.
+        
         Args:
             file_path: Path to the PDF, PowerPoint, or Markdown file
+            storage_key: Stored file_path of the training (enables local extraction)
             
         Returns:
             Extracted content from the document
@@ -192,6 +204,14 @@ class DocumentProcessor:
         if file_info['mime_type'] == 'text/markdown':
             return await self._process_markdown_file(file_path, file_info)
         
+        # Text layer extracted locally (once per stored file), if usable
+        document_text = None
+        if self.chunk_service and storage_key:
+            try:
+                document_text = await self.chunk_service.get_document_text(storage_key, file_path)
+            except Exception as e:
+                logger.warning(f"⚠️ DOCUMENT [LOCAL] Extraction unavailable, sending file: {str(e)}")
+        
         # For PDF/PPT/PPTX files, use Vertex AI
         if not self.vertex_ai_adapter:
             raise DocumentProcessingError(
@@ -210,15 +230,18 @@ class DocumentProcessor:
                 # Get analysis prompt
                 analysis_prompt = self.get_document_analysis_prompt()
                 
-                # Process document with Vertex AI
-                response = await asyncio.wait_for(
-                    self.vertex_ai_adapter.generate_with_file(
+                # Process document with Vertex AI (extracted text when available, file otherwise)
+                if document_text:
+                    request = self.vertex_ai_adapter.generate_content(
+                        f"{analysis_prompt}\n\nContenu du document :\n{document_text}"
+                    )
+                else:
+                    request = self.vertex_ai_adapter.generate_with_file(
                         prompt=analysis_prompt,
                         file_path=file_path,
                         mime_type=file_info['mime_type']
-                    ),
-                    timeout=60.0  # 1 minute timeout
-                )
+                    )
+                response = await asyncio.wait_for(request, timeout=60.0)  # 1 minute timeout
                 
                 duration = time.time() - start_time
                 
@@ -231,7 +254,8 @@ class DocumentProcessor:
                 
                 # Log success
                 logger.info(f"✅ DOCUMENT [SUCCESS] {file_info['file_name']} - "
-                           f"{len(response)} chars in {duration:.2f}s")
+                           f"{len(response)} chars in {duration:.2f}s "
+                           f"({'local text' if document_text else 'file upload'})")
                 
                 return response
                 
@@ -289,5 +313,6 @@ class DocumentProcessor:
             "max_file_size_mb": self.MAX_FILE_SIZE // (1024 * 1024),
             "supported_extensions": list(self.SUPPORTED_MIME_TYPES.keys()),
             "max_retries": self.max_retries,
-            "vertex_ai_configured": self.vertex_ai_adapter is not None
+            "vertex_ai_configured": self.vertex_ai_adapter is not None,
+            "local_extraction_enabled": self.chunk_service is not None
         }
\ No newline at end of file
@@ -3,15 +3,22 @@ FIA v3.0 - File Storage Service
 Implementation of file storage operations for training materials
 """
 
+import asyncio
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import BinaryIO, Tuple
-from uuid import UUID
+from typing import BinaryIO, List, Optional, Tuple
+from uuid import UUID, uuid4
 
 from app.domain.ports.file_storage import FileStoragePort
 from app.domain.ports.settings_port import SettingsPort
 
+# Bytes copied per read when streaming uploads to disk
+STORAGE_CHUNK_SIZE = 1024 * 1024
+
+# Directory (under the uploads directory) of files stored by content hash
+BLOB_DIRECTORY = "blobs"
+
 
 class FileStorageService(FileStoragePort):
     """Local file system implementation of file storage"""
@@ -20,7 +27,8 @@ class FileStorageService(FileStoragePort):
         self.settings = settings_port
         # Base upload directory from settings
         storage_path = self.settings.get_storage_path()
-        self.uploads_dir = Path(storage_path) / "trainings"
+        self.storage_root = Path(storage_path)
+        self.uploads_dir = self.storage_root / "trainings"
         # Ensure directory exists
         self.uploads_dir.mkdir(parents=True, exist_ok=True)
     
@@ -30,13 +38,22 @@ class FileStorageService(FileStoragePort):
         training_id: UUID,
         file_content: BinaryIO,
         original_filename: str,
-        mime_type: str
+        mime_type: str,
+        content_key: Optional[str] = None
     ) -> Tuple[str, int]:
         """Store training file with organized naming convention"""
         
         # Extract file extension
         file_extension = Path(original_filename).suffix.lower()
         
+        if content_key:
+            # Content-addressed: every training with this content shares the file
+            blob_dir = self.uploads_dir / BLOB_DIRECTORY
+            blob_dir.mkdir(exist_ok=True)
+            filename = f"{content_key}{file_extension}"
+            file_size = await asyncio.to_thread(self._write_stream, file_content, blob_dir / filename)
+            return f"{BLOB_DIRECTORY}/{filename}", file_size
+        
         # Generate timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -50,20 +67,31 @@ class FileStorageService(FileStoragePort):
         # Full file path
         file_path = trainer_dir / filename
         
-        # Read content and get size
-        file_content.seek(0)  # Ensure we're at the beginning
-        content = file_content.read()
-        file_size = len(content)
-        
-        # Write file synchronously (content is already in memory)
-        with open(file_path, 'wb') as f:
-            f.write(content)
+        # Stream to a temporary file in a worker thread, then publish it atomically
+        file_size = await asyncio.to_thread(self._write_stream, file_content, file_path)
         
         # Return relative path for database storage
         relative_path = f"{trainer_id}/{filename}"
         
         return relative_path, file_size
     
+    @staticmethod
+    def _write_stream(file_content: BinaryIO, file_path: Path) -> int:
+        """Copy a binary stream to disk chunk by chunk and return its size"""
+        # Unique temporary name: concurrent uploads of the same content share the target
+        temp_path = file_path.with_name(f"{file_path.name}.{uuid4().hex}.part")
+        file_size = 0
+        try:
+            with open(temp_path, 'wb') as f:
+                for chunk in iter(lambda: file_content.read(STORAGE_CHUNK_SIZE), b""):
+                    f.write(chunk)
+                    file_size += len(chunk)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return file_size
+    
     async def get_training_file_path(self, file_path: str) -> Path:
         """Get full system path for stored file"""
         return self.uploads_dir / file_path
@@ -89,6 +117,56 @@ class FileStorageService(FileStoragePort):
         full_path = await self.get_training_file_path(file_path)
         return full_path.exists() and full_path.is_file()
     
+    async def store_asset(self, key: str, content: bytes, content_type: str) -> int:
+        """Write an asset under the storage root, atomically"""
+        asset_path = self.storage_root / key
+        await asyncio.to_thread(self._write_bytes, asset_path, content)
+        return len(content)
+    
+    @staticmethod
+    def _write_bytes(path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".part")
+        try:
+            temp_path.write_bytes(content)
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+    
+    async def get_asset_path(self, key: str) -> Path:
+        """Get full system path for an asset"""
+        return self.storage_root / key
+    
+    async def delete_asset(self, key: str) -> bool:
+        """Delete an asset from storage"""
+        try:
+            await asyncio.to_thread((self.storage_root / key).unlink)
+            return True
+        except FileNotFoundError:
+            return False
+    
+    async def list_stored_files(self) -> List[Tuple[str, int, str]]:
+        """Walk the storage root once (reconciliation only)"""
+        return await asyncio.to_thread(self._scan)
+    
+    def _scan(self) -> List[Tuple[str, int, str]]:
+        files = []
+        pending = [self.storage_root]
+        while pending:
+            directory = pending.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(Path(entry.path))
+                    elif entry.is_file(follow_symlinks=False) and not entry.name.endswith(".part"):
+                        path = Path(entry.path)
+                        if path.is_relative_to(self.uploads_dir):
+                            files.append((path.relative_to(self.uploads_dir).as_posix(), entry.stat().st_size, "training"))
+                        else:
+                            files.append((path.relative_to(self.storage_root).as_posix(), entry.stat().st_size, "asset"))
+        return files
+    
     def get_file_info(self, file_path: str) -> dict:
         """Get file information (size, modified date, etc.)"""
         full_path = self.uploads_dir / file_path
@@ -15,6 +15,7 @@ from app.domain.services.plan_persistence_service import PlanPersistenceService
 from app.domain.entities.learner_training_plan import LearnerTrainingPlan
 from app.domain.entities.api_log import ApiLog
 from app.domain.ports.repositories import LearnerTrainingPlanRepositoryPort, ApiLogRepositoryPort
+from app.domain.services.document_chunk_service import DocumentChunkService
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +27,8 @@ class IntegratedPlanGenerationService:
         self,
         plan_repository: LearnerTrainingPlanRepositoryPort,
         api_log_repository: ApiLogRepositoryPort,
-        db_session: AsyncSession
+        db_session: AsyncSession,
+        chunk_service: Optional[DocumentChunkService] = None
     ):
         """
         Initialiser le service intégré
@@ -35,11 +37,12 @@ class IntegratedPlanGenerationService:
             plan_repository: Repository pour les plans de formation
             api_log_repository: Repository pour les logs API
             db_session: Session de base de données pour la persistance relationnelle
+            chunk_service: Extraction locale du document (texte envoyé au lieu du fichier)
         """
         self.plan_repository = plan_repository
         self.api_log_repository = api_log_repository
         self.db_session = db_session
-        self.plan_generation_service = PlanGenerationService()
+        self.plan_generation_service = PlanGenerationService(chunk_service=chunk_service)
         
         # Décorer le service simple pour capturer les logs
         self._decorate_plan_service()
@@ -133,7 +136,8 @@ class IntegratedPlanGenerationService:
         learner_session_id: UUID,
         learner_profile: Dict[str, Any],
         file_path: str,
-        force_regenerate: bool = False
+        force_regenerate: bool = False,
+        storage_key: Optional[str] = None
     ) -> LearnerTrainingPlan:
         """
         Générer un plan de formation et le persister en base de données
@@ -143,6 +147,7 @@ class IntegratedPlanGenerationService:
             learner_profile: Profil de l'apprenant
             file_path: Chemin du fichier de formation
             force_regenerate: Forcer la régénération
+            storage_key: Clé de stockage du fichier (training.file_path), active l'extraction locale
             
         Returns:
             Plan de formation persisté
@@ -165,7 +170,8 @@ class IntegratedPlanGenerationService:
             # Générer le plan avec le service v2 (qui va maintenant logger en DB)
             plan_data = await self.plan_generation_service.generate_plan_simple(
                 learner_profile=learner_profile,
-                file_path=file_path
+                file_path=file_path,
+                storage_key=storage_key
             )
             
             end_time = time.time()
@@ -217,17 +217,20 @@ class LiveConversationService:
         try:
             logger.info(f"🛑 LIVE_CONVERSATION [STOP] Stopping Live session for learner: {learner_session_id}")
             
-            if learner_session_id not in self.active_live_sessions:
+            live_session_id = self.active_live_sessions.get(learner_session_id)
+            if live_session_id is None:
+                # The session may be served by another connection or worker
+                live_session_id = await self.live_api_adapter.find_live_session(learner_session_id)
+            
+            if live_session_id is None:
                 logger.warning(f"⚠️ LIVE_CONVERSATION [STOP] No active Live session for learner: {learner_session_id}")
                 return True  # Already stopped
             
-            live_session_id = self.active_live_sessions[learner_session_id]
-            
             # Close Live API session
             success = await self.live_api_adapter.close_live_session(live_session_id)
             
             # Remove from active sessions tracking
-            del self.active_live_sessions[learner_session_id]
+            self.active_live_sessions.pop(learner_session_id, None)
             
             if success:
                 logger.info(f"✅ LIVE_CONVERSATION [STOP] Live session stopped successfully for learner: {learner_session_id}")
@@ -245,15 +248,17 @@ class LiveConversationService:
     
     async def get_live_session_status(self, learner_session_id: UUID) -> Dict[str, Any]:
         """Get status of Live session for a learner"""
-        has_active_session = learner_session_id in self.active_live_sessions
+        live_session_id = self.active_live_sessions.get(learner_session_id)
+        if live_session_id is None:
+            live_session_id = await self.live_api_adapter.find_live_session(learner_session_id)
         
         status_info = {
-            "has_active_session": has_active_session,
+            "has_active_session": live_session_id is not None,
             "learner_session_id": str(learner_session_id)
         }
         
-        if has_active_session:
-            status_info["live_session_id"] = self.active_live_sessions[learner_session_id]
+        if live_session_id is not None:
+            status_info["live_session_id"] = live_session_id
         
         return status_info
     
@@ -17,12 +17,14 @@ from app.domain.services.plan_validator import PlanValidator, PlanValidationErro
 # Infrastructure adapter
 from app.domain.ports.ai_adapter_port import AIAdapterPort, AIError
 from app.infrastructure.adapters.vertex_ai_adapter import VertexAIAdapter
+from app.infrastructure.gemini_call_logger import ServiceType
 
 # Optional architecture support
 if TYPE_CHECKING:
     from app.domain.ports.outbound_ports import GeminiServicePort, ContextCacheServicePort
     from app.domain.entities.learner_session import LearnerSession
     from app.domain.entities.training import Training
+    from app.domain.services.document_chunk_service import DocumentChunkService
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -45,7 +47,8 @@ class PlanGenerationService:
     def __init__(
         self,
         gemini_service: Optional["GeminiServicePort"] = None,
-        cache_service: Optional["ContextCacheServicePort"] = None
+        cache_service: Optional["ContextCacheServicePort"] = None,
+        chunk_service: Optional["DocumentChunkService"] = None
     ):
         """
         Initialize plan generation service with dependency injection
@@ -53,10 +56,11 @@ class PlanGenerationService:
         Args:
             gemini_service: Optional Gemini service port (for hexagonal architecture)
             cache_service: Optional cache service port (for cost optimization)
+            chunk_service: Optional local document extraction (sends text instead of files)
         """
         # Initialize domain services
         self.vertex_ai_adapter = VertexAIAdapter()
-        self.document_processor = DocumentProcessor(self.vertex_ai_adapter)
+        self.document_processor = DocumentProcessor(self.vertex_ai_adapter, chunk_service)
         self.prompt_builder = PromptBuilder()
         self.plan_validator = PlanValidator()
         
@@ -149,13 +153,19 @@ class PlanGenerationService:
                 original_error=e
             )
     
-    async def generate_plan_simple(self, learner_profile: Dict[str, Any], file_path: str) -> Dict[str, Any]:
+    async def generate_plan_simple(
+        self,
+        learner_profile: Dict[str, Any],
+        file_path: str,
+        storage_key: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Simple plan generation without entities (for backward compatibility)
         
         Args:
             learner_profile: Learner profile dictionary
             file_path: Path to training document
+            storage_key: Stored file_path of the training (enables local extraction)
             
         Returns:
             Generated training plan
@@ -165,7 +175,7 @@ class PlanGenerationService:
             normalized_profile = self.prompt_builder.extract_learner_profile(learner_profile)
             
             # Process document
-            document_content = await self.document_processor.process_document(file_path)
+            document_content = await self.document_processor.process_document(file_path, storage_key)
             
             # Generate plan
             plan_data = await self._generate_plan_with_ai(normalized_profile, document_content)
@@ -203,7 +213,7 @@ class PlanGenerationService:
             )
             
             # Generate content with AI
-            response = await self.vertex_ai_adapter.generate_content(prompt)
+            response = await self.vertex_ai_adapter.generate_content(prompt, service_type=ServiceType.SLIDES)
             
             # Parse JSON response
             try:
@@ -285,7 +295,8 @@ class PlanGenerationService:
                         "top_p": 0.9,
                         "top_k": 40,
                         "max_output_tokens": 8192
-                    }
+                    },
+                    service_type=ServiceType.PLAN
                 )
                 
                 # Parse JSON response
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.models.training_module_model import TrainingModuleModel
 from app.infrastructure.models.training_submodule_model import TrainingSubmoduleModel
 from app.infrastructure.models.training_slide_model import TrainingSlideModel
+from app.infrastructure.dashboard_rollups import dashboard_rollups
 from app.domain.entities.training_slide import SlideType
 
 logger = logging.getLogger(__name__)
@@ -59,6 +60,7 @@ class PlanPersistenceService:
             
             # IMPORTANT: Committer la transaction
             await self.session.commit()
+            dashboard_rollups.mark_plan(plan_id)
             
             logger.info(f"✅ Plan structure persisted successfully for plan {plan_id}")
             return True
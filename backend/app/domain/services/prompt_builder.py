@@ -4,7 +4,7 @@ Pure domain service for building personalized AI prompts
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -13,6 +13,18 @@ logger = logging.getLogger(__name__)
 PLAN_GENERATION_MODEL = "gemini-2.5-flash"  # Thinking mode for training plan generation
 
 
+def format_source_passages(source_passages: Optional[str], instruction: str) -> str:
+    """Section des extraits du support de formation, précédés de la consigne (vide sans extraits)"""
+    if not source_passages:
+        return ""
+    return f"""
+<EXTRAITS_DU_SUPPORT_DE_FORMATION>
+{instruction}
+{source_passages}
+</EXTRAITS_DU_SUPPORT_DE_FORMATION>
+"""
+
+
 class PromptBuilder:
     """Pure domain service for building personalized prompts"""
     
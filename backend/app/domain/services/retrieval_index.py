@@ -0,0 +1,175 @@
+"""
+FIA v3.0 - Retrieval Index
+BM25 index over document chunks, stored as compact NumPy arrays
+"""
+
+import io
+import json
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.domain.entities.document_chunk import DocumentChunk
+
+# Bump when the tokenizer or the serialized layout changes: persisted indexes are rebuilt
+INDEX_VERSION = 1
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Most frequent French and English function words; they carry no retrieval signal
+STOPWORDS = frozenset("""
+a au aux avec ce ces cette dans de des du elle en est et eux il ils je la le les leur lui ma mais me meme
+mes moi mon ne nos notre nous on ou par pas pour qu que qui sa se ses son sont sur ta te tes toi ton tu un
+une vos votre vous c d j l m n s t y ete etre avoir fait faire plus comme tout tous toute toutes aussi
+the an and are as at be by for from has have in is it its of on or that this to was were will with what
+which who how why when can do does not no your you we our they their
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Accent-folded, lowercased word tokens without stopwords, light plural stripping"""
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    tokens = []
+    for token in TOKEN_PATTERN.findall(folded):
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith(("s", "x")):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a document's chunks
+
+    Postings are stored term-major in flat arrays (CSR layout): the documents
+    of term t are postings_docs[term_offsets[t]:term_offsets[t + 1]]. A query
+    only touches the postings of its own terms. The chunks themselves are
+    kept with the index so a search needs nothing else.
+    """
+
+    def __init__(
+        self,
+        chunks: List[DocumentChunk],
+        vocabulary: Dict[str, int],
+        term_offsets: np.ndarray,
+        postings_docs: np.ndarray,
+        postings_tf: np.ndarray,
+        doc_lengths: np.ndarray,
+        idf: np.ndarray
+    ):
+        self.chunks = chunks
+        self.vocabulary = vocabulary
+        self.term_offsets = term_offsets
+        self.postings_docs = postings_docs
+        self.postings_tf = postings_tf
+        self.doc_lengths = doc_lengths
+        self.idf = idf
+        self.average_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+
+    @classmethod
+    def build(cls, chunks: List[DocumentChunk]) -> "BM25Index":
+        """Index chunks (titles are indexed with the content)"""
+        vocabulary: Dict[str, int] = {}
+        triples: List[Tuple[int, int, int]] = []
+        doc_lengths = np.zeros(len(chunks), dtype=np.float32)
+
+        for doc_id, chunk in enumerate(chunks):
+            tokens = tokenize(f"{chunk.section_title or ''} {chunk.content}")
+            doc_lengths[doc_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_id = vocabulary.setdefault(term, len(vocabulary))
+                triples.append((term_id, doc_id, tf))
+
+        triples.sort()
+        terms = np.fromiter((t[0] for t in triples), dtype=np.int32, count=len(triples))
+        postings_docs = np.fromiter((t[1] for t in triples), dtype=np.int32, count=len(triples))
+        postings_tf = np.fromiter((t[2] for t in triples), dtype=np.float32, count=len(triples))
+
+        document_frequency = np.bincount(terms, minlength=len(vocabulary))
+        term_offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        term_offsets[1:] = np.cumsum(document_frequency)
+        n = float(len(chunks))
+        idf = np.log1p((n - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+
+        return cls(chunks, vocabulary, term_offsets, postings_docs, postings_tf, doc_lengths, idf)
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[DocumentChunk, float]]:
+        """Best chunks for a query, with their scores (only chunks sharing a term)"""
+        if not self.chunks:
+            return []
+        scores = np.zeros(len(self.chunks), dtype=np.float32)
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths / max(self.average_length, 1.0))
+
+        for term in set(tokenize(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            docs = self.postings_docs[start:end]
+            tf = self.postings_tf[start:end]
+            scores[docs] += self.idf[term_id] * tf * (BM25_K1 + 1) / (tf + length_norm[docs])
+
+        k = min(k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.chunks[i], float(scores[i])) for i in top]
+
+    def to_bytes(self) -> bytes:
+        """Serialize as .npz (no pickle)"""
+        metadata = {
+            "version": INDEX_VERSION,
+            "vocabulary": sorted(self.vocabulary, key=self.vocabulary.get),
+            "chunks": [
+                [c.chunk_index, c.location, c.section_title, c.content, c.token_count]
+                for c in self.chunks
+            ],
+        }
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            metadata=np.frombuffer(json.dumps(metadata, ensure_ascii=False).encode("utf-8"), dtype=np.uint8),
+            term_offsets=self.term_offsets,
+            postings_docs=self.postings_docs,
+            postings_tf=self.postings_tf,
+            doc_lengths=self.doc_lengths,
+            idf=self.idf,
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BM25Index":
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            metadata = json.loads(arrays["metadata"].tobytes().decode("utf-8"))
+            if metadata.get("version") != INDEX_VERSION:
+                raise ValueError(f"Unsupported retrieval index version {metadata.get('version')}")
+            return cls(
+                chunks=[DocumentChunk(*row) for row in metadata["chunks"]],
+                vocabulary={term: i for i, term in enumerate(metadata["vocabulary"])},
+                term_offsets=arrays["term_offsets"],
+                postings_docs=arrays["postings_docs"],
+                postings_tf=arrays["postings_tf"],
+                doc_lengths=arrays["doc_lengths"],
+                idf=arrays["idf"],
+            )
+
+
+def select_passages(results: List[Tuple[DocumentChunk, float]], token_budget: int) -> List[DocumentChunk]:
+    """Highest-scoring chunks fitting the token budget, in document order"""
+    selected, used = [], 0
+    for chunk, _ in results:
+        if used + chunk.token_count > token_budget:
+            continue
+        selected.append(chunk)
+        used += chunk.token_count
+    return sorted(selected, key=lambda c: c.chunk_index)
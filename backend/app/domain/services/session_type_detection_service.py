@@ -6,11 +6,7 @@ Service for detecting session type (B2C vs B2B) based on session token
 import logging
 import time
 from typing import Optional
-from app.domain.ports.repositories import (
-    TrainingSessionRepositoryPort,
-    TrainingRepositoryPort, 
-    TrainerRepositoryPort
-)
+from app.domain.ports.repositories import TrainingSessionRepositoryPort
 
 logger = logging.getLogger(__name__)
 
@@ -21,15 +17,8 @@ class SessionTypeDetectionService:
     # Anonymous trainer identifier for B2C sessions
     ANONYMOUS_TRAINER_EMAIL = "anonymous@fia-v3.system"
     
-    def __init__(
-        self, 
-        training_session_repository: TrainingSessionRepositoryPort,
-        training_repository: TrainingRepositoryPort,
-        trainer_repository: TrainerRepositoryPort
-    ):
+    def __init__(self, training_session_repository: TrainingSessionRepositoryPort):
         self.training_session_repo = training_session_repository
-        self.training_repo = training_repository  
-        self.trainer_repo = trainer_repository
     
     async def detect_session_type(self, token: str) -> str:
         """
@@ -50,29 +39,15 @@ class SessionTypeDetectionService:
         try:
             logger.info(f"🔍 SESSION_TYPE_DETECTION [START] Analyzing token: {token[:8]}...")
             
-            # Step 1: Get training session by token
-            training_session = await self.training_session_repo.get_by_token(token)
-            if not training_session:
+            # Session -> training -> trainer in one joined query (hit on every slide navigation)
+            trainer_email = await self.training_session_repo.get_trainer_email_by_token(token)
+            if trainer_email is None:
                 raise ValueError(f"Invalid session token: {token}")
             
-            logger.debug(f"🎯 SESSION_TYPE_DETECTION [SESSION] Found training_session: {training_session.id}")
+            logger.debug(f"👤 SESSION_TYPE_DETECTION [TRAINER] Found trainer: {trainer_email}")
             
-            # Step 2: Get training by training_id
-            training = await self.training_repo.get_by_id(training_session.training_id)
-            if not training:
-                raise ValueError(f"Training not found for session: {training_session.id}")
-            
-            logger.debug(f"📚 SESSION_TYPE_DETECTION [TRAINING] Found training: {training.id} (trainer: {training.trainer_id})")
-            
-            # Step 3: Get trainer by trainer_id
-            trainer = await self.trainer_repo.get_by_id(training.trainer_id)
-            if not trainer:
-                raise ValueError(f"Trainer not found: {training.trainer_id}")
-            
-            logger.debug(f"👤 SESSION_TYPE_DETECTION [TRAINER] Found trainer: {trainer.email}")
-            
-            # Step 4: Determine session type based on trainer email
-            session_type = "B2C" if trainer.email == self.ANONYMOUS_TRAINER_EMAIL else "B2B"
+            # Determine session type based on trainer email
+            session_type = "B2C" if trainer_email == self.ANONYMOUS_TRAINER_EMAIL else "B2B"
             
             duration = time.time() - start_time
             logger.info(f"✅ SESSION_TYPE_DETECTION [SUCCESS] Session type: {session_type} (duration: {duration:.2f}s)")
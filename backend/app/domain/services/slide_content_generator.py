@@ -27,7 +27,8 @@ class SlideContentGenerator:
         slide_title: str,
         learner_profile: Any,
         training_plan: Any,
-        slide_position: str = "middle"
+        slide_position: str = "middle",
+        source_passages: Optional[str] = None
     ) -> str:
         """
         Générer le contenu d'une slide CONTENT avec IA
@@ -37,6 +38,7 @@ class SlideContentGenerator:
             learner_profile: Profil de l'apprenant
             training_plan: Plan de formation
             slide_position: Position dans la formation
+            source_passages: Extraits pertinents du support de formation
             
         Returns:
             Contenu markdown généré
@@ -51,37 +53,28 @@ class SlideContentGenerator:
                 slide_title=slide_title,
                 learner_profile=learner_profile,
                 training_plan=training_plan,
-                slide_position=slide_position
+                slide_position=slide_position,
+                source_passages=source_passages
             )
             
             # Générer avec VertexAI
             content = await self.ai_adapter.generate_content(
                 prompt=prompt,
                 model_name="gemini-2.0-flash-001",
-                temperature=0.7
+                temperature=0.7,
+                service_type="slide_generation"
             )
             
             duration = time.time() - start_time
             logger.info(f"✅ SLIDE CONTENT GENERATOR [SUCCESS] Content generated in {duration:.2f}s - {len(content)} chars")
             
-            # ========== LOGS DÉTAILLÉS CONTENU GÉNÉRÉ PAR L'IA ==========
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] ========== DÉBUT ANALYSE CONTENU IA ==========")
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] Content TYPE: {type(content)}")
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] Content LENGTH: {len(content) if content else 'N/A'}")
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] Content PREVIEW (500 chars):")
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] ---START AI CONTENT---")
-            logger.info(f"{content[:500] + '...' if content and len(content) > 500 else content}")
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] ---END AI CONTENT---")
-            
-            # Analyser le format du contenu
+            # Le contenu complet est dans le log Gemini échantillonné (GeminiCallLogger)
             stripped_content = content.strip() if content else ""
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] Stripped content LENGTH: {len(stripped_content)}")
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] Starts with '#': {stripped_content.startswith('#') if stripped_content else False}")
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] Contains '##': {'##' in stripped_content if stripped_content else False}")
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] Contains markdown lists '- ': {'- ' in stripped_content if stripped_content else False}")
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] Contains double braces: {'{{' in stripped_content if stripped_content else False}")
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] Contains 'slide': {'slide' in stripped_content.lower() if stripped_content else False}")
-            logger.info(f"🤖🤖🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] ========== FIN ANALYSE CONTENU IA ==========")
+            logger.debug(
+                f"🤖 SLIDE CONTENT GENERATOR [AI_RESPONSE] {len(stripped_content)} chars - "
+                f"heading: {stripped_content.startswith('#')}, sections: {'##' in stripped_content}, "
+                f"lists: {'- ' in stripped_content}, double braces: {'{{' in stripped_content}"
+            )
             
             return stripped_content
             
@@ -121,7 +114,8 @@ class SlideContentGenerator:
             content = await self.ai_adapter.generate_content(
                 prompt=prompt,
                 model_name="gemini-2.0-flash-001",
-                temperature=0.4  # Lower temperature for more structured quiz
+                temperature=0.4,  # Lower temperature for more structured quiz
+                service_type="slide_generation"
             )
             
             duration = time.time() - start_time
@@ -165,7 +159,8 @@ class SlideContentGenerator:
             introduction = await self.ai_adapter.generate_content(
                 prompt=prompt,
                 model_name="gemini-2.0-flash-001",
-                temperature=0.6
+                temperature=0.6,
+                service_type="slide_generation"
             )
             
             duration = time.time() - start_time
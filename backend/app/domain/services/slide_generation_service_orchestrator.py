@@ -10,6 +10,7 @@ from datetime import datetime, timezone
 from uuid import UUID
 
 from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.training_retrieval import training_retrieval
 from app.adapters.repositories.learner_training_plan_repository import LearnerTrainingPlanRepository
 from app.adapters.repositories.learner_session_repository import LearnerSessionRepository
 from app.adapters.repositories.training_slide_repository import TrainingSlideRepository
@@ -402,23 +403,19 @@ class SlideGenerationServiceOrchestrator:
                 logger.info(f"🎼🎼🎼 SLIDE ORCHESTRATOR [CONTENT] Training plan ID: {training_plan.id if training_plan else 'N/A'}")
                 logger.info(f"🎼🎼🎼 SLIDE ORCHESTRATOR [CONTENT] Slide position: {slide_position}")
                 
+                # Extraits du support de formation pour ce titre (dans le budget de latence)
+                source_passages = await training_retrieval.passages_for_learner_session(
+                    learner_session.id, slide.title
+                )
+                
                 generated_content = await self.content_generator.generate_content_slide(
                     slide_title=slide.title,
                     learner_profile=learner_session,
                     training_plan=training_plan,
-                    slide_position=slide_position
+                    slide_position=slide_position,
+                    source_passages=source_passages
                 )
                 
-                # ========== LOGS APRÈS GÉNÉRATION CONTENU ==========
-                logger.info(f"🎼🎼🎼 SLIDE ORCHESTRATOR [CONTENT] ========== APRÈS GÉNÉRATION CONTENU ==========")
-                logger.info(f"🎼🎼🎼 SLIDE ORCHESTRATOR [CONTENT] Generated content TYPE: {type(generated_content)}")
-                logger.info(f"🎼🎼🎼 SLIDE ORCHESTRATOR [CONTENT] Generated content LENGTH: {len(generated_content) if generated_content else 'N/A'}")
-                logger.info(f"🎼🎼🎼 SLIDE ORCHESTRATOR [CONTENT] Generated content PREVIEW (300 chars):")
-                logger.info(f"🎼🎼🎼 SLIDE ORCHESTRATOR [CONTENT] ---START GENERATED CONTENT---")
-                logger.info(f"{generated_content[:300] + '...' if generated_content and len(generated_content) > 300 else generated_content}")
-                logger.info(f"🎼🎼🎼 SLIDE ORCHESTRATOR [CONTENT] ---END GENERATED CONTENT---")
-                logger.info(f"🎼🎼🎼 SLIDE ORCHESTRATOR [CONTENT] ========== FIN LOGS GÉNÉRATION CONTENU ==========")
-                
                 return generated_content
                 
             elif slide.slide_type == "quiz":
@@ -0,0 +1,129 @@
+"""
+FIA v3.0 - Slide Image Service
+Stores generated slide images and their variants through the file storage port
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import re
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from app.domain.ports.file_storage import FileStoragePort
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    logger.warning("⚠️ SLIDE_IMAGE [INIT] Pillow not installed - WebP and thumbnail variants disabled")
+
+# Variant name -> (file suffix, content type)
+VARIANTS: Dict[str, Tuple[str, str]] = {
+    "original": (".png", "image/png"),
+    "webp": (".webp", "image/webp"),
+    "thumbnail": ("_thumb.webp", "image/webp"),
+}
+
+THUMBNAIL_SIZE = (320, 320)
+WEBP_QUALITY = 82
+
+# Served file names: "<version>.png", "<version>.webp" or "<version>_thumb.webp"
+IMAGE_FILENAME_PATTERN = re.compile(r"^(?P<version>[0-9a-f]{16})(?P<suffix>\.png|\.webp|_thumb\.webp)$")
+
+
+class SlideImageService:
+    """
+    Persist generated slide images as immutable, versioned assets
+
+    The version is a hash of the original image, so a regenerated image gets
+    new keys and URLs; anything served under a versioned URL can be cached
+    forever by browsers and CDNs.
+    """
+
+    def __init__(self, file_storage: FileStoragePort):
+        self.file_storage = file_storage
+
+    @staticmethod
+    def asset_key(learner_session_id: UUID, slide_id: UUID, filename: str) -> str:
+        """Storage key of one image file"""
+        return f"images/slide_images/{learner_session_id}/{slide_id}/{filename}"
+
+    @staticmethod
+    def image_url(learner_session_id: UUID, slide_id: UUID, filename: str) -> str:
+        """Public URL of one image file"""
+        return f"/api/slides/image/{learner_session_id}/{slide_id}/{filename}"
+
+    @staticmethod
+    def content_type_for(filename: str) -> Optional[str]:
+        """Content type of a served file name, None if the name is not a valid variant"""
+        match = IMAGE_FILENAME_PATTERN.match(filename)
+        if not match:
+            return None
+        for suffix, content_type in VARIANTS.values():
+            if match.group("suffix") == suffix:
+                return content_type
+        return None
+
+    async def save_image(
+        self,
+        image_bytes: bytes,
+        learner_session_id: UUID,
+        slide_id: UUID
+    ) -> Dict[str, str]:
+        """
+        Store the original PNG plus WebP and thumbnail variants
+
+        Returns:
+            Dict with the version, the storage key of the original and one URL per variant
+        """
+        version = hashlib.sha256(image_bytes).hexdigest()[:16]
+        encoded = await asyncio.to_thread(self._encode_variants, image_bytes)
+
+        urls = {}
+        for variant, content in encoded.items():
+            suffix, content_type = VARIANTS[variant]
+            filename = f"{version}{suffix}"
+            await self.file_storage.store_asset(
+                self.asset_key(learner_session_id, slide_id, filename),
+                content,
+                content_type
+            )
+            urls[variant] = self.image_url(learner_session_id, slide_id, filename)
+
+        logger.info(
+            f"🖼️ SLIDE_IMAGE [SAVED] slide={slide_id} version={version} "
+            f"sizes={ {variant: len(content) for variant, content in encoded.items()} }"
+        )
+        return {
+            "version": version,
+            "key": self.asset_key(learner_session_id, slide_id, f"{version}.png"),
+            "image_url": urls.get("webp", urls["original"]),
+            "thumbnail_url": urls.get("thumbnail", urls.get("webp", urls["original"])),
+            "original_url": urls["original"],
+        }
+
+    @staticmethod
+    def _encode_variants(image_bytes: bytes) -> Dict[str, bytes]:
+        """Encode the WebP and thumbnail variants (CPU bound, runs in a thread)"""
+        variants = {"original": image_bytes}
+        if not PIL_AVAILABLE:
+            return variants
+
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            image = image.convert("RGB")
+
+            webp = io.BytesIO()
+            image.save(webp, format="WEBP", quality=WEBP_QUALITY, method=4)
+            variants["webp"] = webp.getvalue()
+
+            image.thumbnail(THUMBNAIL_SIZE)
+            thumbnail = io.BytesIO()
+            image.save(thumbnail, format="WEBP", quality=WEBP_QUALITY, method=4)
+            variants["thumbnail"] = thumbnail.getvalue()
+
+        return variants
@@ -7,6 +7,8 @@ import logging
 import json
 from typing import Dict, Any, Optional
 
+from app.domain.services.prompt_builder import format_source_passages
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,7 +24,8 @@ class SlidePromptBuilder:
         slide_title: str,
         learner_profile: Any,
         training_plan: Any,
-        slide_position: str = "middle"
+        slide_position: str = "middle",
+        source_passages: Optional[str] = None
     ) -> str:
         """
         Construire le prompt de création de slide CONTENT
@@ -32,6 +35,7 @@ class SlidePromptBuilder:
             learner_profile: Profil de l'apprenant
             training_plan: Plan de formation
             slide_position: Position dans la formation
+            source_passages: Extraits du support de formation les plus pertinents pour ce titre
             
         Returns:
             Prompt formaté pour la génération de contenu
@@ -42,6 +46,10 @@ class SlidePromptBuilder:
         profile_info = self._extract_profile_info(learner_profile)
         enriched_profile = self._extract_enriched_profile(learner_profile)
         plan_context = self._extract_plan_context(training_plan)
+        source_section = format_source_passages(
+            source_passages,
+            "Appuie-toi en priorité sur ces extraits du support du formateur (faits, chiffres, vocabulaire) :"
+        )
         
         prompt = f"""
 <ROLE>
@@ -64,7 +72,7 @@ Créer le contenu de la [SLIDE DE FORMATION] suivante : {slide_title}. Cette [SL
 - Position de la slide dans la formation : {slide_position}
 - Plan de la formation : {plan_context}
 </INFORMATIONS_SUPPLEMENTAIRES_SUR_LA_FORMATION>
-
+{source_section}
 <CONTRAINTES>
 - Réponds UNIQUEMENT avec le contenu de la slide en Markdown pur (en insérant au maximum 5 emojis pour tout le contenu si cela est pertinent)
 - Commence directement par le contenu, pas de préambule
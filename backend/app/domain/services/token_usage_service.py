@@ -56,10 +56,8 @@ class TokenUsageService:
                 end_time=end_time
             )
             
-            # Get service type breakdown
-            service_breakdown = await self.logger_adapter.get_service_type_breakdown(
-                learner_session_id=learner_session_id
-            )
+            # Service type breakdown comes with the totals (same aggregate)
+            service_breakdown = usage_data.get("by_service_type", {})
             
             # Get recent calls for timeline
             recent_calls = await self.logger_adapter.get_recent_calls(
@@ -82,6 +80,7 @@ class TokenUsageService:
                     "total_tokens": usage_data.get("total_tokens", 0),
                     "input_tokens": usage_data.get("input_tokens", 0),
                     "output_tokens": usage_data.get("output_tokens", 0),
+                    "cached_tokens": usage_data.get("cached_tokens", 0),
                     "total_calls": usage_data.get("call_count", 0),
                     "session_duration_seconds": usage_data.get("session_duration")
                 },
@@ -89,7 +88,7 @@ class TokenUsageService:
                 "recent_calls": recent_calls,
                 "cost_estimation": cost_estimation,
                 "metadata": {
-                    "data_source": "application_logs",
+                    "data_source": "api_logs",
                     "estimation_accuracy": "high" if self._has_real_token_data(usage_data) else "estimated"
                 }
             }
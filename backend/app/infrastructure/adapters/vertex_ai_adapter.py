@@ -14,6 +14,8 @@ from datetime import datetime, timezone
 
 from app.infrastructure.settings import settings
 from app.infrastructure.gemini_call_logger import gemini_call_logger, ServiceType
+from app.infrastructure.api_log_writer import api_log_writer
+from app.infrastructure.metrics import observe_gemini_call, tts_audio_bytes
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -149,6 +151,22 @@ class VertexAIAdapter:
         status_emoji = "✅" if success else "❌"
         logger.info(f"{status_emoji} VERTEX AI [API] {operation} - {duration:.2f}s - Call #{self.api_call_counter}")
     
+    def _record_usage(self, service_name: str, service_type: ServiceType, model: str, response, duration: float,
+                      learner_session_id: Optional[str] = None, success: bool = True,
+                      endpoint: str = "generate_content") -> None:
+        """Persist the token usage of a Gemini response (batched write into api_logs) and update metrics"""
+        observe_gemini_call(service_type, duration, getattr(response, 'usage_metadata', None), success)
+        api_log_writer.record_gemini_call(
+            service_name=service_name,
+            service_type=service_type,
+            model=model,
+            usage_metadata=getattr(response, 'usage_metadata', None),
+            duration_seconds=duration,
+            learner_session_id=learner_session_id,
+            success=success,
+            endpoint=endpoint
+        )
+    
     async def upload_file_with_retry(self, file_path: str, mime_type: str):
         """Read file locally for Vertex AI processing"""
         if not self.client:
@@ -194,13 +212,14 @@ class VertexAIAdapter:
             logger.error(f"❌ VERTEX AI [FILE] Failed to read {Path(file_path).name}: {str(e)}")
             raise VertexAIError(f"File reading failed: {str(e)}", original_error=e)
     
-    async def generate_content_with_grounding(self, prompt, generation_config: Optional[Dict[str, Any]] = None, use_google_search: bool = False, session_id: Optional[str] = None, learner_session_id: Optional[str] = None) -> tuple[str, Optional[Dict[str, Any]]]:
+    async def generate_content_with_grounding(self, prompt, generation_config: Optional[Dict[str, Any]] = None, use_google_search: bool = False, session_id: Optional[str] = None, learner_session_id: Optional[str] = None, service_type: Optional[ServiceType] = None) -> tuple[str, Optional[Dict[str, Any]]]:
         """Generate content with optional Google Search grounding using genai.Client"""
         if not VERTEX_AI_AVAILABLE or not genai:
             raise VertexAIError("Vertex AI with grounding not available - missing dependencies")
         
         start_time = time.time()
         call_id = None
+        response = None
         
         try:
             # Get project and location from settings
@@ -251,7 +270,7 @@ class VertexAIAdapter:
                     "project_id": project_id,
                     "location": location
                 },
-                service_type=ServiceType.CONVERSATION  # Grounding pour conversations enrichies
+                service_type=service_type or ServiceType.CONVERSATION  # Grounding pour conversations enrichies
             )
             
             logger.info(f"🚀 VERTEX AI [GROUNDING] Starting content generation - Call ID: {call_id}")
@@ -267,6 +286,8 @@ class VertexAIAdapter:
             )
             
             duration = time.time() - start_time
+            self._record_usage("vertex_ai_adapter_grounding", service_type or ServiceType.CONVERSATION, "gemini-2.5-flash",
+                               response, duration, learner_session_id, endpoint="generate_content_with_grounding")
             result = response.text
             
             # Extract grounding metadata if available
@@ -326,6 +347,9 @@ class VertexAIAdapter:
             duration = time.time() - start_time
             
             # 🔍 NOUVEAU: Logger centralisé - ERROR (grounding)
+            if call_id and response is None:
+                self._record_usage("vertex_ai_adapter_grounding", service_type or ServiceType.CONVERSATION, "gemini-2.5-flash",
+                                   None, duration, learner_session_id, success=False, endpoint="generate_content_with_grounding")
             if call_id:
                 gemini_call_logger.log_error(
                     call_id=call_id,
@@ -349,13 +373,14 @@ class VertexAIAdapter:
             
             raise VertexAIError(f"Content generation with grounding failed: {str(e)}", original_error=e)
 
-    async def generate_content(self, prompt, generation_config: Optional[Dict[str, Any]] = None, session_id: Optional[str] = None, learner_session_id: Optional[str] = None) -> str:
+    async def generate_content(self, prompt, generation_config: Optional[Dict[str, Any]] = None, session_id: Optional[str] = None, learner_session_id: Optional[str] = None, service_type: Optional[ServiceType] = None) -> str:
         """Generate content using Vertex AI with Structured Output"""
         if not self.client:
             raise VertexAIError("Vertex AI client not configured")
         
         start_time = time.time()
         call_id = None
+        response = None
         
         try:
             # Prepare generation config - SIMPLE comme l'ancien service
@@ -377,7 +402,7 @@ class VertexAIAdapter:
                     "generation_config": config,
                     "method": "generate_content"
                 },
-                service_type=ServiceType.CONVERSATION  # Par défaut, peut être surchargé par les services appelants
+                service_type=service_type or ServiceType.CONVERSATION  # Par défaut, peut être surchargé par les services appelants
             )
             
             # LOG DÉTAILLÉ INPUT (existant - réduit)
@@ -392,6 +417,8 @@ class VertexAIAdapter:
             )
             
             duration = time.time() - start_time
+            self._record_usage("vertex_ai_adapter", service_type or ServiceType.CONVERSATION, self.model_name,
+                               response, duration, learner_session_id)
             result = response.text
             
             # 🔍 NOUVEAU: Logger centralisé - OUTPUT avec extraction de tokens
@@ -471,6 +498,10 @@ class VertexAIAdapter:
             duration = time.time() - start_time
             
             # 🔍 NOUVEAU: Logger centralisé - ERROR
+            if call_id and response is None:
+                # Failed model call (once a response exists, its usage is already recorded)
+                self._record_usage("vertex_ai_adapter", service_type or ServiceType.CONVERSATION, self.model_name,
+                                   None, duration, learner_session_id, success=False)
             if call_id:
                 gemini_call_logger.log_error(
                     call_id=call_id,
@@ -528,6 +559,8 @@ class VertexAIAdapter:
             )
             
             duration = time.time() - start_time
+            self._record_usage("vertex_ai_adapter_file", ServiceType.DOCUMENT_PROCESSING, self.model_name,
+                               response, duration, endpoint="generate_with_file")
             result = response.text
             
             self._log_api_call(
@@ -681,6 +714,8 @@ class VertexAIAdapter:
                 )
                 
                 # If we reach here, the request was successful
+                self._record_usage("vertex_ai_adapter_tts", ServiceType.TTS, "gemini-2.5-flash-preview-tts",
+                                   response, time.time() - start_time, endpoint="generate_speech_audio")
                 logger.info(f"✅ VERTEX AI [GEMINI_TTS] Success with region: {location}")
                 break
                 
@@ -756,6 +791,7 @@ class VertexAIAdapter:
             "regions_tried": regions_to_try[:regions_to_try.index(location) + 1]
         }
         
+        tts_audio_bytes.inc(len(audio_data), adapter="vertex_ai")
         logger.info(f"✅ VERTEX AI [GEMINI_TTS] Speech generated - {len(audio_data)} bytes in {duration:.2f}s using region {location}")
         return audio_data, metadata
     
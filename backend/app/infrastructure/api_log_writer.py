@@ -0,0 +1,93 @@
+"""
+FIA v3.0 - API Log Writer
+Write-behind buffer persisting the token usage of every Gemini call into api_logs
+"""
+
+import logging
+from typing import Any, List, Optional, Union
+from uuid import UUID
+
+from app.adapters.repositories.api_log_repository import ApiLogRepository
+from app.domain.entities.api_log import ApiLog
+from app.domain.ports.repositories import ApiLogWriterPort
+from app.infrastructure.batch_writer import BatchWriter
+from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _token_count(usage_metadata: Any, name: str) -> Optional[int]:
+    """Read a counter from a usage_metadata object (SDK response) or dict"""
+    value = usage_metadata.get(name) if isinstance(usage_metadata, dict) else getattr(usage_metadata, name, None)
+    return value if isinstance(value, int) else None
+
+
+class ApiLogWriter(BatchWriter, ApiLogWriterPort):
+    """
+    Buffers API call logs and inserts them in batches
+
+    See BatchWriter for the flush policy. Recording a call costs one list
+    append on the request path; usage is queryable within flush_interval_ms.
+    """
+
+    log_tag = "API_LOG_WRITER"
+    item_label = "api logs"
+
+    def record_gemini_call(
+        self,
+        service_name: str,
+        service_type: Optional[Any],
+        model: Optional[str],
+        usage_metadata: Any,
+        duration_seconds: float,
+        learner_session_id: Optional[Union[str, UUID]] = None,
+        success: bool = True,
+        endpoint: str = "generate_content"
+    ) -> None:
+        """
+        Queue the token accounting of one Gemini response (never raises)
+
+        Args:
+            service_name: Gateway method that made the call
+            service_type: ServiceType (or its value) used to break usage down
+            model: Model name the call was sent to
+            usage_metadata: response.usage_metadata (None for failed calls)
+            duration_seconds: Call latency
+            learner_session_id: Learner session the call was made for, if any
+            success: False when the call raised
+        """
+        try:
+            if learner_session_id is not None and not isinstance(learner_session_id, UUID):
+                try:
+                    learner_session_id = UUID(str(learner_session_id))
+                except ValueError:
+                    learner_session_id = None
+            usage = usage_metadata or {}
+            self.write([ApiLog(
+                service_name=service_name,
+                endpoint=endpoint,
+                method="POST",
+                status_code=200 if success else 500,
+                response_time_ms=max(0, int(duration_seconds * 1000)),
+                tokens_used=_token_count(usage, "total_token_count"),
+                learner_session_id=learner_session_id,
+                service_type=getattr(service_type, "value", service_type),
+                model=model,
+                prompt_tokens=_token_count(usage, "prompt_token_count"),
+                candidates_tokens=_token_count(usage, "candidates_token_count"),
+                cached_tokens=_token_count(usage, "cached_content_token_count")
+            )])
+        except Exception as e:
+            logger.error(f"❌ {self.log_tag} [RECORD] Could not record {service_name} call: {str(e)}")
+
+    async def _insert(self, api_logs: List[ApiLog]) -> None:
+        async with AsyncSessionLocal() as db:
+            await ApiLogRepository(db).create_many(api_logs)
+
+
+# Global writer instance
+api_log_writer = ApiLogWriter(
+    flush_interval_ms=settings.api_log_flush_ms,
+    batch_size=settings.api_log_batch_size
+)
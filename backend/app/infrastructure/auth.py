@@ -32,6 +32,7 @@ fastapi_users = FastAPIUsers[TrainerModel, uuid.UUID](
 # Authentication dependencies
 current_active_user = fastapi_users.current_user(active=True)
 current_superuser = fastapi_users.current_user(active=True, superuser=True)
+optional_superuser = fastapi_users.current_user(active=True, superuser=True, optional=True)
 
 # Convert to domain entity
 async def get_current_trainer(
@@ -0,0 +1,169 @@
+"""
+FIA v3.0 - Batch Writer
+Write-behind buffer batching inserts across requests (chat messages, API logs)
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A batch failing this many times in a row is dropped (logged) instead of blocking the buffer
+MAX_FLUSH_ATTEMPTS = 3
+
+
+class BatchWriter(ABC):
+    """
+    Buffers rows and inserts them in batches
+
+    A row waits at most `flush_interval_ms` (less when `batch_size` rows are
+    pending) before one multi-row INSERT and one commit persist every pending
+    row, whatever request produced it. Failed batches are put back and retried
+    on the next flush. stop() flushes what is left. A write's `on_written`
+    callback runs once all of its rows are committed; it never runs if one
+    of them is dropped.
+
+    Subclasses set `log_tag` / `item_label` and implement `_insert`.
+    """
+
+    log_tag = "BATCH_WRITER"
+    item_label = "rows"
+
+    def __init__(
+        self,
+        flush_interval_ms: int = 100,
+        batch_size: int = 200,
+        max_pending: int = 10000,
+        sink: Optional[Callable[[List[Any]], Awaitable[Any]]] = None
+    ):
+        self.flush_interval_ms = flush_interval_ms
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._sink = sink or self._insert
+        self._pending: List[Any] = []
+        self._failed_attempts = 0
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._stats = {"written": 0, "batches": 0, "failed_batches": 0, "dropped": 0}
+        # Rows queued / consumed (written or dropped) since startup: the pending
+        # rows are the queue positions [_consumed, _queued). Callbacks wait with
+        # the positions [first, end) of their write's rows
+        self._queued = 0
+        self._consumed = 0
+        self._callbacks: Deque[Tuple[int, int, Callable[[], Any]]] = deque()
+
+    def write(self, items: List[Any], on_written: Optional[Callable[[], Any]] = None) -> None:
+        """Queue rows for the next batch (never raises, never blocks)"""
+        try:
+            overflow = len(self._pending) + len(items) - self.max_pending
+            if overflow > 0:
+                # Database unreachable for a long time: keep memory bounded, drop the oldest
+                del self._pending[:overflow]
+                self._stats["dropped"] += overflow
+                self._consume(overflow, written=False)
+                logger.error(f"❌ {self.log_tag} [OVERFLOW] Dropped {overflow} {self.item_label}")
+            self._pending.extend(items)
+            if on_written is not None:
+                self._callbacks.append((self._queued, self._queued + len(items), on_written))
+            self._queued += len(items)
+            self._has_pending.set()
+            if len(self._pending) >= self.batch_size:
+                self._batch_full.set()
+            if self._task is None:
+                # Not started (scripts, tests): flush right away
+                asyncio.get_running_loop().create_task(self.flush())
+        except Exception as e:
+            logger.error(f"❌ {self.log_tag} [WRITE] Could not queue {len(items)} {self.item_label}: {str(e)}")
+
+    async def flush(self) -> int:
+        """Insert every pending row in batches of at most batch_size"""
+        written = 0
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:self.batch_size]
+                del self._pending[:len(batch)]
+                try:
+                    await self._sink(batch)
+                except Exception as e:
+                    self._stats["failed_batches"] += 1
+                    self._failed_attempts += 1
+                    if self._failed_attempts >= MAX_FLUSH_ATTEMPTS:
+                        self._failed_attempts = 0
+                        self._stats["dropped"] += len(batch)
+                        self._consume(len(batch), written=False)
+                        logger.error(f"❌ {self.log_tag} [FLUSH] Dropped {len(batch)} {self.item_label} after {MAX_FLUSH_ATTEMPTS} attempts: {str(e)}")
+                    else:
+                        self._pending[:0] = batch
+                        logger.warning(f"⚠️ {self.log_tag} [FLUSH] {len(batch)} {self.item_label} kept for retry: {str(e)}")
+                    break
+                self._failed_attempts = 0
+                self._stats["written"] += len(batch)
+                self._stats["batches"] += 1
+                written += len(batch)
+                self._consume(len(batch), written=True)
+            if not self._pending:
+                self._has_pending.clear()
+            self._batch_full.clear()
+        return written
+
+    async def start(self) -> None:
+        """Start the flush loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the loop and flush the remaining rows"""
+        if self._task is not None:
+            # Wake the loop instead of cancelling it: a cancelled insert could lose its batch
+            self._stopping = True
+            self._has_pending.set()
+            self._batch_full.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+        await self.flush()
+        if self._pending:
+            logger.error(f"❌ {self.log_tag} [STOP] {len(self._pending)} {self.item_label} could not be written")
+
+    def _consume(self, count: int, written: bool) -> None:
+        """Account for the oldest rows leaving the queue, written or dropped"""
+        self._consumed += count
+        if not written:
+            # Writes with a dropped row are never complete: forget their callbacks
+            while self._callbacks and self._callbacks[0][0] < self._consumed:
+                self._callbacks.popleft()
+            return
+        while self._callbacks and self._callbacks[0][1] <= self._consumed:
+            _, _, callback = self._callbacks.popleft()
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"❌ {self.log_tag} [CALLBACK] on_written failed: {str(e)}")
+
+    def get_stats(self) -> dict:
+        return {**self._stats, "pending": len(self._pending)}
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            await self._has_pending.wait()
+            try:
+                # Bounded latency: flush after the interval, or earlier once a batch is full
+                await asyncio.wait_for(self._batch_full.wait(), timeout=self.flush_interval_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping:
+                return
+            await self.flush()
+            if self._pending and not self._stopping:
+                # Failed flush: back off instead of spinning
+                await asyncio.sleep(self.flush_interval_ms / 1000)
+
+    @abstractmethod
+    async def _insert(self, items: List[Any]) -> None:
+        """Insert and commit one batch (used unless a sink is given)"""
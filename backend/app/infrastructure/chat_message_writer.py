@@ -0,0 +1,39 @@
+"""
+FIA v3.0 - Chat Message Writer
+Write-behind buffer batching chat message inserts across requests
+"""
+
+import logging
+from typing import List
+
+from app.adapters.repositories.chat_message_repository import ChatMessageRepository
+from app.domain.entities.chat_message import ChatMessage
+from app.domain.ports.repositories import ChatMessageWriterPort
+from app.infrastructure.batch_writer import BatchWriter
+from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ChatMessageWriter(BatchWriter, ChatMessageWriterPort):
+    """
+    Buffers chat messages and inserts them in batches
+
+    See BatchWriter for the flush policy. Messages carry their own
+    created_at, so batching keeps their order.
+    """
+
+    log_tag = "CHAT_WRITER"
+    item_label = "chat messages"
+
+    async def _insert(self, chat_messages: List[ChatMessage]) -> None:
+        async with AsyncSessionLocal() as db:
+            await ChatMessageRepository(db).create_many(chat_messages)
+
+
+# Global writer instance
+chat_message_writer = ChatMessageWriter(
+    flush_interval_ms=settings.chat_write_flush_ms,
+    batch_size=settings.chat_write_batch_size
+)
@@ -0,0 +1,121 @@
+"""
+FIA v3.0 - Conversation Summarizer
+Background refresh of the rolling chat summary of learner sessions
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from app.adapters.repositories.chat_message_repository import ChatMessageRepository
+from app.adapters.repositories.conversation_summary_repository import ConversationSummaryRepository
+from app.domain.services.conversation_memory_service import ConversationMemoryService
+from app.domain.services.conversation_prompt_builder import ConversationPromptBuilder
+from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.rate_limiter import gemini_rate_limiter
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_GENERATION_CONFIG = {
+    "temperature": 0.2,
+    "top_p": 0.9,
+    "top_k": 40,
+    "max_output_tokens": 512,
+    "response_mime_type": "application/json"
+}
+
+
+class ConversationSummarizer:
+    """
+    Folds old chat messages into the session summary, off the request path
+
+    schedule() is called after each stored chat turn; it starts at most one
+    task per session and the task only calls Gemini when enough turns have
+    accumulated past the recent window.
+    """
+
+    def __init__(self, token_budget: int = 1500, recent_messages: int = 10, summarize_every_turns: int = 5):
+        self.token_budget = token_budget
+        self.recent_messages = recent_messages
+        self.summarize_every_turns = summarize_every_turns
+        self.prompt_builder = ConversationPromptBuilder()
+        self._vertex_adapter = None  # Created on first summary
+        self._tasks: Dict[UUID, asyncio.Task] = {}
+        self._stats = {"scheduled": 0, "summaries": 0, "errors": 0}
+
+    def create_memory_service(self, db) -> ConversationMemoryService:
+        """Memory service bound to a database session, with the configured budget"""
+        return ConversationMemoryService(
+            ChatMessageRepository(db),
+            ConversationSummaryRepository(db),
+            token_budget=self.token_budget,
+            recent_messages=self.recent_messages,
+            summarize_every_turns=self.summarize_every_turns
+        )
+
+    def schedule(self, learner_session_id: UUID) -> None:
+        """Refresh the session summary in the background if it is due"""
+        if self.summarize_every_turns <= 0 or learner_session_id in self._tasks:
+            return
+        self._stats["scheduled"] += 1
+        task = asyncio.create_task(self._refresh(learner_session_id))
+        self._tasks[learner_session_id] = task
+        task.add_done_callback(lambda t: self._tasks.pop(learner_session_id, None))
+
+    async def wait_idle(self) -> None:
+        """Wait for running refreshes (shutdown, tests)"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "running": len(self._tasks)}
+
+    async def _refresh(self, learner_session_id: UUID) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                memory = self.create_memory_service(db)
+                due = await memory.get_messages_to_summarize(learner_session_id)
+                if due is None:
+                    return
+                previous, messages = due
+                prompt = self.prompt_builder.build_conversation_summary_prompt(
+                    previous_summary=previous.summary if previous else None,
+                    messages=[
+                        {"role": "user" if m.is_question() else "assistant", "content": m.content}
+                        for m in messages
+                    ]
+                )
+                summary_text = await self._generate(prompt, learner_session_id)
+                if not summary_text:
+                    return
+                await memory.save_summary(learner_session_id, previous, messages, summary_text)
+                self._stats["summaries"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"⚠️ CHAT_MEMORY [SUMMARY_ERROR] {learner_session_id}: {str(e)}")
+
+    async def _generate(self, prompt: str, learner_session_id: UUID) -> Optional[str]:
+        if self._vertex_adapter is None:
+            from app.infrastructure.adapters.vertex_ai_adapter import VertexAIAdapter
+            self._vertex_adapter = VertexAIAdapter()
+        await gemini_rate_limiter.acquire()
+        response_text = await self._vertex_adapter.generate_content(
+            prompt=prompt,
+            generation_config=SUMMARY_GENERATION_CONFIG,
+            learner_session_id=str(learner_session_id)
+        )
+        try:
+            return json.loads(response_text).get("summary")
+        except (json.JSONDecodeError, AttributeError):
+            return response_text
+
+
+# Global summarizer instance
+conversation_summarizer = ConversationSummarizer(
+    token_budget=settings.chat_history_token_budget,
+    recent_messages=settings.chat_history_recent_messages,
+    summarize_every_turns=settings.chat_summary_every_turns
+)
@@ -0,0 +1,70 @@
+"""
+FIA v3.0 - Dashboard Cache
+Per-trainer TTL cache of trainer dashboard payloads, invalidated when the trainer's data changes
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardCache:
+    """
+    In-process cache of /api/dashboard payloads, keyed by trainer and endpoint
+
+    Entries expire after `ttl_seconds`. Writes invalidate the trainer's
+    entries as they happen: training writes in the repositories, and every
+    rollup refresh for the trainers whose rollups it recomputed (learners
+    joining, progress, sessions). Another worker's writes only show up here
+    when its rollup refresh runs on this worker or the TTL expires.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_trainers: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_trainers = max_trainers
+        self._entries: "OrderedDict[UUID, Dict[str, Tuple[float, Any]]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, trainer_id: UUID, kind: str) -> Optional[Any]:
+        """Cached payload, None if missing or expired"""
+        entry = self._entries.get(trainer_id, {}).get(kind)
+        if entry is None or entry[0] < time.monotonic():
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(trainer_id)
+        self._stats["hits"] += 1
+        return entry[1]
+
+    def put(self, trainer_id: UUID, kind: str, payload: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._entries.setdefault(trainer_id, {})[kind] = (time.monotonic() + self.ttl_seconds, payload)
+        self._entries.move_to_end(trainer_id)
+        while len(self._entries) > self.max_trainers:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, trainer_id) -> None:
+        """Drop every cached payload of a trainer (never raises)"""
+        try:
+            key = trainer_id if isinstance(trainer_id, UUID) else UUID(str(trainer_id))
+        except (TypeError, ValueError):
+            return
+        if self._entries.pop(key, None) is not None:
+            self._stats["invalidations"] += 1
+
+    def invalidate_many(self, trainer_ids: Iterable) -> None:
+        for trainer_id in trainer_ids:
+            self.invalidate(trainer_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "trainers": len(self._entries)}
+
+
+# Global cache instance
+dashboard_cache = DashboardCache(ttl_seconds=settings.dashboard_cache_ttl_seconds)
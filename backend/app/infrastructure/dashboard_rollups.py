@@ -0,0 +1,476 @@
+"""
+FIA v3.0 - Dashboard Rollups
+Per session / training / trainer / day aggregates, so dashboards read rollup rows instead of scanning activity tables
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import Date, case, cast, delete, distinct, exists, func, literal_column, select, text, union_all
+from sqlalchemy.dialects.postgresql import insert
+
+from app.infrastructure.dashboard_cache import dashboard_cache
+from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.models.dashboard_rollup_model import (
+    DailyActivityRollupModel, SessionRollupModel, TrainerRollupModel, TrainingRollupModel
+)
+from app.infrastructure.models.learner_session_model import LearnerSessionModel
+from app.infrastructure.models.learner_training_plan_model import LearnerTrainingPlanModel
+from app.infrastructure.models.trainer_model import TrainerModel
+from app.infrastructure.models.training_model import TrainingModel
+from app.infrastructure.models.training_module_model import TrainingModuleModel
+from app.infrastructure.models.training_session_model import TrainingSessionModel
+from app.infrastructure.models.training_slide_model import TrainingSlideModel
+from app.infrastructure.models.training_submodule_model import TrainingSubmoduleModel
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant identifying the reconciler in pg_try_advisory_xact_lock
+RECONCILE_LOCK_ID = 0x524F_4C4C  # "ROLL"
+
+# Keys failing this many refreshes in a row are left to the reconciler instead of being retried forever
+MAX_REFRESH_ATTEMPTS = 3
+
+
+def _utc_day(column):
+    """Calendar day (UTC) of a timestamptz column"""
+    return cast(func.timezone(literal_column("'UTC'"), column), Date)
+
+
+def _slides_by_learner_session():
+    """Training slides joined up to the learner session whose plan holds them"""
+    return select().select_from(TrainingSlideModel).join(
+        TrainingSubmoduleModel, TrainingSlideModel.submodule_id == TrainingSubmoduleModel.id
+    ).join(
+        TrainingModuleModel, TrainingSubmoduleModel.module_id == TrainingModuleModel.id
+    ).join(
+        LearnerTrainingPlanModel, TrainingModuleModel.plan_id == LearnerTrainingPlanModel.id
+    ).join(
+        LearnerSessionModel, LearnerTrainingPlanModel.learner_session_id == LearnerSessionModel.id
+    )
+
+
+def _upsert(model, rows):
+    """INSERT ... SELECT rows (labelled like the table columns) ON CONFLICT refresh every column"""
+    columns = [column.name for column in rows.selected_columns]
+    statement = insert(model).from_select(columns, rows)
+    keys = [column.name for column in model.__table__.primary_key]
+    return statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={column: statement.excluded[column] for column in columns if column not in keys}
+    )
+
+
+class DashboardRollups:
+    """
+    Incrementally maintained dashboard rollups
+
+    Learner session, slide, session and training writes only mark their keys
+    dirty in memory. The background loop then recomputes the rollup rows of
+    the dirty sessions, of their trainings and trainers, and of the days the
+    activity happened on, with aggregates restricted to those keys (exact
+    distinct counts, no drifting deltas). The same loop periodically
+    recomputes every rollup to absorb drift (writes outside the repositories,
+    lost marks on restart, deletions).
+    """
+
+    def __init__(
+        self,
+        refresh_interval_seconds: float = 5.0,
+        reconcile_interval_seconds: float = 3600.0,
+        session_factory: Optional[Callable[[], Any]] = None
+    ):
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+        self._session_factory = session_factory or AsyncSessionLocal
+        self._dirty: Dict[str, Set[UUID]] = {
+            "learner_sessions": set(), "slides": set(), "plans": set(),
+            "sessions": set(), "trainings": set(), "trainers": set()
+        }
+        self._days: Set[date] = set()
+        self._failed_attempts = 0
+        self._refresh_lock = asyncio.Lock()
+        self._stop_event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"refreshes": 0, "failed_refreshes": 0, "sessions": 0, "trainings": 0, "trainers": 0}
+        self._last_reconcile: Optional[Dict[str, Any]] = None
+
+    def mark_learner_session(self, learner_session_id) -> None:
+        """Learner progress, time or plan changed"""
+        self._mark("learner_sessions", learner_session_id)
+
+    def mark_slide(self, slide_id) -> None:
+        """Slide created or its content generated"""
+        self._mark("slides", slide_id)
+
+    def mark_plan(self, plan_id) -> None:
+        """Training plan structure (slides) persisted"""
+        self._mark("plans", plan_id)
+
+    def mark_session(self, training_session_id) -> None:
+        """Learner joined or left the session"""
+        self._mark("sessions", training_session_id)
+
+    def mark_training(self, training_id) -> None:
+        """Session created, toggled or deleted"""
+        self._mark("trainings", training_id)
+
+    def mark_trainer(self, trainer_id) -> None:
+        """Training created, retyped or deleted"""
+        self._mark("trainers", trainer_id)
+
+    def _mark(self, kind: str, key) -> None:
+        try:
+            if key is not None:
+                self._dirty[kind].add(key if isinstance(key, UUID) else UUID(str(key)))
+                self._days.add(datetime.now(timezone.utc).date())
+        except Exception as e:
+            logger.warning(f"⚠️ DASHBOARD_ROLLUPS [MARK] Ignored {kind} key {key!r}: {str(e)}")
+
+    async def refresh(self) -> Optional[Dict[str, int]]:
+        """Recompute the rollups of every dirty key in one transaction"""
+        async with self._refresh_lock:
+            if not any(self._dirty.values()):
+                return None
+            dirty, days = self._dirty, self._days
+            self._dirty = {kind: set() for kind in dirty}
+            self._days = set()
+            try:
+                async with self._session_factory() as db:
+                    counts, trainer_ids = await self._refresh_keys(db, dirty, days)
+                    await db.commit()
+            except Exception as e:
+                self._stats["failed_refreshes"] += 1
+                self._failed_attempts += 1
+                if self._failed_attempts >= MAX_REFRESH_ATTEMPTS:
+                    self._failed_attempts = 0
+                    logger.error(f"❌ DASHBOARD_ROLLUPS [REFRESH] Keys left to the reconciler after {MAX_REFRESH_ATTEMPTS} attempts: {str(e)}")
+                else:
+                    for kind, keys in dirty.items():
+                        self._dirty[kind] |= keys
+                    self._days |= days
+                    logger.warning(f"⚠️ DASHBOARD_ROLLUPS [REFRESH] Failed, keys kept for retry: {str(e)}")
+                return None
+            self._failed_attempts = 0
+            # Cached dashboards of these trainers were computed from the previous rollups
+            dashboard_cache.invalidate_many(trainer_ids)
+
+        self._stats["refreshes"] += 1
+        for kind, count in counts.items():
+            self._stats[kind] += count
+        logger.debug(f"📊 DASHBOARD_ROLLUPS [REFRESH] {counts}")
+        return counts
+
+    async def reconcile(self) -> Optional[Dict[str, Any]]:
+        """
+        Recompute every rollup from the activity tables
+
+        Only one worker reconciles at a time (transaction-level advisory lock);
+        the others return None.
+        """
+        started = datetime.now(timezone.utc)
+        async with self._session_factory() as db:
+            locked = (await db.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": RECONCILE_LOCK_ID})).scalar()
+            if not locked:
+                return None
+
+            await db.execute(_upsert(SessionRollupModel, self._session_rows()))
+            await db.execute(_upsert(TrainingRollupModel, self._training_rows()))
+            await db.execute(_upsert(TrainerRollupModel, self._trainer_rows()))
+            await db.execute(delete(DailyActivityRollupModel))
+            await db.execute(_upsert(DailyActivityRollupModel, self._daily_rows()))
+            await db.commit()
+
+        self._last_reconcile = {
+            "at": started.isoformat(),
+            "duration_ms": round((datetime.now(timezone.utc) - started).total_seconds() * 1000)
+        }
+        logger.info(f"🔄 DASHBOARD_ROLLUPS [RECONCILE] {self._last_reconcile}")
+        return self._last_reconcile
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "pending_keys": sum(len(keys) for keys in self._dirty.values()),
+            "last_reconcile": self._last_reconcile
+        }
+
+    async def start(self) -> None:
+        """Start the refresh / reconcile loop (reconciling first if the rollups were never filled)"""
+        if self._task is None:
+            self._stop_event = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the loop and refresh the keys still dirty"""
+        if self._task is not None:
+            # Wake the loop instead of cancelling it: a cancelled refresh would lose its keys
+            self._stop_event.set()
+            await self._task
+            self._task = None
+        await self.refresh()
+
+    async def _needs_backfill(self) -> bool:
+        """Trainers exist but no trainer rollup row does (rollup tables just created)"""
+        async with self._session_factory() as db:
+            query = select(exists(select(TrainerModel.id)) & ~exists(select(TrainerRollupModel.trainer_id)))
+            return bool((await db.execute(query)).scalar())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            # Dashboards read zeros until the first reconcile, which is disabled at 0
+            if await self._needs_backfill():
+                logger.info("🔄 DASHBOARD_ROLLUPS [BACKFILL] Rollup tables are empty, reconciling now")
+                await self.reconcile()
+        except Exception as e:
+            logger.warning(f"⚠️ DASHBOARD_ROLLUPS [BACKFILL] Failed: {str(e)}")
+        next_reconcile = loop.time() + min(60.0, self.reconcile_interval_seconds)
+        while True:
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.refresh_interval_seconds)
+                return
+            except asyncio.TimeoutError:
+                pass
+            await self.refresh()
+            if self.reconcile_interval_seconds > 0 and loop.time() >= next_reconcile:
+                next_reconcile = loop.time() + self.reconcile_interval_seconds
+                try:
+                    await self.reconcile()
+                except Exception as e:
+                    logger.warning(f"⚠️ DASHBOARD_ROLLUPS [RECONCILE] Failed: {str(e)}")
+
+    async def _refresh_keys(self, db, dirty: Dict[str, Set[UUID]], days: Set[date]) -> Tuple[Dict[str, int], Set[UUID]]:
+        """Resolve dirty keys up the session -> training -> trainer chain and recompute each level"""
+        session_ids = set(dirty["sessions"])
+        if dirty["learner_sessions"]:
+            session_ids |= await self._scalars(db, select(LearnerSessionModel.training_session_id).where(
+                LearnerSessionModel.id.in_(dirty["learner_sessions"])
+            ))
+        if dirty["plans"]:
+            session_ids |= await self._scalars(db, select(LearnerSessionModel.training_session_id).join(
+                LearnerTrainingPlanModel, LearnerTrainingPlanModel.learner_session_id == LearnerSessionModel.id
+            ).where(LearnerTrainingPlanModel.id.in_(dirty["plans"])))
+        if dirty["slides"]:
+            session_ids |= await self._scalars(db, _slides_by_learner_session().add_columns(
+                LearnerSessionModel.training_session_id
+            ).where(TrainingSlideModel.id.in_(dirty["slides"])))
+
+        training_ids = set(dirty["trainings"])
+        if session_ids:
+            await db.execute(_upsert(SessionRollupModel, self._session_rows(session_ids)))
+            training_ids |= await self._scalars(db, select(TrainingSessionModel.training_id).where(
+                TrainingSessionModel.id.in_(session_ids)
+            ))
+
+        trainer_ids = set(dirty["trainers"])
+        if training_ids:
+            await db.execute(_upsert(TrainingRollupModel, self._training_rows(training_ids)))
+            trainer_ids |= await self._scalars(db, select(TrainingModel.trainer_id).where(
+                TrainingModel.id.in_(training_ids)
+            ))
+
+        if trainer_ids:
+            await db.execute(_upsert(TrainerRollupModel, self._trainer_rows(trainer_ids)))
+            if days:
+                first_day, last_day = min(days), max(days)
+                # Recomputed days that lost their activity must not keep their previous row
+                await db.execute(delete(DailyActivityRollupModel).where(
+                    DailyActivityRollupModel.trainer_id.in_(trainer_ids),
+                    DailyActivityRollupModel.day.between(first_day, last_day)
+                ))
+                await db.execute(_upsert(DailyActivityRollupModel, self._daily_rows(trainer_ids, first_day, last_day)))
+
+        return {"sessions": len(session_ids), "trainings": len(training_ids), "trainers": len(trainer_ids)}, trainer_ids
+
+    async def _scalars(self, db, query) -> Set[UUID]:
+        result = await db.execute(query)
+        return {value for value in result.scalars().all() if value is not None}
+
+    def _session_rows(self, session_ids: Optional[Iterable[UUID]] = None):
+        """One rollup row per training session (all of them when session_ids is None)"""
+        learners = select(
+            LearnerSessionModel.training_session_id.label('session_id'),
+            func.count().label('learner_count'),
+            func.coalesce(func.sum(LearnerSessionModel.total_time_spent), 0).label('total_time_seconds'),
+            func.coalesce(func.sum(LearnerSessionModel.current_slide_number), 0).label('slide_progress_sum'),
+            func.coalesce(func.max(LearnerSessionModel.current_slide_number), 0).label('max_slide_reached')
+        ).group_by(LearnerSessionModel.training_session_id)
+        slides = _slides_by_learner_session().add_columns(
+            LearnerSessionModel.training_session_id.label('session_id'),
+            func.count(TrainingSlideModel.id).label('total_slides'),
+            func.count(TrainingSlideModel.content).label('slides_with_content')
+        ).group_by(LearnerSessionModel.training_session_id)
+        rows = select(TrainingSessionModel.id.label('session_id'))
+        if session_ids is not None:
+            learners = learners.where(LearnerSessionModel.training_session_id.in_(session_ids))
+            slides = slides.where(LearnerSessionModel.training_session_id.in_(session_ids))
+            rows = rows.where(TrainingSessionModel.id.in_(session_ids))
+        learners, slides = learners.subquery('learners'), slides.subquery('slides')
+
+        return rows.add_columns(
+            func.coalesce(learners.c.learner_count, 0).label('learner_count'),
+            func.coalesce(learners.c.total_time_seconds, 0).label('total_time_seconds'),
+            func.coalesce(learners.c.slide_progress_sum, 0).label('slide_progress_sum'),
+            func.coalesce(learners.c.max_slide_reached, 0).label('max_slide_reached'),
+            func.coalesce(slides.c.total_slides, 0).label('total_slides'),
+            func.coalesce(slides.c.slides_with_content, 0).label('slides_with_content'),
+            func.now().label('updated_at')
+        ).outerjoin(
+            learners, learners.c.session_id == TrainingSessionModel.id
+        ).outerjoin(
+            slides, slides.c.session_id == TrainingSessionModel.id
+        )
+
+    def _training_rows(self, training_ids: Optional[Iterable[UUID]] = None):
+        """One rollup row per training, summed from its session rollups"""
+        sessions = select(
+            TrainingSessionModel.training_id,
+            func.count().label('session_count'),
+            func.count(case((TrainingSessionModel.is_active == True, 1))).label('active_session_count'),
+            func.coalesce(func.sum(SessionRollupModel.total_time_seconds), 0).label('total_time_seconds'),
+            func.coalesce(func.sum(SessionRollupModel.slide_progress_sum), 0).label('slide_progress_sum'),
+            func.coalesce(func.max(SessionRollupModel.max_slide_reached), 0).label('max_slide_reached'),
+            func.coalesce(func.sum(SessionRollupModel.total_slides), 0).label('total_slides'),
+            func.coalesce(func.sum(SessionRollupModel.slides_with_content), 0).label('slides_with_content')
+        ).outerjoin(
+            SessionRollupModel, SessionRollupModel.session_id == TrainingSessionModel.id
+        ).group_by(TrainingSessionModel.training_id)
+        # The same email in two sessions is one learner of the training
+        learners = select(
+            TrainingSessionModel.training_id,
+            func.count(distinct(LearnerSessionModel.email)).label('learner_count')
+        ).select_from(LearnerSessionModel).join(
+            TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id
+        ).group_by(TrainingSessionModel.training_id)
+        rows = select(TrainingModel.id.label('training_id'))
+        if training_ids is not None:
+            sessions = sessions.where(TrainingSessionModel.training_id.in_(training_ids))
+            learners = learners.where(TrainingSessionModel.training_id.in_(training_ids))
+            rows = rows.where(TrainingModel.id.in_(training_ids))
+        sessions, learners = sessions.subquery('sessions'), learners.subquery('learners')
+
+        return rows.add_columns(
+            func.coalesce(sessions.c.session_count, 0).label('session_count'),
+            func.coalesce(sessions.c.active_session_count, 0).label('active_session_count'),
+            func.coalesce(learners.c.learner_count, 0).label('learner_count'),
+            func.coalesce(sessions.c.total_time_seconds, 0).label('total_time_seconds'),
+            func.coalesce(sessions.c.slide_progress_sum, 0).label('slide_progress_sum'),
+            func.coalesce(sessions.c.max_slide_reached, 0).label('max_slide_reached'),
+            func.coalesce(sessions.c.total_slides, 0).label('total_slides'),
+            func.coalesce(sessions.c.slides_with_content, 0).label('slides_with_content'),
+            func.now().label('updated_at')
+        ).outerjoin(
+            sessions, sessions.c.training_id == TrainingModel.id
+        ).outerjoin(
+            learners, learners.c.training_id == TrainingModel.id
+        )
+
+    def _trainer_rows(self, trainer_ids: Optional[Iterable[UUID]] = None):
+        """One rollup row per trainer, summed from the training rollups"""
+        trainings = select(
+            TrainingModel.trainer_id,
+            func.count(case((TrainingModel.is_ai_generated == False, 1))).label('trainings_with_support'),
+            func.count(case((TrainingModel.is_ai_generated == True, 1))).label('trainings_ai_generated'),
+            func.coalesce(func.sum(TrainingRollupModel.session_count), 0).label('session_count'),
+            func.coalesce(func.sum(TrainingRollupModel.active_session_count), 0).label('active_session_count'),
+            func.coalesce(func.sum(TrainingRollupModel.total_time_seconds), 0).label('total_time_seconds'),
+            func.coalesce(func.sum(TrainingRollupModel.slide_progress_sum), 0).label('slide_progress_sum'),
+            func.coalesce(func.sum(TrainingRollupModel.total_slides), 0).label('total_slides'),
+            func.coalesce(func.sum(TrainingRollupModel.slides_with_content), 0).label('slides_with_content')
+        ).outerjoin(
+            TrainingRollupModel, TrainingRollupModel.training_id == TrainingModel.id
+        ).group_by(TrainingModel.trainer_id)
+        learners = select(
+            TrainingModel.trainer_id,
+            func.count(distinct(LearnerSessionModel.email)).label('learner_count')
+        ).select_from(LearnerSessionModel).join(
+            TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id
+        ).join(
+            TrainingModel, TrainingSessionModel.training_id == TrainingModel.id
+        ).group_by(TrainingModel.trainer_id)
+        rows = select(TrainerModel.id.label('trainer_id'))
+        if trainer_ids is not None:
+            trainings = trainings.where(TrainingModel.trainer_id.in_(trainer_ids))
+            learners = learners.where(TrainingModel.trainer_id.in_(trainer_ids))
+            rows = rows.where(TrainerModel.id.in_(trainer_ids))
+        trainings, learners = trainings.subquery('trainings'), learners.subquery('learners')
+
+        return rows.add_columns(
+            *(
+                func.coalesce(trainings.c[name], 0).label(name)
+                for name in ('trainings_with_support', 'trainings_ai_generated', 'session_count', 'active_session_count')
+            ),
+            func.coalesce(learners.c.learner_count, 0).label('learner_count'),
+            *(
+                func.coalesce(trainings.c[name], 0).label(name)
+                for name in ('total_time_seconds', 'slide_progress_sum', 'total_slides', 'slides_with_content')
+            ),
+            func.now().label('updated_at')
+        ).outerjoin(
+            trainings, trainings.c.trainer_id == TrainerModel.id
+        ).outerjoin(
+            learners, learners.c.trainer_id == TrainerModel.id
+        )
+
+    def _daily_rows(self, trainer_ids: Optional[Iterable[UUID]] = None,
+                    first_day: Optional[date] = None, last_day: Optional[date] = None):
+        """One rollup row per trainer and UTC day with learners starting or slides being generated"""
+        started_day = _utc_day(LearnerSessionModel.started_at)
+        generated_day = _utc_day(TrainingSlideModel.generated_at)
+        learners = select(
+            TrainingModel.trainer_id,
+            started_day.label('day'),
+            func.count().label('learners_started'),
+            func.count(distinct(LearnerSessionModel.email)).label('unique_learners'),
+            literal_column('0').label('slides_generated')
+        ).select_from(LearnerSessionModel).join(
+            TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id
+        ).join(
+            TrainingModel, TrainingSessionModel.training_id == TrainingModel.id
+        ).where(
+            LearnerSessionModel.started_at.isnot(None)
+        ).group_by(TrainingModel.trainer_id, started_day)
+        slides = _slides_by_learner_session().add_columns(
+            TrainingModel.trainer_id,
+            generated_day.label('day'),
+            literal_column('0').label('learners_started'),
+            literal_column('0').label('unique_learners'),
+            func.count().label('slides_generated')
+        ).join(
+            TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id
+        ).join(
+            TrainingModel, TrainingSessionModel.training_id == TrainingModel.id
+        ).where(
+            TrainingSlideModel.generated_at.isnot(None)
+        ).group_by(TrainingModel.trainer_id, generated_day)
+        if trainer_ids is not None:
+            learners = learners.where(TrainingModel.trainer_id.in_(trainer_ids))
+            slides = slides.where(TrainingModel.trainer_id.in_(trainer_ids))
+        if first_day is not None:
+            # Range on the raw timestamps so the day filter stays sargable
+            since = datetime.combine(first_day, time.min, tzinfo=timezone.utc)
+            until = datetime.combine(last_day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+            learners = learners.where(LearnerSessionModel.started_at >= since, LearnerSessionModel.started_at < until)
+            slides = slides.where(TrainingSlideModel.generated_at >= since, TrainingSlideModel.generated_at < until)
+        activity = union_all(learners, slides).subquery('activity')
+
+        return select(
+            activity.c.trainer_id,
+            activity.c.day,
+            func.sum(activity.c.learners_started).label('learners_started'),
+            func.sum(activity.c.unique_learners).label('unique_learners'),
+            func.sum(activity.c.slides_generated).label('slides_generated'),
+            func.now().label('updated_at')
+        ).group_by(activity.c.trainer_id, activity.c.day)
+
+
+# Global rollups instance
+dashboard_rollups = DashboardRollups(
+    refresh_interval_seconds=settings.dashboard_rollup_refresh_seconds,
+    reconcile_interval_seconds=settings.dashboard_rollup_reconcile_seconds
+)
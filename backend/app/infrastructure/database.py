@@ -3,9 +3,14 @@ FIA v3.0 - Database Configuration
 PostgreSQL connection setup with SQLAlchemy
 """
 
+import time
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.infrastructure.metrics import db_pool_checkout_seconds, metrics
 from app.infrastructure.settings import settings
+from app.infrastructure.tracing import span
 
 
 class Base(DeclarativeBase):
@@ -13,6 +18,18 @@ class Base(DeclarativeBase):
     pass
 
 
+class MeteredAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Default async pool, recording how long each checkout waits for a connection (metric and request span)"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            with span("pool checkout", "db_pool"):
+                return super()._do_get()
+        finally:
+            db_pool_checkout_seconds.observe(time.perf_counter() - started)
+
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
@@ -20,6 +37,14 @@ engine = create_async_engine(
     future=True,
     pool_pre_ping=True,  # Verify connections before use
     pool_recycle=300,    # Recycle connections every 5 minutes
+    poolclass=MeteredAsyncAdaptedQueuePool,
+)
+
+metrics.gauge_callback(
+    "fia_db_pool_checked_out", "Database connections currently checked out", lambda: engine.pool.checkedout()
+)
+metrics.gauge_callback(
+    "fia_db_pool_overflow", "Database connections open beyond the pool size", lambda: max(0, engine.pool.overflow())
 )
 
 # Create async session factory
@@ -69,7 +94,11 @@ async def init_database():
             TrainerModel, TrainingModel, TrainingSessionModel, 
             LearnerSessionModel, SlideModel, ChatMessageModel,
             LearnerTrainingPlanModel, TrainingModuleModel,
-            TrainingSubmoduleModel, TrainingSlideModel
+            TrainingSubmoduleModel, TrainingSlideModel, LiveSessionModel,
+            FileBlobModel, TrainingFileRefModel, StorageManifestModel,
+            DocumentChunkModel, ConversationSummaryModel, SessionRollupModel,
+            TrainingRollupModel, TrainerRollupModel, DailyActivityRollupModel,
+            ApiLogModel
         )
         
         # Create all tables
@@ -0,0 +1,274 @@
+"""
+FIA v3.0 - Local File Cache
+Size-bounded read-through disk cache for remotely stored training files
+"""
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+PARTIAL_SUFFIX = ".part"
+
+
+def compute_etag(path: Path, multipart_part_size: int, parts_count: int = 0) -> str:
+    """
+    Recompute an S3-style ETag for a local file
+
+    Single-part objects have the MD5 of their content as ETag. Multipart
+    objects have the MD5 of the concatenated part MD5s followed by "-N".
+    """
+    if not parts_count:
+        digest = hashlib.md5()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    part_digests = []
+    with open(path, "rb") as f:
+        while True:
+            digest = hashlib.md5()
+            remaining = multipart_part_size
+            while remaining > 0:
+                chunk = f.read(min(HASH_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+            if remaining == multipart_part_size:
+                break
+            part_digests.append(digest.digest())
+    return f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}"
+
+
+def etag_matches(path: Path, etag: str, multipart_part_size: int) -> bool:
+    """Check a downloaded file against the ETag reported by the object store"""
+    etag = etag.strip('"')
+    if not etag:
+        return True
+    parts_count = 0
+    if "-" in etag:
+        try:
+            parts_count = int(etag.rsplit("-", 1)[1])
+        except ValueError:
+            return True  # Unknown ETag format, nothing to verify against
+        size = path.stat().st_size
+        if -(-size // multipart_part_size) != parts_count:
+            # Uploaded with another part size; the ETag cannot be recomputed
+            logger.debug(f"FILE_CACHE [VERIFY] Skipped, unknown part size for {path.name}")
+            return True
+    return compute_etag(path, multipart_part_size, parts_count) == etag
+
+
+class CacheVerificationError(Exception):
+    """Raised when a downloaded file does not match its expected content hash"""
+    pass
+
+
+class LocalFileCache:
+    """
+    Read-through disk cache keyed by object key
+
+    - Fills are atomic: content is downloaded to a unique `.part` file in the
+      cache directory, verified, then renamed into place, so readers (in this
+      or any other worker process) never see a partial file.
+    - Concurrent requests for the same key in one process share a single
+      download.
+    - The directory is kept under `max_bytes` by evicting the least recently
+      used files. Access time is recorded in the file mtime so every worker
+      sharing the directory sees the same recency order.
+    - Files used in the last `min_age_seconds` or currently memory-mapped are
+      never evicted, so a path handed to a caller stays valid while it works.
+
+    Object keys are expected to be immutable (a new upload gets a new key),
+    so cache hits need no round trip to the object store.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, min_age_seconds: float = 300.0):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.min_age_seconds = min_age_seconds
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._mapped: Dict[Path, int] = {}
+        self._initialized = False
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._bytes_downloaded = 0
+
+    def _ensure_directory(self) -> None:
+        if self._initialized:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Remove partial fills left behind by a crashed worker
+        cutoff = time.time() - 3600
+        for partial in self.cache_dir.glob(f"*{PARTIAL_SUFFIX}"):
+            try:
+                if partial.stat().st_mtime < cutoff:
+                    partial.unlink()
+            except OSError:
+                pass
+        self._initialized = True
+
+    def path_for(self, key: str) -> Path:
+        """Local path of a cache entry (exists only once filled)"""
+        suffix = Path(key).suffix.lower()
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}{suffix}"
+
+    async def get_path(
+        self,
+        key: str,
+        fetch: Callable[[Path], Awaitable[Any]],
+        verify: Optional[Callable[[Path], bool]] = None
+    ) -> Path:
+        """
+        Return a local path for `key`, downloading it on a miss
+
+        Args:
+            key: Object key in the remote store
+            fetch: Coroutine writing the object to the given temporary path
+            verify: Optional blocking check of the temporary file (content hash)
+
+        Raises:
+            CacheVerificationError: If the downloaded content fails verification
+        """
+        path = self.path_for(key)
+        if await asyncio.to_thread(self._touch, path):
+            self._hits += 1
+            return path
+
+        task = self._inflight.get(key)
+        if task is None:
+            self._misses += 1
+            task = asyncio.create_task(self._fill(key, path, fetch, verify))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so a cancelled waiter does not abort the download for the others
+        return await asyncio.shield(task)
+
+    async def _fill(
+        self,
+        key: str,
+        path: Path,
+        fetch: Callable[[Path], Awaitable[Any]],
+        verify: Optional[Callable[[Path], bool]]
+    ) -> Path:
+        await asyncio.to_thread(self._ensure_directory)
+        partial = path.with_name(f"{path.name}.{uuid.uuid4().hex}{PARTIAL_SUFFIX}")
+        started = time.perf_counter()
+        try:
+            await fetch(partial)
+            if verify is not None and not await asyncio.to_thread(verify, partial):
+                raise CacheVerificationError(f"Content hash mismatch for {key}")
+            size = partial.stat().st_size
+            os.replace(partial, path)
+        except BaseException:
+            try:
+                partial.unlink()
+            except OSError:
+                pass
+            raise
+
+        self._bytes_downloaded += size
+        logger.info(
+            f"📥 FILE_CACHE [FILL] {key} ({size} bytes) in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        await asyncio.to_thread(self._evict, path)
+        return path
+
+    def discard(self, key: str) -> None:
+        """Drop a cached entry, e.g. after the remote object was deleted"""
+        try:
+            self.path_for(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _touch(path: Path) -> bool:
+        """Mark an entry as recently used; False if it is not cached"""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _evict(self, keep: Path) -> None:
+        """Delete least recently used entries until the cache fits `max_bytes`"""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.iterdir():
+            if entry.name.endswith(PARTIAL_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        cutoff = time.time() - self.min_age_seconds
+        for mtime, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if entry == keep or mtime > cutoff or self._mapped.get(entry):
+                continue
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            total -= size
+            self._evictions += 1
+            logger.debug(f"🧹 FILE_CACHE [EVICT] {entry.name} ({size} bytes)")
+
+        if total > self.max_bytes:
+            logger.warning(f"⚠️ FILE_CACHE [FULL] {total} bytes in use, all remaining entries are pinned")
+
+    @contextmanager
+    def open_mmap(self, path: Path) -> Iterator[mmap.mmap]:
+        """Memory-map a cached file read-only; the entry is pinned while open"""
+        self._mapped[path] = self._mapped.get(path, 0) + 1
+        try:
+            with open(path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    yield mapped
+        finally:
+            self._mapped[path] -= 1
+            if not self._mapped[path]:
+                del self._mapped[path]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit ratio and download volume since startup"""
+        lookups = self._hits + self._misses
+        return {
+            "cache_dir": str(self.cache_dir),
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0,
+            "evictions": self._evictions,
+            "bytes_downloaded": self._bytes_downloaded,
+            "inflight": len(self._inflight)
+        }
+
+
+# Global cache for training files kept in remote storage (R2)
+training_file_cache = LocalFileCache(
+    cache_dir=settings.r2_cache_dir,
+    max_bytes=settings.r2_cache_max_mb * 1024 * 1024
+)
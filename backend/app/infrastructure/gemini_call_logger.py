@@ -4,33 +4,47 @@ Service centralisé pour logger tous les appels et réponses Gemini/VertexAI ave
 ATTENTION: Ce service ne doit PAS impacter la logique métier existante
 """
 
-import logging
+import asyncio
+import gzip
 import json
+import logging
+import os
+import queue
+import shutil
 import time
-from typing import Optional, Dict, Any, Union
+import zlib
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, Dict, Any, Union, List, Tuple
 from datetime import datetime, timezone
 from uuid import UUID
 from enum import Enum
 
+from app.infrastructure.settings import settings
+
 logger = logging.getLogger(__name__)
+# Prompts et réponses complets des appels échantillonnés
+body_logger = logging.getLogger(f"{__name__}.bodies")
+
+BODY_LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
 
 
 class ServiceType(Enum):
     """Types de services pour catégoriser les appels AI"""
     PLAN = "plan_generation"
-    SLIDES = "slide_generation"  
+    SLIDES = "slide_generation"
     CONVERSATION = "conversation"
     TTS = "tts_generation"
     LIVE = "live_conversation"
     IMAGE = "image_generation"
     CONTEXT_CACHE = "context_cache"
     DOCUMENT_PROCESSING = "document_processing"
-    
+
     @classmethod
     def from_service_name(cls, service_name: str) -> 'ServiceType':
         """Détecter le type de service depuis le nom du service"""
         service_name_lower = service_name.lower()
-        
+
         if "plan" in service_name_lower:
             return cls.PLAN
         elif "slide" in service_name_lower:
@@ -51,26 +65,180 @@ class ServiceType(Enum):
             return cls.CONVERSATION  # Default fallback
 
 
+def _format_response(response: Any) -> str:
+    """Formater la réponse pour un affichage lisible (JSON indenté si possible)"""
+    try:
+        if isinstance(response, str):
+            try:
+                parsed = json.loads(response)
+                return json.dumps(parsed, indent=2, ensure_ascii=False)
+            except json.JSONDecodeError:
+                return response
+        elif isinstance(response, dict):
+            return json.dumps(response, indent=2, ensure_ascii=False, default=str)
+        else:
+            return str(response)
+    except Exception:
+        return str(response)
+
+
+class _Body:
+    """
+    Prompt ou réponse complet, rendu (JSON indenté, tronqué) à l'écriture du log
+
+    Le rendu a lieu dans le thread du QueueListener une fois le pipeline
+    démarré, jamais sur la boucle d'événements.
+    """
+
+    __slots__ = ("kind", "call_id", "content", "max_chars")
+
+    def __init__(self, kind: str, call_id: str, content: Any, max_chars: int):
+        self.kind = kind
+        self.call_id = call_id
+        self.content = content
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        text = _format_response(self.content) if self.kind == "RESPONSE" else str(self.content)
+        if self.max_chars and len(text) > self.max_chars:
+            text = f"{text[:self.max_chars]}\n... [truncated {len(text) - self.max_chars} characters]"
+        return f"📄 [GEMINI_BODY] [{self.kind}] call_id={self.call_id}\n{text}"
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler qui laisse le formatage des messages au thread du listener"""
+
+    def __init__(self, log_queue: queue.Queue, on_drop):
+        super().__init__(log_queue)
+        self.on_drop = on_drop
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # File in-process: pas besoin de pré-formater ni de copier le record
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.on_drop()
+
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Compresser le fichier de bodies sortant lors de la rotation"""
+    with open(source, "rb") as source_file, gzip.open(dest, "wb") as dest_file:
+        shutil.copyfileobj(source_file, dest_file)
+    os.remove(source)
+
+
 class GeminiCallLogger:
     """
     Service centralisé pour logger tous les appels Gemini/VertexAI de façon standardisée
-    
-    Objectifs:
-    - Traçabilité complète des appels AI
-    - Format uniforme pour debug facile
-    - ID de session pour suivre les conversations
-    - Aucun impact sur la logique métier
+
+    Chaque appel produit une ligne de métadonnées structurées (call id, type,
+    tailles, tokens, durée). Les prompts et réponses complets ne sont loggés que
+    pour une fraction body_sample_rate des appels (décision déterministe par
+    call id, l'entrée et la sortie d'un appel sont donc gardées ensemble),
+    tronqués à body_max_chars, dans un fichier à rotation compressée en gzip.
+
+    Une fois start() appelé, les records passent par une file et sont écrits
+    par un thread QueueListener: la boucle d'événements ne paie plus que la
+    création du record. Avant start() (scripts, tests), le logging reste
+    synchrone sur les handlers de l'application.
     """
-    
-    def __init__(self):
-        """Initialize Gemini call logger"""
+
+    def __init__(
+        self,
+        body_sample_rate: float = 1.0,
+        body_max_chars: int = 0,
+        body_log_file: str = "",
+        body_log_max_bytes: int = 50 * 1024 * 1024,
+        body_log_backups: int = 5,
+        queue_size: int = 10000
+    ):
+        """
+        Initialize Gemini call logger
+
+        Args:
+            body_sample_rate: Fraction des appels dont le prompt/la réponse complets sont loggés (0 à 1)
+            body_max_chars: Taille maximale d'un body loggé (0 = pas de troncature)
+            body_log_file: Fichier des bodies ("" = logs de l'application)
+            body_log_max_bytes: Taille du fichier de bodies avant rotation
+            body_log_backups: Nombre de fichiers compressés conservés
+            queue_size: Records en attente avant que les nouveaux soient abandonnés
+        """
+        self.body_sample_rate = min(max(body_sample_rate, 0.0), 1.0)
+        self.body_max_chars = body_max_chars
+        self.body_log_file = body_log_file
+        self.body_log_max_bytes = body_log_max_bytes
+        self.body_log_backups = body_log_backups
+        self.queue_size = queue_size
+
         self.call_counter = 0
-        # 🔍 Simple déduplication pour éviter les logs identiques en succession rapide
-        self.last_prompt_hash = None
-        self.last_prompt_time = 0
-        self.dedup_window_seconds = 2  # Éviter les doublons dans une fenêtre de 2 secondes
+        self.bodies_logged = 0
+        self.dropped_records = 0
+        # 🔍 Déduplication des prompts identiques en succession rapide (appels imbriqués
+        # adapter -> gateway), sur une petite fenêtre de prompts récents
+        self.dedup_window_seconds = 2
+        self.dedup_max_entries = 256
+        self._recent_prompts: "OrderedDict[Tuple[int, int], float]" = OrderedDict()
+
+        self._listeners: List[QueueListener] = []
+        self._queue_handlers: List[Tuple[logging.Logger, QueueHandler]] = []
+        self._body_file_handler: Optional[RotatingFileHandler] = None
         logger.info("🔍 GEMINI_CALL_LOGGER [INIT] Service initialized")
-    
+
+    async def start(self) -> None:
+        """Faire passer les logs d'appels par une file écrite dans un thread dédié"""
+        if self._listeners:
+            return
+
+        app_handlers = list(logging.getLogger().handlers)
+        if not app_handlers:
+            logger.warning("⚠️ GEMINI_CALL_LOGGER [START] No log handler configured, logging stays synchronous")
+            return
+
+        body_handlers = app_handlers
+        if self.body_log_file:
+            try:
+                self._body_file_handler = self._create_body_file_handler()
+                body_handlers = [self._body_file_handler]
+            except OSError as e:
+                logger.error(f"❌ GEMINI_CALL_LOGGER [START] Cannot open {self.body_log_file}, bodies go to the application log: {e}")
+
+        for target_logger, handlers in ((logger, app_handlers), (body_logger, body_handlers)):
+            log_queue: queue.Queue = queue.Queue(self.queue_size)
+            listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            queue_handler = _DeferredQueueHandler(log_queue, self._count_drop)
+            target_logger.addHandler(queue_handler)
+            target_logger.propagate = False
+            listener.start()
+            self._listeners.append(listener)
+            self._queue_handlers.append((target_logger, queue_handler))
+
+        logger.info(
+            f"🚀 GEMINI_CALL_LOGGER [START] Queued logging, bodies sampled at {self.body_sample_rate:.0%} "
+            f"-> {self.body_log_file if self._body_file_handler else 'application log'}"
+        )
+
+    async def stop(self) -> None:
+        """Vider la file et revenir au logging synchrone"""
+        if not self._listeners:
+            return
+        for target_logger, queue_handler in self._queue_handlers:
+            target_logger.removeHandler(queue_handler)
+            target_logger.propagate = True
+        listeners, self._listeners, self._queue_handlers = self._listeners, [], []
+        # stop() attend que le thread ait écrit les records restants
+        await asyncio.to_thread(lambda: [listener.stop() for listener in listeners])
+        if self._body_file_handler:
+            self._body_file_handler.close()
+            self._body_file_handler = None
+        logger.info(f"🛑 GEMINI_CALL_LOGGER [STOP] Log queue drained ({self.dropped_records} records dropped)")
+
     def log_input(
         self,
         service_name: str,
@@ -82,7 +250,7 @@ class GeminiCallLogger:
     ) -> str:
         """
         Logger un prompt/input envoyé à Gemini
-        
+
         Args:
             service_name: Nom du service appelant (ex: "conversation", "plan_generation")
             prompt: Le prompt complet envoyé
@@ -90,56 +258,39 @@ class GeminiCallLogger:
             learner_session_id: ID de session apprenant
             additional_context: Contexte additionnel (config, metadata)
             service_type: Type de service pour catégorisation (auto-détecté si None)
-            
+
         Returns:
             call_id: Identifiant unique pour tracer l'appel
         """
         try:
-            # 🔍 Simple déduplication - éviter les prompts identiques en succession rapide  
-            import hashlib
-            prompt_hash = hashlib.md5(prompt.encode()).hexdigest()
             current_time = time.time()
-            
-            if (prompt_hash == self.last_prompt_hash and 
-                current_time - self.last_prompt_time < self.dedup_window_seconds):
-                logger.info(f"🔍 GEMINI_CALL_LOGGER [DEDUP] Skipping duplicate prompt (within {self.dedup_window_seconds}s)")
+            if self._is_duplicate(prompt, current_time):
+                logger.debug(f"🔍 GEMINI_CALL_LOGGER [DEDUP] Skipping duplicate prompt (within {self.dedup_window_seconds}s)")
                 return f"dedup_skip_{int(current_time)}"
-            
-            self.last_prompt_hash = prompt_hash
-            self.last_prompt_time = current_time
-            
+
             self.call_counter += 1
-            call_id = f"call_{self.call_counter}_{int(time.time())}"
-            
+            call_id = f"call_{self.call_counter}_{int(current_time)}"
+
             # Détecter le type de service si non fourni
             detected_service_type = service_type or ServiceType.from_service_name(service_name)
-            
-            # Préparer le contexte de session
-            session_info = self._format_session_info(session_id, learner_session_id)
-            
-            # Logger le prompt complet avec formatage lisible
-            logger.info("=" * 100)
-            logger.info(f"🎯 [GEMINI_CALL] [INPUT] [{service_name.upper()}] {session_info}")
-            logger.info(f"📋 Call ID: {call_id}")
-            logger.info(f"🏷️ Service Type: {detected_service_type.value}")
-            logger.info(f"⏰ Timestamp: {datetime.now(timezone.utc).isoformat()}")
-            logger.info(f"📏 Prompt Length: {len(prompt)} characters")
-            
-            if additional_context:
-                logger.info(f"🔧 Context: {json.dumps(additional_context, indent=2, default=str)}")
-            
-            logger.info("-" * 50 + " PROMPT START " + "-" * 50)
-            logger.info(prompt)
-            logger.info("-" * 50 + " PROMPT END " + "-" * 52)
-            logger.info("=" * 100)
-            
+            sampled = self._is_sampled(call_id)
+
+            context = f" context={json.dumps(additional_context, default=str)}" if additional_context else ""
+            logger.info(
+                f"🎯 [GEMINI_CALL] [INPUT] [{service_name.upper()}] {self._format_session_info(session_id, learner_session_id)} "
+                f"call_id={call_id} type={detected_service_type.value} prompt_chars={len(prompt)} "
+                f"body={'sampled' if sampled else 'skipped'}{context}"
+            )
+            if sampled:
+                self._log_body("PROMPT", call_id, prompt)
+
             return call_id
-            
+
         except Exception as e:
             # Le logging ne doit JAMAIS faire planter la logique métier
             logger.error(f"❌ GEMINI_CALL_LOGGER [INPUT_ERROR] Failed to log input: {e}")
             return f"error_call_{int(time.time())}"
-    
+
     def log_output(
         self,
         call_id: str,
@@ -155,7 +306,7 @@ class GeminiCallLogger:
     ) -> None:
         """
         Logger la réponse reçue de Gemini avec comptage de tokens
-        
+
         Args:
             call_id: ID de l'appel correspondant (retourné par log_input)
             service_name: Nom du service appelant
@@ -172,44 +323,31 @@ class GeminiCallLogger:
             # Skip si c'était un appel dédupliqué
             if call_id.startswith("dedup_skip_"):
                 return
-                
-            # Préparer le contexte de session
-            session_info = self._format_session_info(session_id, learner_session_id)
-            
-            # Extraire les tokens depuis usage_metadata si disponibles
+
             extracted_input_tokens, extracted_output_tokens = self._extract_tokens_from_metadata(
                 usage_metadata, input_tokens, output_tokens
             )
-            
-            # Formater la réponse pour affichage
-            formatted_response = self._format_response(response)
-            
-            # Logger la réponse complète avec formatage lisible
-            logger.info("=" * 100)
-            logger.info(f"📥 [GEMINI_CALL] [OUTPUT] [{service_name.upper()}] {session_info}")
-            logger.info(f"📋 Call ID: {call_id}")
-            logger.info(f"⏰ Timestamp: {datetime.now(timezone.utc).isoformat()}")
-            logger.info(f"📏 Response Length: {len(str(response))} characters")
-            
-            # Afficher les tokens si disponibles
-            if extracted_input_tokens is not None or extracted_output_tokens is not None:
-                logger.info(f"🪙 TOKENS - Input: {extracted_input_tokens or 'N/A'} | Output: {extracted_output_tokens or 'N/A'} | Total: {(extracted_input_tokens or 0) + (extracted_output_tokens or 0) if extracted_input_tokens and extracted_output_tokens else 'N/A'}")
-            
-            if processing_time:
-                logger.info(f"⚡ Processing Time: {processing_time:.3f}s")
-                
-            if additional_metadata:
-                logger.info(f"🔧 Metadata: {json.dumps(additional_metadata, indent=2, default=str)}")
-            
-            logger.info("-" * 50 + " RESPONSE START " + "-" * 48)
-            logger.info(formatted_response)
-            logger.info("-" * 50 + " RESPONSE END " + "-" * 50)
-            logger.info("=" * 100)
-            
+            total_tokens = (
+                extracted_input_tokens + extracted_output_tokens
+                if extracted_input_tokens is not None and extracted_output_tokens is not None else None
+            )
+            response_chars = len(response) if isinstance(response, str) else None
+            duration = f"{processing_time:.3f}s" if processing_time is not None else None
+            metadata = f" metadata={json.dumps(additional_metadata, default=str)}" if additional_metadata else ""
+
+            logger.info(
+                f"📥 [GEMINI_CALL] [OUTPUT] [{service_name.upper()}] {self._format_session_info(session_id, learner_session_id)} "
+                f"call_id={call_id} response_chars={self._or_na(response_chars)} "
+                f"tokens_in={self._or_na(extracted_input_tokens)} tokens_out={self._or_na(extracted_output_tokens)} "
+                f"tokens_total={self._or_na(total_tokens)} duration={self._or_na(duration)}{metadata}"
+            )
+            if self._is_sampled(call_id):
+                self._log_body("RESPONSE", call_id, response)
+
         except Exception as e:
             # Le logging ne doit JAMAIS faire planter la logique métier
             logger.error(f"❌ GEMINI_CALL_LOGGER [OUTPUT_ERROR] Failed to log output for call {call_id}: {e}")
-    
+
     def log_error(
         self,
         call_id: str,
@@ -221,7 +359,7 @@ class GeminiCallLogger:
     ) -> None:
         """
         Logger une erreur lors d'un appel Gemini
-        
+
         Args:
             call_id: ID de l'appel correspondant
             service_name: Nom du service appelant
@@ -231,57 +369,101 @@ class GeminiCallLogger:
             processing_time: Temps avant erreur en secondes
         """
         try:
-            session_info = self._format_session_info(session_id, learner_session_id)
-            
-            logger.error("=" * 100)
-            logger.error(f"❌ [GEMINI_CALL] [ERROR] [{service_name.upper()}] {session_info}")
-            logger.error(f"📋 Call ID: {call_id}")
-            logger.error(f"⏰ Timestamp: {datetime.now(timezone.utc).isoformat()}")
-            logger.error(f"🚨 Error Type: {type(error).__name__}")
-            logger.error(f"💬 Error Message: {str(error)}")
-            
-            if processing_time:
-                logger.error(f"⚡ Time Before Error: {processing_time:.3f}s")
-            
-            logger.error("=" * 100)
-            
+            duration = f"{processing_time:.3f}s" if processing_time is not None else None
+            logger.error(
+                f"❌ [GEMINI_CALL] [ERROR] [{service_name.upper()}] {self._format_session_info(session_id, learner_session_id)} "
+                f"call_id={call_id} error_type={type(error).__name__} duration={self._or_na(duration)} "
+                f"error={str(error)}"
+            )
+
         except Exception as e:
             # Même les logs d'erreur ne doivent pas planter
             logger.error(f"❌ GEMINI_CALL_LOGGER [ERROR_LOG_ERROR] Failed to log error: {e}")
-    
+
+    def _is_duplicate(self, prompt: str, current_time: float) -> bool:
+        """Le même prompt a-t-il été loggé il y a moins de dedup_window_seconds ?"""
+        # hash() de str est mis en cache par l'interpréteur, contrairement à un md5 du prompt encodé
+        key = (len(prompt), hash(prompt))
+        while self._recent_prompts:
+            oldest_key, seen_at = next(iter(self._recent_prompts.items()))
+            if current_time - seen_at < self.dedup_window_seconds and len(self._recent_prompts) < self.dedup_max_entries:
+                break
+            self._recent_prompts.pop(oldest_key)
+
+        if key in self._recent_prompts:
+            return True
+        self._recent_prompts[key] = current_time
+        return False
+
+    def _is_sampled(self, call_id: str) -> bool:
+        """Échantillonnage déterministe par call id (entrée et sortie d'un appel ensemble)"""
+        if self.body_sample_rate >= 1.0:
+            return True
+        if self.body_sample_rate <= 0.0:
+            return False
+        return zlib.crc32(call_id.encode()) % 10000 < self.body_sample_rate * 10000
+
+    def _log_body(self, kind: str, call_id: str, content: Any) -> None:
+        self.bodies_logged += 1
+        body_logger.info(_Body(kind, call_id, content, self.body_max_chars))
+
+    def _count_drop(self) -> None:
+        self.dropped_records += 1
+
+    def _create_body_file_handler(self) -> RotatingFileHandler:
+        """Fichier de bodies avec rotation compressée (gemini_bodies.log.1.gz, ...)"""
+        directory = os.path.dirname(self.body_log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handler = RotatingFileHandler(
+            self.body_log_file,
+            maxBytes=self.body_log_max_bytes,
+            backupCount=self.body_log_backups,
+            encoding="utf-8",
+            delay=True
+        )
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+        handler.setFormatter(logging.Formatter(BODY_LOG_FORMAT))
+        return handler
+
+    @staticmethod
+    def _or_na(value: Any) -> Any:
+        return "N/A" if value is None else value
+
     def _format_session_info(
-        self, 
-        session_id: Optional[Union[str, UUID]], 
+        self,
+        session_id: Optional[Union[str, UUID]],
         learner_session_id: Optional[Union[str, UUID]]
     ) -> str:
         """Formater les informations de session pour affichage"""
         info_parts = []
-        
+
         if session_id:
             info_parts.append(f"Session: {str(session_id)[:8]}...")
-            
+
         if learner_session_id:
             info_parts.append(f"Learner: {str(learner_session_id)[:8]}...")
-            
+
         if not info_parts:
             info_parts.append("No Session")
-            
+
         return f"[{' | '.join(info_parts)}]"
-    
+
     def _extract_tokens_from_metadata(
-        self, 
-        usage_metadata: Optional[Dict[str, Any]], 
-        input_tokens: Optional[int], 
+        self,
+        usage_metadata: Optional[Any],
+        input_tokens: Optional[int],
         output_tokens: Optional[int]
     ) -> tuple[Optional[int], Optional[int]]:
         """
         Extraire les tokens depuis les métadonnées d'usage ou utiliser les valeurs fournies
-        
+
         Args:
-            usage_metadata: Métadonnées d'usage de l'API Vertex AI
+            usage_metadata: Métadonnées d'usage de l'API Vertex AI (dict ou objet du SDK)
             input_tokens: Tokens d'entrée fournis manuellement
             output_tokens: Tokens de sortie fournis manuellement
-            
+
         Returns:
             tuple: (input_tokens, output_tokens) ou (None, None) si non disponibles
         """
@@ -289,43 +471,33 @@ class GeminiCallLogger:
             # Priorité aux valeurs fournies explicitement
             final_input_tokens = input_tokens
             final_output_tokens = output_tokens
-            
+
             # Si les valeurs ne sont pas fournies, essayer d'extraire depuis usage_metadata
-            if usage_metadata and isinstance(usage_metadata, dict):
+            if usage_metadata is not None:
+                def read(name):
+                    if isinstance(usage_metadata, dict):
+                        return usage_metadata.get(name)
+                    return getattr(usage_metadata, name, None)
+
                 if final_input_tokens is None:
-                    final_input_tokens = usage_metadata.get('prompt_token_count')
+                    final_input_tokens = read('prompt_token_count')
                 if final_output_tokens is None:
-                    final_output_tokens = usage_metadata.get('candidates_token_count')
-                    
+                    final_output_tokens = read('candidates_token_count')
+
             return final_input_tokens, final_output_tokens
-            
+
         except Exception as e:
             logger.warning(f"⚠️ GEMINI_CALL_LOGGER [TOKEN_EXTRACTION] Failed to extract tokens: {e}")
             return input_tokens, output_tokens
-    
+
     def _format_response(self, response: Union[str, Dict[str, Any]]) -> str:
         """Formater la réponse pour un affichage lisible"""
-        try:
-            if isinstance(response, str):
-                # Essayer de parser comme JSON pour un affichage plus propre
-                try:
-                    parsed = json.loads(response)
-                    return json.dumps(parsed, indent=2, ensure_ascii=False)
-                except json.JSONDecodeError:
-                    # Si ce n'est pas du JSON, retourner tel quel
-                    return response
-            elif isinstance(response, dict):
-                return json.dumps(response, indent=2, ensure_ascii=False, default=str)
-            else:
-                return str(response)
-        except Exception:
-            # En cas de problème de formatage, retourner la représentation string
-            return str(response)
-    
+        return _format_response(response)
+
     def log_tokens(
         self,
         call_id: str,
-        service_name: str, 
+        service_name: str,
         service_type: ServiceType,
         input_tokens: Optional[int] = None,
         output_tokens: Optional[int] = None,
@@ -333,7 +505,7 @@ class GeminiCallLogger:
     ) -> None:
         """
         Méthode spécialisée pour logger uniquement les tokens (utilisée pour les services sans prompt/response)
-        
+
         Args:
             call_id: ID de l'appel
             service_name: Nom du service
@@ -343,30 +515,34 @@ class GeminiCallLogger:
             learner_session_id: ID de session apprenant
         """
         try:
-            session_info = self._format_session_info(None, learner_session_id)
             total_tokens = (input_tokens or 0) + (output_tokens or 0)
-            
-            logger.info("=" * 50)
-            logger.info(f"🪙 [TOKENS_ONLY] [{service_name.upper()}] {session_info}")
-            logger.info(f"📋 Call ID: {call_id}")
-            logger.info(f"🏷️ Service Type: {service_type.value}")
-            logger.info(f"🪙 TOKENS - Input: {input_tokens or 'N/A'} | Output: {output_tokens or 'N/A'} | Total: {total_tokens or 'N/A'}")
-            logger.info("=" * 50)
-            
+            logger.info(
+                f"🪙 [TOKENS_ONLY] [{service_name.upper()}] {self._format_session_info(None, learner_session_id)} "
+                f"call_id={call_id} type={service_type.value} tokens_in={self._or_na(input_tokens)} "
+                f"tokens_out={self._or_na(output_tokens)} tokens_total={total_tokens or 'N/A'}"
+            )
+
         except Exception as e:
             logger.error(f"❌ GEMINI_CALL_LOGGER [TOKENS_ERROR] Failed to log tokens for call {call_id}: {e}")
-    
+
     def get_stats(self) -> Dict[str, Any]:
         """Obtenir les statistiques du logger avec support tokens"""
         return {
             "service_name": "GeminiCallLogger",
             "total_calls_logged": self.call_counter,
+            "bodies_logged": self.bodies_logged,
+            "dropped_records": self.dropped_records,
+            "body_sample_rate": self.body_sample_rate,
+            "body_max_chars": self.body_max_chars,
+            "queued": bool(self._listeners),
             "status": "active",
             "features": [
                 "input_output_logging",
-                "token_counting", 
+                "token_counting",
                 "service_type_detection",
-                "usage_metadata_extraction"
+                "usage_metadata_extraction",
+                "queued_logging",
+                "body_sampling"
             ],
             "supported_service_types": [service_type.value for service_type in ServiceType],
             "last_check": datetime.now(timezone.utc).isoformat()
@@ -374,4 +550,11 @@ class GeminiCallLogger:
 
 
 # Instance globale pour utilisation dans toute l'application
-gemini_call_logger = GeminiCallLogger()
\ No newline at end of file
+gemini_call_logger = GeminiCallLogger(
+    body_sample_rate=settings.gemini_log_body_sample_rate,
+    body_max_chars=settings.gemini_log_body_max_chars,
+    body_log_file=settings.gemini_log_body_file,
+    body_log_max_bytes=settings.gemini_log_body_max_bytes,
+    body_log_backups=settings.gemini_log_body_backups,
+    queue_size=settings.gemini_log_queue_size
+)
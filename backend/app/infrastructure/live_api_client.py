@@ -6,6 +6,7 @@ Infrastructure client for Vertex AI Live API WebSocket connections
 import asyncio
 import json
 import logging
+import time
 import websockets
 from typing import Dict, Any, Optional, AsyncGenerator
 from dataclasses import dataclass
@@ -39,6 +40,75 @@ class LiveAPIError(Exception):
     pass
 
 
+class AccessTokenCache:
+    """
+    Process-wide cache for the Google OAuth access token used by the Live API
+    
+    Resolving Application Default Credentials and refreshing them are blocking
+    calls that cost a network round trip, so the credentials object is kept
+    and only refreshed when the token is within `refresh_margin_seconds` of
+    its expiry. Refreshes run in a worker thread behind a lock so concurrent
+    connects share a single refresh.
+    """
+    
+    def __init__(self, refresh_margin_seconds: int = 300):
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self._credentials = None
+        self._lock = asyncio.Lock()
+    
+    async def get_token(self) -> str:
+        """Return a valid access token, refreshing it ahead of expiry"""
+        if self._is_fresh():
+            return self._credentials.token
+        
+        async with self._lock:
+            # Another coroutine may have refreshed while we were waiting
+            if self._is_fresh():
+                return self._credentials.token
+            
+            try:
+                self._credentials = await asyncio.to_thread(self._load_and_refresh)
+                logger.info("🔑 LIVE_API [AUTH] Successfully obtained access token")
+                return self._credentials.token
+            except Exception as e:
+                logger.error(f"❌ LIVE_API [AUTH] Failed to get access token: {str(e)}")
+                # Fallback to placeholder for testing
+                logger.warning("⚠️ LIVE_API [AUTH] Using placeholder token for testing")
+                return "placeholder_token"
+    
+    def invalidate(self) -> None:
+        """Drop the cached token (e.g. after the server rejected it)"""
+        self._credentials = None
+    
+    def _is_fresh(self) -> bool:
+        credentials = self._credentials
+        if credentials is None or not credentials.token:
+            return False
+        expiry = getattr(credentials, "expiry", None)
+        if expiry is None:
+            return bool(credentials.valid)
+        # google-auth stores expiry as a naive UTC datetime
+        from datetime import datetime
+        remaining = (expiry - datetime.utcnow()).total_seconds()
+        return remaining > self.refresh_margin_seconds
+    
+    def _load_and_refresh(self):
+        """Blocking credential resolution, executed in a worker thread"""
+        from google.auth import default
+        from google.auth.transport.requests import Request
+        
+        credentials = self._credentials
+        if credentials is None:
+            # Get default credentials (will use the same credentials as Vertex AI)
+            credentials, _ = default(scopes=['https://www.googleapis.com/auth/cloud-platform'])
+        credentials.refresh(Request())
+        return credentials
+
+
+# Global token cache shared by every Live API client in this process
+live_api_token_cache = AccessTokenCache()
+
+
 class LiveAPIClient:
     """Client for connecting to Vertex AI Live API via WebSocket"""
     
@@ -47,6 +117,7 @@ class LiveAPIClient:
         self.websocket = None
         self.is_connected = False
         self.session_id = None
+        self.transport_opened_at: Optional[float] = None
         self.project_id = settings.google_cloud_project
         self.region = settings.google_cloud_region
         
@@ -70,9 +141,19 @@ class LiveAPIClient:
         Returns:
             bool: True if connection successful
         """
+        logger.info("🔗 LIVE_API [CONNECT] Starting connection to Live API...")
+        await self.open_transport()
+        return await self.complete_setup(session_config)
+    
+    async def open_transport(self) -> None:
+        """
+        Open the authenticated WebSocket without sending the setup message
+        
+        The Live API requires the setup message (model, system instruction,
+        voice) to be the first frame of a session, so this is the part of the
+        connection that can be done ahead of time by the connection pool.
+        """
         try:
-            logger.info("🔗 LIVE_API [CONNECT] Starting connection to Live API...")
-            
             # Build WebSocket URL for Live API
             ws_url = self._build_websocket_url()
             
@@ -87,7 +168,28 @@ class LiveAPIClient:
                 ping_interval=30,  # Keep connection alive
                 ping_timeout=10
             )
+            self.transport_opened_at = time.monotonic()
             
+        except websockets.exceptions.WebSocketException as e:
+            logger.error(f"❌ LIVE_API [CONNECT] WebSocket error: {str(e)}")
+            self.is_connected = False
+            raise LiveAPIError(f"WebSocket connection failed: {str(e)}")
+        except Exception as e:
+            logger.error(f"❌ LIVE_API [CONNECT] Connection error: {str(e)}")
+            self.is_connected = False
+            raise LiveAPIError(f"Connection failed: {str(e)}")
+    
+    async def complete_setup(self, session_config: Dict[str, Any]) -> bool:
+        """
+        Bind a session configuration to an open transport
+        
+        Args:
+            session_config: Same configuration as accepted by connect()
+        
+        Returns:
+            bool: True if the Live API confirmed the setup
+        """
+        try:
             # Send setup message with session configuration
             setup_message = self._build_setup_message(session_config)
             await self._send_message(setup_message)
@@ -203,6 +305,7 @@ class LiveAPIClient:
                 
             self.is_connected = False
             self.session_id = None
+            self.transport_opened_at = None
             logger.info("✅ LIVE_API [DISCONNECT] Disconnected successfully")
             
         except Exception as e:
@@ -232,27 +335,8 @@ class LiveAPIClient:
         return headers
     
     async def _get_access_token(self) -> str:
-        """Get access token for authentication using Google Application Default Credentials"""
-        try:
-            from google.auth import default
-            from google.auth.transport.requests import Request
-            
-            # Get default credentials (will use the same credentials as Vertex AI)
-            credentials, project = default(scopes=['https://www.googleapis.com/auth/cloud-platform'])
-            
-            # Refresh the credentials if needed
-            if not credentials.valid:
-                credentials.refresh(Request())
-            
-            token = credentials.token
-            logger.info("🔑 LIVE_API [AUTH] Successfully obtained access token")
-            return token
-            
-        except Exception as e:
-            logger.error(f"❌ LIVE_API [AUTH] Failed to get access token: {str(e)}")
-            # Fallback to placeholder for testing
-            logger.warning("⚠️ LIVE_API [AUTH] Using placeholder token for testing")
-            return "placeholder_token"
+        """Get access token for authentication using the shared token cache"""
+        return await live_api_token_cache.get_token()
     
     def _build_setup_message(self, session_config: Dict[str, Any]) -> Dict[str, Any]:
         """Build setup message for Live API session"""
@@ -363,6 +447,17 @@ class LiveAPIClient:
         """Check if client is connected"""
         return self.is_connected and self.websocket is not None
     
+    def is_transport_open(self) -> bool:
+        """Check if the WebSocket is open (setup may not be sent yet)"""
+        if self.websocket is None:
+            return False
+        # websockets >= 13 exposes `state`, older versions expose `closed`
+        closed = getattr(self.websocket, "closed", None)
+        if closed is not None:
+            return not closed
+        state = getattr(self.websocket, "state", None)
+        return getattr(state, "name", "OPEN") == "OPEN"
+    
     def get_session_info(self) -> Dict[str, Any]:
         """Get current session information"""
         return {
@@ -0,0 +1,195 @@
+"""
+FIA v3.0 - Live API Connection Pool
+Pre-authenticated, pre-connected upstream WebSockets for Live API sessions
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from app.infrastructure.live_api_client import LiveAPIClient, LiveAPIError
+from app.infrastructure.metrics import metrics
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _percentiles(samples: Deque[float]) -> Dict[str, Optional[float]]:
+    """Compute p50/p95/p99 (milliseconds) over a sample window"""
+    if not samples:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    def pick(q: float) -> float:
+        return round(ordered[min(last, int(round(q * last)))] * 1000, 1)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+    }
+
+
+class LiveAPIConnectionPool:
+    """
+    Small pool of warm Live API WebSockets
+
+    Each warm client has already resolved its OAuth token (through the shared
+    token cache), completed TLS and the WebSocket upgrade. The Live API only
+    accepts the session setup (system instruction with the learner context,
+    voice) as the first frame, so that part is bound on checkout with
+    `complete_setup`. A configured session cannot be reused for another
+    learner: released clients are closed and the pool refills in background.
+    """
+
+    def __init__(
+        self,
+        size: int = 0,
+        max_idle_seconds: float = 240.0,
+        client_factory: Callable[[], LiveAPIClient] = LiveAPIClient
+    ):
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+        self.client_factory = client_factory
+        self._idle: Deque[LiveAPIClient] = deque()
+        self._refill_event = asyncio.Event()
+        self._refill_task: Optional[asyncio.Task] = None
+        # Connect latency samples in seconds, for before/after comparisons
+        self._cold_latencies: Deque[float] = deque(maxlen=500)
+        self._warm_latencies: Deque[float] = deque(maxlen=500)
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    async def start(self) -> None:
+        """Start the background refill loop"""
+        if not self.enabled or self._refill_task is not None:
+            return
+        self._refill_task = asyncio.create_task(self._refill_loop())
+        self._refill_event.set()
+        logger.info(f"🏊 LIVE_API [POOL] Started with target size {self.size}")
+
+    async def stop(self) -> None:
+        """Stop refilling and close every idle connection"""
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+
+        while self._idle:
+            await self._idle.popleft().disconnect()
+        logger.info("🏊 LIVE_API [POOL] Stopped")
+
+    async def acquire(self, session_config: Dict[str, Any]) -> LiveAPIClient:
+        """
+        Check out a connected client bound to `session_config`
+
+        Falls back to a cold connect when no warm transport is available.
+
+        Raises:
+            LiveAPIError: If neither a warm nor a cold connection succeeds
+        """
+        started = time.perf_counter()
+        client = self._pop_warm()
+
+        if client is not None:
+            self._refill_event.set()
+            try:
+                if await client.complete_setup(session_config):
+                    self._hits += 1
+                    self._warm_latencies.append(time.perf_counter() - started)
+                    return client
+            except LiveAPIError as e:
+                logger.warning(f"⚠️ LIVE_API [POOL] Warm connection failed setup, connecting cold: {str(e)}")
+            await client.disconnect()
+            started = time.perf_counter()
+
+        self._misses += 1
+        client = self.client_factory()
+        if not await client.connect(session_config):
+            await client.disconnect()
+            raise LiveAPIError("Live API setup was rejected")
+        self._cold_latencies.append(time.perf_counter() - started)
+        return client
+
+    async def release(self, client: Optional[LiveAPIClient]) -> None:
+        """Return a checked-out client; configured sessions are closed"""
+        if client is not None:
+            await client.disconnect()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool occupancy, hit ratio and connect latency percentiles"""
+        return {
+            "enabled": self.enabled,
+            "target_size": self.size,
+            "idle_connections": len(self._idle),
+            "hits": self._hits,
+            "misses": self._misses,
+            "warm_connect_latency": _percentiles(self._warm_latencies),
+            "cold_connect_latency": _percentiles(self._cold_latencies),
+        }
+
+    def _pop_warm(self) -> Optional[LiveAPIClient]:
+        """Pop the oldest usable idle client, discarding stale ones"""
+        while self._idle:
+            client = self._idle.pop()
+            if self._is_usable(client):
+                return client
+            asyncio.create_task(client.disconnect())
+        return None
+
+    def _is_usable(self, client: LiveAPIClient) -> bool:
+        if not client.is_transport_open() or client.transport_opened_at is None:
+            return False
+        return time.monotonic() - client.transport_opened_at < self.max_idle_seconds
+
+    async def _refill_loop(self) -> None:
+        """Keep `size` warm transports open, recycling them before idle expiry"""
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._refill_event.wait(),
+                    timeout=max(1.0, self.max_idle_seconds / 4)
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._refill_event.clear()
+
+            stale: List[LiveAPIClient] = [c for c in self._idle if not self._is_usable(c)]
+            for client in stale:
+                self._idle.remove(client)
+                await client.disconnect()
+
+            while len(self._idle) < self.size:
+                client = self.client_factory()
+                try:
+                    await client.open_transport()
+                except LiveAPIError as e:
+                    logger.warning(f"⚠️ LIVE_API [POOL] Pre-connect failed: {str(e)}")
+                    await client.disconnect()
+                    # Back off until the next periodic pass
+                    break
+                self._idle.appendleft(client)
+
+            logger.debug(f"🏊 LIVE_API [POOL] Refilled - idle: {len(self._idle)}/{self.size}")
+
+
+# Global pool instance (disabled unless LIVE_API_POOL_SIZE > 0)
+live_api_pool = LiveAPIConnectionPool(
+    size=settings.live_api_pool_size,
+    max_idle_seconds=settings.live_api_pool_max_idle_seconds
+)
+metrics.gauge_callback(
+    "fia_live_api_pool_idle_connections", "Pre-connected Live API sessions waiting in the pool",
+    lambda: len(live_api_pool._idle)
+)
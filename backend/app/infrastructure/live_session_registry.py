@@ -0,0 +1,360 @@
+"""
+FIA v3.0 - Live Session Registry
+Cluster-wide record of which worker owns each Live API session
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.infrastructure.database import AsyncSessionLocal, engine
+from app.infrastructure.models.live_session_model import LiveSessionModel
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "live_sessions"
+
+EvictionCallback = Callable[[str], Awaitable[None]]
+
+
+@dataclass
+class LiveSessionRecord:
+    """Registry entry for one Live session"""
+    session_id: str
+    learner_session_id: UUID
+    node_id: str
+    context: Dict[str, Any]
+    last_heartbeat_at: datetime
+
+
+def default_node_id() -> str:
+    """Identify this worker process within the cluster"""
+    return settings.node_id or f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LiveSessionRegistry(ABC):
+    """
+    Shared registry of Live sessions
+
+    Each worker registers the sessions it serves and heartbeats them. A
+    session whose owner stopped heartbeating for `ttl_seconds` is expired and
+    reaped, but can still be claimed by another worker while it is listed,
+    which is how a learner reconnects through a different worker.
+    """
+
+    def __init__(self, node_id: str, ttl_seconds: float = 30.0, heartbeat_seconds: float = 10.0):
+        self.node_id = node_id
+        self.ttl_seconds = ttl_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self._on_evicted: Optional[EvictionCallback] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    def set_eviction_callback(self, callback: EvictionCallback) -> None:
+        """Called with a session ID when another worker takes it over or closes it"""
+        self._on_evicted = callback
+
+    async def start(self) -> None:
+        """Start heartbeating sessions owned by this worker"""
+        if self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+            logger.info(f"💓 LIVE_REGISTRY [START] Node {self.node_id} heartbeating every {self.heartbeat_seconds}s")
+
+    async def stop(self) -> None:
+        """Stop heartbeating; sessions of this node will expire after the TTL"""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await self.heartbeat()
+            except Exception as e:
+                logger.error(f"❌ LIVE_REGISTRY [HEARTBEAT] Error: {str(e)}")
+
+    async def _evict_locally(self, session_id: str) -> None:
+        if self._on_evicted is not None:
+            try:
+                await self._on_evicted(session_id)
+            except Exception as e:
+                logger.error(f"❌ LIVE_REGISTRY [EVICT] Error evicting {session_id}: {str(e)}")
+
+    def _is_alive(self, record: LiveSessionRecord) -> bool:
+        age = datetime.now(timezone.utc) - record.last_heartbeat_at
+        return age < timedelta(seconds=self.ttl_seconds)
+
+    @abstractmethod
+    async def register(self, session_id: str, learner_session_id: UUID, context: Dict[str, Any]) -> None:
+        """Record a new session owned by this worker"""
+        pass
+
+    @abstractmethod
+    async def claim(self, session_id: str) -> Optional[LiveSessionRecord]:
+        """Take ownership of an existing session; returns None if it is gone"""
+        pass
+
+    @abstractmethod
+    async def release(self, session_id: str, force: bool = False) -> None:
+        """
+        Remove a session from the registry
+        
+        Without `force`, only a session still owned by this worker is removed,
+        so a late cleanup cannot drop a session another worker took over.
+        """
+        pass
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[LiveSessionRecord]:
+        """Look up a session by ID"""
+        pass
+
+    @abstractmethod
+    async def find_by_learner(self, learner_session_id: UUID) -> Optional[LiveSessionRecord]:
+        """Most recent session of a learner, on any worker"""
+        pass
+
+    @abstractmethod
+    async def list_sessions(self) -> List[LiveSessionRecord]:
+        """All non-expired sessions in the cluster"""
+        pass
+
+    @abstractmethod
+    async def heartbeat(self) -> None:
+        """Refresh sessions owned by this worker and reap expired ones"""
+        pass
+
+    async def count_by_node(self) -> Dict[str, int]:
+        """Cluster-wide live session count per worker"""
+        counts: Dict[str, int] = {}
+        for record in await self.list_sessions():
+            counts[record.node_id] = counts.get(record.node_id, 0) + 1
+        return counts
+
+
+class InMemoryLiveSessionRegistry(LiveSessionRegistry):
+    """Single-process registry, used when no PostgreSQL database is configured"""
+
+    def __init__(self, node_id: str, ttl_seconds: float = 30.0, heartbeat_seconds: float = 10.0):
+        super().__init__(node_id, ttl_seconds, heartbeat_seconds)
+        self._records: Dict[str, LiveSessionRecord] = {}
+
+    async def register(self, session_id: str, learner_session_id: UUID, context: Dict[str, Any]) -> None:
+        self._records[session_id] = LiveSessionRecord(
+            session_id=session_id,
+            learner_session_id=learner_session_id,
+            node_id=self.node_id,
+            context=context,
+            last_heartbeat_at=datetime.now(timezone.utc)
+        )
+
+    async def claim(self, session_id: str) -> Optional[LiveSessionRecord]:
+        record = self._records.get(session_id)
+        if record is None:
+            return None
+        record.node_id = self.node_id
+        record.last_heartbeat_at = datetime.now(timezone.utc)
+        return record
+
+    async def release(self, session_id: str, force: bool = False) -> None:
+        record = self._records.get(session_id)
+        if record is not None and (force or record.node_id == self.node_id):
+            del self._records[session_id]
+
+    async def get(self, session_id: str) -> Optional[LiveSessionRecord]:
+        return self._records.get(session_id)
+
+    async def find_by_learner(self, learner_session_id: UUID) -> Optional[LiveSessionRecord]:
+        matches = [r for r in self._records.values() if r.learner_session_id == learner_session_id]
+        return max(matches, key=lambda r: r.last_heartbeat_at) if matches else None
+
+    async def list_sessions(self) -> List[LiveSessionRecord]:
+        return [r for r in self._records.values() if self._is_alive(r)]
+
+    async def heartbeat(self) -> None:
+        now = datetime.now(timezone.utc)
+        for record in self._records.values():
+            if record.node_id == self.node_id:
+                record.last_heartbeat_at = now
+        expired = [sid for sid, r in self._records.items() if not self._is_alive(r)]
+        for session_id in expired:
+            del self._records[session_id]
+
+
+class PostgresLiveSessionRegistry(LiveSessionRegistry):
+    """
+    Registry stored in the `live_sessions` table
+
+    Ownership changes are broadcast with NOTIFY so that the previous owner
+    drops its local state (upstream connection, throttle) for the session.
+    """
+
+    def __init__(self, node_id: str, ttl_seconds: float = 30.0, heartbeat_seconds: float = 10.0):
+        super().__init__(node_id, ttl_seconds, heartbeat_seconds)
+        self._listen_connection = None
+
+    async def start(self) -> None:
+        await super().start()
+        try:
+            self._listen_connection = await engine.connect()
+            raw_connection = await self._listen_connection.get_raw_connection()
+            await raw_connection.driver_connection.add_listener(NOTIFY_CHANNEL, self._on_notify)
+            logger.info(f"👂 LIVE_REGISTRY [LISTEN] Listening on '{NOTIFY_CHANNEL}'")
+        except Exception as e:
+            # Without LISTEN, stale local copies are still bounded by the TTL
+            logger.warning(f"⚠️ LIVE_REGISTRY [LISTEN] Could not listen for ownership changes: {str(e)}")
+            await self._close_listen_connection()
+
+    async def stop(self) -> None:
+        await super().stop()
+        await self._close_listen_connection()
+
+    async def _close_listen_connection(self) -> None:
+        if self._listen_connection is not None:
+            try:
+                await self._listen_connection.close()
+            except Exception:
+                pass
+            self._listen_connection = None
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        """asyncpg listener callback (synchronous)"""
+        try:
+            event = json.loads(payload)
+        except json.JSONDecodeError:
+            return
+        if event.get("node_id") != self.node_id:
+            asyncio.get_running_loop().create_task(self._evict_locally(event["session_id"]))
+
+    async def _notify(self, db, event: str, session_id: str) -> None:
+        payload = json.dumps({"event": event, "session_id": session_id, "node_id": self.node_id})
+        await db.execute(select(func.pg_notify(NOTIFY_CHANNEL, payload)))
+
+    @staticmethod
+    def _to_record(model: LiveSessionModel) -> LiveSessionRecord:
+        return LiveSessionRecord(
+            session_id=model.id,
+            learner_session_id=model.learner_session_id,
+            node_id=model.node_id,
+            context=model.context or {},
+            last_heartbeat_at=model.last_heartbeat_at
+        )
+
+    async def register(self, session_id: str, learner_session_id: UUID, context: Dict[str, Any]) -> None:
+        async with AsyncSessionLocal() as db:
+            stmt = insert(LiveSessionModel).values(
+                id=session_id,
+                learner_session_id=learner_session_id,
+                node_id=self.node_id,
+                context=context
+            ).on_conflict_do_update(
+                index_elements=[LiveSessionModel.id],
+                set_={"node_id": self.node_id, "context": context, "last_heartbeat_at": func.now()}
+            )
+            await db.execute(stmt)
+            await db.commit()
+
+    async def claim(self, session_id: str) -> Optional[LiveSessionRecord]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(LiveSessionModel)
+                .where(LiveSessionModel.id == session_id)
+                .values(node_id=self.node_id, last_heartbeat_at=func.now())
+                .returning(LiveSessionModel)
+            )
+            model = result.scalar_one_or_none()
+            if model is None:
+                await db.rollback()
+                return None
+            await self._notify(db, "claimed", session_id)
+            await db.commit()
+            return self._to_record(model)
+
+    async def release(self, session_id: str, force: bool = False) -> None:
+        async with AsyncSessionLocal() as db:
+            stmt = delete(LiveSessionModel).where(LiveSessionModel.id == session_id)
+            if not force:
+                stmt = stmt.where(LiveSessionModel.node_id == self.node_id)
+            result = await db.execute(stmt)
+            if result.rowcount:
+                await self._notify(db, "released", session_id)
+            await db.commit()
+
+    async def get(self, session_id: str) -> Optional[LiveSessionRecord]:
+        async with AsyncSessionLocal() as db:
+            model = await db.get(LiveSessionModel, session_id)
+            return self._to_record(model) if model else None
+
+    async def find_by_learner(self, learner_session_id: UUID) -> Optional[LiveSessionRecord]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(LiveSessionModel)
+                .where(LiveSessionModel.learner_session_id == learner_session_id)
+                .order_by(LiveSessionModel.last_heartbeat_at.desc())
+                .limit(1)
+            )
+            model = result.scalar_one_or_none()
+            return self._to_record(model) if model else None
+
+    def _alive_clause(self):
+        return LiveSessionModel.last_heartbeat_at > func.now() - timedelta(seconds=self.ttl_seconds)
+
+    async def list_sessions(self) -> List[LiveSessionRecord]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(LiveSessionModel).where(self._alive_clause()))
+            return [self._to_record(m) for m in result.scalars().all()]
+
+    async def count_by_node(self) -> Dict[str, int]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(LiveSessionModel.node_id, func.count())
+                .where(self._alive_clause())
+                .group_by(LiveSessionModel.node_id)
+            )
+            return {node_id: count for node_id, count in result.all()}
+
+    async def heartbeat(self) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(LiveSessionModel)
+                .where(LiveSessionModel.node_id == self.node_id)
+                .values(last_heartbeat_at=func.now())
+            )
+            await db.execute(
+                delete(LiveSessionModel).where(~self._alive_clause())
+            )
+            await db.commit()
+
+
+def create_live_session_registry() -> LiveSessionRegistry:
+    """Pick the registry backend from settings ('auto' uses PostgreSQL when configured)"""
+    backend = settings.live_session_registry_backend
+    if backend == "auto":
+        backend = "postgres" if settings.database_url.startswith("postgresql") else "memory"
+
+    registry_class = PostgresLiveSessionRegistry if backend == "postgres" else InMemoryLiveSessionRegistry
+    logger.info(f"🗂️ LIVE_REGISTRY [INIT] Using {registry_class.__name__}")
+    return registry_class(
+        node_id=default_node_id(),
+        ttl_seconds=settings.live_session_ttl_seconds,
+        heartbeat_seconds=settings.live_session_heartbeat_seconds
+    )
+
+
+# Global registry instance
+live_session_registry = create_live_session_registry()
@@ -0,0 +1,363 @@
+"""
+FIA v3.0 - Metrics
+In-process metrics registry exposed in the Prometheus text format at /metrics
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# (metric name, label values) -> float, or bucket counts + sum for histograms
+Samples = Dict[Tuple[str, Tuple[str, ...]], Any]
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, Tuple[str, ...]]:
+        return self.name, tuple(str(labels.get(label, "")) for label in self.labelnames)
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        values = self.registry._shard()
+        key = self._key(labels)
+        values[key] = values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Gauge moved by inc/dec; per-thread deltas are summed at collection"""
+    type_name = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        values = self.registry._shard()
+        key = self._key(labels)
+        values[key] = values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class CallbackGauge(_Metric):
+    """Gauge read from a callback when metrics are collected (pool occupancy, ...)"""
+    type_name = "gauge"
+
+    def __init__(self, registry, name, documentation, callback: Callable[[], float]):
+        super().__init__(registry, name, documentation)
+        self.callback = callback
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        values = self.registry._shard()
+        key = self._key(labels)
+        counts = values.get(key)
+        if counts is None:
+            # One count per bucket, one for +Inf, then the sum of observed values
+            counts = values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+
+def _merge(into: Samples, samples: Samples) -> None:
+    for key, value in samples.items():
+        current = into.get(key)
+        if current is None:
+            into[key] = list(value) if isinstance(value, list) else value
+        elif isinstance(current, list):
+            for i, count in enumerate(value):
+                current[i] += count
+        else:
+            into[key] = current + value
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MetricsRegistry:
+    """
+    Counters, gauges and histograms of this worker
+
+    Updates never take a lock: each thread writes to its own shard (the
+    event loop, the executor threads) and shards are summed when metrics
+    are collected. With a multiproc_dir, every worker also publishes its
+    samples to <multiproc_dir>/<pid>.json each flush_seconds, and /metrics
+    on any worker aggregates the whole host: counters and histograms of
+    every file, gauges of the workers still publishing.
+    """
+
+    def __init__(self, multiproc_dir: str = "", flush_seconds: float = 5.0, worker_id: Optional[str] = None):
+        self.multiproc_dir = multiproc_dir
+        self.flush_seconds = flush_seconds
+        self.worker_id = worker_id or str(os.getpid())
+        self._metrics: Dict[str, _Metric] = {}
+        self._shards: List[Samples] = []
+        self._shards_lock = threading.Lock()
+        self._local = threading.local()
+        self._stop_event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(self, name, documentation, labelnames))
+
+    def gauge_callback(self, name: str, documentation: str, callback: Callable[[], float]) -> CallbackGauge:
+        return self._register(CallbackGauge(self, name, documentation, callback))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def _shard(self) -> Samples:
+        try:
+            return self._local.values
+        except AttributeError:
+            values: Samples = {}
+            # Only taken the first time a thread records a metric
+            with self._shards_lock:
+                self._shards.append(values)
+            self._local.values = values
+            return values
+
+    def collect(self) -> Samples:
+        """Samples of this worker, shards summed and callback gauges read"""
+        samples: Samples = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            _merge(samples, dict(shard))
+        for metric in self._metrics.values():
+            if isinstance(metric, CallbackGauge):
+                try:
+                    samples[(metric.name, ())] = float(metric.callback())
+                except Exception as e:
+                    logger.debug(f"🔍 METRICS [CALLBACK] {metric.name} unavailable: {str(e)}")
+        return samples
+
+    def exposition(self) -> str:
+        """Prometheus text format of this worker, or of the host with a multiproc_dir"""
+        samples = self.collect()
+        if self.multiproc_dir:
+            for worker_samples in self._read_other_workers():
+                _merge(samples, worker_samples)
+        return self.render(samples)
+
+    def render(self, samples: Samples) -> str:
+        by_metric: Dict[str, List[Tuple[Tuple[str, ...], Any]]] = {}
+        for (name, label_values), value in samples.items():
+            by_metric.setdefault(name, []).append((label_values, value))
+
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for label_values, value in sorted(by_metric.get(metric.name, [])):
+                labels = _format_labels(metric.labelnames, label_values)
+                if not isinstance(metric, Histogram):
+                    lines.append(f"{metric.name}{labels} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(metric.buckets) + ["+Inf"], value[:-1]):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _format_value(bound)
+                    bucket_labels = _format_labels(metric.labelnames + ("le",), label_values + (str(le),))
+                    lines.append(f"{metric.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{metric.name}_sum{labels} {_format_value(value[-1])}")
+                lines.append(f"{metric.name}_count{labels} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self, live: bool = True) -> None:
+        """Publish this worker's samples for the other workers' /metrics"""
+        samples = self.collect()
+        if not live:
+            # A stopped worker keeps its counters in the totals, not its gauges
+            samples = {key: value for key, value in samples.items()
+                       if not isinstance(self._metrics.get(key[0]), (Gauge, CallbackGauge))}
+        snapshot = {
+            "worker_id": self.worker_id,
+            "written_at": time.time(),
+            "live": live,
+            "samples": [[name, list(label_values), value] for (name, label_values), value in samples.items()]
+        }
+        path = os.path.join(self.multiproc_dir, f"{self.worker_id}.json")
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w") as snapshot_file:
+            json.dump(snapshot, snapshot_file)
+        os.replace(temporary_path, path)
+
+    def _read_other_workers(self) -> List[Samples]:
+        stale_before = time.time() - 3 * self.flush_seconds
+        workers = []
+        try:
+            file_names = os.listdir(self.multiproc_dir)
+        except FileNotFoundError:
+            return workers
+        for file_name in file_names:
+            if not file_name.endswith(".json") or file_name == f"{self.worker_id}.json":
+                continue
+            try:
+                with open(os.path.join(self.multiproc_dir, file_name)) as snapshot_file:
+                    snapshot = json.load(snapshot_file)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ METRICS [AGGREGATE] Skipping {file_name}: {str(e)}")
+                continue
+            live = snapshot.get("live") and snapshot.get("written_at", 0) >= stale_before
+            samples: Samples = {}
+            for name, label_values, value in snapshot.get("samples", []):
+                metric = self._metrics.get(name)
+                if metric is None or (isinstance(metric, (Gauge, CallbackGauge)) and not live):
+                    continue
+                samples[(name, tuple(label_values))] = value
+            workers.append(samples)
+        return workers
+
+    async def start(self) -> None:
+        """Publish this worker's samples periodically (no-op without a multiproc_dir)"""
+        if self.multiproc_dir and self._task is None:
+            os.makedirs(self.multiproc_dir, exist_ok=True)
+            self._stop_event = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"📊 METRICS [START] Publishing worker {self.worker_id} metrics to {self.multiproc_dir}")
+
+    async def stop(self) -> None:
+        """Stop publishing; the last snapshot keeps this worker's counters in the totals"""
+        if self._task is not None:
+            self._stop_event.set()
+            await self._task
+            self._task = None
+            await asyncio.to_thread(self.write_snapshot, False)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.write_snapshot)
+            except Exception as e:
+                logger.warning(f"⚠️ METRICS [PUBLISH] Failed: {str(e)}")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.flush_seconds)
+                return
+            except asyncio.TimeoutError:
+                pass
+
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """Route template of a handled request ("/api/sessions/{session_id}"), bounded cardinality"""
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+def observe_gemini_call(service_type: Any, duration_seconds: float, usage_metadata: Any, success: bool) -> None:
+    """Latency, errors and tokens of one Gemini call"""
+    service = getattr(service_type, "value", service_type) or "unknown"
+    gemini_call_seconds.observe(duration_seconds, service_type=service, status="ok" if success else "error")
+    if not success:
+        gemini_call_errors.inc(service_type=service)
+    for kind, field in (("prompt", "prompt_token_count"), ("candidates", "candidates_token_count"),
+                        ("cached", "cached_content_token_count")):
+        count = getattr(usage_metadata, field, None)
+        if isinstance(count, int) and count > 0:
+            gemini_tokens.inc(count, service_type=service, kind=kind)
+
+
+# Global registry instance
+metrics = MetricsRegistry(
+    multiproc_dir=settings.metrics_multiproc_dir,
+    flush_seconds=settings.metrics_flush_seconds
+)
+
+http_request_seconds = metrics.histogram(
+    "fia_http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status")
+)
+http_response_bytes = metrics.histogram(
+    "fia_http_response_size_bytes", "HTTP response body size by route template",
+    ("method", "route"), SIZE_BUCKETS
+)
+gemini_call_seconds = metrics.histogram(
+    "fia_gemini_call_duration_seconds", "Gemini call latency by service type",
+    ("service_type", "status"), LLM_LATENCY_BUCKETS
+)
+gemini_call_errors = metrics.counter(
+    "fia_gemini_call_errors_total", "Failed Gemini calls by service type", ("service_type",)
+)
+gemini_tokens = metrics.counter(
+    "fia_gemini_tokens_total", "Gemini tokens by service type and kind (prompt, candidates, cached)",
+    ("service_type", "kind")
+)
+rate_limiter_wait_seconds = metrics.histogram(
+    "fia_rate_limiter_wait_seconds", "Time spent waiting for a rate limiter slot", ("limiter",), WAIT_BUCKETS
+)
+rate_limiter_rejections = metrics.counter(
+    "fia_rate_limiter_rejections_total", "Rate limiter waits that timed out", ("limiter",)
+)
+db_pool_checkout_seconds = metrics.histogram(
+    "fia_db_pool_checkout_seconds", "Time to check a connection out of the database pool", (), WAIT_BUCKETS
+)
+db_queries_per_request = metrics.histogram(
+    "fia_db_queries_per_request", "SQL statements per request by route template",
+    ("method", "route"), QUERY_COUNT_BUCKETS
+)
+db_time_per_request_seconds = metrics.histogram(
+    "fia_db_time_per_request_seconds", "Time spent in SQL statements per request by route template",
+    ("method", "route")
+)
+db_repeated_query_requests = metrics.counter(
+    "fia_db_repeated_query_requests_total", "Requests repeating one statement shape above the N+1 threshold",
+    ("method", "route")
+)
+tts_audio_bytes = metrics.counter(
+    "fia_tts_audio_bytes_total", "Audio bytes generated by text-to-speech", ("adapter",)
+)
+live_websocket_connections = metrics.gauge(
+    "fia_live_websocket_connections", "Open Live session WebSocket connections"
+)
+live_websocket_connections_opened = metrics.counter(
+    "fia_live_websocket_connections_opened_total", "Live session WebSocket connections accepted"
+)
@@ -14,6 +14,15 @@ from .learner_training_plan_model import LearnerTrainingPlanModel
 from .training_module_model import TrainingModuleModel
 from .training_submodule_model import TrainingSubmoduleModel
 from .training_slide_model import TrainingSlideModel
+from .live_session_model import LiveSessionModel
+from .file_blob_model import FileBlobModel, TrainingFileRefModel
+from .storage_manifest_model import StorageManifestModel
+from .document_chunk_model import DocumentChunkModel
+from .conversation_summary_model import ConversationSummaryModel
+from .dashboard_rollup_model import (
+    SessionRollupModel, TrainingRollupModel, TrainerRollupModel, DailyActivityRollupModel
+)
+from .api_log_model import ApiLogModel
 
 __all__ = [
     "TrainerModel",
@@ -25,5 +34,16 @@ __all__ = [
     "LearnerTrainingPlanModel",
     "TrainingModuleModel",
     "TrainingSubmoduleModel", 
-    "TrainingSlideModel"
+    "TrainingSlideModel",
+    "LiveSessionModel",
+    "FileBlobModel",
+    "TrainingFileRefModel",
+    "StorageManifestModel",
+    "DocumentChunkModel",
+    "ConversationSummaryModel",
+    "SessionRollupModel",
+    "TrainingRollupModel",
+    "TrainerRollupModel",
+    "DailyActivityRollupModel",
+    "ApiLogModel"
 ]
\ No newline at end of file
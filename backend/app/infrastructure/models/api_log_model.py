@@ -3,7 +3,7 @@ FIA v3.0 - API Log SQLAlchemy Model
 Infrastructure layer model for api_logs table
 """
 
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -25,10 +25,23 @@ class ApiLogModel(Base):
     response_data = Column(JSONB)
     status_code = Column(Integer)
     response_time_ms = Column(Integer)
-    tokens_used = Column(Integer)
+    tokens_used = Column(Integer)  # total_token_count of the usage metadata
     cost_estimate = Column(String)  # monetary cost if available
-    learner_session_id = Column(UUID(as_uuid=True), ForeignKey("learner_sessions.id"), nullable=True)  # optional for traceability
+    learner_session_id = Column(UUID(as_uuid=True), ForeignKey("learner_sessions.id", ondelete="SET NULL"), nullable=True)  # optional for traceability
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Token accounting (Gemini usage metadata)
+    service_type = Column(String, nullable=True)  # ServiceType value: 'conversation', 'plan_generation'...
+    model = Column(String, nullable=True)
+    prompt_tokens = Column(Integer)
+    candidates_tokens = Column(Integer)
+    cached_tokens = Column(Integer)
 
     # Relationships
-    learner_session = relationship("LearnerSessionModel", foreign_keys=[learner_session_id])
\ No newline at end of file
+    learner_session = relationship("LearnerSessionModel", foreign_keys=[learner_session_id])
+    
+    __table_args__ = (
+        # Per-session usage and recent calls (token usage endpoints, admin cost columns)
+        Index('idx_api_logs_learner_session_created', 'learner_session_id', 'created_at'),
+        Index('idx_api_logs_created', 'created_at'),
+    )
@@ -23,6 +23,7 @@ class ChatMessageModel(Base):
     response = Column(Text)  # Additional column in DB
     message_type = Column(String)  # 'question', 'answer'
     ai_context = Column(Text)  # Additional column in DB
+    slide_id = Column(UUID(as_uuid=True), ForeignKey("training_slides.id", ondelete="SET NULL"))  # Slide the message was sent from
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
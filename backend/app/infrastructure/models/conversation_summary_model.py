@@ -0,0 +1,23 @@
+"""
+FIA v3.0 - Conversation Summary SQLAlchemy Model
+Infrastructure layer model for conversation_summaries table (rolling chat summary per learner session)
+"""
+
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.infrastructure.database import Base
+
+
+class ConversationSummaryModel(Base):
+    """SQLAlchemy model for conversation_summaries table"""
+    
+    __tablename__ = "conversation_summaries"
+
+    learner_session_id = Column(UUID(as_uuid=True), ForeignKey("learner_sessions.id", ondelete="CASCADE"), primary_key=True)
+    summary = Column(Text, nullable=False)
+    summarized_until = Column(DateTime(timezone=True), nullable=False)
+    summarized_messages = Column(Integer, nullable=False, default=0)
+    summarized_tokens = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -0,0 +1,74 @@
+"""
+FIA v3.0 - Dashboard Rollup SQLAlchemy Models
+Infrastructure layer models for the per session / training / trainer / day rollup tables
+read by the admin and trainer dashboards (maintained by app.infrastructure.dashboard_rollups)
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, Date, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.infrastructure.database import Base
+
+
+class SessionRollupModel(Base):
+    """SQLAlchemy model for session_rollups table (one row per training session)"""
+
+    __tablename__ = "session_rollups"
+
+    session_id = Column(UUID(as_uuid=True), ForeignKey("training_sessions.id", ondelete="CASCADE"), primary_key=True)
+    learner_count = Column(Integer, nullable=False, default=0)  # One learner session per email and session
+    total_time_seconds = Column(BigInteger, nullable=False, default=0)
+    slide_progress_sum = Column(BigInteger, nullable=False, default=0)  # Sum of current_slide_number
+    max_slide_reached = Column(Integer, nullable=False, default=0)
+    total_slides = Column(Integer, nullable=False, default=0)  # Slides in the learners' training plans
+    slides_with_content = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class TrainingRollupModel(Base):
+    """SQLAlchemy model for training_rollups table (one row per training)"""
+
+    __tablename__ = "training_rollups"
+
+    training_id = Column(UUID(as_uuid=True), ForeignKey("trainings.id", ondelete="CASCADE"), primary_key=True)
+    session_count = Column(Integer, nullable=False, default=0)
+    active_session_count = Column(Integer, nullable=False, default=0)
+    learner_count = Column(Integer, nullable=False, default=0)  # Distinct emails across sessions
+    total_time_seconds = Column(BigInteger, nullable=False, default=0)
+    slide_progress_sum = Column(BigInteger, nullable=False, default=0)
+    max_slide_reached = Column(Integer, nullable=False, default=0)
+    total_slides = Column(Integer, nullable=False, default=0)
+    slides_with_content = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class TrainerRollupModel(Base):
+    """SQLAlchemy model for trainer_rollups table (one row per trainer)"""
+
+    __tablename__ = "trainer_rollups"
+
+    trainer_id = Column(UUID(as_uuid=True), ForeignKey("trainers.id", ondelete="CASCADE"), primary_key=True)
+    trainings_with_support = Column(Integer, nullable=False, default=0)
+    trainings_ai_generated = Column(Integer, nullable=False, default=0)
+    session_count = Column(Integer, nullable=False, default=0)
+    active_session_count = Column(Integer, nullable=False, default=0)
+    learner_count = Column(Integer, nullable=False, default=0)  # Distinct emails across trainings
+    total_time_seconds = Column(BigInteger, nullable=False, default=0)
+    slide_progress_sum = Column(BigInteger, nullable=False, default=0)
+    total_slides = Column(Integer, nullable=False, default=0)
+    slides_with_content = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class DailyActivityRollupModel(Base):
+    """SQLAlchemy model for daily_activity_rollups table (one row per trainer and active day, UTC)"""
+
+    __tablename__ = "daily_activity_rollups"
+
+    trainer_id = Column(UUID(as_uuid=True), ForeignKey("trainers.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    learners_started = Column(Integer, nullable=False, default=0)
+    unique_learners = Column(Integer, nullable=False, default=0)
+    slides_generated = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,27 @@
+"""
+FIA v3.0 - Document Chunk SQLAlchemy Model
+Infrastructure layer model for document_chunks table (locally extracted text of training files)
+"""
+
+from sqlalchemy import Column, String, Integer, Text, DateTime, PrimaryKeyConstraint
+from sqlalchemy.sql import func
+
+from app.infrastructure.database import Base
+
+
+class DocumentChunkModel(Base):
+    """SQLAlchemy model for document_chunks table"""
+    
+    __tablename__ = "document_chunks"
+
+    storage_key = Column(String, nullable=False)  # Training file_path (shared by deduplicated trainings)
+    chunk_index = Column(Integer, nullable=False)
+    location = Column(String, nullable=False)  # "page 3", "slide 12", "section 4"
+    section_title = Column(String)
+    content = Column(Text, nullable=False)
+    token_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('storage_key', 'chunk_index'),
+    )
@@ -0,0 +1,39 @@
+"""
+FIA v3.0 - File Blob SQLAlchemy Models
+Infrastructure layer models for content-addressed training files (file_blobs, training_file_refs)
+"""
+
+from sqlalchemy import Column, String, DateTime, BigInteger, Integer, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.infrastructure.database import Base
+
+
+class FileBlobModel(Base):
+    """SQLAlchemy model for file_blobs table - one row per distinct stored file content"""
+    
+    __tablename__ = "file_blobs"
+
+    sha256 = Column(String(64), primary_key=True)  # Hex SHA-256 of the file content
+    storage_key = Column(String, nullable=False, unique=True)  # Path / object key in the file storage
+    size_bytes = Column(BigInteger, nullable=False)
+    mime_type = Column(String)
+    ref_count = Column(Integer, nullable=False, default=0)  # Number of trainings using this blob
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class TrainingFileRefModel(Base):
+    """SQLAlchemy model for training_file_refs table - which blob a training uses"""
+    
+    __tablename__ = "training_file_refs"
+
+    # No FK to trainings: the reference is taken before the training row is inserted
+    training_id = Column(UUID(as_uuid=True), primary_key=True)
+    sha256 = Column(String(64), ForeignKey("file_blobs.sha256"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_training_file_refs_sha256', 'sha256'),
+    )
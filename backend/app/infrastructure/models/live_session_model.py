@@ -0,0 +1,29 @@
+"""
+FIA v3.0 - Live Session SQLAlchemy Model
+Infrastructure layer model for live_sessions table (cluster-wide Live API session registry)
+"""
+
+from sqlalchemy import Column, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.infrastructure.database import Base
+
+
+class LiveSessionModel(Base):
+    """SQLAlchemy model for live_sessions table"""
+    
+    __tablename__ = "live_sessions"
+
+    id = Column(String, primary_key=True)  # Live session ID generated by LiveAPIAdapter
+    learner_session_id = Column(UUID(as_uuid=True), nullable=False)
+    node_id = Column(String, nullable=False)  # Worker currently owning the session
+    context = Column(JSONB)  # Slide context, learner profile and session config to rebuild the session
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_heartbeat_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('idx_live_sessions_learner', 'learner_session_id'),
+        Index('idx_live_sessions_node', 'node_id'),
+        Index('idx_live_sessions_heartbeat', 'last_heartbeat_at'),
+    )
@@ -0,0 +1,30 @@
+"""
+FIA v3.0 - Storage Manifest SQLAlchemy Model
+Infrastructure layer model for storage_manifest table (one row per stored file)
+"""
+
+from sqlalchemy import Column, String, DateTime, BigInteger, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.infrastructure.database import Base
+
+
+class StorageManifestModel(Base):
+    """SQLAlchemy model for storage_manifest table"""
+    
+    __tablename__ = "storage_manifest"
+
+    storage_key = Column(String, primary_key=True)  # Training file_path or asset key, as returned by the storage
+    kind = Column(String, nullable=False)  # 'training' or 'asset'
+    size_bytes = Column(BigInteger, nullable=False)
+    trainer_id = Column(UUID(as_uuid=True))  # Owner of training files
+    sha256 = Column(String(64))
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_accessed_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index('idx_storage_manifest_kind', 'kind'),
+        Index('idx_storage_manifest_trainer', 'trainer_id'),
+        Index('idx_storage_manifest_last_accessed', 'last_accessed_at'),
+    )
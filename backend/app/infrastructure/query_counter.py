@@ -0,0 +1,166 @@
+"""
+FIA v3.0 - SQL Query Counter
+Per-request SQL statement count, DB time and N+1 detection from SQLAlchemy engine events
+"""
+
+import functools
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.infrastructure.metrics import db_queries_per_request, db_time_per_request_seconds, db_repeated_query_requests
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Bind placeholders of asyncpg ($1), sqlite (?) and psycopg (%(name)s), alone or as an IN list
+_PLACEHOLDER = r"(?:\$\d+|\?|%\(\w+\)s)"
+_PLACEHOLDER_LIST = re.compile(rf"{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+MAX_SHAPE_CHARS = 300
+
+
+@functools.lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """Statement with literals, placeholders and IN lists collapsed to '?'"""
+    shape = _PLACEHOLDER_LIST.sub("?", statement)
+    shape = _LITERAL.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """SQL statements run while the stats are active, and the time spent in them"""
+
+    __slots__ = ("count", "seconds", "shapes", "parent")
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Dict[str, int] = {}
+        # Enclosing stats (a test budget around a request) see the same statements
+        self.parent = parent
+
+    def record(self, statement: str, duration: float) -> None:
+        shape = statement_shape(statement)
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += duration
+            stats.shapes[shape] = stats.shapes.get(shape, 0) + 1
+            stats = stats.parent
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes run more than threshold times, most repeated first"""
+        return sorted(
+            ((shape, count) for shape, count in self.shapes.items() if count > threshold),
+            key=lambda item: -item[1]
+        )
+
+    def describe(self, top: int = 5) -> str:
+        shapes = "; ".join(
+            f"{count}x {shape[:MAX_SHAPE_CHARS]}"
+            for shape, count in sorted(self.shapes.items(), key=lambda item: -item[1])[:top]
+        )
+        return f"{self.count} queries, {self.seconds * 1000:.1f} ms - {shapes or 'none'}"
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("fia_query_stats", default=None)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Count the SQL statements run in a block (on engines set up by QueryCounter.setup)"""
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def instrument_engine(engine) -> None:
+    """Record every SQL statement in the active QueryStats (idempotent per engine)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if getattr(sync_engine, "_fia_query_counter", False):
+        return
+    sync_engine._fia_query_counter = True
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_stats.get() is not None:
+            context._fia_count_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_fia_count_started", None)
+        stats = _current_stats.get()
+        if started is None or stats is None:
+            return
+        stats.record(statement, time.perf_counter() - started)
+
+
+class QueryCounter:
+    """
+    Counts SQL statements and DB time per request
+
+    Each request reports its query count and DB time as metrics by route
+    template, and requests running one statement shape more than
+    repeat_threshold times (an N+1 pattern) are logged. With debug_headers,
+    responses carry X-DB-Query-Count and X-DB-Time-Ms.
+    """
+
+    def __init__(self, enabled: bool = True, repeat_threshold: int = 10, debug_headers: bool = False):
+        self.enabled = enabled
+        self.repeat_threshold = repeat_threshold
+        self.debug_headers = debug_headers
+
+    def setup(self, engine) -> None:
+        if not self.enabled:
+            return
+        instrument_engine(engine)
+        logger.info(f"🧮 QUERY_COUNTER [SETUP] Counting SQL per request, N+1 above {self.repeat_threshold} repeats")
+
+    def start(self) -> Tuple[Optional[QueryStats], Any]:
+        if not self.enabled:
+            return None, None
+        stats = QueryStats(parent=_current_stats.get())
+        return stats, _current_stats.set(stats)
+
+    def finish(self, stats: Optional[QueryStats], token: Any, method: str, route: str) -> Dict[str, str]:
+        """Close the request stats; returns the debug headers to set on the response"""
+        if stats is None:
+            return {}
+        _current_stats.reset(token)
+        db_queries_per_request.observe(stats.count, method=method, route=route)
+        db_time_per_request_seconds.observe(stats.seconds, method=method, route=route)
+
+        repeated = stats.repeated(self.repeat_threshold)
+        if repeated:
+            db_repeated_query_requests.inc(method=method, route=route)
+            shape, count = repeated[0]
+            logger.warning(
+                f"🔁 N_PLUS_ONE [{method} {route}] {count}x {shape[:MAX_SHAPE_CHARS]} "
+                f"({stats.count} queries, {stats.seconds * 1000:.0f} ms)"
+            )
+
+        return self.headers(stats)
+
+    def headers(self, stats: Optional[QueryStats]) -> Dict[str, str]:
+        """Debug headers with the statements run so far (empty unless debug_headers)"""
+        if stats is None or not self.debug_headers:
+            return {}
+        return {"X-DB-Query-Count": str(stats.count), "X-DB-Time-Ms": f"{stats.seconds * 1000:.1f}"}
+
+
+# Global query counter instance
+query_counter = QueryCounter(
+    enabled=settings.query_counter_enabled,
+    repeat_threshold=settings.n_plus_one_threshold,
+    debug_headers=settings.debug
+)
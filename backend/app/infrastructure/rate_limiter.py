@@ -9,7 +9,9 @@ import logging
 from typing import Dict, Optional
 from collections import defaultdict, deque
 
+from app.infrastructure.metrics import rate_limiter_rejections, rate_limiter_wait_seconds
 from app.infrastructure.settings import settings
+from app.infrastructure.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +59,7 @@ class SlidingWindowRateLimiter:
             
             return False
     
+    @traced("rate_limit")
     async def wait_until_allowed(self, key: str, max_wait_seconds: int = 300) -> None:
         """
         Wait until a request is allowed or timeout
@@ -72,6 +75,7 @@ class SlidingWindowRateLimiter:
         
         while time.time() - start_time < max_wait_seconds:
             if await self.is_allowed(key):
+                rate_limiter_wait_seconds.observe(time.time() - start_time, limiter=key)
                 return
             
             # Calculate wait time until next slot is available
@@ -86,6 +90,7 @@ class SlidingWindowRateLimiter:
             
             await asyncio.sleep(wait_time)
         
+        rate_limiter_rejections.inc(limiter=key)
         raise RateLimitExceeded(f"Rate limit exceeded for key '{key}' after {max_wait_seconds}s")
     
     def get_remaining_requests(self, key: str) -> int:
@@ -0,0 +1,100 @@
+"""
+FIA v3.0 - Request Logging Middleware
+Pure ASGI access log with latency and response size per route template
+"""
+
+import logging
+import random
+import time
+import traceback
+from typing import Any, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.metrics import http_request_seconds, http_response_bytes, route_label
+from app.infrastructure.query_counter import QueryStats, query_counter
+from app.infrastructure.sampling_profiler import sampling_profiler
+from app.infrastructure.tracing import RequestTrace, request_tracer
+
+logger = logging.getLogger(__name__)
+
+
+class RequestLoggingMiddleware:
+    """
+    Pure ASGI middleware timing and logging every HTTP request
+
+    Unlike @app.middleware("http") (BaseHTTPMiddleware), the application runs
+    in the server's task and its messages go straight to the server: body
+    chunks, streamed or not, are only counted. The Server-Timing (and debug
+    X-DB-*) headers are added to http.response.start. Once the response is
+    sent, latency and size are recorded by route template, the request trace,
+    query stats and profiler samples are closed, and one access log line is
+    written for sample_rate of the requests (always for errors and 5xx).
+    WebSocket and lifespan scopes are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        trace, trace_tokens = request_tracer.start()
+        query_stats, query_token = query_counter.start()
+        profiled = sampling_profiler.begin_request(scope["path"])
+        status_code = 500
+        response_bytes = 0
+        failed = False
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                status_code = message["status"]
+                extra_headers = _timing_headers(trace, trace_tokens, query_stats)
+                if extra_headers:
+                    message = {**message, "headers": [*message.get("headers", ()), *extra_headers]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except Exception as exc:
+            failed = True
+            logger.error(f"🚨 REQUEST [ERROR]: {scope['method']} {scope['path']} - {exc}")
+            logger.error(f"🚨 REQUEST [TRACEBACK]: {traceback.format_exc()}")
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            method = scope["method"]
+            route = route_label(scope)
+            http_request_seconds.observe(duration, method=method, route=route, status=status_code)
+            http_response_bytes.observe(response_bytes, method=method, route=route)
+            sampling_profiler.end_request(profiled, method, route)
+            query_counter.finish(query_stats, query_token, method, route)
+            request_tracer.finish(trace, trace_tokens, method, route, status_code)
+
+            if failed or status_code >= 500 or self.sample_rate >= 1.0 or random.random() < self.sample_rate:
+                level = logging.WARNING if failed or status_code >= 500 else logging.INFO
+                if logger.isEnabledFor(level):
+                    logger.log(
+                        level,
+                        f"📤 REQUEST [{method} {route}] {scope['path']} - {status_code} "
+                        f"in {duration * 1000:.1f} ms, {response_bytes} bytes"
+                    )
+
+
+def _timing_headers(trace: Optional[RequestTrace], trace_tokens: Any,
+                    query_stats: Optional[QueryStats]) -> List[Tuple[bytes, bytes]]:
+    """Server-Timing and X-DB-* headers as they stand when the response starts"""
+    headers = []
+    server_timing = request_tracer.server_timing(trace, trace_tokens)
+    if server_timing:
+        headers.append((b"server-timing", server_timing.encode("latin-1")))
+    for name, value in query_counter.headers(query_stats).items():
+        headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+    return headers
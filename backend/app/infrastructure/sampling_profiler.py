@@ -0,0 +1,383 @@
+"""
+FIA v3.0 - Sampling Profiler
+On-demand statistical profiler of selected requests, stored as folded stacks for flamegraphs
+"""
+
+import asyncio
+import fnmatch
+import logging
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.domain.ports.file_storage import FileStoragePort
+from app.infrastructure.settings import settings
+from app.infrastructure.storage_manifest import storage_manifest
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PREFIX = "profiles/"
+PROFILE_ID_PATTERN = re.compile(r"^\d{8}T\d{6}Z-[0-9a-f]{8}$")
+MIN_INTERVAL_SECONDS = 0.001
+MAX_INTERVAL_SECONDS = 1.0
+MAX_STACK_DEPTH = 128
+MAX_DISTINCT_STACKS = 20000
+OVERHEAD_WINDOW_SECONDS = 1.0
+OTHER_STACKS_FRAME = "[other stacks]"
+
+_BACKEND_ROOT = str(Path(__file__).resolve().parents[2])
+# Event loop callback frame: everything above it is the loop itself
+_HANDLE_RUN_CODE = asyncio.events.Handle._run.__code__
+
+_profiled_request: ContextVar[Optional["_ProfiledRequest"]] = ContextVar("fia_profiled_request", default=None)
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    marker = filename.rfind("site-packages")
+    if marker >= 0:
+        filename = filename[marker + len("site-packages") + 1:]
+    elif filename.startswith(_BACKEND_ROOT):
+        filename = filename[len(_BACKEND_ROOT) + 1:]
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+def folded_stacks(stacks: Dict[Tuple[str, Optional[tuple]], int]) -> str:
+    """Brendan Gregg's folded format ("root;caller;callee count"), read by flamegraph.pl and speedscope"""
+    labels: Dict[Any, str] = {}
+    lines = []
+    for (root, codes), count in sorted(stacks.items(), key=lambda item: -item[1]):
+        frames = [root.replace(";", ":")]
+        if codes is None:
+            frames.append(OTHER_STACKS_FRAME)
+        else:
+            for code in codes:
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                frames.append(label)
+        lines.append(f"{';'.join(frames)} {count}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class _ProfiledRequest:
+    """Samples of one selected request, merged into the session when it ends"""
+
+    __slots__ = ("stacks", "closed")
+
+    def __init__(self):
+        self.stacks: Dict[tuple, int] = {}
+        self.closed = False
+
+
+class ProfilingSession:
+    """One profiling window: which requests to sample, and the stacks collected so far"""
+
+    def __init__(self, route_pattern: str, sample_percent: float, duration_seconds: float, interval_seconds: float):
+        self.started_at = datetime.now(timezone.utc)
+        self.profile_id = f"{self.started_at:%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:8]}"
+        self.route_pattern = route_pattern
+        self.sample_percent = sample_percent
+        self.duration_seconds = duration_seconds
+        self.interval_seconds = interval_seconds
+        self.requests = 0
+        self.samples = 0
+        self.sampler_seconds = 0.0
+        self.backoffs = 0
+        self.stacks: Dict[Tuple[str, Optional[tuple]], int] = {}
+        self.stop_requested = asyncio.Event()
+        self.stop_sampling = threading.Event()
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.thread: Optional[threading.Thread] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "profile_id": self.profile_id,
+            "route_pattern": self.route_pattern,
+            "sample_percent": self.sample_percent,
+            "duration_seconds": self.duration_seconds,
+            "interval_ms": round(self.interval_seconds * 1000, 3),
+            "started_at": self.started_at.isoformat(),
+            "requests_profiled": self.requests,
+            "samples": self.samples,
+            "sampler_ms": round(self.sampler_seconds * 1000, 1),
+            "interval_backoffs": self.backoffs
+        }
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler of production requests, enabled on demand
+
+    While a session runs, a daemon thread samples the event loop thread's
+    stack every interval. A sample is kept only when the task running on the
+    loop belongs to a selected request: requests whose path matches the glob
+    route_pattern, picked with sample_percent probability. The tasks such a
+    request spawns are tagged through a loop task factory, so work moved to
+    child tasks is attributed too. Samples capture what runs on the loop
+    (prompt building, JSON parsing, Pydantic serialization); time spent
+    awaiting I/O or in worker threads does not show.
+
+    Overhead is capped: the sampler measures its own time and doubles its
+    interval whenever it exceeds max_overhead of the wall time, sessions
+    last at most max_duration_seconds, one session runs at a time and stack
+    depth and distinct stacks are bounded. Each session is profiled in the
+    worker that received the admin call. Profiles are stored through the
+    storage port, keeping the max_profiles newest for retention_days.
+    """
+
+    def __init__(
+        self,
+        max_duration_seconds: int = 300,
+        max_overhead: float = 0.02,
+        max_profiles: int = 20,
+        retention_days: int = 7
+    ):
+        self.max_duration_seconds = max_duration_seconds
+        self.max_overhead = max_overhead
+        self.max_profiles = max_profiles
+        self.retention_days = retention_days
+        self._session: Optional[ProfilingSession] = None
+        self._tasks: Dict[asyncio.Task, _ProfiledRequest] = {}
+        self._lock = threading.Lock()
+        self._previous_task_factory = None
+        self._last_profile: Optional[Dict[str, Any]] = None
+
+    async def start_session(
+        self,
+        file_storage: FileStoragePort,
+        route_pattern: str = "*",
+        sample_percent: float = 100.0,
+        duration_seconds: float = 60.0,
+        interval_ms: float = 10.0
+    ) -> Dict[str, Any]:
+        """Start profiling matching requests; the profile is stored when the session ends"""
+        if self._session is not None:
+            raise RuntimeError("A profiling session is already running")
+
+        session = ProfilingSession(
+            route_pattern=route_pattern or "*",
+            sample_percent=min(max(sample_percent, 0.0), 100.0),
+            duration_seconds=min(max(duration_seconds, 1.0), self.max_duration_seconds),
+            interval_seconds=min(max(interval_ms / 1000, MIN_INTERVAL_SECONDS), MAX_INTERVAL_SECONDS)
+        )
+        self._previous_task_factory = session.loop.get_task_factory()
+        session.loop.set_task_factory(self._task_factory)
+        self._session = session
+        session.thread = threading.Thread(target=self._sample, args=(session,), name="fia-sampling-profiler", daemon=True)
+        session.thread.start()
+        session.task = asyncio.create_task(self._run(session, file_storage))
+
+        logger.info(
+            f"🔥 PROFILER [START] {session.profile_id}: {session.route_pattern} at {session.sample_percent}% "
+            f"for {session.duration_seconds:.0f}s, every {session.interval_seconds * 1000:.1f} ms"
+        )
+        return session.to_dict()
+
+    async def stop_session(self) -> Optional[Dict[str, Any]]:
+        """End the running session early; returns the stored profile"""
+        session = self._session
+        if session is None:
+            return None
+        session.stop_requested.set()
+        return await asyncio.shield(session.task)
+
+    async def stop(self) -> None:
+        """Shutdown: store the profile of a running session"""
+        try:
+            await self.stop_session()
+        except Exception as e:
+            logger.warning(f"⚠️ PROFILER [STOP] Could not store the running profile: {e}")
+
+    def status(self) -> Dict[str, Any]:
+        session = self._session
+        return {
+            "active": session is not None,
+            "session": session.to_dict() if session else None,
+            "last_profile": self._last_profile,
+            "limits": {
+                "max_duration_seconds": self.max_duration_seconds,
+                "max_overhead": self.max_overhead,
+                "max_profiles": self.max_profiles,
+                "retention_days": self.retention_days
+            }
+        }
+
+    def begin_request(self, path: str) -> Optional[Tuple[_ProfiledRequest, Any, Optional[asyncio.Task], Any]]:
+        """Select the current request for profiling; one attribute check when no session runs"""
+        session = self._session
+        if session is None:
+            return None
+        if not fnmatch.fnmatchcase(path, session.route_pattern) or random.random() * 100 >= session.sample_percent:
+            return None
+
+        request = _ProfiledRequest()
+        task = asyncio.current_task()
+        # The connection task serves one request at a time: restore its previous tag afterwards
+        previous = self._tasks.get(task)
+        self._tasks[task] = request
+        session.requests += 1
+        return request, _profiled_request.set(request), task, previous
+
+    def end_request(self, profiled: Optional[Tuple[_ProfiledRequest, Any, Optional[asyncio.Task], Any]],
+                    method: str, route: str) -> None:
+        """Merge the samples of a selected request into the session, under its route template"""
+        if profiled is None:
+            return
+        request, token, task, previous = profiled
+        _profiled_request.reset(token)
+        if previous is None:
+            self._tasks.pop(task, None)
+        else:
+            self._tasks[task] = previous
+
+        root = f"{method} {route}"
+        with self._lock:
+            request.closed = True
+            stacks, request.stacks = request.stacks, {}
+            session = self._session
+            if session is None:
+                return
+            for codes, count in stacks.items():
+                key = (root, codes)
+                if key not in session.stacks and len(session.stacks) >= MAX_DISTINCT_STACKS:
+                    key = (root, None)
+                session.stacks[key] = session.stacks.get(key, 0) + count
+
+    def _task_factory(self, loop, coro, context=None):
+        """Tag the tasks created by a selected request (runs in the creator's context)"""
+        previous = self._previous_task_factory
+        if previous is not None:
+            task = previous(loop, coro) if context is None else previous(loop, coro, context=context)
+        else:
+            task = asyncio.Task(coro, loop=loop, context=context)
+        request = _profiled_request.get() if context is None else context.get(_profiled_request)
+        if request is not None and not request.closed:
+            self._tasks[task] = request
+            task.add_done_callback(self._forget_task)
+        return task
+
+    def _forget_task(self, task: asyncio.Task) -> None:
+        self._tasks.pop(task, None)
+
+    def _sample(self, session: ProfilingSession) -> None:
+        """Sampler thread: stack of the loop thread whenever a selected request's task is running"""
+        current_frames = sys._current_frames
+        current_task = asyncio.current_task
+        tasks = self._tasks
+        window_started = time.perf_counter()
+        window_cost = 0.0
+
+        while not session.stop_sampling.wait(session.interval_seconds):
+            started = time.perf_counter()
+            request = tasks.get(current_task(session.loop))
+            if request is not None and not request.closed:
+                frame = current_frames().get(session.loop_thread_id)
+                codes = []
+                while frame is not None and len(codes) < MAX_STACK_DEPTH:
+                    code = frame.f_code
+                    if code is _HANDLE_RUN_CODE:
+                        break
+                    codes.append(code)
+                    frame = frame.f_back
+                frame = None
+                codes.reverse()
+                key = tuple(codes)
+                with self._lock:
+                    request.stacks[key] = request.stacks.get(key, 0) + 1
+                session.samples += 1
+
+            now = time.perf_counter()
+            window_cost += now - started
+            if now - window_started >= OVERHEAD_WINDOW_SECONDS:
+                session.sampler_seconds += window_cost
+                if window_cost > self.max_overhead * (now - window_started) and session.interval_seconds < MAX_INTERVAL_SECONDS:
+                    session.interval_seconds = min(session.interval_seconds * 2, MAX_INTERVAL_SECONDS)
+                    session.backoffs += 1
+                    logger.warning(
+                        f"⚠️ PROFILER [OVERHEAD] Sampling took {window_cost * 1000:.1f} ms in "
+                        f"{now - window_started:.1f}s, interval raised to {session.interval_seconds * 1000:.0f} ms"
+                    )
+                window_started, window_cost = now, 0.0
+
+    async def _run(self, session: ProfilingSession, file_storage: FileStoragePort) -> Dict[str, Any]:
+        """Wait for the end of the session, then store its profile"""
+        try:
+            await asyncio.wait_for(session.stop_requested.wait(), timeout=session.duration_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+        session.stop_sampling.set()
+        await asyncio.to_thread(session.thread.join)
+        if session.loop.get_task_factory() == self._task_factory:
+            session.loop.set_task_factory(self._previous_task_factory)
+        with self._lock:
+            self._session = None
+            stacks, session.stacks = session.stacks, {}
+
+        profile = session.to_dict()
+        profile.update({"key": None, "size_bytes": 0, "ended_at": datetime.now(timezone.utc).isoformat()})
+        if stacks:
+            try:
+                body = await asyncio.to_thread(folded_stacks, stacks)
+                key = f"{PROFILE_PREFIX}{session.profile_id}.folded"
+                profile["size_bytes"] = await file_storage.store_asset(key, body.encode("utf-8"), "text/plain")
+                profile["key"] = key
+                logger.info(
+                    f"🔥 PROFILER [STORED] {session.profile_id}: {session.samples} samples from "
+                    f"{session.requests} requests, {len(stacks)} stacks, {profile['size_bytes']} bytes"
+                )
+                await self._enforce_retention(file_storage)
+            except Exception as e:
+                logger.error(f"❌ PROFILER [STORE] Could not store {session.profile_id}: {e}")
+        else:
+            logger.info(f"🔥 PROFILER [EMPTY] {session.profile_id}: no sample from {session.requests} requests")
+
+        self._last_profile = profile
+        return profile
+
+    async def _enforce_retention(self, file_storage: FileStoragePort) -> int:
+        """Delete the profiles beyond max_profiles or older than retention_days"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+        profiles = await storage_manifest.list_keys(PROFILE_PREFIX)
+        expired = [
+            key for index, (key, _, created_at) in enumerate(profiles)
+            if index >= self.max_profiles or created_at < cutoff
+        ]
+        for key in expired:
+            await file_storage.delete_asset(key)
+        if expired:
+            logger.info(f"🧹 PROFILER [RETENTION] {len(expired)} expired profiles deleted")
+        return len(expired)
+
+    async def list_profiles(self) -> List[Dict[str, Any]]:
+        """Stored profiles, newest first"""
+        return [
+            {"profile_id": key[len(PROFILE_PREFIX):].rsplit(".", 1)[0], "size_bytes": size, "created_at": created_at}
+            for key, size, created_at in await storage_manifest.list_keys(PROFILE_PREFIX)
+        ]
+
+    async def get_profile_path(self, file_storage: FileStoragePort, profile_id: str) -> Optional[Path]:
+        """Local path of a stored profile, None for an unknown or malformed id"""
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = await file_storage.get_asset_path(f"{PROFILE_PREFIX}{profile_id}.folded")
+        return path if path.exists() else None
+
+
+# Global profiler instance
+sampling_profiler = SamplingProfiler(
+    max_duration_seconds=settings.profiler_max_duration_seconds,
+    max_overhead=settings.profiler_max_overhead,
+    max_profiles=settings.profiler_max_profiles,
+    retention_days=settings.profiler_retention_days
+)
@@ -33,6 +33,16 @@ class Settings(BaseSettings):
     google_cloud_region: str = Field(default="europe-west1", description="GCP region")
     gemini_model_name: str = Field(default="gemini-2.5-flash", description="Gemini 2.5 Flash model name")
     
+    # Live API
+    live_api_pool_size: int = Field(default=0, description="Number of pre-connected Live API WebSockets (0 disables the pool)")
+    live_api_pool_max_idle_seconds: float = Field(default=240.0, description="Recycle pre-connected Live API WebSockets after this idle time")
+    live_vad_enabled: bool = Field(default=True, description="Trim silence from Live PCM audio before sending it upstream")
+    live_vad_threshold_dbfs: float = Field(default=-45.0, description="Minimum frame level (dBFS) considered as speech")
+    live_session_registry_backend: str = Field(default="auto", description="Live session registry: 'auto', 'postgres' or 'memory'")
+    live_session_ttl_seconds: float = Field(default=30.0, description="Live sessions expire when their worker stops heartbeating for this long")
+    live_session_heartbeat_seconds: float = Field(default=10.0, description="Live session heartbeat interval")
+    node_id: str = Field(default="", description="Worker identifier in the cluster (defaults to hostname-pid)")
+    
     # OpenAI
     openai_api_key: str = Field(default="", description="OpenAI API key for image generation")
     
@@ -51,6 +61,12 @@ class Settings(BaseSettings):
     r2_endpoint_url: str = Field(default="", description="Cloudflare R2 endpoint URL")
     r2_access_key: str = Field(default="", description="Cloudflare R2 access key")
     r2_secret_key: str = Field(default="", description="Cloudflare R2 secret key")
+    r2_download_mode: str = Field(default="proxy", description="R2 file downloads: 'proxy' or 'redirect' (presigned URL, needs CORS on the bucket for fetch() downloads)")
+    r2_presigned_url_ttl_seconds: int = Field(default=300, description="Lifetime of presigned R2 download URLs")
+    r2_cache_dir: str = Field(default="./cache/r2", description="Local read-through cache directory for R2 files")
+    r2_cache_max_mb: int = Field(default=2048, description="Maximum size of the local R2 file cache in MB")
+    r2_max_concurrency: int = Field(default=16, description="Worker threads and HTTP connections for R2 transfers")
+    storage_manifest_reconcile_seconds: int = Field(default=21600, description="Interval between storage manifest reconciliations (0 disables)")
     
     
     # Logging
@@ -59,6 +75,39 @@ class Settings(BaseSettings):
     # Rate Limiting
     gemini_rate_limit_per_minute: int = Field(default=60, description="Gemini API rate limit")
     gemini_context_cache_ttl_hours: int = Field(default=12, description="Context cache TTL in hours")
+    document_text_token_budget: int = Field(default=32000, description="Max estimated tokens of extracted document text sent instead of the file")
+    retrieval_top_k: int = Field(default=4, description="Document passages added to slide and chat prompts")
+    retrieval_passage_token_budget: int = Field(default=1200, description="Max estimated tokens of document passages per prompt")
+    retrieval_latency_budget_ms: int = Field(default=250, description="Max wait for a retrieval index before prompting without passages (0 disables retrieval)")
+    chat_history_token_budget: int = Field(default=1500, description="Max estimated tokens of chat summary + recent messages per prompt")
+    chat_history_recent_messages: int = Field(default=10, description="Latest chat messages kept verbatim in prompts")
+    chat_summary_every_turns: int = Field(default=5, description="Question/answer turns past the recent window before the summary is refreshed (0 disables)")
+    chat_write_flush_ms: int = Field(default=100, description="Max delay before buffered chat messages are inserted")
+    chat_write_batch_size: int = Field(default=200, description="Chat messages inserted per batch (an earlier flush starts when reached)")
+    dashboard_rollup_refresh_seconds: float = Field(default=5.0, description="Max delay before dashboard rollups reflect learner and slide activity")
+    dashboard_rollup_reconcile_seconds: int = Field(default=3600, description="Interval between full dashboard rollup recomputations (0 disables)")
+    api_log_flush_ms: int = Field(default=1000, description="Max delay before buffered Gemini token usage rows are inserted into api_logs")
+    api_log_batch_size: int = Field(default=500, description="api_logs rows inserted per batch (an earlier flush starts when reached)")
+    dashboard_cache_ttl_seconds: float = Field(default=30.0, description="Lifetime of cached trainer dashboard payloads (0 disables)")
+    gemini_log_body_sample_rate: float = Field(default=0.1, description="Share of Gemini calls whose full prompt and response are logged (1 logs all, 0 none)")
+    gemini_log_body_max_chars: int = Field(default=20000, description="Logged prompt/response bodies are truncated past this many characters (0 disables)")
+    gemini_log_body_file: str = Field(default="logs/gemini_bodies.log", description="File receiving sampled Gemini bodies, gzip-rotated (empty logs them with the application)")
+    gemini_log_body_max_bytes: int = Field(default=50 * 1024 * 1024, description="Size of the Gemini body log before it is rotated and compressed")
+    gemini_log_body_backups: int = Field(default=5, description="Compressed Gemini body logs kept")
+    gemini_log_queue_size: int = Field(default=10000, description="Gemini call log records waiting for the writer thread before new ones are dropped")
+    metrics_multiproc_dir: str = Field(default="", description="Directory where each worker publishes its metrics so /metrics aggregates every worker of the host (empty: this worker only; wipe it before starting the workers)")
+    metrics_flush_seconds: float = Field(default=5.0, description="Interval between two publications of a worker's metrics")
+    metrics_token: str = Field(default="", description="Bearer token accepted by /metrics (empty: admin JWT only)")
+    metrics_public: bool = Field(default=False, description="Serve /metrics without a token or admin authentication")
+    tracing_enabled: bool = Field(default=True, description="Break requests down by layer (slow request log; Server-Timing header in debug)")
+    slow_request_ms: int = Field(default=2000, description="Requests slower than this are logged with their timing breakdown")
+    request_log_sample_rate: float = Field(default=1.0, description="Share of requests written to the access log (errors and 5xx always are)")
+    query_counter_enabled: bool = Field(default=True, description="Count SQL statements and DB time per request (metrics, N+1 log, X-DB-* headers in debug)")
+    n_plus_one_threshold: int = Field(default=10, description="Requests running one statement shape more than this many times are logged as N+1")
+    profiler_max_duration_seconds: int = Field(default=300, description="Longest on-demand profiling session")
+    profiler_max_overhead: float = Field(default=0.02, description="Share of wall time the profiler's sampler may use before slowing down")
+    profiler_max_profiles: int = Field(default=20, description="Stored profiles kept (newest first)")
+    profiler_retention_days: int = Field(default=7, description="Stored profiles older than this are deleted")
     
     # Email (Brevo)
     brevo_api_key: str = Field(default="", description="Brevo API key")
@@ -0,0 +1,281 @@
+"""
+FIA v3.0 - Storage Manifest
+Database record of every stored file, so storage stats and orphan cleanup never scan the storage
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import bindparam, delete, exists, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.domain.ports.file_storage import FileStoragePort
+from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.models.storage_manifest_model import StorageManifestModel
+from app.infrastructure.models.training_model import TrainingModel
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant identifying the reconciler in pg_try_advisory_xact_lock
+RECONCILE_LOCK_ID = 0x5354_4F52  # "STOR"
+
+# Files younger than this are never orphans: the training row is inserted after the upload
+ORPHAN_GRACE_PERIOD = timedelta(hours=1)
+
+
+def trainer_id_from_key(storage_key: str) -> Optional[UUID]:
+    """Owner of a training file, from its "<trainer_id>/<file>" or "trainings/<trainer_id>/<file>" key"""
+    for segment in reversed(storage_key.split("/")[:-1]):
+        try:
+            return UUID(segment)
+        except ValueError:
+            continue
+    return None
+
+
+def access_time_update():
+    """Core UPDATE of last_accessed_at, executed with one (key, accessed_at) parameter set per file"""
+    table = StorageManifestModel.__table__
+    return (
+        update(table)
+        .where(table.c.storage_key == bindparam("key"))
+        .values(last_accessed_at=bindparam("accessed_at"))
+    )
+
+
+class StorageManifest:
+    """
+    Incrementally maintained manifest of stored files
+
+    Stores and deletes are recorded as they happen. Reads only mark the file
+    as accessed in memory; access times are written in one batched UPDATE by
+    the background loop. The same loop periodically reconciles the manifest
+    with a full listing of the storage to absorb drift (crashes between the
+    storage write and the manifest write, manual changes, legacy files).
+    """
+
+    def __init__(self, flush_interval_seconds: float = 60.0, reconcile_interval_seconds: float = 21600.0):
+        self.flush_interval_seconds = flush_interval_seconds
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+        self._accessed: Dict[str, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._last_reconcile: Optional[Dict[str, Any]] = None
+
+    async def record_store(
+        self,
+        storage_key: str,
+        kind: str,
+        size_bytes: int,
+        trainer_id: Optional[UUID] = None,
+        sha256: Optional[str] = None
+    ) -> None:
+        """Insert or refresh the entry of a stored file"""
+        try:
+            async with AsyncSessionLocal() as db:
+                statement = insert(StorageManifestModel).values(
+                    storage_key=storage_key,
+                    kind=kind,
+                    size_bytes=size_bytes,
+                    trainer_id=trainer_id,
+                    sha256=sha256
+                )
+                await db.execute(statement.on_conflict_do_update(
+                    index_elements=[StorageManifestModel.storage_key],
+                    set_={
+                        "size_bytes": statement.excluded.size_bytes,
+                        "sha256": statement.excluded.sha256,
+                        "trainer_id": statement.excluded.trainer_id
+                    }
+                ))
+                await db.commit()
+        except Exception as e:
+            # The reconciler picks the file up later
+            logger.warning(f"⚠️ STORAGE_MANIFEST [STORE] Could not record {storage_key}: {str(e)}")
+
+    async def record_delete(self, storage_key: str) -> None:
+        """Remove the entry of a deleted file"""
+        self._accessed.pop(storage_key, None)
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(StorageManifestModel).where(StorageManifestModel.storage_key == storage_key))
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ STORAGE_MANIFEST [DELETE] Could not remove {storage_key}: {str(e)}")
+
+    def touch(self, storage_key: str) -> None:
+        """Mark a file as accessed (written by the next flush)"""
+        self._accessed[storage_key] = datetime.now(timezone.utc)
+
+    async def flush_access_times(self) -> int:
+        """Write pending access times in one batched UPDATE"""
+        if not self._accessed:
+            return 0
+        pending, self._accessed = self._accessed, {}
+        try:
+            async with AsyncSessionLocal() as db:
+                # Core executemany: an ORM update() with a parameter list is a bulk UPDATE by primary key
+                connection = await db.connection()
+                await connection.execute(
+                    access_time_update(),
+                    [{"key": key, "accessed_at": accessed_at} for key, accessed_at in pending.items()]
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ STORAGE_MANIFEST [FLUSH] Could not write {len(pending)} access times: {str(e)}")
+            return 0
+        return len(pending)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """File count and size per kind, from a single aggregate query"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(
+                    StorageManifestModel.kind,
+                    func.count(),
+                    func.coalesce(func.sum(StorageManifestModel.size_bytes), 0),
+                    func.max(StorageManifestModel.last_accessed_at)
+                ).group_by(StorageManifestModel.kind)
+            )
+            rows = result.all()
+
+        by_kind = {
+            kind: {"files": count, "size_bytes": int(size), "last_accessed_at": last_accessed}
+            for kind, count, size, last_accessed in rows
+        }
+        total_size = sum(entry["size_bytes"] for entry in by_kind.values())
+        return {
+            "total_files": sum(entry["files"] for entry in by_kind.values()),
+            "total_size_bytes": total_size,
+            "total_size_mb": round(total_size / (1024 * 1024), 2),
+            "by_kind": by_kind,
+            "last_reconcile": self._last_reconcile
+        }
+
+    async def list_keys(self, prefix: str) -> List[Tuple[str, int, datetime]]:
+        """(key, size, created_at) of the files under a key prefix, newest first"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(StorageManifestModel.storage_key, StorageManifestModel.size_bytes, StorageManifestModel.created_at)
+                .where(StorageManifestModel.storage_key.startswith(prefix, autoescape=True))
+                .order_by(StorageManifestModel.created_at.desc())
+            )
+            return [(key, size, created_at) for key, size, created_at in result.all()]
+
+    async def find_orphans(self, limit: int = 1000) -> List[str]:
+        """Training files no training references (anti-join on trainings.file_path)"""
+        cutoff = datetime.now(timezone.utc) - ORPHAN_GRACE_PERIOD
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(StorageManifestModel.storage_key)
+                .where(
+                    StorageManifestModel.kind == "training",
+                    StorageManifestModel.created_at < cutoff,
+                    ~exists().where(TrainingModel.file_path == StorageManifestModel.storage_key)
+                )
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+
+    async def cleanup_orphans(self, file_storage: FileStoragePort, limit: int = 1000) -> int:
+        """Delete orphaned training files from storage and from the manifest"""
+        cleaned = 0
+        for storage_key in await self.find_orphans(limit):
+            try:
+                await file_storage.delete_training_file(storage_key)
+            except Exception as e:
+                logger.warning(f"⚠️ STORAGE_MANIFEST [CLEANUP] Could not delete {storage_key}: {str(e)}")
+                continue
+            await self.record_delete(storage_key)
+            cleaned += 1
+        logger.info(f"🧹 STORAGE_MANIFEST [CLEANUP] Removed {cleaned} orphaned files")
+        return cleaned
+
+    async def reconcile(self, file_storage: FileStoragePort) -> Optional[Dict[str, Any]]:
+        """
+        Align the manifest with a full listing of the storage
+
+        Only one worker reconciles at a time (transaction-level advisory lock);
+        the others return None.
+        """
+        started = datetime.now(timezone.utc)
+        async with AsyncSessionLocal() as db:
+            locked = (await db.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": RECONCILE_LOCK_ID})).scalar()
+            if not locked:
+                return None
+
+            stored = {key: (size, kind) for key, size, kind in await file_storage.list_stored_files()}
+            result = await db.execute(select(StorageManifestModel.storage_key, StorageManifestModel.size_bytes))
+            recorded: Dict[str, int] = dict(result.all())
+
+            missing: List[Tuple[str, int, str]] = [
+                (key, size, kind) for key, (size, kind) in stored.items()
+                if recorded.get(key) != size
+            ]
+            stale = [key for key in recorded if key not in stored]
+
+            if missing:
+                statement = insert(StorageManifestModel)
+                await db.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[StorageManifestModel.storage_key],
+                        set_={"size_bytes": statement.excluded.size_bytes}
+                    ),
+                    [
+                        {
+                            "storage_key": key,
+                            "kind": kind,
+                            "size_bytes": size,
+                            "trainer_id": trainer_id_from_key(key) if kind == "training" else None
+                        }
+                        for key, size, kind in missing
+                    ]
+                )
+            if stale:
+                await db.execute(delete(StorageManifestModel).where(StorageManifestModel.storage_key.in_(stale)))
+            await db.commit()
+
+        self._last_reconcile = {
+            "at": started.isoformat(),
+            "files": len(stored),
+            "added_or_resized": len(missing),
+            "removed": len(stale),
+            "duration_ms": round((datetime.now(timezone.utc) - started).total_seconds() * 1000)
+        }
+        logger.info(f"🔄 STORAGE_MANIFEST [RECONCILE] {self._last_reconcile}")
+        return self._last_reconcile
+
+    async def start(self, file_storage_factory) -> None:
+        """Start the flush / reconcile loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(file_storage_factory))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush_access_times()
+
+    async def _run(self, file_storage_factory) -> None:
+        loop = asyncio.get_running_loop()
+        next_reconcile = loop.time() + min(60.0, self.reconcile_interval_seconds)
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush_access_times()
+            if self.reconcile_interval_seconds > 0 and loop.time() >= next_reconcile:
+                next_reconcile = loop.time() + self.reconcile_interval_seconds
+                try:
+                    await self.reconcile(file_storage_factory())
+                except Exception as e:
+                    logger.warning(f"⚠️ STORAGE_MANIFEST [RECONCILE] Failed: {str(e)}")
+
+
+# Global manifest instance
+storage_manifest = StorageManifest(reconcile_interval_seconds=settings.storage_manifest_reconcile_seconds)
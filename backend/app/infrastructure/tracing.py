@@ -0,0 +1,291 @@
+"""
+FIA v3.0 - Request Tracing
+Contextvar-based spans breaking each request down by layer (controller, service, adapter, DB, ...)
+"""
+
+import functools
+import inspect
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import event
+
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Module prefix -> layer of the classes instrumented by instrument_layers()
+LAYER_PACKAGES = (
+    ("app.domain.services.", "service"),
+    ("app.adapters.outbound.", "adapter"),
+    ("app.adapters.repositories.", "repository"),
+    ("app.infrastructure.adapters.", "gemini"),
+)
+# Private helpers worth a span of their own (JSON cleanup of model responses)
+JSON_HELPER_HINTS = ("json", "clean")
+MAX_RECORDED_SPANS = 200
+
+
+class RequestTrace:
+    """Timing breakdown of one request: exclusive time per layer and the slowest spans"""
+
+    __slots__ = ("started", "duration", "layers", "counts", "spans")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.layers: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.spans: List[Tuple[float, str, str]] = []
+
+    def record(self, layer: str, name: str, duration: float, self_time: float) -> None:
+        self.layers[layer] = self.layers.get(layer, 0.0) + self_time
+        self.counts[layer] = self.counts.get(layer, 0) + 1
+        if len(self.spans) < MAX_RECORDED_SPANS:
+            self.spans.append((duration, layer, name))
+
+    def server_timing(self, open_span: Optional["_Span"] = None) -> str:
+        """Server-Timing header value: total, then exclusive milliseconds per layer"""
+        layers, counts, duration = self.layers, self.counts, self.duration
+        if open_span is not None:
+            # Response headers go out before the root span closes: count it as it stands
+            now = time.perf_counter()
+            duration = now - self.started
+            layers, counts = dict(layers), dict(counts)
+            layers[open_span.layer] = layers.get(open_span.layer, 0.0) + max(0.0, now - open_span.started - open_span.child_time)
+            counts[open_span.layer] = counts.get(open_span.layer, 0) + 1
+        entries = [f"total;dur={duration * 1000:.1f}"]
+        for layer, seconds in sorted(layers.items(), key=lambda item: -item[1]):
+            entries.append(f'{layer};dur={seconds * 1000:.1f};desc="{counts[layer]} spans"')
+        return ", ".join(entries)
+
+    def summary(self, top: int = 5) -> str:
+        layers = ", ".join(
+            f"{layer} {seconds * 1000:.0f} ms ({self.counts[layer]})"
+            for layer, seconds in sorted(self.layers.items(), key=lambda item: -item[1])
+        )
+        slowest = ", ".join(
+            f"{name} {duration * 1000:.0f} ms" for duration, _, name in sorted(self.spans, reverse=True)[:top]
+        )
+        return f"{layers} - slowest: {slowest or 'none'}"
+
+
+class _Span:
+    __slots__ = ("name", "layer", "started", "child_time")
+
+    def __init__(self, name: str, layer: str):
+        self.name = name
+        self.layer = layer
+        self.started = time.perf_counter()
+        self.child_time = 0.0
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("fia_request_trace", default=None)
+_current_span: ContextVar[Optional[_Span]] = ContextVar("fia_request_span", default=None)
+
+
+def _close(trace: RequestTrace, span: _Span, parent: Optional[_Span]) -> None:
+    duration = time.perf_counter() - span.started
+    # Concurrent children (asyncio.gather) can add up to more than their parent
+    trace.record(span.layer, span.name, duration, max(0.0, duration - span.child_time))
+    if parent is not None:
+        parent.child_time += duration
+
+
+@contextmanager
+def span(name: str, layer: str) -> Iterator[None]:
+    """Time a block as a span of the current request (no-op outside a traced request)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    parent = _current_span.get()
+    current = _Span(name, layer)
+    token = _current_span.set(current)
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+        _close(trace, current, parent)
+
+
+def _open(name: str, layer: str):
+    """Inlined span() for the decorators: no generator per call"""
+    parent = _current_span.get()
+    current = _Span(name, layer)
+    return parent, current, _current_span.set(current)
+
+
+def traced(layer: str, name: Optional[str] = None) -> Callable:
+    """Decorator recording each call of a sync or async function as a span"""
+
+    def decorate(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                trace = _current_trace.get()
+                if trace is None:
+                    return await func(*args, **kwargs)
+                parent, current, token = _open(span_name, layer)
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _current_span.reset(token)
+                    _close(trace, current, parent)
+            wrapper = async_wrapper
+        else:
+            @functools.wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                trace = _current_trace.get()
+                if trace is None:
+                    return func(*args, **kwargs)
+                parent, current, token = _open(span_name, layer)
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    _current_span.reset(token)
+                    _close(trace, current, parent)
+            wrapper = sync_wrapper
+
+        wrapper.__fia_traced__ = True
+        return wrapper
+
+    return decorate
+
+
+def instrument_class(cls: type, layer: str) -> int:
+    """Wrap the public methods (and JSON cleanup helpers) of a class in spans"""
+    wrapped = 0
+    for attribute, value in list(vars(cls).items()):
+        if attribute.startswith("__"):
+            continue
+        method_layer = layer
+        if attribute.startswith("_"):
+            if not any(hint in attribute.lower() for hint in JSON_HELPER_HINTS):
+                continue
+            method_layer = "json"
+
+        kind = type(value) if isinstance(value, (staticmethod, classmethod)) else None
+        func = value.__func__ if kind else value
+        if (not inspect.isfunction(func) or getattr(func, "__fia_traced__", False)
+                or inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func)):
+            continue
+
+        wrapper = traced(method_layer, f"{cls.__name__}.{attribute}")(func)
+        setattr(cls, attribute, kind(wrapper) if kind else wrapper)
+        wrapped += 1
+    return wrapped
+
+
+def instrument_layers() -> int:
+    """
+    Instrument the classes of the hexagonal layers already imported
+
+    Controllers import the services and adapters they use at startup, so
+    calling this once the routers are included covers the request path.
+    """
+    wrapped = 0
+    for module_name, module in list(sys.modules.items()):
+        layer = next((layer for prefix, layer in LAYER_PACKAGES if module_name.startswith(prefix)), None)
+        if layer is None or module is None:
+            continue
+        for value in list(vars(module).values()):
+            if (not inspect.isclass(value) or value.__module__ != module_name or inspect.isabstract(value)
+                    or issubclass(value, (BaseException, Enum, BaseModel))):
+                continue
+            wrapped += instrument_class(value, layer)
+    return wrapped
+
+
+def instrument_engine(engine) -> None:
+    """Record every SQL statement as a db span of the current request"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_trace.get() is not None:
+            context._fia_query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_fia_query_started", None)
+        trace = _current_trace.get()
+        if started is None or trace is None:
+            return
+        duration = time.perf_counter() - started
+        trace.record("db", statement.split(None, 1)[0].upper() if statement else "SQL", duration, duration)
+        parent = _current_span.get()
+        if parent is not None:
+            parent.child_time += duration
+
+
+class RequestTracer:
+    """
+    Starts a trace per request and exports its breakdown
+
+    The breakdown goes out as a warning log for requests slower than
+    slow_request_ms and, with timing_header (debug only: it reveals the
+    internals of every request to any client), as a Server-Timing header
+    as it stands when the response starts. When disabled, nothing is
+    instrumented and requests pay one attribute check.
+    """
+
+    def __init__(self, enabled: bool = True, slow_request_ms: int = 2000, timing_header: bool = False):
+        self.enabled = enabled
+        self.slow_request_ms = slow_request_ms
+        self.timing_header = timing_header
+
+    def setup(self, engine) -> None:
+        """Instrument the layers and the SQLAlchemy engine (once the routers are included)"""
+        if not self.enabled:
+            return
+        instrument_engine(engine)
+        wrapped = instrument_layers()
+        logger.info(f"🔭 TRACING [SETUP] {wrapped} methods instrumented, slow requests above {self.slow_request_ms} ms are logged")
+
+    def start(self) -> Tuple[Optional[RequestTrace], Any]:
+        """Open the trace and the root (controller) span of the current request"""
+        if not self.enabled:
+            return None, None
+        trace = RequestTrace()
+        root = _Span("request", "controller")
+        return trace, (_current_trace.set(trace), _current_span.set(root), root)
+
+    def server_timing(self, trace: Optional[RequestTrace], tokens: Any) -> Optional[str]:
+        """Server-Timing header value of a request still in progress (None unless timing_header)"""
+        if trace is None or not self.timing_header:
+            return None
+        return trace.server_timing(open_span=tokens[2])
+
+    def finish(self, trace: Optional[RequestTrace], tokens: Any, method: str, route: str, status_code: int) -> Optional[str]:
+        """Close the trace; returns the Server-Timing header value"""
+        if trace is None:
+            return None
+        trace_token, span_token, root = tokens
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        root.name = f"{method} {route}"
+        _close(trace, root, None)
+        trace.duration = time.perf_counter() - trace.started
+
+        if trace.duration * 1000 >= self.slow_request_ms:
+            logger.warning(
+                f"🐢 SLOW_REQUEST [{method} {route}] {trace.duration * 1000:.0f} ms ({status_code}) - {trace.summary()}"
+            )
+        return trace.server_timing()
+
+
+# Global tracer instance
+request_tracer = RequestTracer(
+    enabled=settings.tracing_enabled,
+    slow_request_ms=settings.slow_request_ms,
+    timing_header=settings.debug
+)
@@ -0,0 +1,189 @@
+"""
+FIA v3.0 - Training Retrieval
+Per-training BM25 indexes, persisted next to the training file, queried under a latency budget
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.adapters.repositories.document_chunk_repository import DocumentChunkRepository
+from app.domain.entities.document_chunk import DocumentChunk
+from app.domain.services.document_chunk_service import DocumentChunkService
+from app.domain.services.retrieval_index import BM25Index, INDEX_VERSION, select_passages
+from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.models.learner_session_model import LearnerSessionModel
+from app.infrastructure.models.training_model import TrainingModel
+from app.infrastructure.models.training_session_model import TrainingSessionModel
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_CONTENT_TYPE = "application/octet-stream"
+
+
+def index_key(storage_key: str) -> str:
+    """Asset key of a training file's index, e.g. "indexes/v1/<trainer>/<file>.bm25.npz" """
+    return f"indexes/v{INDEX_VERSION}/{storage_key}.bm25.npz"
+
+
+class TrainingRetrieval:
+    """
+    Top-k passages of a training document for a slide title or a question
+
+    Indexes are loaded from storage (or built from the document chunks and
+    stored) once, then kept in a small in-process LRU. Loading or building
+    runs as a shared background task: a caller waits at most the latency
+    budget and gets no passages on timeout, while the task finishes for the
+    next request.
+    """
+
+    def __init__(
+        self,
+        latency_budget_ms: int = 250,
+        top_k: int = 4,
+        passage_token_budget: int = 1200,
+        max_indexes: int = 32
+    ):
+        self.latency_budget_ms = latency_budget_ms
+        self.top_k = top_k
+        self.passage_token_budget = passage_token_budget
+        self.max_indexes = max_indexes
+        self._indexes: "OrderedDict[str, BM25Index]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._storage_keys: "OrderedDict[UUID, str]" = OrderedDict()
+        self._stats = {"queries": 0, "hits": 0, "loaded": 0, "built": 0, "timeouts": 0, "errors": 0}
+
+    async def passages_for_learner_session(self, learner_session_id: UUID, query: str) -> Optional[str]:
+        """Rendered passages for a learner's training, None if unavailable in time"""
+        if self.latency_budget_ms <= 0 or not query:
+            return None
+        try:
+            storage_key = await self._storage_key_for(learner_session_id)
+            if not storage_key:
+                return None
+            chunks = await self.search(storage_key, query)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"⚠️ RETRIEVAL [ERROR] {learner_session_id}: {str(e)}")
+            return None
+        return DocumentChunkService.render(chunks) if chunks else None
+
+    async def search(self, storage_key: str, query: str) -> List[DocumentChunk]:
+        """Passages within the token budget, empty if the index is not ready within the latency budget"""
+        started = time.perf_counter()
+        self._stats["queries"] += 1
+
+        index = self._indexes.get(storage_key)
+        if index is not None:
+            self._indexes.move_to_end(storage_key)
+            self._stats["hits"] += 1
+        else:
+            try:
+                index = await asyncio.wait_for(
+                    asyncio.shield(self._ensure_loading(storage_key)),
+                    timeout=self.latency_budget_ms / 1000
+                )
+            except asyncio.TimeoutError:
+                self._stats["timeouts"] += 1
+                logger.info(f"⏱️ RETRIEVAL [TIMEOUT] Index for {storage_key} not ready, prompt sent without passages")
+                return []
+
+        passages = select_passages(index.search(query, self.top_k), self.passage_token_budget)
+        logger.debug(
+            f"🔎 RETRIEVAL [QUERY] {storage_key} - {len(passages)} passages "
+            f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        return passages
+
+    def prefetch(self, storage_key: str) -> None:
+        """Load or build an index in the background (e.g. right after plan generation)"""
+        if storage_key not in self._indexes:
+            self._ensure_loading(storage_key)
+
+    def invalidate(self, storage_key: str) -> None:
+        self._indexes.pop(storage_key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "indexes_in_memory": len(self._indexes), "loading": len(self._loading)}
+
+    def _ensure_loading(self, storage_key: str) -> asyncio.Task:
+        task = self._loading.get(storage_key)
+        if task is None:
+            task = asyncio.create_task(self._load_or_build(storage_key))
+            self._loading[storage_key] = task
+            task.add_done_callback(lambda t: self._loading.pop(storage_key, None))
+            # Retrieved later or never: keep failures out of "exception never retrieved" logs
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def _load_or_build(self, storage_key: str) -> BM25Index:
+        # Imported here: outbound adapters import this module
+        from app.infrastructure.dependencies import get_file_storage_service
+        file_storage = get_file_storage_service()
+        key = index_key(storage_key)
+
+        index = None
+        try:
+            path = await file_storage.get_asset_path(key)
+            if path.exists():
+                index = BM25Index.from_bytes(await asyncio.to_thread(path.read_bytes))
+                self._stats["loaded"] += 1
+        except Exception as e:
+            logger.debug(f"🔎 RETRIEVAL [LOAD] No stored index for {storage_key}: {str(e)}")
+
+        if index is None:
+            started = time.perf_counter()
+            local_path = await file_storage.get_training_file_path(storage_key)
+            async with AsyncSessionLocal() as db:
+                chunk_service = DocumentChunkService(DocumentChunkRepository(db))
+                chunks = await chunk_service.get_chunks(storage_key, str(local_path))
+                await db.commit()
+            index = await asyncio.to_thread(BM25Index.build, chunks)
+            if chunks:
+                await file_storage.store_asset(key, index.to_bytes(), INDEX_CONTENT_TYPE)
+            self._stats["built"] += 1
+            logger.info(
+                f"🔎 RETRIEVAL [BUILD] {storage_key} - {len(chunks)} chunks, "
+                f"{len(index.vocabulary)} terms in {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+
+        self._indexes[storage_key] = index
+        self._indexes.move_to_end(storage_key)
+        while len(self._indexes) > self.max_indexes:
+            self._indexes.popitem(last=False)
+        return index
+
+    async def _storage_key_for(self, learner_session_id: UUID) -> Optional[str]:
+        """Training file of a learner session (a training's file never changes, a missing one may be added)"""
+        if learner_session_id in self._storage_keys:
+            return self._storage_keys[learner_session_id]
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(TrainingModel.file_path)
+                .join(TrainingSessionModel, TrainingSessionModel.training_id == TrainingModel.id)
+                .join(LearnerSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id)
+                .where(LearnerSessionModel.id == learner_session_id)
+            )
+            storage_key = result.scalar_one_or_none()
+
+        if storage_key is None:
+            return None
+        self._storage_keys[learner_session_id] = storage_key
+        while len(self._storage_keys) > 1024:
+            self._storage_keys.popitem(last=False)
+        return storage_key
+
+
+# Global retrieval instance
+training_retrieval = TrainingRetrieval(
+    latency_budget_ms=settings.retrieval_latency_budget_ms,
+    top_k=settings.retrieval_top_k,
+    passage_token_budget=settings.retrieval_passage_token_budget
+)
@@ -0,0 +1,192 @@
+"""
+FIA v3.0 - Voice Activity Detection
+Energy-gate VAD over 16-bit PCM audio, used to trim Live API uploads
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VADResult:
+    """Result of running the VAD over one audio buffer"""
+    audio: bytes
+    has_speech: bool
+    input_bytes: int
+    output_bytes: int
+    segments: List[Tuple[float, float]] = field(default_factory=list)  # (start_s, end_s)
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.input_bytes - self.output_bytes
+
+
+class EnergyVAD:
+    """
+    Frame-energy voice activity detector
+
+    The buffer is split into fixed frames and the RMS level of every frame is
+    computed in one vectorized pass. A frame is speech when it is louder than
+    both an absolute floor and the estimated noise floor plus a margin.
+    The noise floor is tracked per session across buffers (moving average of
+    the non-voiced frames) and capped at `max_noise_floor_dbfs`, so a buffer
+    that is speech from its first frame to its last is not mistaken for
+    background noise.
+    Speech frames are padded on both sides, segments separated by less than
+    `max_gap_ms` are coalesced, and everything else (leading, trailing and
+    long inner silences) is dropped.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 20,
+        threshold_dbfs: float = -45.0,
+        noise_margin_db: float = 10.0,
+        padding_ms: int = 200,
+        max_gap_ms: int = 400,
+        min_speech_ms: int = 100,
+        max_noise_floor_dbfs: float = -40.0,
+        noise_floor_alpha: float = 0.3,
+        max_tracked_sessions: int = 1024
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = sample_rate * frame_ms // 1000
+        self.frame_ms = frame_ms
+        self.threshold_dbfs = threshold_dbfs
+        self.noise_margin_db = noise_margin_db
+        self.padding_frames = max(0, padding_ms // frame_ms)
+        self.max_gap_frames = max(0, max_gap_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.max_noise_floor_dbfs = max_noise_floor_dbfs
+        self.noise_floor_alpha = noise_floor_alpha
+        self.max_tracked_sessions = max_tracked_sessions
+        # Noise floor (dBFS) per session, least recently used first
+        self._noise_floors: "OrderedDict[str, float]" = OrderedDict()
+
+        # CPU cost accounting
+        self._audio_seconds = 0.0
+        self._cpu_seconds = 0.0
+        self._input_bytes = 0
+        self._output_bytes = 0
+
+    def process(self, pcm: bytes, session_id: Optional[str] = None) -> VADResult:
+        """Trim silence from little-endian 16-bit mono PCM (noise floor tracked per session_id)"""
+        started = time.process_time()
+        try:
+            return self._process(pcm, session_id)
+        finally:
+            self._cpu_seconds += time.process_time() - started
+            self._audio_seconds += len(pcm) / 2 / self.sample_rate
+
+    def forget(self, session_id: str) -> None:
+        """Drop the noise floor of an ended session"""
+        self._noise_floors.pop(session_id, None)
+
+    def _process(self, pcm: bytes, session_id: Optional[str] = None) -> VADResult:
+        usable = len(pcm) - (len(pcm) % 2)
+        samples = np.frombuffer(pcm[:usable], dtype="<i2")
+        n_frames = len(samples) // self.frame_len
+
+        if n_frames == 0:
+            return self._record(VADResult(audio=b"", has_speech=False, input_bytes=len(pcm), output_bytes=0))
+
+        frames = samples[:n_frames * self.frame_len].reshape(n_frames, self.frame_len).astype(np.float32)
+        rms = np.sqrt(np.mean(frames * frames, axis=1)) / 32768.0
+        dbfs = 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+        noise_floor = self._noise_floors.get(session_id) if session_id else None
+        if noise_floor is None:
+            # First buffer: the quietest 10% of frames approximate the background noise level
+            noise_floor = min(float(np.percentile(dbfs, 10)), self.max_noise_floor_dbfs)
+        threshold = max(self.threshold_dbfs, noise_floor + self.noise_margin_db)
+        voiced = dbfs > threshold
+        if session_id:
+            self._update_noise_floor(session_id, dbfs[~voiced])
+
+        if int(voiced.sum()) < self.min_speech_frames:
+            return self._record(VADResult(audio=b"", has_speech=False, input_bytes=len(pcm), output_bytes=0))
+
+        # Dilate voiced frames by the padding, then close gaps up to max_gap
+        if self.padding_frames:
+            kernel = np.ones(2 * self.padding_frames + 1, dtype=np.int32)
+            voiced = np.convolve(voiced.astype(np.int32), kernel, mode="same") > 0
+
+        starts, ends = self._runs(voiced)
+        if self.max_gap_frames and len(starts) > 1:
+            keep = (starts[1:] - ends[:-1]) > self.max_gap_frames
+            starts = np.concatenate(([starts[0]], starts[1:][keep]))
+            ends = np.concatenate((ends[:-1][keep], [ends[-1]]))
+
+        byte_frame = self.frame_len * 2
+        chunks = [pcm[s * byte_frame:e * byte_frame] for s, e in zip(starts.tolist(), ends.tolist())]
+        # Keep the sub-frame tail if the last segment reaches the end of the buffer
+        if ends[-1] == n_frames:
+            chunks[-1] += pcm[n_frames * byte_frame:usable]
+        audio = b"".join(chunks)
+
+        frame_s = self.frame_ms / 1000
+        segments = [(s * frame_s, e * frame_s) for s, e in zip(starts.tolist(), ends.tolist())]
+        return self._record(VADResult(
+            audio=audio,
+            has_speech=True,
+            input_bytes=len(pcm),
+            output_bytes=len(audio),
+            segments=segments
+        ))
+
+    def _update_noise_floor(self, session_id: str, unvoiced_dbfs: np.ndarray) -> None:
+        """Move the session's noise floor towards the level of its non-voiced frames"""
+        if not len(unvoiced_dbfs):
+            return
+        observed = float(np.median(unvoiced_dbfs))
+        previous = self._noise_floors.pop(session_id, None)
+        floor = observed if previous is None else previous + self.noise_floor_alpha * (observed - previous)
+        self._noise_floors[session_id] = min(floor, self.max_noise_floor_dbfs)
+        while len(self._noise_floors) > self.max_tracked_sessions:
+            self._noise_floors.popitem(last=False)
+
+    @staticmethod
+    def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Start (inclusive) and end (exclusive) indices of True runs"""
+        padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+        edges = np.diff(padded)
+        return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    def _record(self, result: VADResult) -> VADResult:
+        self._input_bytes += result.input_bytes
+        self._output_bytes += result.output_bytes
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Bytes trimmed and CPU cost per audio minute since startup"""
+        audio_minutes = self._audio_seconds / 60
+        return {
+            "audio_seconds": round(self._audio_seconds, 2),
+            "cpu_seconds": round(self._cpu_seconds, 4),
+            "cpu_ms_per_audio_minute": round(self._cpu_seconds * 1000 / audio_minutes, 3) if audio_minutes else 0.0,
+            "input_bytes": self._input_bytes,
+            "output_bytes": self._output_bytes,
+            "bytes_saved_ratio": round(1 - self._output_bytes / self._input_bytes, 3) if self._input_bytes else 0.0
+        }
+
+
+def is_pcm_mime_type(mime_type: str) -> bool:
+    """Only raw PCM can be gated; encoded containers (webm, ogg...) pass through"""
+    return mime_type.split(";")[0].strip().lower() in ("audio/pcm", "audio/l16")
+
+
+# Global VAD instance for Live audio (16 kHz PCM)
+live_audio_vad = EnergyVAD(
+    sample_rate=16000,
+    threshold_dbfs=settings.live_vad_threshold_dbfs
+)
@@ -26,7 +26,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import traceback
 from app.infrastructure.settings import settings
-from app.infrastructure.database import init_database
+from app.infrastructure.metrics import metrics
+from app.infrastructure.tracing import request_tracer
+from app.infrastructure.query_counter import query_counter
+from app.infrastructure.database import engine, init_database
 from app.infrastructure.auth import fastapi_users, auth_backend
 from app.infrastructure.schemas.fastapi_user_schemas import UserRead, UserCreate, UserUpdate
 from app.adapters.inbound.training_controller import router as training_router
@@ -45,6 +48,10 @@ from app.adapters.inbound.admin_controller import router as admin_router
 from app.adapters.inbound.public_quick_start_controller import router as public_quick_start_router
 from app.adapters.inbound.token_usage_controller import router as token_usage_router
 from app.adapters.inbound.storage_controller import router as storage_router
+from app.adapters.inbound.metrics_controller import router as metrics_router
+from app.adapters.inbound.profiler_controller import router as profiler_router
+from app.infrastructure.sampling_profiler import sampling_profiler
+from app.infrastructure.request_logging import RequestLoggingMiddleware
 
 # Import working controllers only (skip broken ones for now)
 logger = logging.getLogger(__name__)
@@ -76,8 +83,50 @@ async def lifespan(app: FastAPI):
         logger.warning(f"⚠️ Database initialization failed: {e}")
         logger.info("🚀 Application starting without database (will use fallback)")
     
+    # Write Gemini call logs from a background thread (sampled bodies to a rotated file)
+    await gemini_call_logger.start()
+    
+    # Publish this worker's metrics for the host-wide /metrics (no-op unless METRICS_MULTIPROC_DIR is set)
+    await metrics.start()
+    
+    # Pre-connect Live API WebSockets (no-op unless LIVE_API_POOL_SIZE > 0)
+    from app.infrastructure.live_api_pool import live_api_pool
+    await live_api_pool.start()
+    
+    # Heartbeat Live sessions owned by this worker in the shared registry
+    from app.infrastructure.live_session_registry import live_session_registry
+    await live_session_registry.start()
+    
+    # Batch storage access times and reconcile the storage manifest in the background
+    from app.infrastructure.storage_manifest import storage_manifest
+    from app.infrastructure.dependencies import get_file_storage_service
+    await storage_manifest.start(get_file_storage_service)
+    
+    # Batch chat message inserts across requests
+    from app.infrastructure.chat_message_writer import chat_message_writer
+    await chat_message_writer.start()
+    
+    # Batch the token usage rows of Gemini calls into api_logs
+    from app.infrastructure.api_log_writer import api_log_writer
+    await api_log_writer.start()
+    
+    # Refresh dashboard rollups from learner and slide activity, reconcile them periodically
+    from app.infrastructure.dashboard_rollups import dashboard_rollups
+    await dashboard_rollups.start()
+    
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    from app.infrastructure.conversation_summarizer import conversation_summarizer
+    await sampling_profiler.stop()
+    await chat_message_writer.stop()
+    await conversation_summarizer.wait_idle()
+    await api_log_writer.stop()
+    await dashboard_rollups.stop()
+    await storage_manifest.stop()
+    await live_session_registry.stop()
+    await live_api_pool.stop()
+    await metrics.stop()
+    await gemini_call_logger.stop()
 
 
 # Create FastAPI application
@@ -110,20 +159,8 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
-# Add middleware to log requests
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all HTTP requests"""
-    logger.info(f"📥 REQUEST [START]: {request.method} {request.url}")
-    
-    try:
-        response = await call_next(request)
-        logger.info(f"📤 RESPONSE [SUCCESS]: {request.method} {request.url} - {response.status_code}")
-        return response
-    except Exception as exc:
-        logger.error(f"🚨 REQUEST [ERROR]: {request.method} {request.url} - {exc}")
-        logger.error(f"🚨 REQUEST [TRACEBACK]: {traceback.format_exc()}")
-        raise
+# Log and time requests (pure ASGI: streamed bodies and WebSockets pass through untouched)
+app.add_middleware(RequestLoggingMiddleware, sample_rate=settings.request_log_sample_rate)
 
 
 # Mount static files (frontend)
@@ -195,10 +232,20 @@ app.include_router(token_usage_router)
 # Include storage router
 app.include_router(storage_router)
 
+# Include Prometheus metrics router
+app.include_router(metrics_router)
+
+# Include admin profiler router
+app.include_router(profiler_router)
+
 # Include unified plan generation router if available
 if PLAN_GENERATION_AVAILABLE:
     app.include_router(plan_generation_router)
 
+# Span the services, adapters and SQL statements of each request (no-op unless TRACING_ENABLED)
+request_tracer.setup(engine)
+query_counter.setup(engine)
+
 
 @app.get("/")
 async def root():
@@ -3,14 +3,16 @@ FIA v3.0 - File Validation Utilities
 File validation for training material uploads
 """
 
+import hashlib
 import mimetypes
-from typing import List, Tuple
+from typing import BinaryIO, List, Optional, Tuple
 from fastapi import UploadFile, HTTPException
 from pathlib import Path
 
 
 # Configuration
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB in bytes
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB read size when streaming uploads
 ALLOWED_EXTENSIONS = {'.pdf', '.ppt', '.pptx'}
 ALLOWED_MIME_TYPES = {
     'application/pdf',
@@ -19,6 +21,14 @@ ALLOWED_MIME_TYPES = {
 }
 
 
+# File signatures checked against the first bytes of the upload
+MAGIC_SIGNATURES = {
+    '.pdf': (b'%PDF-',),
+    '.pptx': (b'PK\x03\x04',),  # OOXML is a ZIP container
+    '.ppt': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),  # OLE2 compound document
+}
+
+
 class FileValidationError(Exception):
     """Custom exception for file validation errors"""
     pass
@@ -49,19 +59,14 @@ async def validate_training_file(file: UploadFile) -> Tuple[str, str]:
     if file_extension not in ALLOWED_EXTENSIONS:
         raise FileValidationError("error.file.invalidType")
     
-    # Read file content to check size
-    content = await file.read()
-    file_size = len(content)
+    # Check the size announced by the server without reading the content;
+    # the actual size is enforced while streaming (see ValidatedUploadStream)
+    file_size = file.size
     
-    # Reset file position for later reading
-    await file.seek(0)
-    
-    # Validate file size
     if file_size == 0:
         raise FileValidationError("error.file.empty")
     
-    if file_size > MAX_FILE_SIZE:
-        max_size_mb = MAX_FILE_SIZE / (1024 * 1024)
+    if file_size is not None and file_size > MAX_FILE_SIZE:
         raise FileValidationError("error.file.tooLarge")
     
     # Guess MIME type from filename
@@ -77,6 +82,81 @@ async def validate_training_file(file: UploadFile) -> Tuple[str, str]:
     return file_extension, mime_type
 
 
+def validate_magic_bytes(file_extension: str, head: bytes) -> None:
+    """
+    Check that the first bytes of a file match its extension
+    
+    Raises:
+        FileValidationError: If the content does not look like the declared type
+    """
+    signatures = MAGIC_SIGNATURES.get(file_extension.lower())
+    if signatures and not any(head.startswith(signature) for signature in signatures):
+        raise FileValidationError("error.file.invalidContent")
+
+
+class ValidatedUploadStream:
+    """
+    Read-only file wrapper that validates an upload while it is consumed
+    
+    Storage adapters read it chunk by chunk like any binary file. The magic
+    bytes are checked on the first chunk, the SHA-256 is computed
+    incrementally and the size limit is enforced as bytes go through, so the
+    upload is never held in memory as a whole.
+    """
+    
+    def __init__(self, source: BinaryIO, file_extension: str, max_size: int = MAX_FILE_SIZE):
+        self.source = source
+        self.file_extension = file_extension
+        self.max_size = max_size
+        self.size = 0
+        self._hasher = hashlib.sha256()
+        self._head = b""
+        self._head_checked = False
+        self._head_size = max((len(sig) for sig in MAGIC_SIGNATURES.get(file_extension.lower(), ())), default=0)
+    
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            # Reading "everything" still goes through the size limit chunk by chunk
+            return b"".join(self.iter_chunks())
+        chunk = self.source.read(size)
+        
+        if not self._head_checked:
+            # Short reads are accumulated until the longest signature fits
+            self._head += chunk[:self._head_size]
+            if len(self._head) >= self._head_size or (not chunk and self._head):
+                validate_magic_bytes(self.file_extension, self._head)
+                self._head_checked = True
+        
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise FileValidationError("error.file.tooLarge")
+        
+        if not chunk and self.size == 0:
+            raise FileValidationError("error.file.empty")
+        
+        self._hasher.update(chunk)
+        return chunk
+    
+    def iter_chunks(self, chunk_size: int = UPLOAD_CHUNK_SIZE):
+        """Yield chunks until the source is exhausted"""
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    
+    def drain(self) -> str:
+        """Validate and hash the whole source without keeping it; returns the SHA-256"""
+        for _ in self.iter_chunks():
+            pass
+        return self.sha256
+    
+    @property
+    def sha256(self) -> str:
+        """Hex digest of the bytes read so far"""
+        return self._hasher.hexdigest()
+
+
 def get_file_type_from_extension(extension: str) -> str:
     """
     Get standardized file type from extension
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark: admin overview endpoints, full listings vs paginated aggregate queries
+
+Seeds a platform with --sessions training sessions (learners, training plans
+and slides included), then measures each /api/admin/*-overview repository call:
+  - previous: every row at once; for sessions, the slide total was one extra
+    query per session row (N+1)
+  - page 1: the default first page (50 rows), total count included
+  - page N: a page in the middle of the listing
+  - sorted: first page sorted on an aggregate column
+
+Needs a scratch PostgreSQL database in DATABASE_URL with the migration indexes
+applied: tables are created if missing, benchmark rows are deleted at the end.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python tests/benchmarks/bench_admin_overview.py [--sessions 10000]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import delete, func, insert, select  # noqa: E402
+
+from app.adapters.repositories.admin_repository import AdminRepository  # noqa: E402
+from app.domain.schemas.admin import AdminOverviewParams  # noqa: E402
+from app.infrastructure.dashboard_rollups import dashboard_rollups  # noqa: E402
+from app.infrastructure.database import AsyncSessionLocal, engine, init_database  # noqa: E402
+from app.infrastructure.models import (  # noqa: E402
+    LearnerSessionModel, TrainerModel, TrainingModel, TrainingSessionModel
+)
+from app.infrastructure.models.learner_training_plan_model import LearnerTrainingPlanModel  # noqa: E402
+from app.infrastructure.models.training_module_model import TrainingModuleModel  # noqa: E402
+from app.infrastructure.models.training_slide_model import TrainingSlideModel  # noqa: E402
+from app.infrastructure.models.training_submodule_model import TrainingSubmoduleModel  # noqa: E402
+
+LEARNERS_PER_SESSION = 3
+SLIDES_PER_PLAN = 8
+EMAIL_PREFIX = "bench-admin-"
+
+
+async def insert_rows(db, model, rows):
+    for start in range(0, len(rows), 5000):
+        await db.execute(insert(model), rows[start:start + 5000])
+
+
+async def create_fixtures(sessions: int) -> None:
+    trainers = [uuid.uuid4() for _ in range(max(1, sessions // 100))]
+    trainings = [(uuid.uuid4(), trainers[i % len(trainers)]) for i in range(max(1, sessions // 10))]
+    session_rows, learner_rows, plan_rows, module_rows, submodule_rows, slide_rows = [], [], [], [], [], []
+    for i in range(sessions):
+        session_id = uuid.uuid4()
+        session_rows.append({
+            "id": session_id, "training_id": trainings[i % len(trainings)][0], "name": f"Session {i}",
+            "session_token": f"{EMAIL_PREFIX}{session_id}", "is_active": i % 3 != 0
+        })
+        for n in range(LEARNERS_PER_SESSION):
+            learner_id, plan_id, module_id, submodule_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+            learner_rows.append({
+                "id": learner_id, "training_session_id": session_id, "email": f"{EMAIL_PREFIX}{i % 5000}-{n}@example.com",
+                "experience_level": ("beginner", "intermediate", "advanced")[n], "job_position": "Analyste",
+                "current_slide_number": 1 + (i + n) % SLIDES_PER_PLAN, "total_time_spent": 60 * (i % 50)
+            })
+            plan_rows.append({"id": plan_id, "learner_session_id": learner_id, "plan_data": {}})
+            module_rows.append({"id": module_id, "plan_id": plan_id, "stage_number": 1, "order_in_stage": 1, "title": "Module"})
+            submodule_rows.append({"id": submodule_id, "module_id": module_id, "order_in_module": 1, "title": "Sous-module"})
+            slide_rows.extend(
+                {"id": uuid.uuid4(), "submodule_id": submodule_id, "order_in_submodule": s, "title": f"Slide {s}"}
+                for s in range(SLIDES_PER_PLAN)
+            )
+
+    async with AsyncSessionLocal() as db:
+        await insert_rows(db, TrainerModel, [
+            {"id": trainer_id, "email": f"{EMAIL_PREFIX}{trainer_id}@example.com", "hashed_password": "x",
+             "first_name": "Bench", "last_name": f"Trainer {i}"}
+            for i, trainer_id in enumerate(trainers)
+        ])
+        await insert_rows(db, TrainingModel, [
+            {"id": training_id, "trainer_id": trainer_id, "name": f"Formation {i}", "is_ai_generated": i % 2 == 0}
+            for i, (training_id, trainer_id) in enumerate(trainings)
+        ])
+        for model, rows in (
+            (TrainingSessionModel, session_rows), (LearnerSessionModel, learner_rows),
+            (LearnerTrainingPlanModel, plan_rows), (TrainingModuleModel, module_rows),
+            (TrainingSubmoduleModel, submodule_rows), (TrainingSlideModel, slide_rows)
+        ):
+            await insert_rows(db, model, rows)
+        await db.commit()
+    print(f"Seeded {len(trainers)} trainers, {len(trainings)} trainings, {sessions} sessions, "
+          f"{len(learner_rows)} learner sessions, {len(slide_rows)} slides")
+
+
+async def delete_fixtures() -> None:
+    async with AsyncSessionLocal() as db:
+        trainers = select(TrainerModel.id).where(TrainerModel.email.startswith(EMAIL_PREFIX))
+        trainings = select(TrainingModel.id).where(TrainingModel.trainer_id.in_(trainers))
+        sessions = select(TrainingSessionModel.id).where(TrainingSessionModel.training_id.in_(trainings))
+        learners = select(LearnerSessionModel.id).where(LearnerSessionModel.training_session_id.in_(sessions))
+        # Modules, submodules and slides go with their plan (ON DELETE CASCADE)
+        await db.execute(delete(LearnerTrainingPlanModel).where(LearnerTrainingPlanModel.learner_session_id.in_(learners)))
+        await db.execute(delete(LearnerSessionModel).where(LearnerSessionModel.training_session_id.in_(sessions)))
+        await db.execute(delete(TrainingSessionModel).where(TrainingSessionModel.training_id.in_(trainings)))
+        await db.execute(delete(TrainingModel).where(TrainingModel.trainer_id.in_(trainers)))
+        await db.execute(delete(TrainerModel).where(TrainerModel.email.startswith(EMAIL_PREFIX)))
+        await db.commit()
+
+
+async def previous_sessions_overview(repository: AdminRepository) -> int:
+    """Session rows, then one slide count query per row (what the listing did)"""
+    rows, _ = await repository.get_sessions_overview_statistics(everything())
+    for row in rows:
+        await repository.session.execute(
+            select(func.count(TrainingSlideModel.id))
+            .join(TrainingSubmoduleModel, TrainingSlideModel.submodule_id == TrainingSubmoduleModel.id)
+            .join(TrainingModuleModel, TrainingSubmoduleModel.module_id == TrainingModuleModel.id)
+            .join(LearnerTrainingPlanModel, TrainingModuleModel.plan_id == LearnerTrainingPlanModel.id)
+            .join(LearnerSessionModel, LearnerTrainingPlanModel.learner_session_id == LearnerSessionModel.id)
+            .join(TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id)
+            .where(TrainingSessionModel.id == row["session_id"])
+        )
+    return len(rows)
+
+
+def everything() -> AdminOverviewParams:
+    """Unbounded listing (bypasses the per_page limit) to reproduce the previous responses"""
+    return AdminOverviewParams.model_construct(page=1, per_page=10 ** 9, sort=None, order=None, search=None)
+
+
+async def timed(label, call, runs):
+    durations, result = [], None
+    for _ in range(runs):
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            result = await call(AdminRepository(db))
+            durations.append((time.perf_counter() - started) * 1000)
+    summary = f"{len(result[0])} rows of {result[1]}" if isinstance(result, tuple) else result
+    print(f"  {label:<12} {min(durations):9.1f} ms (best of {runs})  -> {summary}")
+    return result
+
+
+async def main_async(sessions: int, runs: int) -> None:
+    logging.disable(logging.INFO)
+    await init_database()
+    await delete_fixtures()
+    await create_fixtures(sessions)
+    # Overview aggregates are read from the dashboard rollups
+    await dashboard_rollups.reconcile()
+    listings = {
+        "trainers": "total_sessions",
+        "trainees": "total_time",
+        "trainings": "total_learners",
+        "sessions": "progress_percentage"
+    }
+    try:
+        for listing, aggregate in listings.items():
+            method = f"get_{listing}_overview_statistics"
+            print(f"\n/api/admin/{listing}-overview")
+            if listing == "sessions":
+                await timed("previous", previous_sessions_overview, runs)
+            else:
+                await timed("previous", lambda repo: getattr(repo, method)(everything()), runs)
+            _, total = await timed("page 1", lambda repo: getattr(repo, method)(AdminOverviewParams()), runs)
+            middle = max(1, total // 100)
+            await timed(f"page {middle}", lambda repo: getattr(repo, method)(AdminOverviewParams(page=middle)), runs)
+            await timed("sorted", lambda repo: getattr(repo, method)(
+                AdminOverviewParams(sort=aggregate, order="desc")
+            ), runs)
+    finally:
+        await delete_fixtures()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.sessions, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark: trainer chat history of a large session, previous endpoint vs keyset query
+
+Seeds one training session with many learners and messages, then measures:
+  - previous: ownership check, learner sessions, two message queries and
+    an email lookup per message scanning every learner (what the endpoint did)
+  - first page: one joined query, LIMIT page size + 1 (what the dashboard modal loads first)
+  - all pages: the same query followed page by page through the keyset cursor
+  - ndjson: the export stream through a server-side cursor
+
+Needs a scratch PostgreSQL database in DATABASE_URL with migration 018 applied
+(chat_messages.slide_id): other tables are created if missing, benchmark rows
+are deleted at the end.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python tests/benchmarks/bench_chat_history_endpoint.py [--learners 200] [--messages 50]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import delete, insert, select  # noqa: E402
+
+from app.adapters.inbound.dashboard_controller import (  # noqa: E402
+    CHAT_HISTORY_PAGE_SIZE, _chat_history_query, _format_chat_row, _stream_chat_history
+)
+from app.infrastructure.database import AsyncSessionLocal, engine, init_database  # noqa: E402
+from app.infrastructure.models import (  # noqa: E402
+    ChatMessageModel, LearnerSessionModel, TrainerModel, TrainingModel, TrainingSessionModel
+)
+
+
+async def create_fixtures(learners: int, messages: int):
+    trainer_id, training_id, session_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    learner_ids = [uuid.uuid4() for _ in range(learners)]
+    started = datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc)
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(TrainerModel).values(
+            id=trainer_id, email=f"bench-{trainer_id}@example.com", hashed_password="x",
+            first_name="Bench", last_name="Trainer"
+        ))
+        await db.execute(insert(TrainingModel).values(id=training_id, trainer_id=trainer_id, name="Bench"))
+        await db.execute(insert(TrainingSessionModel).values(
+            id=session_id, training_id=training_id, name="Bench", session_token=str(session_id)
+        ))
+        await db.execute(insert(LearnerSessionModel), [
+            {"id": learner_id, "training_session_id": session_id, "email": f"{learner_id}@example.com"}
+            for learner_id in learner_ids
+        ])
+        rows = [
+            {
+                "id": uuid.uuid4(), "learner_session_id": learner_id, "message_type": "question",
+                "message": f"Question {i} : comment rédiger un bon prompt ?",
+                "created_at": started + timedelta(seconds=i * learners + n)
+            }
+            for n, learner_id in enumerate(learner_ids) for i in range(messages)
+        ]
+        for start in range(0, len(rows), 5000):
+            await db.execute(insert(ChatMessageModel), rows[start:start + 5000])
+        await db.commit()
+    return trainer_id, training_id, session_id, learner_ids
+
+
+async def delete_fixtures(trainer_id, training_id, session_id, learner_ids):
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(ChatMessageModel).where(ChatMessageModel.learner_session_id.in_(learner_ids)))
+        await db.execute(delete(LearnerSessionModel).where(LearnerSessionModel.id.in_(learner_ids)))
+        await db.execute(delete(TrainingSessionModel).where(TrainingSessionModel.id == session_id))
+        await db.execute(delete(TrainingModel).where(TrainingModel.id == training_id))
+        await db.execute(delete(TrainerModel).where(TrainerModel.id == trainer_id))
+        await db.commit()
+
+
+async def previous_endpoint(trainer_id, session_id):
+    """Queries and formatting of the endpoint before the keyset rewrite (debug logging left out)"""
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            select(TrainingSessionModel)
+            .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
+            .where(TrainingSessionModel.id == session_id, TrainingModel.trainer_id == trainer_id)
+        )
+        learner_sessions = (await db.execute(
+            select(LearnerSessionModel).where(LearnerSessionModel.training_session_id == session_id)
+        )).scalars().all()
+        chat_messages = (await db.execute(
+            select(ChatMessageModel)
+            .join(LearnerSessionModel, ChatMessageModel.learner_session_id == LearnerSessionModel.id)
+            .where(LearnerSessionModel.training_session_id == session_id)
+            .order_by(ChatMessageModel.created_at.asc())
+        )).scalars().all()
+        direct_messages = (await db.execute(
+            select(ChatMessageModel)
+            .where(ChatMessageModel.learner_session_id.in_([str(ls.id) for ls in learner_sessions]))
+            .order_by(ChatMessageModel.created_at.asc())
+        )).scalars().all()
+        formatted = []
+        for msg in direct_messages or chat_messages:
+            learner_email = "Unknown"
+            for ls in learner_sessions:
+                if str(ls.id) == str(msg.learner_session_id):
+                    learner_email = ls.email
+                    break
+            formatted.append({
+                "id": str(msg.id),
+                "learner_message": msg.message,
+                "ai_response": msg.response,
+                "message_type": msg.message_type,
+                "created_at": msg.created_at.strftime("%Y-%m-%d %H:%M:%S") if msg.created_at else None,
+                "learner_email": learner_email
+            })
+        return len(formatted)
+
+
+async def keyset_pages(trainer_id, session_id, max_pages=None):
+    fetched, pages, after = 0, 0, None
+    async with AsyncSessionLocal() as db:
+        while True:
+            query = _chat_history_query(trainer_id, session_id, after)
+            rows = (await db.execute(query.limit(CHAT_HISTORY_PAGE_SIZE + 1))).all()
+            page = [_format_chat_row(row) for row in rows[:CHAT_HISTORY_PAGE_SIZE]]
+            fetched, pages = fetched + len(page), pages + 1
+            if len(rows) <= CHAT_HISTORY_PAGE_SIZE or pages == max_pages:
+                return fetched
+            after = (rows[CHAT_HISTORY_PAGE_SIZE - 1].created_at, rows[CHAT_HISTORY_PAGE_SIZE - 1].id)
+
+
+async def ndjson_export(trainer_id, session_id):
+    size = 0
+    async for chunk in _stream_chat_history(_chat_history_query(trainer_id, session_id)):
+        size += len(chunk)
+    return size
+
+
+async def timed(label, coroutine_factory, runs):
+    durations, result = [], None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = await coroutine_factory()
+        durations.append((time.perf_counter() - started) * 1000)
+    print(f"  {label:<14} {min(durations):9.1f} ms (best of {runs})  -> {result}")
+
+
+async def main_async(learners: int, messages: int, runs: int) -> None:
+    logging.disable(logging.INFO)
+    await init_database()
+    fixtures = await create_fixtures(learners, messages)
+    trainer_id, session_id = fixtures[0], fixtures[2]
+    try:
+        print(f"\n{learners} learners x {messages} messages = {learners * messages} messages")
+        await timed("previous", lambda: previous_endpoint(trainer_id, session_id), runs)
+        await timed("first page", lambda: keyset_pages(trainer_id, session_id, max_pages=1), runs)
+        await timed("all pages", lambda: keyset_pages(trainer_id, session_id), runs)
+        await timed("ndjson bytes", lambda: ndjson_export(trainer_id, session_id), runs)
+    finally:
+        await delete_fixtures(*fixtures)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--learners", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.learners, args.messages, args.runs))
+
+
+if __name__ == "__main__":
+    main()
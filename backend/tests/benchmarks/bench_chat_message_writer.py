@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark: chat message insert throughput, per-message commits vs write-behind batches
+
+Replays chat turns (one question + one answer each) from concurrent requests:
+  - per-message: the previous path, ChatMessageRepository.create() twice per
+    turn (INSERT + COMMIT + SELECT refresh for each message)
+  - write-behind: ChatMessageWriter.write() once per turn, batches flushed
+    by the background loop
+
+Needs a scratch PostgreSQL database in DATABASE_URL: tables are created if
+missing, benchmark rows are deleted at the end.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python tests/benchmarks/bench_chat_message_writer.py [--turns 2000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import delete, insert  # noqa: E402
+
+from app.adapters.repositories.chat_message_repository import ChatMessageRepository  # noqa: E402
+from app.domain.entities.chat_message import ChatMessage  # noqa: E402
+from app.infrastructure.chat_message_writer import ChatMessageWriter  # noqa: E402
+from app.infrastructure.database import AsyncSessionLocal, engine, init_database  # noqa: E402
+from app.infrastructure.models import (  # noqa: E402
+    ChatMessageModel, LearnerSessionModel, TrainerModel, TrainingModel, TrainingSessionModel
+)
+
+
+async def create_fixtures(learners: int):
+    trainer_id, training_id, session_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    learner_ids = [uuid.uuid4() for _ in range(learners)]
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(TrainerModel).values(
+            id=trainer_id, email=f"bench-{trainer_id}@example.com", hashed_password="x",
+            first_name="Bench", last_name="Trainer"
+        ))
+        await db.execute(insert(TrainingModel).values(id=training_id, trainer_id=trainer_id, name="Bench"))
+        await db.execute(insert(TrainingSessionModel).values(
+            id=session_id, training_id=training_id, name="Bench", session_token=str(session_id)
+        ))
+        await db.execute(insert(LearnerSessionModel), [
+            {"id": learner_id, "training_session_id": session_id, "email": f"{learner_id}@example.com"}
+            for learner_id in learner_ids
+        ])
+        await db.commit()
+    return trainer_id, training_id, session_id, learner_ids
+
+
+async def delete_fixtures(trainer_id, training_id, session_id, learner_ids):
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(ChatMessageModel).where(ChatMessageModel.learner_session_id.in_(learner_ids)))
+        await db.execute(delete(LearnerSessionModel).where(LearnerSessionModel.id.in_(learner_ids)))
+        await db.execute(delete(TrainingSessionModel).where(TrainingSessionModel.id == session_id))
+        await db.execute(delete(TrainingModel).where(TrainingModel.id == training_id))
+        await db.execute(delete(TrainerModel).where(TrainerModel.id == trainer_id))
+        await db.commit()
+
+
+def turn_messages(learner_id, i):
+    return [
+        ChatMessage(learner_id, "question", f"Question {i} : comment rédiger un bon prompt ?"),
+        ChatMessage(learner_id, "answer", f"Réponse {i} : précise le rôle, le contexte, la tâche et le format. " * 3)
+    ]
+
+
+async def run_turns(turns, concurrency, learner_ids, store_turn):
+    """Request-path latency of each turn's storage, and total wall time"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            started = time.perf_counter()
+            await store_turn(turn_messages(learner_ids[i % len(learner_ids)], i))
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(turns)))
+    return latencies, time.perf_counter() - started
+
+
+async def per_message(messages):
+    async with AsyncSessionLocal() as db:
+        repository = ChatMessageRepository(db)
+        for message in messages:
+            await repository.create(message)
+
+
+def report(label, turns, latencies, total_seconds):
+    ordered = sorted(latencies)
+    print(f"\n{label}")
+    print(f"  throughput   {turns * 2 / total_seconds:8.0f} messages/s ({total_seconds:.2f} s for {turns * 2} messages)")
+    print(f"  request path p50 {statistics.median(ordered):.3f} ms / p95 {ordered[int(len(ordered) * 0.95)]:.3f} ms")
+
+
+async def main_async(turns: int, concurrency: int) -> None:
+    await init_database()
+    fixtures = await create_fixtures(concurrency)
+    learner_ids = fixtures[3]
+    try:
+        latencies, total = await run_turns(turns, concurrency, learner_ids, per_message)
+        report("per-message commits", turns, latencies, total)
+
+        writer = ChatMessageWriter(flush_interval_ms=100, batch_size=200)
+        await writer.start()
+
+        async def write_behind(messages):
+            writer.write(messages)
+
+        started = time.perf_counter()
+        latencies, _ = await run_turns(turns, concurrency, learner_ids, write_behind)
+        await writer.stop()  # Includes the last flush: throughput counts until every row is committed
+        total = time.perf_counter() - started
+        report("write-behind batches", turns, latencies, total)
+        stats = writer.get_stats()
+        print(f"  batches      {stats['batches']} ({stats['written']} messages, {stats['failed_batches']} failed)")
+    finally:
+        await delete_fixtures(*fixtures)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.turns, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
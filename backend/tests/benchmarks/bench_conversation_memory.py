@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: prompt history tokens per chat turn, client history vs server-side memory
+
+Replays a synthetic learner conversation through ConversationMemoryService
+(in-memory repositories, a fixed ~150-word summary standing in for Gemini)
+and compares, for each turn, the estimated tokens of the history section:
+  - verbatim:  the whole conversation (what keeping all context costs)
+  - client:    the last 10 client-sent messages (previous behaviour, older context lost)
+  - memory:    rolling summary + recent messages under the token budget
+
+Usage:
+    python tests/benchmarks/bench_conversation_memory.py [--turns 60] [--budget 1500]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.domain.entities.chat_message import ChatMessage  # noqa: E402
+from app.domain.services.conversation_memory_service import ConversationMemoryService  # noqa: E402
+from app.domain.services.conversation_prompt_builder import ConversationPromptBuilder  # noqa: E402
+from app.domain.services.document_extraction_service import estimate_tokens  # noqa: E402
+
+WORDS = "modèle prompt contexte exemple données tâche format rôle équipe client analyse synthèse".split()
+SUMMARY = " ".join(["L'apprenant a travaillé sur le prompting et ses difficultés."] * 15)  # ~150 words
+
+
+class _Messages:
+    def __init__(self):
+        self.messages = []
+
+    async def get_after(self, learner_session_id, after=None):
+        return [m for m in self.messages if after is None or m.created_at > after]
+
+
+class _Summaries:
+    def __init__(self):
+        self.summary = None
+
+    async def get(self, learner_session_id):
+        return self.summary
+
+    async def save(self, summary):
+        self.summary = summary
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+async def replay(turns: int, budget: int):
+    rng = random.Random(0)
+    learner_session_id = uuid4()
+    messages, summaries = _Messages(), _Summaries()
+    memory = ConversationMemoryService(messages, summaries, token_budget=budget)
+    builder = ConversationPromptBuilder()
+    started = datetime(2026, 10, 1, 9, 0)
+    client_history, rows = [], []
+
+    for turn in range(1, turns + 1):
+        question = _text(rng, rng.randint(8, 30))
+        window = await memory.load_history(learner_session_id)
+        client_tokens = estimate_tokens(builder._format_conversation_history(client_history))
+        memory_tokens = estimate_tokens(builder._format_conversation_history(window.to_conversation_history()))
+        verbatim_tokens = sum(estimate_tokens(m["content"]) for m in client_history)
+        rows.append((turn, verbatim_tokens, client_tokens, memory_tokens))
+
+        answer = _text(rng, rng.randint(30, 70))
+        for message_type, content in (("question", question), ("answer", answer)):
+            created_at = started + timedelta(seconds=len(messages.messages))
+            messages.messages.append(ChatMessage(learner_session_id, message_type, content, created_at=created_at))
+            client_history.append({"role": "user" if message_type == "question" else "assistant", "content": content})
+
+        # What the background summarizer does after each stored turn
+        due = await memory.get_messages_to_summarize(learner_session_id)
+        if due:
+            previous, folded = due
+            await memory.save_summary(learner_session_id, previous, folded, SUMMARY)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--budget", type=int, default=1500)
+    args = parser.parse_args()
+
+    rows = asyncio.run(replay(args.turns, args.budget))
+
+    print(f"{'turn':>5} {'verbatim':>9} {'client':>7} {'memory':>7} {'saved vs verbatim':>18}")
+    for turn, verbatim, client, memory in rows:
+        if turn in (1, 5, 10, 15, 20, 30, 40, 50, 60) or turn == len(rows):
+            saved = (1 - memory / verbatim) * 100 if verbatim else 0
+            print(f"{turn:>5} {verbatim:>9} {client:>7} {memory:>7} {saved:>17.0f}%")
+
+    total_verbatim = sum(r[1] for r in rows)
+    total_client = sum(r[2] for r in rows)
+    total_memory = sum(r[3] for r in rows)
+    print(f"\nTotal history tokens over {len(rows)} turns: verbatim {total_verbatim}, client {total_client}, memory {total_memory}")
+    print(f"Memory vs verbatim: -{(1 - total_memory / total_verbatim) * 100:.0f}%, "
+          f"max per turn {max(r[3] for r in rows)} tokens (budget {args.budget})")
+
+
+if __name__ == "__main__":
+    main()
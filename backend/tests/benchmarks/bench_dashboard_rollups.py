@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dashboard aggregates over the activity tables vs rollup tables
+
+Seeds the platform of bench_admin_overview (--sessions training sessions with
+learners, plans and slides), then measures:
+  - trainer /stats: the six join + count(distinct) queries it ran, vs one
+    trainer_rollups row (busiest trainer)
+  - admin trainers / trainings / sessions overviews: first page sorted on an
+    aggregate, grouped over the activity tables vs read from the rollups
+  - maintenance: full reconcile, and one incremental refresh after
+    --dirty learner sessions made progress
+
+Needs a scratch PostgreSQL database in DATABASE_URL with the migration indexes
+applied: tables are created if missing, benchmark rows are deleted at the end.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python tests/benchmarks/bench_dashboard_rollups.py [--sessions 10000] [--dirty 100]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import distinct, func, select, update  # noqa: E402
+
+from app.adapters.inbound.dashboard_controller import get_dashboard_stats  # noqa: E402
+from app.adapters.repositories.admin_repository import AdminRepository  # noqa: E402
+from app.domain.schemas.admin import AdminOverviewParams  # noqa: E402
+from app.infrastructure.dashboard_rollups import dashboard_rollups  # noqa: E402
+from app.infrastructure.database import AsyncSessionLocal, engine, init_database  # noqa: E402
+from app.infrastructure.models import (  # noqa: E402
+    LearnerSessionModel, TrainerModel, TrainingModel, TrainingSessionModel
+)
+from app.infrastructure.models.learner_training_plan_model import LearnerTrainingPlanModel  # noqa: E402
+from app.infrastructure.models.training_module_model import TrainingModuleModel  # noqa: E402
+from app.infrastructure.models.training_slide_model import TrainingSlideModel  # noqa: E402
+from app.infrastructure.models.training_submodule_model import TrainingSubmoduleModel  # noqa: E402
+
+from bench_admin_overview import EMAIL_PREFIX, create_fixtures, delete_fixtures  # noqa: E402
+
+
+def _by_trainer(query, trainer_id):
+    return query.join(
+        TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id
+    ).join(
+        TrainingModel, TrainingSessionModel.training_id == TrainingModel.id
+    ).where(TrainingModel.trainer_id == trainer_id)
+
+
+async def previous_stats(db, trainer_id):
+    """Queries /stats ran before the rollups"""
+    await db.execute(select(func.count(TrainingModel.id)).where(TrainingModel.trainer_id == trainer_id))
+    await db.execute(
+        select(func.count(TrainingSessionModel.id))
+        .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
+        .where(TrainingModel.trainer_id == trainer_id, TrainingSessionModel.is_active == True)
+    )
+    await db.execute(_by_trainer(select(func.count(distinct(LearnerSessionModel.email))), trainer_id))
+    await db.execute(_by_trainer(select(func.sum(LearnerSessionModel.total_time_spent)), trainer_id))
+    await db.execute(_by_trainer(select(func.sum(LearnerSessionModel.current_slide_number)), trainer_id))
+    await db.execute(
+        select(func.count(TrainingSlideModel.id))
+        .join(TrainingSubmoduleModel, TrainingSlideModel.submodule_id == TrainingSubmoduleModel.id)
+        .join(TrainingModuleModel, TrainingSubmoduleModel.module_id == TrainingModuleModel.id)
+        .join(LearnerTrainingPlanModel, TrainingModuleModel.plan_id == LearnerTrainingPlanModel.id)
+        .join(LearnerSessionModel, LearnerTrainingPlanModel.learner_session_id == LearnerSessionModel.id)
+        .join(TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id)
+        .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
+        .where(TrainingModel.trainer_id == trainer_id, TrainingSlideModel.content.isnot(None))
+    )
+
+
+async def previous_trainers_page(db):
+    """Trainer overview grouped over trainings, sessions and learner sessions, sorted on learners"""
+    unique_learners = func.count(distinct(LearnerSessionModel.email))
+    await db.execute(
+        select(TrainerModel.id, unique_learners, func.count(distinct(TrainingSessionModel.id)),
+               func.coalesce(func.sum(LearnerSessionModel.total_time_spent), 0))
+        .outerjoin(TrainingModel, TrainerModel.id == TrainingModel.trainer_id)
+        .outerjoin(TrainingSessionModel, TrainingModel.id == TrainingSessionModel.training_id)
+        .outerjoin(LearnerSessionModel, TrainingSessionModel.id == LearnerSessionModel.training_session_id)
+        .group_by(TrainerModel.id)
+        .order_by(unique_learners.desc(), TrainerModel.id)
+        .limit(50)
+    )
+
+
+async def previous_trainings_page(db):
+    total_learners = func.count(distinct(LearnerSessionModel.email))
+    await db.execute(
+        select(TrainingModel.id, total_learners, func.count(distinct(TrainingSessionModel.id)),
+               func.coalesce(func.sum(LearnerSessionModel.total_time_spent), 0))
+        .outerjoin(TrainingSessionModel, TrainingModel.id == TrainingSessionModel.training_id)
+        .outerjoin(LearnerSessionModel, TrainingSessionModel.id == LearnerSessionModel.training_session_id)
+        .group_by(TrainingModel.id)
+        .order_by(total_learners.desc(), TrainingModel.id)
+        .limit(50)
+    )
+
+
+async def previous_sessions_page(db):
+    """Session overview sorted on progress: slide totals aggregated for every session"""
+    slides = (
+        select(LearnerSessionModel.training_session_id, func.count(TrainingSlideModel.id).label('total_slides'))
+        .select_from(TrainingSlideModel)
+        .join(TrainingSubmoduleModel, TrainingSlideModel.submodule_id == TrainingSubmoduleModel.id)
+        .join(TrainingModuleModel, TrainingSubmoduleModel.module_id == TrainingModuleModel.id)
+        .join(LearnerTrainingPlanModel, TrainingModuleModel.plan_id == LearnerTrainingPlanModel.id)
+        .join(LearnerSessionModel, LearnerTrainingPlanModel.learner_session_id == LearnerSessionModel.id)
+        .group_by(LearnerSessionModel.training_session_id)
+    ).subquery()
+    learners = (
+        select(LearnerSessionModel.training_session_id, func.avg(LearnerSessionModel.current_slide_number).label('avg_slide'))
+        .group_by(LearnerSessionModel.training_session_id)
+    ).subquery()
+    progress = learners.c.avg_slide / func.nullif(slides.c.total_slides, 0)
+    await db.execute(
+        select(TrainingSessionModel.id, progress)
+        .outerjoin(learners, learners.c.training_session_id == TrainingSessionModel.id)
+        .outerjoin(slides, slides.c.training_session_id == TrainingSessionModel.id)
+        .order_by(progress.desc().nulls_last(), TrainingSessionModel.id)
+        .limit(50)
+    )
+
+
+async def timed(label, call, runs):
+    durations = []
+    for _ in range(runs):
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            await call(db)
+            durations.append((time.perf_counter() - started) * 1000)
+    print(f"  {label:<22} {min(durations):9.1f} ms (best of {runs})")
+
+
+async def main_async(sessions: int, dirty: int, runs: int) -> None:
+    logging.disable(logging.INFO)
+    await init_database()
+    await delete_fixtures()
+    await create_fixtures(sessions)
+    try:
+        async with AsyncSessionLocal() as db:
+            trainer_id = (await db.execute(
+                select(TrainingModel.trainer_id)
+                .join(TrainerModel, TrainingModel.trainer_id == TrainerModel.id)
+                .where(TrainerModel.email.startswith(EMAIL_PREFIX))
+                .group_by(TrainingModel.trainer_id)
+                .order_by(func.count().desc())
+                .limit(1)
+            )).scalar()
+            learner_ids = (await db.execute(
+                _by_trainer(select(LearnerSessionModel.id), trainer_id).limit(dirty)
+            )).scalars().all()
+
+        print("\nMaintenance")
+        started = time.perf_counter()
+        await dashboard_rollups.reconcile()
+        print(f"  {'full reconcile':<22} {(time.perf_counter() - started) * 1000:9.1f} ms")
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(LearnerSessionModel)
+                .where(LearnerSessionModel.id.in_(learner_ids))
+                .values(current_slide_number=LearnerSessionModel.current_slide_number + 1)
+            )
+            await db.commit()
+        for learner_id in learner_ids:
+            dashboard_rollups.mark_learner_session(learner_id)
+        started = time.perf_counter()
+        counts = await dashboard_rollups.refresh()
+        print(f"  {f'refresh {len(learner_ids)} learners':<22} {(time.perf_counter() - started) * 1000:9.1f} ms  -> {counts}")
+
+        trainer = SimpleNamespace(id=trainer_id)
+        print("\nTrainer /stats")
+        await timed("previous", lambda db: previous_stats(db, trainer_id), runs)
+        await timed("rollup", lambda db: get_dashboard_stats(current_trainer=trainer, db=db), runs)
+
+        for listing, sort, previous in (
+            ("trainers", "unique_learners", previous_trainers_page),
+            ("trainings", "total_learners", previous_trainings_page),
+            ("sessions", "progress_percentage", previous_sessions_page)
+        ):
+            print(f"\n/api/admin/{listing}-overview, page 1 sorted on {sort}")
+            await timed("previous", previous, runs)
+            method = f"get_{listing}_overview_statistics"
+            await timed("rollup", lambda db: getattr(AdminRepository(db), method)(
+                AdminOverviewParams(sort=sort, order="desc")
+            ), runs)
+    finally:
+        await delete_fixtures()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--dirty", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.sessions, args.dirty, args.runs))
+
+
+if __name__ == "__main__":
+    main()
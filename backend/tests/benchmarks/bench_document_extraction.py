@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: local extraction and chunking of training documents
+
+For each document, measures extraction and chunking time and compares the
+estimated input tokens of the extracted text with those of sending the PDF
+itself (Gemini bills each PDF page as an image, 258 tokens, plus its text).
+
+Usage:
+    python tests/benchmarks/bench_document_extraction.py [files...] [--runs 5] [--chunk-tokens 350]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.domain.services.document_extraction_service import DocumentExtractor  # noqa: E402
+from app.domain.services.document_chunk_service import DocumentChunkService, DEFAULT_TOKEN_BUDGET  # noqa: E402
+
+GEMINI_TOKENS_PER_PDF_PAGE = 258
+DEFAULT_DOCUMENTS = sorted((Path(__file__).resolve().parents[1] / "old").glob("*.pdf"))
+
+
+def bench(path: Path, runs: int, chunk_tokens: int) -> None:
+    extractor = DocumentExtractor()
+    extract_times, chunk_times = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        document = extractor.extract(str(path))
+        extract_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        chunks = extractor.chunk(document, max_tokens=chunk_tokens)
+        chunk_times.append(time.perf_counter() - start)
+
+    pages = len(document.sections) if document.source_type != "pdf" else _pdf_pages(path)
+    text_tokens = sum(c.token_count for c in chunks)
+    file_tokens = pages * GEMINI_TOKENS_PER_PDF_PAGE + text_tokens if path.suffix.lower() == ".pdf" else text_tokens
+    selected = DocumentChunkService.select_within_budget(chunks, DEFAULT_TOKEN_BUDGET)
+    sizes = [c.token_count for c in chunks] or [0]
+
+    print(f"\n{path.name} ({path.stat().st_size / 1024:.0f} KiB, {pages} pages/slides)")
+    print(f"  extract     median {statistics.median(extract_times) * 1000:8.1f} ms")
+    print(f"  chunk       median {statistics.median(chunk_times) * 1000:8.1f} ms")
+    print(f"  chunks      {len(chunks)} (tokens min {min(sizes)} / median {int(statistics.median(sizes))} / max {max(sizes)})")
+    print(f"  outline     {len(document.outline)} entries")
+    print(f"  input tokens, file upload   ~{file_tokens}")
+    print(f"  input tokens, local text    ~{text_tokens} ({_reduction(file_tokens, text_tokens)})")
+    print(f"  input tokens, budgeted      ~{sum(c.token_count for c in selected)} of {DEFAULT_TOKEN_BUDGET}")
+
+
+def _pdf_pages(path: Path) -> int:
+    from pypdf import PdfReader
+    return len(PdfReader(str(path)).pages)
+
+
+def _reduction(before: int, after: int) -> str:
+    return f"-{(1 - after / before) * 100:.0f}%" if before else "n/a"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", type=Path, default=DEFAULT_DOCUMENTS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--chunk-tokens", type=int, default=350)
+    args = parser.parse_args()
+
+    if not args.files:
+        sys.exit("No documents to benchmark")
+    for path in args.files:
+        bench(path, args.runs, args.chunk_tokens)
+
+
+if __name__ == "__main__":
+    main()
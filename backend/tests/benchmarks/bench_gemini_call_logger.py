@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark: event-loop time spent logging Gemini calls
+
+Logs --calls prompt/response pairs (--prompt-kb of prompt, --response-kb of
+JSON response) from a coroutine, with the application log written to a file
+in the main.py format, and measures how long each log_input + log_output pair
+holds the event loop:
+  - previous: every prompt and response logged in full through a dozen
+    synchronous logger.info calls (JSON re-indented on the loop)
+  - queued, all bodies: QueueListener pipeline, every body logged
+  - queued, sampled: QueueListener pipeline with the default settings
+    (bodies sampled and truncated, gzip-rotated body file)
+
+Usage:
+    python tests/benchmarks/bench_gemini_call_logger.py [--calls 500] [--prompt-kb 30] [--response-kb 8]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.infrastructure.gemini_call_logger import GeminiCallLogger  # noqa: E402
+from app.infrastructure.settings import settings  # noqa: E402
+
+logger = logging.getLogger("app.infrastructure.gemini_call_logger")
+
+
+def previous_log_call(call_id, prompt, response):
+    """Log lines GeminiCallLogger emitted per call before the queued pipeline"""
+    logger.info("=" * 100)
+    logger.info("🎯 [GEMINI_CALL] [INPUT] [CONVERSATION_ADAPTER] [Learner: 5f2b3c4d...]")
+    logger.info(f"📋 Call ID: {call_id}")
+    logger.info("🏷️ Service Type: conversation")
+    logger.info(f"⏰ Timestamp: {datetime.now(timezone.utc).isoformat()}")
+    logger.info(f"📏 Prompt Length: {len(prompt)} characters")
+    logger.info("-" * 50 + " PROMPT START " + "-" * 50)
+    logger.info(prompt)
+    logger.info("-" * 50 + " PROMPT END " + "-" * 52)
+    logger.info("=" * 100)
+
+    formatted_response = json.dumps(json.loads(response), indent=2, ensure_ascii=False)
+    logger.info("=" * 100)
+    logger.info("📥 [GEMINI_CALL] [OUTPUT] [CONVERSATION_ADAPTER] [Learner: 5f2b3c4d...]")
+    logger.info(f"📋 Call ID: {call_id}")
+    logger.info(f"⏰ Timestamp: {datetime.now(timezone.utc).isoformat()}")
+    logger.info(f"📏 Response Length: {len(response)} characters")
+    logger.info("🪙 TOKENS - Input: 7500 | Output: 2000 | Total: 9500")
+    logger.info("⚡ Processing Time: 1.234s")
+    logger.info("-" * 50 + " RESPONSE START " + "-" * 48)
+    logger.info(formatted_response)
+    logger.info("-" * 50 + " RESPONSE END " + "-" * 50)
+    logger.info("=" * 100)
+
+
+def _payloads(prompt_kb: int, response_kb: int, calls: int):
+    sentence = "Le formateur présente les concepts clés du module avec des exemples concrets. "
+    prompt = (sentence * (prompt_kb * 1024 // len(sentence) + 1))[:prompt_kb * 1024]
+    item = {"title": "Concept", "content": sentence * 2, "bullets": ["point un", "point deux"]}
+    response = json.dumps({"slides": [item] * max(1, response_kb * 1024 // len(json.dumps(item)))})
+    # Distinct prompts so the dedup window does not skip calls
+    return [(f"{i} {prompt}", response) for i in range(calls)]
+
+
+async def _run(mode: str, payloads, log_dir: Path) -> dict:
+    gemini_logger = None
+    if mode != "previous":
+        gemini_logger = GeminiCallLogger(
+            body_sample_rate=1.0 if mode == "queued, all bodies" else settings.gemini_log_body_sample_rate,
+            body_max_chars=0 if mode == "queued, all bodies" else settings.gemini_log_body_max_chars,
+            body_log_file=str(log_dir / f"{mode.replace(', ', '_').replace(' ', '_')}.log"),
+            body_log_max_bytes=settings.gemini_log_body_max_bytes,
+            body_log_backups=settings.gemini_log_body_backups,
+            queue_size=settings.gemini_log_queue_size
+        )
+        await gemini_logger.start()
+
+    blocked = []
+    for i, (prompt, response) in enumerate(payloads):
+        started = time.perf_counter()
+        if gemini_logger is None:
+            previous_log_call(f"call_{i}", prompt, response)
+        else:
+            call_id = gemini_logger.log_input("conversation_adapter", prompt,
+                                              learner_session_id="5f2b3c4d-0000-0000-0000-000000000000")
+            gemini_logger.log_output(call_id, "conversation_adapter", response, processing_time=1.234,
+                                     usage_metadata={"prompt_token_count": 7500, "candidates_token_count": 2000})
+        blocked.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0)
+
+    drain_started = time.perf_counter()
+    if gemini_logger is not None:
+        await gemini_logger.stop()
+    drain_ms = (time.perf_counter() - drain_started) * 1000
+
+    blocked.sort()
+    return {
+        "p50_ms": statistics.median(blocked),
+        "p95_ms": blocked[int(len(blocked) * 0.95) - 1],
+        "total_ms": sum(blocked),
+        "drain_ms": drain_ms,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--prompt-kb", type=int, default=30)
+    parser.add_argument("--response-kb", type=int, default=8)
+    args = parser.parse_args()
+
+    payloads = _payloads(args.prompt_kb, args.response_kb, args.calls)
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = Path(tmp)
+        logging.basicConfig(
+            level=logging.DEBUG,
+            format='%(asctime)s %(levelname)s %(name)s: %(message)s',
+            filename=str(log_dir / "app.log"),
+            force=True
+        )
+        for mode in ("previous", "queued, all bodies", "queued, sampled"):
+            result = asyncio.run(_run(mode, payloads, log_dir))
+            print(
+                f"{mode:>18}: loop blocked per call p50 {result['p50_ms']:.3f} ms, "
+                f"p95 {result['p95_ms']:.3f} ms, total {result['total_ms']:.0f} ms "
+                f"(writer drained {result['drain_ms']:.0f} ms after the last call)"
+            )
+
+
+if __name__ == "__main__":
+    main()
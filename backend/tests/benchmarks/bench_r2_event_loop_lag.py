@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: event-loop lag during concurrent R2 downloads
+
+Runs N concurrent downloads against a stub S3 client whose get_object blocks
+like a real network call, while a ticker task measures how late the event
+loop wakes it up. Compares the previous adapter behaviour (boto3 called
+directly from the coroutine) with the executor-backed adapter.
+
+Usage:
+    python tests/benchmarks/bench_r2_event_loop_lag.py [--downloads 20] [--latency-ms 150]
+"""
+
+import argparse
+import asyncio
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.adapters.outbound import cloudflare_r2_storage_adapter as r2  # noqa: E402
+
+OBJECT_SIZE = 256 * 1024
+
+
+class _StubS3Client:
+    """Blocking stand-in for a boto3 S3 client"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def head_object(self, Bucket, Key):
+        time.sleep(self.latency / 5)
+        return {"ContentLength": OBJECT_SIZE, "ETag": '"stub"'}
+
+    def get_object(self, Bucket, Key, Range=None):
+        time.sleep(self.latency)
+        return {"Body": io.BytesIO(b"\0" * OBJECT_SIZE)}
+
+
+class _Settings:
+    def get_r2_bucket_name(self):
+        return "bench"
+
+    def get_r2_endpoint_url(self):
+        return "https://stub.invalid"
+
+    def get_r2_access_key(self):
+        return "key"
+
+    def get_r2_secret_key(self):
+        return "secret"
+
+    def get_setting(self, key, default=None):
+        return default
+
+
+async def _ticker(lags, stop, interval=0.005):
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _run(mode: str, downloads: int, latency: float) -> dict:
+    client = _StubS3Client(latency)
+    r2._get_client = lambda *args, **kwargs: client
+    adapter = r2.CloudflareR2StorageAdapter(_Settings())
+
+    async def blocking_download(key):
+        # Previous behaviour: synchronous boto3 calls inside the coroutine
+        response = client.get_object(Bucket="bench", Key=key)
+        return response["Body"].read()
+
+    download = blocking_download if mode == "blocking" else adapter.get_file_download_content
+
+    lags, stop = [], asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    await asyncio.sleep(0.02)
+    started = time.perf_counter()
+    await asyncio.gather(*(download(f"trainings/bench/{i}.pdf") for i in range(downloads)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "wall_s": elapsed,
+        "lag_p50_ms": statistics.median(lags_ms),
+        "lag_max_ms": lags_ms[-1],
+        "ticks": len(lags_ms),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--downloads", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    for mode in ("blocking", "executor"):
+        result = asyncio.run(_run(mode, args.downloads, args.latency_ms / 1000))
+        print(
+            f"{mode:>9}: wall {result['wall_s']:.2f}s, "
+            f"loop lag p50 {result['lag_p50_ms']:.1f} ms, max {result['lag_max_ms']:.1f} ms "
+            f"({result['ticks']} ticks)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: BM25 retrieval index build, persistence and query times
+
+Indexes the chunks of each document, then replays every section title as a
+query (what slide generation does). The chunks are also replicated to a
+larger synthetic corpus to show how the index scales with long documents.
+
+Usage:
+    python tests/benchmarks/bench_retrieval_index.py [files...] [--scale 20] [--queries 500]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.domain.services.document_extraction_service import DocumentExtractor  # noqa: E402
+from app.domain.services.retrieval_index import BM25Index, select_passages  # noqa: E402
+
+DEFAULT_DOCUMENTS = sorted((Path(__file__).resolve().parents[1] / "old").glob("*.pdf"))
+PASSAGE_TOKEN_BUDGET = 1200
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def bench_chunks(label, chunks, queries, runs):
+    build_times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        index = BM25Index.build(chunks)
+        build_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    data = index.to_bytes()
+    save_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    BM25Index.from_bytes(data)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    query_times, passage_tokens = [], []
+    for i in range(runs):
+        query = queries[i % len(queries)]
+        start = time.perf_counter()
+        passages = select_passages(index.search(query, 4), PASSAGE_TOKEN_BUDGET)
+        query_times.append((time.perf_counter() - start) * 1000)
+        passage_tokens.append(sum(p.token_count for p in passages))
+
+    document_tokens = sum(c.token_count for c in chunks)
+    print(f"\n{label}: {len(chunks)} chunks, {document_tokens} tokens, {len(index.vocabulary)} terms")
+    print(f"  build       median {statistics.median(build_times) * 1000:8.1f} ms")
+    print(f"  persisted   {len(data) / 1024:8.1f} KiB (save {save_ms:.1f} ms, load {load_ms:.1f} ms)")
+    print(f"  query       p50 {percentile(query_times, 0.5):.3f} ms / p95 {percentile(query_times, 0.95):.3f} ms / max {max(query_times):.3f} ms")
+    print(f"  prompt      ~{int(statistics.mean(passage_tokens))} passage tokens instead of {document_tokens} for the whole document")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", type=Path, default=DEFAULT_DOCUMENTS)
+    parser.add_argument("--scale", type=int, default=20, help="Replication factor of the synthetic corpus")
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    extractor = DocumentExtractor()
+    for path in args.files:
+        chunks = extractor.chunk(extractor.extract(str(path)))
+        queries = [c.section_title for c in chunks if c.section_title] or ["formation"]
+        bench_chunks(path.name, chunks, queries, args.queries)
+
+        # Synthetic long document: shuffled copies with distinct section titles
+        rng = random.Random(0)
+        scaled = []
+        for copy in range(args.scale):
+            for chunk in rng.sample(chunks, len(chunks)):
+                scaled.append(replace(
+                    chunk,
+                    chunk_index=len(scaled),
+                    section_title=f"{chunk.section_title} {copy}",
+                    content=f"{chunk.content} partie{copy}"
+                ))
+        bench_chunks(f"{path.name} x{args.scale}", scaled, queries, args.queries)
+
+
+if __name__ == "__main__":
+    main()
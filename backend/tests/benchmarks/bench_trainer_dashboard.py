@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: trainer dashboard endpoints, p50 / p95 latency per request
+
+Seeds the platform of bench_admin_overview (--sessions training sessions),
+then calls each endpoint --requests times for the busiest trainer:
+  /stats
+    - six queries: the sequential aggregate queries over the activity tables
+    - rollup: one trainer_rollups row, cache disabled
+    - cached: TTL cache hit (one query per TTL or invalidation)
+  /recent-activity
+    - three queries: latest trainings, sessions and learners fetched one by one
+    - one query: the three merged and sorted by a single UNION ALL
+    - cached: TTL cache hit
+
+Needs a scratch PostgreSQL database in DATABASE_URL with the migration indexes
+applied: tables are created if missing, benchmark rows are deleted at the end.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python tests/benchmarks/bench_trainer_dashboard.py [--sessions 10000] [--requests 200]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import func, select  # noqa: E402
+
+from app.adapters.inbound import dashboard_controller  # noqa: E402
+from app.adapters.inbound.dashboard_controller import get_dashboard_stats, get_recent_activity  # noqa: E402
+from app.infrastructure.dashboard_cache import DashboardCache  # noqa: E402
+from app.infrastructure.dashboard_rollups import dashboard_rollups  # noqa: E402
+from app.infrastructure.database import AsyncSessionLocal, engine, init_database  # noqa: E402
+from app.infrastructure.models import (  # noqa: E402
+    LearnerSessionModel, TrainerModel, TrainingModel, TrainingSessionModel
+)
+
+from bench_admin_overview import EMAIL_PREFIX, create_fixtures, delete_fixtures  # noqa: E402
+from bench_dashboard_rollups import previous_stats  # noqa: E402
+
+
+async def previous_recent_activity(db, trainer_id):
+    """Queries /recent-activity ran before the UNION ALL"""
+    await db.execute(
+        select(TrainingModel).where(TrainingModel.trainer_id == trainer_id)
+        .order_by(TrainingModel.created_at.desc()).limit(3)
+    )
+    await db.execute(
+        select(TrainingSessionModel)
+        .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
+        .where(TrainingModel.trainer_id == trainer_id)
+        .order_by(TrainingSessionModel.created_at.desc()).limit(3)
+    )
+    result = await db.execute(
+        select(LearnerSessionModel)
+        .join(TrainingSessionModel, LearnerSessionModel.training_session_id == TrainingSessionModel.id)
+        .join(TrainingModel, TrainingSessionModel.training_id == TrainingModel.id)
+        .where(TrainingModel.trainer_id == trainer_id)
+        .order_by(LearnerSessionModel.started_at.desc()).limit(3)
+    )
+    return result.scalars().all()
+
+
+async def measure(label, call, requests):
+    durations = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            await call(db)
+        durations.append((time.perf_counter() - started) * 1000)
+    p95 = statistics.quantiles(durations, n=20)[-1]
+    print(f"  {label:<14} p50 {statistics.median(durations):7.2f} ms   p95 {p95:7.2f} ms")
+
+
+async def main_async(sessions: int, requests: int) -> None:
+    logging.disable(logging.INFO)
+    await init_database()
+    await delete_fixtures()
+    await create_fixtures(sessions)
+    try:
+        await dashboard_rollups.reconcile()
+        async with AsyncSessionLocal() as db:
+            trainer_id = (await db.execute(
+                select(TrainingModel.trainer_id)
+                .join(TrainerModel, TrainingModel.trainer_id == TrainerModel.id)
+                .where(TrainerModel.email.startswith(EMAIL_PREFIX))
+                .group_by(TrainingModel.trainer_id)
+                .order_by(func.count().desc())
+                .limit(1)
+            )).scalar()
+        trainer = SimpleNamespace(id=trainer_id)
+
+        print(f"\n{requests} requests per variant, connection pool warm")
+        print("/api/dashboard/stats")
+        await measure("six queries", lambda db: previous_stats(db, trainer_id), requests)
+        dashboard_controller.dashboard_cache = DashboardCache(ttl_seconds=0)
+        await measure("rollup", lambda db: get_dashboard_stats(current_trainer=trainer, db=db), requests)
+        dashboard_controller.dashboard_cache = DashboardCache(ttl_seconds=30)
+        await measure("cached", lambda db: get_dashboard_stats(current_trainer=trainer, db=db), requests)
+
+        print("/api/dashboard/recent-activity")
+        await measure("three queries", lambda db: previous_recent_activity(db, trainer_id), requests)
+        dashboard_controller.dashboard_cache = DashboardCache(ttl_seconds=0)
+        await measure("one query", lambda db: get_recent_activity(current_trainer=trainer, db=db), requests)
+        dashboard_controller.dashboard_cache = DashboardCache(ttl_seconds=30)
+        await measure("cached", lambda db: get_recent_activity(current_trainer=trainer, db=db), requests)
+    finally:
+        await delete_fixtures()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.sessions, args.requests))
+
+
+if __name__ == "__main__":
+    main()
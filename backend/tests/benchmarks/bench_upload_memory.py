@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak RSS while storing concurrent training uploads
+
+Compares the previous in-memory path (io.BytesIO(await file.read()) then
+read() again in the adapter) with the streaming ValidatedUploadStream path.
+Each mode runs in its own subprocess so ru_maxrss is not shared.
+
+Usage:
+    python tests/benchmarks/bench_upload_memory.py [--uploads 8] [--size-mb 50]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+class _Settings:
+    def __init__(self, path):
+        self.path = path
+
+    def get_storage_path(self):
+        return self.path
+
+
+def _make_upload(path: Path, size_mb: int) -> None:
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.7\n")
+        block = os.urandom(1024 * 1024)
+        for _ in range(size_mb):
+            f.write(block)
+
+
+async def _run(mode: str, uploads: int, source: Path, storage_dir: str) -> None:
+    from app.domain.services.file_storage_service import FileStorageService
+    from app.utils.file_validation import ValidatedUploadStream
+
+    storage = FileStorageService(_Settings(storage_dir))
+
+    async def one_upload():
+        with open(source, "rb") as spooled:  # stands in for UploadFile.file
+            if mode == "in_memory":
+                content = io.BytesIO(spooled.read())
+                # Previous adapter behaviour: read the whole buffer a second time
+                content = io.BytesIO(content.read())
+            else:
+                content = ValidatedUploadStream(spooled, ".pdf", max_size=1 << 34)
+            await storage.store_training_file(uuid4(), uuid4(), content, "deck.pdf", "application/pdf")
+
+    await asyncio.gather(*(one_upload() for _ in range(uploads)))
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>10}: peak RSS {peak_mb:.0f} MB for {uploads} concurrent uploads")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--mode")
+    parser.add_argument("--source")
+    parser.add_argument("--storage")
+    args = parser.parse_args()
+
+    if args.mode:
+        asyncio.run(_run(args.mode, args.uploads, Path(args.source), args.storage))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "upload.pdf"
+        _make_upload(source, args.size_mb)
+        for mode in ("in_memory", "streaming"):
+            subprocess.run([
+                sys.executable, __file__, "--mode", mode,
+                "--uploads", str(args.uploads), "--source", str(source),
+                "--storage", str(Path(tmp) / mode)
+            ], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Tests for streaming upload validation (magic bytes, size limit, hashing)
+"""
+
+import hashlib
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.utils.file_validation import FileValidationError, ValidatedUploadStream
+
+
+def _drain(stream: ValidatedUploadStream) -> bytes:
+    return b"".join(stream.iter_chunks(chunk_size=4))
+
+
+def test_stream_hashes_and_counts_valid_pdf():
+    content = b"%PDF-1.7 some content"
+    stream = ValidatedUploadStream(io.BytesIO(content), ".pdf")
+
+    assert _drain(stream) == content
+    assert stream.size == len(content)
+    assert stream.sha256 == hashlib.sha256(content).hexdigest()
+
+
+def test_stream_rejects_content_not_matching_extension():
+    stream = ValidatedUploadStream(io.BytesIO(b"PK\x03\x04zip"), ".pdf")
+
+    with pytest.raises(FileValidationError, match="error.file.invalidContent"):
+        _drain(stream)
+
+
+def test_stream_enforces_size_limit_while_reading():
+    stream = ValidatedUploadStream(io.BytesIO(b"%PDF-" + b"x" * 100), ".pdf", max_size=50)
+
+    with pytest.raises(FileValidationError, match="error.file.tooLarge"):
+        _drain(stream)
+
+
+def test_stream_rejects_empty_upload():
+    stream = ValidatedUploadStream(io.BytesIO(b""), ".pptx")
+
+    with pytest.raises(FileValidationError, match="error.file.empty"):
+        stream.read(1024)
@@ -0,0 +1,116 @@
+"""
+Tests for the energy-gate VAD used on Live API audio uploads
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.infrastructure.voice_activity_detector import EnergyVAD, is_pcm_mime_type
+
+SAMPLE_RATE = 16000
+
+
+def _tone(seconds: float, amplitude: float = 0.3) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * 220 * t)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.normal(0, 0.0005, int(seconds * SAMPLE_RATE))
+
+
+def _pcm(*parts: np.ndarray) -> bytes:
+    signal = np.concatenate(parts)
+    return (signal * 32767).astype("<i2").tobytes()
+
+
+def test_silence_only_has_no_speech():
+    vad = EnergyVAD()
+    result = vad.process(_pcm(_silence(2.0)))
+
+    assert not result.has_speech
+    assert result.audio == b""
+
+
+def test_leading_and_trailing_silence_are_trimmed():
+    vad = EnergyVAD(padding_ms=100)
+    pcm = _pcm(_silence(1.0), _tone(1.0), _silence(1.0))
+    result = vad.process(pcm)
+
+    assert result.has_speech
+    assert len(result.segments) == 1
+    # 1s of speech plus at most 100ms padding on each side
+    assert 2 * SAMPLE_RATE * 1.0 <= result.output_bytes <= 2 * SAMPLE_RATE * 1.25
+    start, end = result.segments[0]
+    assert 0.85 <= start <= 1.0
+    assert 2.0 <= end <= 2.15
+
+
+def test_short_gaps_are_coalesced_and_long_gaps_dropped():
+    vad = EnergyVAD(padding_ms=0, max_gap_ms=400)
+    short_gap = vad.process(_pcm(_tone(0.5), _silence(0.2), _tone(0.5)))
+    long_gap = vad.process(_pcm(_tone(0.5), _silence(1.5), _tone(0.5)))
+
+    assert len(short_gap.segments) == 1
+    assert len(long_gap.segments) == 2
+    assert long_gap.output_bytes < 2 * SAMPLE_RATE * 1.1
+
+
+def test_stats_report_cpu_cost_per_audio_minute():
+    vad = EnergyVAD()
+    vad.process(_pcm(_silence(0.5), _tone(1.0), _silence(0.5)))
+    stats = vad.get_stats()
+
+    assert stats["audio_seconds"] == 2.0
+    assert stats["cpu_ms_per_audio_minute"] >= 0
+    assert 0 < stats["bytes_saved_ratio"] < 1
+
+
+def test_only_pcm_is_gated():
+    assert is_pcm_mime_type("audio/pcm;rate=16000")
+    assert is_pcm_mime_type("audio/pcm")
+    assert not is_pcm_mime_type("audio/webm;codecs=opus")
+
+
+def _modulated_noise(seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(1)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    return np.clip(rng.normal(0, 0.15, len(t)) * envelope, -1, 1)
+
+
+def test_buffers_voiced_from_first_to_last_frame_are_kept():
+    vad = EnergyVAD()
+    tone = _pcm(_tone(1.0))
+    speech = _pcm(_modulated_noise(3.0))
+
+    for pcm in (tone, speech):
+        result = vad.process(pcm)
+        assert result.has_speech
+        assert result.output_bytes == len(pcm)
+
+    # Same with a session whose noise floor was learned on a quiet buffer
+    vad.process(_pcm(_silence(1.0)), session_id="session-1")
+    assert vad.process(speech, session_id="session-1").output_bytes == len(speech)
+    assert not vad.process(_pcm(_silence(1.0)), session_id="session-1").has_speech
+
+
+def test_noise_floor_is_tracked_per_session():
+    vad = EnergyVAD(padding_ms=0)
+    noisy_room = np.random.default_rng(2).normal(0, 0.01, SAMPLE_RATE)  # about -40 dBFS
+
+    vad.process(_pcm(noisy_room), session_id="noisy")
+    vad.process(_pcm(_silence(1.0)), session_id="quiet")
+    # A quiet voice at -37 dBFS stands out in the quiet room only
+    quiet_voice = _pcm(_silence(0.5), _tone(0.5, amplitude=0.02), _silence(0.5))
+
+    assert vad.process(quiet_voice, session_id="quiet").has_speech
+    assert not vad.process(quiet_voice, session_id="noisy").has_speech
+
+    vad.forget("noisy")
+    assert "noisy" not in vad._noise_floors
@@ -205,7 +205,7 @@ class AdminDashboard {
 
             // Fetch trainers overview data
             console.log('📡 ADMIN - Fetching trainers overview data...');
-            const trainersData = await apiClient.get('/api/admin/trainers-overview');
+            const trainersData = await this.fetchAllPages('/api/admin/trainers-overview');
             console.log('📊 ADMIN - Received trainers data:', trainersData.length, 'trainers');
 
             // Validate response data structure
@@ -346,7 +346,7 @@ class AdminDashboard {
 
             // Fetch trainees overview data
             console.log('📡 ADMIN - Fetching trainees overview data...');
-            const traineesData = await apiClient.get('/api/admin/trainees-overview');
+            const traineesData = await this.fetchAllPages('/api/admin/trainees-overview');
             console.log('📊 ADMIN - Received trainees data:', traineesData.length, 'trainees');
 
             // Validate response data structure
@@ -538,7 +538,7 @@ class AdminDashboard {
 
             // Fetch trainings overview data
             console.log('📡 ADMIN - Fetching trainings overview data...');
-            const trainingsData = await apiClient.get('/api/admin/trainings-overview');
+            const trainingsData = await this.fetchAllPages('/api/admin/trainings-overview');
             console.log('📊 ADMIN - Received trainings data:', trainingsData.length, 'trainings');
 
             // Validate response data structure
@@ -722,7 +722,7 @@ class AdminDashboard {
 
             // Fetch sessions overview data
             console.log('📡 ADMIN - Fetching sessions overview data...');
-            const sessionsData = await apiClient.get('/api/admin/sessions-overview');
+            const sessionsData = await this.fetchAllPages('/api/admin/sessions-overview');
             console.log('📊 ADMIN - Received sessions data:', sessionsData.length, 'sessions');
 
             // Validate response data structure
@@ -940,6 +940,26 @@ class AdminDashboard {
         `;
     }
 
+    async fetchAllPages(endpoint, concurrency = 3) {
+        // Overview listings are paginated server-side (100 rows max per page):
+        // the tables sort and filter client-side, so load every page, with at
+        // most `concurrency` requests in flight so large listings don't flood the API
+        const perPage = 100;
+        const firstPage = await apiClient.get(`${endpoint}?per_page=${perPage}`);
+        const pages = [firstPage];
+        let nextPage = 2;
+        const worker = async () => {
+            while (nextPage <= firstPage.total_pages) {
+                const page = nextPage++;
+                pages[page - 1] = await apiClient.get(`${endpoint}?page=${page}&per_page=${perPage}`);
+            }
+        };
+        const workers = Math.min(concurrency, Math.max(0, firstPage.total_pages - 1));
+        await Promise.all(Array.from({ length: workers }, worker));
+        console.log(`📄 ADMIN - ${endpoint}: ${firstPage.total} rows in ${pages.length} pages`);
+        return pages.flatMap(page => page.items);
+    }
+
     setupTableSorting() {
         // Setup sorting for all tables with sortable-table class
         const tables = document.querySelectorAll('table.sortable-table');
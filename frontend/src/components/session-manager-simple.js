@@ -459,36 +459,45 @@ async function showChatHistory(sessionId, sessionName) {
         }
         
         const endpoint = `/api/dashboard/chat-history/${sessionId}`;
-        const url = window.buildSecureApiUrl ? window.buildSecureApiUrl(endpoint) : endpoint;
-        console.log(`🌐 [DEBUG] Making API call to: ${url}`);
         console.log(`🔐 [DEBUG] Auth token exists: ${!!getAuthToken()}`);
         
         const headers = getAuthHeaders();
         console.log(`🔐 [DEBUG] Using headers:`, Object.keys(headers));
         
-        const response = await fetch(url, {
-            headers: headers
-        });
-        
-        console.log(`📡 [DEBUG] API response status: ${response.status} ${response.statusText}`);
-        
-        if (!response.ok) {
-            const errorText = await response.text();
-            console.error(`❌ [DEBUG] API error response: ${errorText}`);
+        // History is paginated: follow X-Next-Cursor until the last page
+        const chatHistory = [];
+        let cursor = null;
+        do {
+            const pageEndpoint = cursor ? `${endpoint}?cursor=${encodeURIComponent(cursor)}` : endpoint;
+            const url = window.buildSecureApiUrl ? window.buildSecureApiUrl(pageEndpoint) : pageEndpoint;
+            console.log(`🌐 [DEBUG] Making API call to: ${url}`);
+            
+            const response = await fetch(url, {
+                headers: headers
+            });
+            
+            console.log(`📡 [DEBUG] API response status: ${response.status} ${response.statusText}`);
             
-            if (response.status === 401) {
-                console.error('❌ [DEBUG] Authentication failed - token may be expired');
-                if (window.authManager) {
-                    window.authManager.clearToken();
-                    window.location.href = '/frontend/public/login.html';
+            if (!response.ok) {
+                const errorText = await response.text();
+                console.error(`❌ [DEBUG] API error response: ${errorText}`);
+                
+                if (response.status === 401) {
+                    console.error('❌ [DEBUG] Authentication failed - token may be expired');
+                    if (window.authManager) {
+                        window.authManager.clearToken();
+                        window.location.href = '/frontend/public/login.html';
+                    }
+                    throw new Error('Authentication expired. Please log in again.');
                 }
-                throw new Error('Authentication expired. Please log in again.');
+                
+                throw new Error(`HTTP ${response.status}: ${errorText}`);
             }
             
-            throw new Error(`HTTP ${response.status}: ${errorText}`);
-        }
+            chatHistory.push(...await response.json());
+            cursor = response.headers.get('X-Next-Cursor');
+        } while (cursor);
         
-        const chatHistory = await response.json();
         console.log(`📊 [DEBUG] Received ${chatHistory.length} chat messages`);
         
         if (chatHistory.length === 0) {
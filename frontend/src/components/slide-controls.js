@@ -452,8 +452,12 @@ export class SlideControls {
             console.log('✅ [IMAGE_GEN] Image generated successfully:', result);
             
             // Display the generated image in the slide content
-            if (result.success && result.image_data) {
-                this.displayGeneratedImage(result.image_data, result.revised_prompt);
+            if (result.success && result.image_url) {
+                const imageSrc = window.buildSecureApiUrl ? window.buildSecureApiUrl(result.image_url) : result.image_url;
+                this.displayGeneratedImage(imageSrc, result.revised_prompt);
+            } else if (result.success && result.image_data) {
+                // Fallback when the server could not store the image
+                this.displayGeneratedImage(`data:image/png;base64,${result.image_data}`, result.revised_prompt);
             }
             
         } catch (error) {
@@ -651,10 +655,10 @@ export class SlideControls {
     
     /**
      * Display generated image in the slide content
-     * @param {string} imageData - Base64 image data
+     * @param {string} imageSrc - Image URL (or data URL)
      * @param {string} prompt - The prompt used to generate the image
      */
-    displayGeneratedImage(imageData, prompt) {
+    displayGeneratedImage(imageSrc, prompt) {
         const slideContentEl = document.getElementById('slide-content');
         if (!slideContentEl) {
             console.error('❌ [SLIDE-CONTROLS] Slide content element not found for image display');
@@ -668,8 +672,9 @@ export class SlideControls {
             <div class="card">
                 <div class="card-body text-center">
                     <h6 class="card-title">📊 Generated Visual Content</h6>
-                    <img src="data:image/png;base64,${imageData}" 
+                    <img src="${imageSrc}" 
                          class="img-fluid rounded" 
+                         decoding="async" 
                          alt="Generated slide image" 
                          style="max-width: 100%; height: auto; border: 1px solid #dee2e6;"
                     />
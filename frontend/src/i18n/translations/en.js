@@ -335,6 +335,7 @@ export const en = {
     'error.file.empty': 'File is empty',
     'error.file.tooLarge': 'File too large. Maximum size: 50MB',
     'error.file.invalidMimeType': 'Invalid file type. Expected: PDF, PPT, or PPTX',
+    'error.file.invalidContent': 'File content does not match its type. Expected: PDF, PPT, or PPTX',
     
     // Training validation
     'validation.trainingNameRequired': 'Training name cannot be empty',
@@ -374,6 +374,7 @@ export const fr = {
     'error.file.empty': 'Le fichier est vide',
     'error.file.tooLarge': 'Fichier trop volumineux. Taille maximale : 50MB',
     'error.file.invalidMimeType': 'Type de fichier invalide. Attendu : PDF, PPT ou PPTX',
+    'error.file.invalidContent': 'Le contenu du fichier ne correspond pas à son type. Attendu : PDF, PPT ou PPTX',
     
     // Validation de formation
     'validation.trainingNameRequired': 'Le nom de la formation ne peut pas être vide',